@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Benchmark chunk offset computation on a large synthetic corpus.
+
+Builds a markdown-ish text corpus (default 50MB, with headers, paragraphs and
+form-feed page breaks), then times:
+
+- span-based chunking + metadata (offsets carried through splitting), for
+  both StructuredMarkdownChunker and PageLevelChunker;
+- the legacy ``raw_content.find(chunk, cursor)`` / retry-from-0 lookup on the
+  same chunks. The legacy path is quadratic, so it is timed on the first
+  ``--legacy-chunks`` chunks and extrapolated linearly (a lower bound).
+
+Usage:
+    python scripts/benchmarks/bench_chunk_offsets.py
+    python scripts/benchmarks/bench_chunk_offsets.py --mb 5 --legacy-chunks 500
+"""
+
+import argparse
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add src to path
+project_root = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(project_root / "src"))
+
+from knowledge_graph.document_ingestion.pdf.utils.chunker import PageLevelChunker, StructuredMarkdownChunker
+
+WORDS = (
+    "graph entity relation ontology schema node edge property label source target "
+    "document chunk page section header footer table column value index query"
+).split()
+
+
+def build_corpus(size_bytes: int, seed: int = 11) -> str:
+    """Markdown sections with hyphenated line breaks and a form feed every ~3KB."""
+    rng = random.Random(seed)
+    parts = []
+    total = 0
+    page_chars = 0
+    section = 0
+    while total < size_bytes:
+        section += 1
+        block = [f"{'#' * rng.randint(1, 3)} Section {section}\n\n"]
+        for _ in range(rng.randint(2, 6)):
+            words = rng.choices(WORDS, k=rng.randint(40, 160))
+            line = " ".join(words)
+            if rng.random() < 0.3:
+                line = line.replace(" ", "-\n", 1)
+            block.append(line + "\n\n")
+        text = "".join(block)
+        parts.append(text)
+        total += len(text)
+        page_chars += len(text)
+        if page_chars > 3000:
+            parts.append("Running Header\n\f")
+            page_chars = 0
+    return "".join(parts)
+
+
+def legacy_offsets(raw: str, chunks, limit: int):
+    cursor = 0
+    for chunk_text in chunks[:limit]:
+        start_index = raw.find(chunk_text, cursor)
+        if start_index == -1:
+            start_index = raw.find(chunk_text)
+        end_index = start_index + len(chunk_text) if start_index != -1 else -1
+        cursor = end_index if end_index != -1 else cursor
+
+
+def bench(name: str, document, chunk_fn, meta_fn, legacy_limit: int) -> None:
+    started = time.perf_counter()
+    chunks = chunk_fn(document)
+    metas = meta_fn(document, chunks)
+    span_seconds = time.perf_counter() - started
+    located = sum(1 for m in metas if m.start_index >= 0)
+
+    limit = min(legacy_limit, len(chunks))
+    started = time.perf_counter()
+    legacy_offsets(document.raw_content, chunks, limit)
+    legacy_seconds = (time.perf_counter() - started) * (len(chunks) / max(limit, 1))
+
+    print(
+        f"{name:<26} chunks={len(chunks):>8} located={located:>8} "
+        f"spans={span_seconds:8.2f}s legacy~{legacy_seconds:10.2f}s "
+        f"(x{legacy_seconds / max(span_seconds, 1e-9):.1f})"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mb", type=float, default=50.0, help="corpus size in MB")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--chunk-overlap", type=int, default=200)
+    parser.add_argument("--legacy-chunks", type=int, default=2000, help="chunks timed with the legacy find()")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    raw = build_corpus(int(args.mb * 1024 * 1024))
+    print(f"corpus: {len(raw) / 1e6:.1f}M chars, {raw.count(chr(12)) + 1} pages")
+
+    document = SimpleNamespace(id="bench", raw_content=raw, pages=None, metadata=SimpleNamespace(language="en"))
+    markdown = StructuredMarkdownChunker(args.chunk_size, args.chunk_overlap)
+    bench("StructuredMarkdownChunker", document, markdown.chunk_document, markdown.create_chunk_metadata, args.legacy_chunks)
+
+    page_level = PageLevelChunker(args.chunk_size, args.chunk_overlap)
+    bench("PageLevelChunker", document, page_level.chunk_document_by_page, page_level.create_page_chunk_metadata, args.legacy_chunks)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""Benchmark graph snapshot and neighbor-lookup latency with and without indexes.
+
+Loads a synthetic graph (default 1M edges spread over several knowledge bases
+and documents) into a throwaway SQLite database, then times
+``get_graph_snapshot`` and ``get_neighbors`` before and after
+``create_indexes()`` + ``optimize(analyze=True)``.
+
+Usage:
+    python scripts/benchmarks/bench_graph_snapshot.py
+    python scripts/benchmarks/bench_graph_snapshot.py --edges 200000 --kbs 5
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add src to path
+project_root = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(project_root / "src"))
+
+from knowledge_graph.settings.settings import load_settings
+from knowledge_graph.persistence.sqlite.sql_lite import SqlLite
+from knowledge_graph.persistence.sqlite.core.queries import INSERT_ENTITY, INSERT_RELATIONSHIP
+
+
+def load_graph(sql_lite: SqlLite, *, edges: int, kbs: int, docs_per_kb: int, batch_size: int = 50_000):
+    """Bulk load a synthetic graph; returns (kb_ids, doc_ids, entity_count)."""
+    kb_repo = sql_lite.knowledge_base_repository()
+    kb_ids = [int(kb_repo.create(f"Bench {i}", f"bench-{i}").id) for i in range(kbs)]
+
+    graph_repo = sql_lite.graph_repository()
+    graph_repo.create_tables(build_indexes=False)
+
+    doc_ids = []
+    total_docs = kbs * docs_per_kb
+    entities_per_doc = max(2, edges // (2 * total_docs))
+    edges_per_doc = max(1, edges // total_docs)
+    rng = random.Random(7)
+
+    started = time.perf_counter()
+    with sql_lite.pool.writer() as conn:
+        cur = conn.cursor()
+        entity_id = 0
+        rel_id = 0
+        for k, kb_id in enumerate(kb_ids):
+            for d in range(docs_per_kb):
+                doc_id = k * docs_per_kb + d + 1
+                doc_ids.append(doc_id)
+                cur.execute(
+                    "INSERT INTO documents (id, kb_id, file_name, file_path, file_type) VALUES (?, ?, ?, ?, 'CSV')",
+                    (doc_id, kb_id, f"doc_{doc_id}.csv", f"/tmp/doc_{doc_id}.csv"),
+                )
+                first = entity_id + 1
+                rows = []
+                for _ in range(entities_per_doc):
+                    entity_id += 1
+                    rows.append((entity_id, kb_id, doc_id, 0, "thing", f"Entity {entity_id}", '{"n":1}'))
+                cur.executemany(INSERT_ENTITY, rows)
+                rels = []
+                for _ in range(edges_per_doc):
+                    rel_id += 1
+                    src = rng.randint(first, entity_id)
+                    tgt = rng.randint(first, entity_id)
+                    rels.append((rel_id, kb_id, doc_id, None, "related_to", src, tgt, None, 1.0))
+                    if len(rels) >= batch_size:
+                        cur.executemany(INSERT_RELATIONSHIP, rels)
+                        rels = []
+                if rels:
+                    cur.executemany(INSERT_RELATIONSHIP, rels)
+    elapsed = time.perf_counter() - started
+    print(f"Loaded {entity_id:,} entities / {rel_id:,} edges in {elapsed:.1f}s ({(entity_id + rel_id) / elapsed:,.0f} rows/sec)")
+    return kb_ids, doc_ids, entity_id
+
+
+def timed(fn, repeat: int) -> float:
+    """Median wall time in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def run_queries(sql_lite: SqlLite, kb_ids, doc_ids, entity_count: int, repeat: int) -> dict:
+    graph_repo = sql_lite.graph_repository()
+    rng = random.Random(11)
+    probe_entities = [rng.randint(1, entity_count) for _ in range(200)]
+    return {
+        "snapshot(kb_id)": timed(lambda: graph_repo.get_graph_snapshot(kb_id=str(kb_ids[0])), repeat),
+        "snapshot(document_id)": timed(lambda: graph_repo.get_graph_snapshot(document_id=str(doc_ids[-1])), repeat),
+        "200x get_neighbors": timed(lambda: [graph_repo.get_neighbors(str(e)) for e in probe_entities], repeat),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--edges", type=int, default=1_000_000)
+    parser.add_argument("--kbs", type=int, default=10)
+    parser.add_argument("--docs-per-kb", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        settings = load_settings({"db": {"db_location": str(Path(tmp) / "bench.db")}})
+        sql_lite = SqlLite(settings)
+        sql_lite.knowledge_base_repository().create_tables()
+        sql_lite.document_repository().create_tables()
+
+        kb_ids, doc_ids, entity_count = load_graph(
+            sql_lite, edges=args.edges, kbs=args.kbs, docs_per_kb=args.docs_per_kb
+        )
+
+        print("\nWithout graph indexes...")
+        before = run_queries(sql_lite, kb_ids, doc_ids, entity_count, args.repeat)
+
+        graph_repo = sql_lite.graph_repository()
+        started = time.perf_counter()
+        graph_repo.create_indexes()
+        graph_repo.optimize(analyze=True)
+        print(f"Built indexes + ANALYZE in {time.perf_counter() - started:.1f}s")
+
+        print("With graph indexes...")
+        after = run_queries(sql_lite, kb_ids, doc_ids, entity_count, args.repeat)
+
+        print(f"\n{'query':<24}{'no index (ms)':>16}{'indexed (ms)':>16}{'speedup':>10}")
+        for name in before:
+            speedup = before[name] / after[name] if after[name] else float("inf")
+            print(f"{name:<24}{before[name]:>16.1f}{after[name]:>16.1f}{speedup:>9.1f}x")
+
+        sql_lite.close()
+
+
+if __name__ == "__main__":
+    main()
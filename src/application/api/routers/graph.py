@@ -1,8 +1,10 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator
+import json
 import logging
 
 from knowledge_graph.entity_resolution import EntityResolutionService
@@ -32,6 +34,36 @@ async def get_graph_snapshot(
     return client.get_graph_snapshot(document_id=document_id)
 
 
+@router.get("/api/graph/page")
+async def get_graph_page(
+    kind: str = Query("nodes", pattern="^(nodes|edges)$"),
+    kb_id: Optional[str] = None,
+    document_id: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(1000, ge=1, le=10000),
+    client = Depends(get_kg_client),
+):
+    """Keyset-paginated nodes or edges; pass `next_cursor` back as `cursor`."""
+    if cursor is not None and not cursor.isdigit():
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return client.get_graph_page(kind, kb_id=kb_id, document_id=document_id, cursor=cursor, limit=limit)
+
+
+@router.get("/api/graph/stream")
+def stream_graph_snapshot(
+    kb_id: Optional[str] = None,
+    document_id: Optional[str] = None,
+    client = Depends(get_kg_client),
+):
+    """NDJSON snapshot: one {"kind": ..., "data": ...} object per line (documents, then nodes, then edges)."""
+
+    def lines() -> Iterator[str]:
+        for kind, record in client.iter_graph_snapshot(kb_id=kb_id, document_id=document_id):
+            yield json.dumps({"kind": kind, "data": record}, separators=(",", ":")) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
 @router.post("/api/entity-resolution/run")
 async def run_entity_resolution(
     payload: ERRunPayload,
@@ -64,11 +96,10 @@ async def get_resolved_graph(
     # Build resolved nodes/edges
     resolved = er_persist.fetch_resolved_graph_snapshot(client.db_client, ids_list)
     # Reuse existing documents list to keep UI filter consistent
-    raw_snapshot = client.get_graph_snapshot()
     return {
         "nodes": resolved.get("nodes", []),
         "edges": resolved.get("edges", []),
-        "documents": raw_snapshot.get("documents", []),
+        "documents": client.get_graph_documents(),
     }
 
 
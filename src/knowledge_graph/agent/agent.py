@@ -113,7 +113,8 @@ class CsvAnalysis:
 
 
 """Note: the agent uses the shared tabular tools for CSV IO."""
-from knowledge_graph.document_ingestion.tabular.agents_tools import sniff_csv, read_rows
+from knowledge_graph.document_ingestion.tabular.source import CsvSource
+from knowledge_graph.document_ingestion.tabular.profiler import profile_rows
 
 
 # # --- Type inference ---
@@ -183,60 +184,38 @@ class CsvAnalysisAgent:
     It uses internal helper functions as "tools" to read and parse the file safely.
     """
 
-    def analyze_csv_columns(self, path: str, sample_rows: int = 1000) -> CsvAnalysis:
+    def analyze_csv_columns(self, path: str, sample_rows: int = 1000, *, source: Optional[CsvSource] = None) -> CsvAnalysis:
         if not os.path.exists(path):
             raise FileNotFoundError(f"File not found: {path}")
 
         logger.info("[agent] analyze_csv_columns start path=%s sample_rows=%d", path, sample_rows)
         t0 = time.time()
 
-        dialect = sniff_csv(path)
-        rows = read_rows(path, dialect, limit=sample_rows)
-        if not rows:
+        source = source or CsvSource.open(path, sample_rows=sample_rows)
+        headers = source.headers
+        if not headers:
             raise ValueError("CSV appears empty")
-
-        headers = rows[0]
-        data = rows[1:]
+        data = source.sample(sample_rows)
         col_count = len(headers)
-        col_values: List[List[str]] = [[] for _ in range(col_count)]
-        null_counts = [0] * col_count
-        examples: List[List[str]] = [[] for _ in range(col_count)]
-
-        for r in data:
-            # Normalize row length
-            if len(r) < col_count:
-                r = r + [""] * (col_count - len(r))
-            elif len(r) > col_count:
-                r = r[:col_count]
-            for i, v in enumerate(r):
-                val = (v or "").strip()
-                if val == "":
-                    null_counts[i] += 1
-                else:
-                    col_values[i].append(val)
-                    if len(examples[i]) < 3 and val not in examples[i]:
-                        examples[i].append(val)
-
-        summaries: List[ColumnSummary] = []
-        for i, name in enumerate(headers):
-            non_null = len(col_values[i])
-            distinct = len(set(col_values[i]))
-            inferred = _infer_type(col_values[i][:200])  # cap for speed
-            summaries.append(
-                ColumnSummary(
-                    name=name,
-                    inferred_type=inferred,
-                    non_null=non_null,
-                    nulls=null_counts[i],
-                    distinct=distinct,
-                    examples=examples[i],
-                )
+
+        # Bounded-memory column stats (HLL distinct estimates past 10k values)
+        table = profile_rows(headers, data)
+        summaries: List[ColumnSummary] = [
+            ColumnSummary(
+                name=c.name,
+                inferred_type=c.inferred_type,
+                non_null=c.non_null,
+                nulls=c.nulls,
+                distinct=c.distinct,
+                examples=c.example_values,
             )
+            for c in table.columns
+        ]
 
         analysis = CsvAnalysis(
             path=os.path.abspath(path),
-            delimiter=getattr(dialect, "delimiter", ","),
-            encoding="utf-8",
+            delimiter=source.delimiter,
+            encoding=source.encoding,
             row_count_sampled=len(data),
             column_count=col_count,
             columns=summaries,
@@ -283,28 +262,29 @@ class CsvAnalysisAgent:
         sample_rows: int = 30,
         llm_service: Optional[Any] = None,
         delimiter: Optional[str] = None,
+        source: Optional[CsvSource] = None,
     ) -> str:
         """Summarize columns via LLM using a compact sample.
 
         Requires an LLMService instance (or will construct a default one).
-        Returns a concise natural-language analysis.
+        Returns a concise natural-language analysis. Pass the document's
+        ``CsvSource`` to reuse its sniffed headers and sample rows.
         """
         # Local read (the "tool")
         logger.info("[agent] analyze_with_llm start path=%s sample_rows=%d", path, sample_rows)
         t0 = time.time()
-        dialect = sniff_csv(path, delimiter=delimiter)
-        rows = read_rows(path, dialect, limit=sample_rows + 1)
-        if not rows:
+        source = source or CsvSource.open(path, delimiter=delimiter, sample_rows=sample_rows)
+        headers = source.headers
+        if not headers:
             raise ValueError("CSV appears empty")
-        headers = rows[0]
-        data = rows[1:]
+        data = source.sample(sample_rows)
 
         # Build a compact sample (avoid huge prompts); use random sampling of data rows
         sample_rows_count = min(sample_rows, len(data))
         selected_rows = random.sample(data, sample_rows_count) if sample_rows_count > 0 else []
         preview_lines = [headers] + selected_rows
         # Render as Markdown table for improved LLM readability
-        delim = getattr(dialect, "delimiter", ",") or ","
+        delim = source.delimiter or ","
 
         def _to_markdown_table(hdrs, rows_, *, max_cols=None, cell_max_len=120):
             """Convert a csv to a markdown table."""
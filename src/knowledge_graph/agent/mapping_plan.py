@@ -0,0 +1,391 @@
+"""Compile a mapping spec into a per-row execution plan.
+
+The mapping spec (see ``transformer``) is a nested dict keyed by entity name.
+Interpreting it per row means re-walking those dicts, looking normalizers up
+by name and re-running the ``{Column}`` template regex for every row, entity
+and edge. ``MappingPlan.compile`` does all of that once against the CSV
+headers and produces closures over column positions, so the inner loop works
+on plain row lists (``row[i]``) with no dict lookups or regex work.
+
+Semantics match the dict-based helpers they replace:
+
+- key ``{column, prefix, transform}``: ``prefix + transform(row[column])``,
+  or "" when the normalized value is empty;
+- key ``{template, transforms}``: placeholders replaced by their
+  (optionally normalized) column values;
+- missing columns read as "", unknown normalizer names act as identity.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import re
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from .normalizers import REGISTRY as NORMALIZERS
+
+Row = Sequence[str]
+KeyFn = Callable[[Row], str]
+Normalizer = Callable[[Any], str]
+# Expanded staged entities: node id -> (entity name, retained attribute columns)
+Staged = Dict[str, Tuple[str, Dict[str, str]]]
+Relation = Tuple[str, str, str]
+
+_PLACEHOLDER = re.compile(r"\{([^}]+)\}")
+
+
+def _normalizer(name: Optional[str]) -> Optional[Normalizer]:
+    """Resolve a normalizer once; None means identity."""
+    return NORMALIZERS.get(name) if name else None
+
+
+def _reader(column: Optional[str], columns: Dict[str, int], fn: Optional[Normalizer]) -> Callable[[Row], str]:
+    """Closure returning the (normalized) value of ``column`` from a row list."""
+    idx = columns.get(column) if column is not None else None
+    if idx is None:
+        value = fn("") if fn else ""
+        return lambda row: value
+    if fn is None:
+        return lambda row: row[idx]
+    return lambda row: fn(row[idx])
+
+
+def _entity_key_spec(entity_spec: Any) -> Dict[str, Any]:
+    """Extract the key specification from an entity spec."""
+    key = entity_spec.get("key") if isinstance(entity_spec, dict) else None
+    return key if isinstance(key, dict) else {}
+
+
+def compile_key(key_spec: Dict[str, Any], columns: Dict[str, int]) -> KeyFn:
+    """Compile a key spec into ``fn(row) -> node id`` ("" when unresolvable)."""
+    template = key_spec.get("template")
+    if template:
+        transforms = key_spec.get("transforms", {}) or {}
+        # re.split with one group alternates literal, placeholder, literal, ...
+        pieces = _PLACEHOLDER.split(template)
+        literals = pieces[0::2]
+        readers = [_reader(col, columns, _normalizer(transforms.get(col))) for col in pieces[1::2]]
+        if not readers:
+            return lambda row: template
+        head, tails = literals[0], tuple(zip(readers, literals[1:]))
+
+        def template_key(row: Row) -> str:
+            parts = [head]
+            for read, literal in tails:
+                parts.append(read(row))
+                parts.append(literal)
+            return "".join(parts)
+
+        return template_key
+
+    prefix = key_spec.get("prefix", "") or ""
+    read = _reader(key_spec.get("column"), columns, _normalizer(key_spec.get("transform")))
+    if not prefix:
+        return read
+
+    def column_key(row: Row) -> str:
+        norm = read(row)
+        return f"{prefix}{norm}" if norm else ""
+
+    return column_key
+
+
+@dataclass(frozen=True)
+class EdgePlan:
+    predicate: str
+    source_entity: str
+    target_entity: str
+    source_key: KeyFn
+    target_key: KeyFn
+
+
+@dataclass(frozen=True)
+class MappingPlan:
+    """Tuple-indexed execution plan for one mapping spec and header row."""
+
+    headers: Tuple[str, ...]
+    columns: Dict[str, int]
+    # (entity name, key fn) per mapped entity, in mapping order
+    entities: Tuple[Tuple[str, KeyFn], ...]
+    edges: Tuple[EdgePlan, ...]
+    null_policy: str
+    # (column name, position) of each entity's mapped attribute columns
+    attribute_columns: Dict[str, Tuple[Tuple[str, int], ...]]
+
+    @classmethod
+    def compile(cls, mapping: Dict[str, Any], headers: Sequence[str]) -> "MappingPlan":
+        headers = tuple(headers)
+        # Duplicate headers resolve to the last occurrence, as dict(zip(headers, row)) did
+        columns = {header: idx for idx, header in enumerate(headers)}
+
+        ent_map: Dict[str, Any] = mapping.get("entities", {}) if isinstance(mapping.get("entities"), dict) else {}
+        entity_keys = {name: compile_key(_entity_key_spec(spec), columns) for name, spec in ent_map.items()}
+
+        edges: List[EdgePlan] = []
+        for e in mapping.get("edges", []) or []:
+            pred = e.get("predicate") or e.get("label") or e.get("relation")
+            if not pred:
+                continue
+            ends = []
+            for which in (e.get("source") or {}, e.get("target") or {}):
+                name = which.get("entity")
+                by = which.get("by")
+                if by and isinstance(by, dict):
+                    key = compile_key(by, columns)
+                else:
+                    key = entity_keys.get(name) or compile_key(_entity_key_spec(ent_map.get(name, {})), columns)
+                ends.append((name or "Entity", key))
+            edges.append(EdgePlan(pred, ends[0][0], ends[1][0], ends[0][1], ends[1][1]))
+
+        attribute_columns: Dict[str, Tuple[Tuple[str, int], ...]] = {}
+        for name, spec in ent_map.items():
+            retained: List[Tuple[str, int]] = []
+            for attr in (spec.get("attributes", []) or []) if isinstance(spec, dict) else []:
+                column = attr.get("column") if isinstance(attr, dict) else None
+                if column in columns and all(column != c for c, _ in retained):
+                    retained.append((column, columns[column]))
+            attribute_columns[name] = tuple(retained)
+
+        return cls(
+            headers=headers,
+            columns=columns,
+            entities=tuple(entity_keys.items()),
+            edges=tuple(edges),
+            null_policy=(mapping.get("options", {}) or {}).get("null_policy", "skip"),
+            attribute_columns=attribute_columns,
+        )
+
+    def fit(self, row: List[str]) -> List[str]:
+        """Pad/truncate a raw CSV row to the header width."""
+        width = len(self.headers)
+        if len(row) < width:
+            return row + [""] * (width - len(row))
+        if len(row) > width:
+            return row[:width]
+        return row
+
+    def entity_ids(self, row: Row) -> Iterator[Tuple[str, str]]:
+        """(entity name, node id) for each mapped entity whose key resolves on ``row``."""
+        for name, key in self.entities:
+            node_id = key(row)
+            if node_id:
+                yield name, node_id
+
+    def edge_triples(self, row: Row) -> Iterator[Tuple[EdgePlan, str, str]]:
+        """(edge, source id, target id) for each edge with both endpoints resolved on ``row``."""
+        for edge in self.edges:
+            src_id = edge.source_key(row)
+            if not src_id:
+                continue
+            tgt_id = edge.target_key(row)
+            if tgt_id:
+                yield edge, src_id, tgt_id
+
+    def accumulator(self) -> "EntityAccumulator":
+        """Empty entity accumulator retaining this plan's attribute columns."""
+        return EntityAccumulator(self.attribute_columns)
+
+    def stage_row(self, row: Row, staged: "EntityAccumulator", relations: Set[Relation]) -> None:
+        """Accumulate ``row``'s entities and relations.
+
+        Entities keep only their attribute columns; an entity seen again
+        keeps its first non-empty value per column. Edge endpoints are staged
+        too (as placeholders when their entity has no key of its own).
+        """
+        stage = staged.stage
+        for name, node_id in self.entity_ids(row):
+            stage(node_id, name, row)
+        for edge, src_id, tgt_id in self.edge_triples(row):
+            stage(src_id, edge.source_entity, row)
+            stage(tgt_id, edge.target_entity, row)
+            relations.add((src_id, edge.predicate, tgt_id))
+
+
+def mapping_columns(mapping: Dict[str, Any]) -> List[str]:
+    """Every column a mapping spec reads (keys, templates, attributes, edge ``by`` keys), in first-use order."""
+    seen: Dict[str, None] = {}
+
+    def visit(node: Any) -> None:
+        if isinstance(node, dict):
+            column = node.get("column")
+            if isinstance(column, str) and column:
+                seen.setdefault(column)
+            template = node.get("template")
+            if isinstance(template, str):
+                for column in _PLACEHOLDER.findall(template):
+                    seen.setdefault(column)
+            for value in node.values():
+                visit(value)
+        elif isinstance(node, list):
+            for value in node:
+                visit(value)
+
+    visit(mapping.get("entities", {}))
+    visit(mapping.get("edges", []))
+    return list(seen)
+
+
+# Accumulator codes pack (slot within type << _TYPE_BITS) | type ordinal into one int
+_TYPE_BITS = 16
+_TYPE_MASK = (1 << _TYPE_BITS) - 1
+
+
+class _TypeColumns:
+    """Column store for the entities of one type: node ids plus one value list per retained column."""
+
+    __slots__ = ("name", "index", "columns", "positions", "node_ids", "values")
+
+    def __init__(self, name: str, index: int, attribute_columns: Tuple[Tuple[str, int], ...]) -> None:
+        self.name = name
+        self.index = index
+        self.columns = tuple(c for c, _ in attribute_columns)
+        self.positions = tuple(i for _, i in attribute_columns)
+        self.node_ids: List[str] = []
+        self.values: List[List[str]] = [[] for _ in self.columns]
+
+    def __len__(self) -> int:
+        return len(self.node_ids)
+
+    def row_data(self, slot: int) -> Dict[str, str]:
+        return {c: values[slot] for c, values in zip(self.columns, self.values)}
+
+
+class EntityAccumulator:
+    """Compact staging area for the entities produced by ``MappingPlan.stage_row``.
+
+    Entity type names are interned once per accumulator; each type keeps its
+    node ids and one list per mapped attribute column, so an entity costs one
+    dict entry (node id -> packed type/slot code) plus one list cell per
+    retained column instead of a tuple and a per-entity dict. An entity seen
+    again keeps its first non-empty value per column.
+    """
+
+    __slots__ = ("_attribute_columns", "_types", "_type_index", "_codes")
+
+    def __init__(self, attribute_columns: Optional[Dict[str, Tuple[Tuple[str, int], ...]]] = None) -> None:
+        self._attribute_columns = attribute_columns or {}
+        self._types: List[_TypeColumns] = []
+        self._type_index: Dict[str, int] = {}
+        self._codes: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    def __contains__(self, node_id: object) -> bool:
+        return node_id in self._codes
+
+    def _type(self, name: str, like: Optional[_TypeColumns] = None) -> _TypeColumns:
+        """Type store for ``name``, created on first use (with ``like``'s columns when given)."""
+        idx = self._type_index.get(name)
+        if idx is None:
+            idx = len(self._types)
+            if idx > _TYPE_MASK:
+                raise ValueError(f"too many entity types (> {_TYPE_MASK})")
+            columns = tuple(zip(like.columns, like.positions)) if like else self._attribute_columns.get(name, ())
+            self._types.append(_TypeColumns(name, idx, columns))
+            self._type_index[name] = idx
+        return self._types[idx]
+
+    def _locate(self, node_id: str) -> Optional[Tuple[_TypeColumns, int]]:
+        code = self._codes.get(node_id)
+        if code is None:
+            return None
+        return self._types[code & _TYPE_MASK], code >> _TYPE_BITS
+
+    def stage(self, node_id: str, name: str, row: Row) -> None:
+        """Add ``node_id`` of type ``name`` from ``row``, or fill its empty columns from ``row``."""
+        code = self._codes.get(node_id)
+        if code is None:
+            t = self._type(name)
+            slot = len(t.node_ids)
+            t.node_ids.append(node_id)
+            for values, i in zip(t.values, t.positions):
+                values.append(row[i])
+            self._codes[node_id] = (slot << _TYPE_BITS) | t.index
+            return
+        t = self._types[code & _TYPE_MASK]
+        slot = code >> _TYPE_BITS
+        for values, i in zip(t.values, t.positions):
+            if not values[slot]:
+                values[slot] = row[i]
+
+    def merge(self, other: "EntityAccumulator") -> "EntityAccumulator":
+        """Merge ``other`` into this accumulator, column by column (keep first non-empty)."""
+        for src in other._types:
+            dst = self._type(src.name, like=src)
+            new_slots: List[int] = []
+            # existing entities grouped by the type they were first staged as
+            fills: Dict[int, List[Tuple[int, int]]] = {}
+            for src_slot, node_id in enumerate(src.node_ids):
+                code = self._codes.get(node_id)
+                if code is None:
+                    new_slots.append(src_slot)
+                else:
+                    fills.setdefault(code & _TYPE_MASK, []).append((code >> _TYPE_BITS, src_slot))
+
+            src_by_column = dict(zip(src.columns, src.values))
+            for type_idx, pairs in fills.items():
+                target = self._types[type_idx]
+                for column, dst_values in zip(target.columns, target.values):
+                    src_values = src_by_column.get(column)
+                    for dst_slot, src_slot in pairs:
+                        if not dst_values[dst_slot]:
+                            dst_values[dst_slot] = src_values[src_slot] if src_values is not None else ""
+
+            if new_slots:
+                base = len(dst.node_ids)
+                dst.node_ids.extend(src.node_ids[s] for s in new_slots)
+                for column, dst_values in zip(dst.columns, dst.values):
+                    src_values = src_by_column.get(column)
+                    if src_values is None:
+                        dst_values.extend("" for _ in new_slots)
+                    else:
+                        dst_values.extend(src_values[s] for s in new_slots)
+                for offset, node_id in enumerate(dst.node_ids[base:]):
+                    self._codes[node_id] = ((base + offset) << _TYPE_BITS) | dst.index
+        return self
+
+    def select(self, node_ids: Iterable[str]) -> "EntityAccumulator":
+        """New accumulator holding just ``node_ids`` (used to flush a large result in slices)."""
+        out = EntityAccumulator(self._attribute_columns)
+        for node_id in node_ids:
+            found = self._locate(node_id)
+            if found is None:
+                continue
+            t, slot = found
+            dst = out._type(t.name, like=t)
+            out._codes[node_id] = (len(dst.node_ids) << _TYPE_BITS) | dst.index
+            dst.node_ids.append(node_id)
+            for dst_values, values in zip(dst.values, t.values):
+                dst_values.append(values[slot])
+        return out
+
+    def clear(self) -> None:
+        self._types.clear()
+        self._type_index.clear()
+        self._codes.clear()
+
+    def node_ids(self) -> Iterator[str]:
+        return iter(self._codes)
+
+    def types(self) -> Iterator[_TypeColumns]:
+        """Per-type column stores, in first-seen order (empty types skipped)."""
+        return (t for t in self._types if t.node_ids)
+
+    def records(self) -> Iterator[Tuple[str, str, Dict[str, str]]]:
+        """(node id, entity name, retained column values) for every entity."""
+        for t in self.types():
+            for slot, node_id in enumerate(t.node_ids):
+                yield node_id, t.name, t.row_data(slot)
+
+    def to_dict(self) -> Staged:
+        """Expanded ``{node id: (entity name, row data)}`` view (for tests and debugging)."""
+        return {node_id: (name, data) for node_id, name, data in self.records()}
+
+
+def merge_staged(into: EntityAccumulator, other: EntityAccumulator) -> EntityAccumulator:
+    """Merge ``other`` into ``into`` with the same keep-first-non-empty rule as ``stage_row``."""
+    return into.merge(other)
+
+
+__all__ = ["EdgePlan", "EntityAccumulator", "MappingPlan", "compile_key", "mapping_columns", "merge_staged"]
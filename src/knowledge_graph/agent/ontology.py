@@ -192,8 +192,8 @@ def generate_ontology_from_analysis(analysis_text: str, *, llm_service: Optional
     Returns a dict with keys 'entities', 'relationships', and optional 'notes'.
     On parse error, returns {'raw': <llm_text>}.
     """
-from knowledge_graph.llm.service import LLMService
-from langchain_core.prompts import ChatPromptTemplate
+    from knowledge_graph.llm.service import LLMService
+    from langchain_core.prompts import ChatPromptTemplate
 
     svc = LLMService()
 
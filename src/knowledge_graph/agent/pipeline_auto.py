@@ -23,7 +23,7 @@ from typing import Optional
 from .agent import CsvAnalysisAgent
 from .ontology import generate_ontology_from_analysis
 from .mapping import compile_mapping_from_ontology
-from .tools import sniff_csv, read_rows
+from knowledge_graph.document_ingestion.tabular.source import CsvSource
 from .transformer import transform_csv_to_kg, write_kg_json
 from .entity_resolution import resolve_entities
 
@@ -32,19 +32,18 @@ logger = logging.getLogger("knowledgeAgent.agent.pipeline_auto")
 
 
 def _csv_headers(path: str, sample_rows: int = 1, *, delimiter: Optional[str] = None) -> list[str]:
-    d = sniff_csv(path, delimiter=delimiter)
-    rows = read_rows(path, d, limit=sample_rows)
-    if not rows:
-        return []
-    return rows[0]
+    return CsvSource.open(path, delimiter=delimiter, sample_rows=sample_rows).headers
 
 
 def run(csv_path: str, *, sample_rows: int = 30, out_path: Optional[str] = None, save_mapping: Optional[str] = None, delimiter: Optional[str] = None, er: bool = True) -> dict:
     logger.info("[auto] start csv=%s sample_rows=%d", csv_path, sample_rows)
 
+    # Sniff once; analysis, mapping and transform all reuse this source
+    source = CsvSource.open(csv_path, delimiter=delimiter, sample_rows=sample_rows)
+
     # 1) Column analysis (LLM)
     agent = CsvAnalysisAgent()
-    analysis_text = agent.analyze_with_llm(csv_path, sample_rows=sample_rows, delimiter=delimiter)
+    analysis_text = agent.analyze_with_llm(csv_path, sample_rows=sample_rows, delimiter=delimiter, source=source)
     try:
         logger.info("[auto] analysis text (first 2000 chars):\n%s", (analysis_text or "")[:2000])
     except Exception:
@@ -58,7 +57,7 @@ def run(csv_path: str, *, sample_rows: int = 30, out_path: Optional[str] = None,
         pass
 
     # 3) Compile mapping
-    headers = _csv_headers(csv_path, delimiter=delimiter)
+    headers = source.headers
     try:
         logger.info("[auto] detected headers: %s", headers)
     except Exception:
@@ -92,7 +91,7 @@ def run(csv_path: str, *, sample_rows: int = 30, out_path: Optional[str] = None,
             if save_mapping is None:
                 save_mapping = "/tmp/mapping.json"
 
-    kg = transform_csv_to_kg(csv_path, mapping, delimiter=delimiter)
+    kg = transform_csv_to_kg(csv_path, mapping, delimiter=delimiter, source=source)
     if er:
         kg_resolved, er_stats = resolve_entities(kg)
         try:
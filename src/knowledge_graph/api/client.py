@@ -1,10 +1,13 @@
-from typing import Dict, Optional, Union, List, Any, Tuple
+from typing import Dict, Iterator, Optional, Union, List, Any, Tuple
+from dataclasses import replace
+from functools import partial
 import uuid as _uuid
 import logging
 from pathlib import Path
 from datetime import datetime
-from ..document_ingestion import DocumentPipeline # , DocumentPipelineConfig, DocumentPipelineServices
+from ..document_ingestion import DocumentPipeline, DocumentPipelineConfig, DocumentPipelineServices
 from ..document_ingestion.factory import PipelineFactory
+from ..document_ingestion.batch import BatchIngestor, BatchReport, discover_paths
 from ..config import (
     KnowledgeGraphConfig,
     DatabaseConfig,
@@ -17,6 +20,7 @@ from ..config import (
 from ..data_structs.knowledge_base import KnowledgeBase
 
 from ..persistence.json.knowledge_base_repository import JSONKnowledgeBaseRepository
+from ..persistence.sqlite.core.ids import document_db_id
 from ..persistence.sqlite.knowledge_graph.knowledge_base_repository import (
     SQLiteKnowledgeBaseRepository,
 )
@@ -49,31 +53,98 @@ class KnowledgeGraphClient:
         from ..persistence.sqlite.sql_lite import SqlLite
         self.sql_lite = SqlLite(self.settings)
         self.sql_lite.create_tables()
+
+    def _pipeline_config(self, config: Optional[DocumentPipelineConfig] = None) -> DocumentPipelineConfig:
+        """``config`` (or the defaults) with the parse cache from ``settings.cache`` unless it sets its own."""
+        config = config or DocumentPipelineConfig()
+        cache = getattr(self.settings, "cache", None)
+        if config.cache is not None or cache is None:
+            return config
+        return replace(
+            config,
+            cache=CacheConfig(
+                enabled=cache.enabled,
+                location=cache.location,
+                max_size_mb=cache.max_size_mb,
+                ttl_hours=cache.ttl_hours,
+            ),
+        )
         
     
     # Document Operations
-    def add_document(self, document_path: str,kb_id: str) -> str:
+    def add_document(
+        self,
+        document_path: str,
+        kb_id: str,
+        *,
+        dedup: bool = True,
+        clone_duplicates: bool = True,
+    ) -> str:
         logger.debug(green("--------------------------------- Add Document---------------------------------"))
         """Add a document to the knowledge graph using the appropriate pipeline.
 
         Auto-generates a document ID and routes to a CSV or general pipeline
         based on file extension.
 
-        Returns the generated document ID.
+        With ``dedup``, content already ingested into this KB by the same
+        pipeline configuration is not processed again and the existing
+        document's ID is returned; content ingested into another KB is cloned
+        into this one (``clone_duplicates``) instead of re-extracted.
+
+        Returns the document ID.
         """
         
         document_id = f"doc_{_uuid.uuid4().hex[:8]}"
-        pipeline = PipelineFactory.for_file(document_path)
+        pipeline = PipelineFactory.for_file(document_path, config=self._pipeline_config())
         
         document = pipeline.run(
             document_path=document_path,
             document_id=document_id,
             kb_id=kb_id,
+            dedup=dedup,
+            clone_duplicates=clone_duplicates,
         )            
+        dedup_info = pipeline.last_results.get("dedup") or {}
+        if dedup_info.get("action") == "skipped":
+            logger.info(f"Document already ingested as {dedup_info['duplicate_of']}; skipped")
+            return str(dedup_info["duplicate_of"])
+        if dedup_info.get("action") == "cloned":
+            logger.info(
+                f"Document cloned from {dedup_info['duplicate_of']} "
+                f"({dedup_info['entities']} entities, {dedup_info['relationships']} relationships)"
+            )
         logger.info(f"Document ID: {document_id}")
         logger.info(f"kb ID: {kb_id}")
         return document_id
 
+    def reingest_document(self, document_id: str, document_path: str, kb_id: Optional[str] = None) -> str:
+        """Re-ingest a new version of an existing document under the same ID.
+
+        Tabular documents apply only the delta against the rows stored for the
+        previous version (changed and removed rows; see ``tabular/incremental``)
+        instead of loading the whole file again. ``kb_id`` defaults to the
+        document's current knowledge base. The run is recorded for dedup but
+        never skipped as a duplicate.
+
+        Returns the document ID.
+        """
+        if kb_id is None:
+            stored_kb = self.sql_lite.document_repository().get_document_kb_id(document_db_id(document_id))
+            if stored_kb is None:
+                raise ValueError(f"Document {document_id} does not exist")
+            kb_id = str(stored_kb)
+
+        pipeline = PipelineFactory.for_file(document_path, config=self._pipeline_config(), incremental=True)
+        pipeline.run(
+            document_path=document_path,
+            document_id=document_id,
+            kb_id=kb_id,
+            dedup=False,
+            record_completed=True,
+        )
+        logger.info(f"Document {document_id} re-ingested from {document_path}: {pipeline.last_results.get('transform_and_persist_kg')}")
+        return document_id
+
     def upload_file(self, file_path: str, kb_id: str) -> str:
         """Convenience: upload/ingest a file and route to the appropriate pipeline.
 
@@ -252,44 +323,95 @@ class KnowledgeGraphClient:
         s = _re.sub(r"-+", "-", s)
         return s.strip("-") or "kb"
 
-    # --- Bulk ingestion wrapper ---
+    # --- Bulk ingestion ---
+    def add_documents(
+        self,
+        source: Union[str, List[str]],
+        kb_id: str,
+        *,
+        pattern: Optional[str] = None,
+        documents: int = 4,
+        cpu_workers: Optional[int] = None,
+        io_workers: int = 8,
+        queue_size: Optional[int] = None,
+        dedup: bool = True,
+        clone_duplicates: bool = True,
+        domain: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        pipeline_config: Optional[DocumentPipelineConfig] = None,
+    ) -> BatchReport:
+        """Ingest many files concurrently into a knowledge base.
+
+        ``source`` is a directory (every supported file, or those matching
+        ``pattern``), a glob, or a list of paths. ``documents`` pipelines run at
+        once, fed from a queue of ``queue_size`` paths; their steps share a CPU
+        pool, an I/O pool (``io_workers``) and a single thread for the
+        persistence steps. Dedup works as in ``add_document``.
+        ``pipeline_config`` configures the general (non-tabular) pipeline; its
+        parse cache defaults to ``settings.cache``.
+
+        Returns a BatchReport: per-file results and ``summary()`` throughput.
+        """
+        ingestor = BatchIngestor(
+            partial(PipelineFactory.for_file, config=self._pipeline_config(pipeline_config)),
+            documents=documents,
+            cpu_workers=cpu_workers,
+            io_workers=io_workers,
+            queue_size=queue_size,
+        )
+        report = ingestor.run(
+            discover_paths(source, pattern),
+            kb_id,
+            dedup=dedup,
+            clone_duplicates=clone_duplicates,
+            domain=domain,
+            tags=tags,
+        )
+        logger.info(green(f"Batch ingestion into kb {kb_id}: {report.summary()}"))
+        return report
+
     def bulk_add_documents(
         self,
         root: str,
         glob: str = "**/*.md",
         *,
+        kb_id: Optional[str] = None,
         domain: Optional[str] = None,
         tags: Optional[List[str]] = None,
         concurrency: int = 1,
         skip_existing: bool = True,
         force_structured_markdown: bool = True,
     ) -> list[dict]:
-        """Discover and ingest many markdown files under a directory.
+        """Discover and ingest many files under a directory (see ``add_documents``).
 
-        Returns a list of per-file result dicts {path, id?, ok?, skipped?, chunks?, elapsed_ms, error?}.
+        ``force_structured_markdown`` chunks text documents with the structured
+        markdown chunker regardless of the configured ``chunker_type``.
+
+        Returns a list of per-file result dicts {path, document_id, ok, action, elapsed_ms, error, ...}.
         """
-        pipeline_overrides = None
+        pipeline_config = None
         if force_structured_markdown:
             # Base settings from config, but force markdown chunker
-            dp = getattr(self.config, 'document_pipeline', None)
-            pipeline_overrides = DocumentPipelineConfig(
-                enable_enrichment=getattr(dp, 'enable_enrichment', True) if dp else True,
-                enable_kg_extraction=getattr(dp, 'enable_kg_extraction', True) if dp else True,
+            dp = getattr(self.settings, 'pipeline', None)
+            pipeline_config = DocumentPipelineConfig(
+                enable_enrichment=getattr(dp, 'enable_enrichment', True),
+                enable_kg_extraction=getattr(dp, 'enable_kg_extraction', True),
                 enable_persistence=True,
-                chunk_size=getattr(dp, 'chunk_size', 1000) if dp else 1000,
-                chunk_overlap=getattr(dp, 'chunk_overlap', 200) if dp else 200,
+                chunk_size=getattr(dp, 'chunk_size', 1000),
+                chunk_overlap=getattr(dp, 'chunk_overlap', 200),
                 chunker_type='structured_markdown',
             )
-
-        return self.document_service.add_documents_from_dir(
+        report = self.add_documents(
             root,
-            glob=glob,
+            kb_id,
+            pattern=glob,
+            documents=concurrency,
+            dedup=skip_existing,
             domain=domain,
             tags=tags,
-            concurrency=concurrency,
-            skip_existing=skip_existing,
-            pipeline_overrides=pipeline_overrides,
+            pipeline_config=pipeline_config,
         )
+        return [result.as_dict() for result in report.files]
 
     def get_cached_document(self,document_id):
         document_object = self.sql_lite.document_repository().get_document(document_id)
@@ -462,6 +584,36 @@ class KnowledgeGraphClient:
             self.logger.error(f"Failed to build graph snapshot: {exc}")
             return {"nodes": [], "edges": [], "documents": []}
 
+    def get_graph_page(
+        self,
+        kind: str,
+        *,
+        kb_id: Optional[str] = None,
+        document_id: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 1000,
+    ) -> Dict[str, Any]:
+        """Return one keyset-paginated page of graph nodes or edges."""
+        return self.sql_lite.graph_repository().get_graph_page(
+            kind, kb_id=kb_id, document_id=document_id, cursor=cursor, limit=limit
+        )
+
+    def iter_graph_snapshot(
+        self,
+        *,
+        kb_id: Optional[str] = None,
+        document_id: Optional[str] = None,
+        page_size: int = 1000,
+    ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Stream ("document" | "node" | "edge", record) pairs with bounded memory."""
+        return self.sql_lite.graph_repository().iter_graph_snapshot(
+            kb_id=kb_id, document_id=document_id, page_size=page_size
+        )
+
+    def get_graph_documents(self, *, kb_id: Optional[str] = None, document_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Return the documents list used by graph views (no nodes/edges)."""
+        return self.sql_lite.graph_repository().get_graph_documents(kb_id=kb_id, document_id=document_id)
+
     # Advanced KG Extraction using kggen
     def extract_knowledge_graph_with_kggen(self,text: str,context: Optional[str] = None,strategy: str = "detailed") -> Dict[str, Any]:
         """
@@ -493,8 +645,8 @@ class KnowledgeGraphClient:
 
     def close(self) -> None:
         """Close all connections and free resources."""
-        # sql_lite repositories use connection-per-operation, no explicit close needed
-        # But we can clear any cached resources if needed
+        # Release the pooled SQLite connections for this database
+        self.sql_lite.close()
         logger.info("KnowledgeGraphClient closed")
 
     # Class methods for easy client creation
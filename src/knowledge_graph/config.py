@@ -47,8 +47,8 @@ class LLMConfig:
 
 @dataclass
 class CacheConfig:
-    """Cache configuration for document processing."""
-    enabled: bool = True
+    """Cache configuration for document processing (opt-in: set ``enabled``)."""
+    enabled: bool = False
     location: Optional[str] = None
     max_size_mb: int = 1000
     ttl_hours: int = 24
@@ -72,6 +72,15 @@ class KGExtractionConfig:
     # Parallelization settings for chunk-level extraction
     # Use small default to avoid hitting provider rate limits
     max_concurrent_chunks: int = 4
+    # Async engine: provider budgets (None = unlimited), AIMD ceiling and retries
+    requests_per_minute: Optional[int] = None
+    tokens_per_minute: Optional[int] = None
+    max_concurrency: int = 16
+    latency_target_s: Optional[float] = None
+    max_retries: int = 4
+    # Pack chunks into one request up to this many estimated tokens (0 = off)
+    batch_token_budget: int = 0
+    max_chunks_per_batch: Optional[int] = None
 
 
 @dataclass
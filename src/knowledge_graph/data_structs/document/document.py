@@ -52,6 +52,8 @@ class Document:
     is_chunked: bool = False
     is_metadata_generated: bool = False
     is_hash_generated: bool = False
+    # SHA-256 of the file's bytes (set when is_hash_generated)
+    file_hash: Optional[str] = None
 
     def estimate_token_count(self, text: Optional[str] = None) -> int:
         """Rough estimate of tokens for LLM processing"""
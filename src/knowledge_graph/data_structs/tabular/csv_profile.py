@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime
 import hashlib
 
@@ -16,6 +16,14 @@ class ColumnStat:
     distinct: int
     inferred_type: str
     example_values: List[str] = field(default_factory=list)
+    # Filled by the full-file profiler; distinct is an HLL estimate unless distinct_exact
+    distinct_exact: bool = True
+    min_value: Any = None
+    max_value: Any = None
+    min_length: Optional[int] = None
+    max_length: Optional[int] = None
+    length_histogram: Dict[str, int] = field(default_factory=dict)
+    sample_values: List[str] = field(default_factory=list)
 
 
 @dataclass
@@ -50,3 +58,21 @@ class CSVProfile:
             pass
         return h.hexdigest()[:16]
 
+    def schema_fingerprint(self) -> str:
+        """Return a fingerprint of the file's shape, independent of its rows.
+
+        Built from the normalized headers, the delimiter and (when the full
+        profiler ran) each column's inferred type, so two uploads with the same
+        schema share it even if their data differs. Used as the cache key for
+        reusing an ontology + mapping across documents.
+        """
+        h = hashlib.sha256()
+        types = {c.name: c.inferred_type for c in self.columns}
+        for original, normalized in zip(self.headers_original, self.headers_normalized):
+            h.update(" ".join(normalized.split()).encode("utf-8", errors="ignore"))
+            h.update(b"\x1f")
+            h.update(str(types.get(original, "")).encode("utf-8"))
+            h.update(b"\x1e")
+        h.update((self.delimiter or ",").encode("utf-8", errors="ignore"))
+        return h.hexdigest()[:32]
+
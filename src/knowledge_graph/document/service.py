@@ -3,6 +3,7 @@ import logging
 import uuid
 from pathlib import Path
 import time
+from dataclasses import replace
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from ..document_ingestion import DocumentPipeline, DocumentPipelineConfig, DocumentPipelineServices
 from ..document_ingestion.pdf.steps import (
@@ -16,6 +17,7 @@ from ..document_ingestion.pdf.steps import (
 )
 from ..document_ingestion.factory import PipelineFactory
 from ..knowledge_graph.service import KnowledgeGraphService
+from ..config import CacheConfig, KGExtractionConfig
 
 class DocumentService:
     """Service for document operations, used by the client"""
@@ -27,6 +29,8 @@ class DocumentService:
         llm_provider="openai",
         pipeline_config: Optional[DocumentPipelineConfig] = None,
         kg_service=None,
+        kg_extraction_config: Optional[KGExtractionConfig] = None,
+        cache_config: Optional[CacheConfig] = None,
     ):
         self.logger = logging.getLogger("knowledgeAgent.document")
         self.db_client = db_client
@@ -40,11 +44,16 @@ class DocumentService:
                 db_client=db_client,
                 llm_service=llm_service,
                 llm_provider=llm_provider,
+                kg_extraction_config=kg_extraction_config,
+                cache_config=cache_config,
             )
         else:
             self.kg_service = None
 
         self.pipeline_config = pipeline_config or DocumentPipelineConfig()
+        if self.pipeline_config.cache is None and cache_config is not None:
+            # The same CacheConfig drives the parse cache and the extraction cache
+            self.pipeline_config = replace(self.pipeline_config, cache=cache_config)
         self.pipeline = self._create_pipeline(self.pipeline_config)
 
     def _create_pipeline(self, config: DocumentPipelineConfig) -> DocumentPipeline:
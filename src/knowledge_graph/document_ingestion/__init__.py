@@ -1,5 +1,5 @@
 """Pipeline module exposing the document processing pipeline."""
 
-from .document_pipeline import DocumentPipeline # , DocumentPipelineConfig, DocumentPipelineServices
+from .document_pipeline import DocumentPipeline, DocumentPipelineConfig, DocumentPipelineServices
 
-__all__ = ["DocumentPipeline"] #, "DocumentPipelineConfig", "DocumentPipelineServices"]
+__all__ = ["DocumentPipeline", "DocumentPipelineConfig", "DocumentPipelineServices"]
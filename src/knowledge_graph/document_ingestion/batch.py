@@ -0,0 +1,255 @@
+"""Batch ingestion of many documents with shared worker pools.
+
+``BatchIngestor.run`` feeds file paths through a bounded queue to a fixed
+number of document workers; each worker runs one ``DocumentPipeline`` at a
+time. Path discovery blocks while the queue is full, so a large directory
+or glob is never expanded into memory ahead of the workers.
+
+Pipeline steps do not get their own threads here: every document's steps
+are submitted, by ``PipelineStep.kind``, to pools shared across the batch:
+
+- ``cpu``: parsing, cleaning, chunking, profiling and mapping compilation,
+  sized to the CPU count (PDF pages are extracted serially on these threads
+  unless the parser is given a shared process pool);
+- ``io``: LLM calls and lookups, sized for waiting rather than computing;
+- ``write``: a single thread for the steps whose main job is persistence
+  (graph load, mapping cache, document row), so at most one document bulk
+  loads at a time instead of several queueing on the SQLite write lock.
+
+The writer thread does not serialise every write. Steps on the other pools
+still save their own small rows (the CSV document row, its profile and
+ontology, mapping-cache hits, dedup clones); the connection pool's writer
+lock orders them per transaction. The CSV graph step also transforms rows as it streams them
+into the store, so that transform work shares the writer thread unless
+partition workers are configured.
+
+The returned ``BatchReport`` has one ``BatchFileResult`` per file (time,
+bytes, outcome) and aggregate throughput.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from glob import has_magic, iglob
+import logging
+import os
+from queue import Queue
+from threading import Lock, Thread
+import time
+import uuid
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
+
+from .document_pipeline import DocumentPipeline
+from .factory import PipelineFactory
+from .tabular.columnar import COLUMNAR_EXTENSIONS
+
+logger = logging.getLogger("knowledgeAgent.pipeline.batch")
+
+# Files picked up when a directory is given without a pattern: the tabular
+# pipeline persists a graph; text and PDF documents only go through the
+# general pipeline when listed or matched by a pattern explicitly
+SUPPORTED_EXTENSIONS = (".csv",) + COLUMNAR_EXTENSIONS
+
+# Pool sizes when not given
+DEFAULT_DOCUMENTS = 4
+DEFAULT_IO_WORKERS = 8
+
+_DONE = object()
+
+
+def discover_paths(source: Union[str, Iterable[str]], pattern: Optional[str] = None) -> Iterator[str]:
+    """Lazily yield files from a directory (optionally filtered by ``pattern``), a glob, a file or a list of paths."""
+    if not isinstance(source, str):
+        yield from (str(path) for path in source)
+        return
+    if os.path.isdir(source):
+        if pattern:
+            matches = iglob(os.path.join(source, pattern), recursive=True)
+        else:
+            matches = (
+                os.path.join(root, name)
+                for root, dirs, files in os.walk(source)
+                for name in sorted(files)
+                if os.path.splitext(name)[1].lower() in SUPPORTED_EXTENSIONS
+            )
+    elif has_magic(source):
+        matches = iglob(source, recursive=True)
+    else:
+        matches = iter([source])
+    yield from (path for path in matches if os.path.isfile(path))
+
+
+@dataclass
+class BatchFileResult:
+    path: str
+    document_id: Optional[str] = None
+    ok: bool = False
+    # "ingested", "skipped" (duplicate in the KB), "cloned" (from another KB) or "failed"
+    action: str = "failed"
+    size_bytes: int = 0
+    elapsed_ms: int = 0
+    error: Optional[str] = None
+    steps_ms: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def mb_per_sec(self) -> float:
+        return (self.size_bytes / (1024 * 1024)) / (self.elapsed_ms / 1000) if self.elapsed_ms else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), "mb_per_sec": round(self.mb_per_sec, 3)}
+
+
+@dataclass
+class BatchReport:
+    files: List[BatchFileResult] = field(default_factory=list)
+    elapsed_s: float = 0.0
+
+    def count(self, action: str) -> int:
+        return sum(1 for f in self.files if f.action == action)
+
+    def summary(self) -> Dict[str, Any]:
+        total_bytes = sum(f.size_bytes for f in self.files)
+        busy_s = sum(f.elapsed_ms for f in self.files) / 1000
+        steps: Dict[str, int] = {}
+        for f in self.files:
+            for name, ms in f.steps_ms.items():
+                steps[name] = steps.get(name, 0) + ms
+        return {
+            "files": len(self.files),
+            "ingested": self.count("ingested"),
+            "skipped": self.count("skipped"),
+            "cloned": self.count("cloned"),
+            "failed": self.count("failed"),
+            "bytes": total_bytes,
+            "elapsed_s": round(self.elapsed_s, 3),
+            "files_per_sec": round(len(self.files) / self.elapsed_s, 3) if self.elapsed_s else 0.0,
+            "mb_per_sec": round(total_bytes / (1024 * 1024) / self.elapsed_s, 3) if self.elapsed_s else 0.0,
+            # Average number of documents in flight
+            "concurrency": round(busy_s / self.elapsed_s, 2) if self.elapsed_s else 0.0,
+            "steps_ms": steps,
+        }
+
+
+class BatchIngestor:
+    """Run many document pipelines concurrently through shared CPU, I/O and persistence pools."""
+
+    def __init__(
+        self,
+        pipeline_factory: Callable[[str], DocumentPipeline] = PipelineFactory.for_file,
+        *,
+        documents: int = DEFAULT_DOCUMENTS,
+        cpu_workers: Optional[int] = None,
+        io_workers: int = DEFAULT_IO_WORKERS,
+        queue_size: Optional[int] = None,
+    ) -> None:
+        self.pipeline_factory = pipeline_factory
+        self.documents = max(1, documents)
+        self.cpu_workers = max(1, cpu_workers or os.cpu_count() or 1)
+        self.io_workers = max(1, io_workers)
+        self.queue_size = queue_size or 2 * self.documents
+
+    def run(
+        self,
+        paths: Iterable[str],
+        kb_id: Optional[str],
+        *,
+        dedup: bool = True,
+        clone_duplicates: bool = True,
+        domain: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        on_result: Optional[Callable[[BatchFileResult], None]] = None,
+    ) -> BatchReport:
+        """Ingest ``paths`` into ``kb_id``; a failing file is reported and does not stop the batch."""
+        report = BatchReport()
+        lock = Lock()
+        work: Queue = Queue(maxsize=self.queue_size)
+        started = time.time()
+
+        with ThreadPoolExecutor(self.cpu_workers, thread_name_prefix="ingest-cpu") as cpu, \
+                ThreadPoolExecutor(self.io_workers, thread_name_prefix="ingest-io") as io, \
+                ThreadPoolExecutor(1, thread_name_prefix="ingest-writer") as writer:
+            executors = {"cpu": cpu, "io": io, "write": writer}
+
+            def worker() -> None:
+                while True:
+                    path = work.get()
+                    if path is _DONE:
+                        return
+                    result = self._ingest(path, kb_id, executors, dedup, clone_duplicates, domain, tags)
+                    with lock:
+                        report.files.append(result)
+                    if on_result is not None:
+                        try:
+                            on_result(result)
+                        except Exception:
+                            # A failing callback must not stop the worker (run() would block on the queue)
+                            logger.exception("on_result callback failed for %s", path)
+
+            workers = [Thread(target=worker, name=f"ingest-doc-{i}", daemon=True) for i in range(self.documents)]
+            for thread in workers:
+                thread.start()
+            try:
+                for path in paths:
+                    work.put(path)  # blocks while the queue is full
+            finally:
+                for _ in workers:
+                    work.put(_DONE)
+                for thread in workers:
+                    thread.join()
+
+        report.elapsed_s = time.time() - started
+        logger.info("Batch ingestion finished: %s", report.summary())
+        return report
+
+    def _ingest(
+        self,
+        path: str,
+        kb_id: Optional[str],
+        executors: Dict[str, Any],
+        dedup: bool,
+        clone_duplicates: bool,
+        domain: Optional[str],
+        tags: Optional[List[str]],
+    ) -> BatchFileResult:
+        result = BatchFileResult(path=path, document_id=f"doc_{uuid.uuid4().hex[:8]}")
+        start = time.time()
+        try:
+            result.size_bytes = os.path.getsize(path)
+            pipeline = self.pipeline_factory(path)
+            pipeline.executors = executors
+            pipeline.run(
+                document_path=path,
+                document_id=result.document_id,
+                kb_id=kb_id,
+                domain=domain,
+                tags=tags,
+                dedup=dedup,
+                clone_duplicates=clone_duplicates,
+            )
+            dedup_info = pipeline.last_results.get("dedup") or {}
+            result.action = dedup_info.get("action") or "ingested"
+            if result.action == "skipped":
+                result.document_id = str(dedup_info["duplicate_of"])
+            result.ok = True
+            result.steps_ms = {
+                name: summary["elapsed_ms"]
+                for name, summary in pipeline.last_results.items()
+                if isinstance(summary, dict) and "elapsed_ms" in summary and name != "run"
+            }
+        except Exception as exc:
+            logger.exception("Batch ingestion failed for %s", path)
+            result.error = f"{exc}: {exc.__cause__}" if exc.__cause__ else str(exc)
+        result.elapsed_ms = int((time.time() - start) * 1000)
+        logger.info(
+            "%s %s in %d ms (%.2f MB/s)%s",
+            result.action,
+            path,
+            result.elapsed_ms,
+            result.mb_per_sec,
+            f": {result.error}" if result.error else "",
+        )
+        return result
+
+
+__all__ = ["BatchFileResult", "BatchIngestor", "BatchReport", "SUPPORTED_EXTENSIONS", "discover_paths"]
@@ -0,0 +1,76 @@
+"""Document-level dedup for pipeline runs.
+
+A completed pipeline run records the document's content hash and the
+pipeline's configuration fingerprint on its ``documents`` row. Before
+running the steps, ``DocumentPipeline.run(dedup=True)`` looks for a completed
+document with the same pair:
+
+- in the same KB, the run is skipped and the existing document is reported;
+- in another KB (with ``clone_duplicates``), the document row and its
+  entities / relationships are copied into the target KB with
+  ``INSERT ... SELECT`` instead of being parsed and extracted again.
+
+The fingerprint covers each step's class, name, enabled flag and scalar
+settings, so a run with different steps or options is not a duplicate.
+"""
+
+from __future__ import annotations
+
+from hashlib import sha256
+import json
+import logging
+from typing import Any, Dict, Iterable, Optional
+
+from ..persistence.sqlite.core.ids import document_db_id, kb_db_id
+
+logger = logging.getLogger("knowledgeAgent.pipeline.dedup")
+
+_SCALARS = (str, int, float, bool, type(None))
+
+
+def pipeline_fingerprint(steps: Iterable[Any]) -> str:
+    """Stable fingerprint of a step list and the scalar settings of each step."""
+    description = []
+    for step in steps:
+        settings = {
+            key: value
+            for key, value in sorted(vars(step).items())
+            if not key.startswith("_") and isinstance(value, _SCALARS)
+        }
+        description.append([type(step).__module__, type(step).__qualname__, getattr(step, "name", ""), settings])
+    payload = json.dumps(description, sort_keys=True, default=str)
+    return sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+def find_duplicate(sql_lite: Any, file_hash: str, fingerprint: str, kb_id: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Completed document with the same content and pipeline, preferring ``kb_id``; None when there is none."""
+    return sql_lite.document_repository().find_duplicate_document(file_hash, fingerprint, kb_db_id(kb_id))
+
+
+def clone_duplicate(
+    sql_lite: Any,
+    duplicate: Dict[str, Any],
+    *,
+    document_id: str,
+    kb_id: Optional[str],
+    document_path: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Copy ``duplicate``'s document row and graph to ``document_id`` in ``kb_id``, in one transaction."""
+    target_doc = document_db_id(document_id)
+    target_kb = kb_db_id(kb_id)
+    with sql_lite.pool.writer():
+        sql_lite.document_repository().clone_document(
+            duplicate["document_id"], target_doc, target_kb, file_path=document_path
+        )
+        counts = sql_lite.graph_repository().clone_document_graph(duplicate["document_id"], target_doc, target_kb)
+    return {"document_id": target_doc, "kb_id": target_kb, **counts}
+
+
+def record_completed(sql_lite: Any, document_id: str, file_hash: Optional[str], fingerprint: str) -> bool:
+    """Record a finished run on the document's row (False when the pipeline wrote no ``documents`` row)."""
+    return sql_lite.document_repository().mark_document_completed(
+        document_db_id(document_id), file_hash=file_hash, pipeline_fingerprint=fingerprint
+    )
+
+
+__all__ = ["clone_duplicate", "find_duplicate", "pipeline_fingerprint", "record_completed"]
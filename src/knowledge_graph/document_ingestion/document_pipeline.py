@@ -1,14 +1,34 @@
-"""Core orchestration logic for the document processing pipeline."""
+"""Core orchestration logic for the document processing pipeline.
+
+Steps declare the context slots they read (``inputs``) and write
+(``outputs``): context attributes such as ``"csv_profile"``, parts of the
+document such as ``"document.chunks"``, or another step's name to read its
+``context.results`` entry (every step implicitly writes its own). The
+pipeline orders steps as a DAG built from those declarations and the list
+order: a step waits for every earlier step it reads from, writes over, or
+whose inputs it overwrites. With ``max_workers > 1`` steps with no
+dependency between them run concurrently on a thread pool (most steps wait
+on LLM or database I/O), so a document takes roughly its critical path. The
+default is sequential: the factory pipelines are linear chains with nothing
+to overlap. Steps that declare nothing (``inputs = None``) keep the
+sequential behaviour: they wait for every earlier step and every later step
+waits for them.
+"""
 
 from __future__ import annotations
 
+import contextvars
 import logging
+import time
 import uuid
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 
+from ..config import CacheConfig
 from ..data_structs.document import Document
 from ..logging_utils import set_logging_context, clear_logging_context
+from ..persistence.sqlite.core.ids import kb_db_id
 
 
 logger = logging.getLogger("knowledgeAgent.pipeline")
@@ -18,6 +38,32 @@ class DocumentPipelineError(Exception):
     """Raised when a pipeline step fails irrecoverably."""
 
 
+@dataclass
+class DocumentPipelineConfig:
+    """Configuration toggles determining which steps run."""
+
+    enable_enrichment: bool = True
+    enable_kg_extraction: bool = True
+    enable_persistence: bool = True
+    chunk_size: int = 1000
+    chunk_overlap: int = 200
+
+    chunker_type: str = "auto"
+    # Parsed-document cache for the load step (None = disabled)
+    cache: Optional[CacheConfig] = None
+
+
+@dataclass
+class DocumentPipelineServices:
+    """External services required by pipeline steps (None = step skips that work)."""
+
+    llm_service: Optional[Any] = None
+    kg_service: Optional[Any] = None
+    db_client: Optional[Any] = None
+    llm_provider: str = "openai"
+    agent_service: Optional[Any] = None
+
+
 @dataclass
 class DocumentPipelineParams:
     """Immutable parameters supplied when running the pipeline."""
@@ -25,7 +71,8 @@ class DocumentPipelineParams:
     document_path: str
     document_id: str
     kb_id: str
-
+    domain: Optional[str] = None
+    tags: Optional[List[str]] = None
 
 
 @dataclass
@@ -35,6 +82,7 @@ class DocumentPipelineContext:
     params: DocumentPipelineParams
     document: Optional[Document] = None
     results: Dict[str, Any] = field(default_factory=dict)
+    services: DocumentPipelineServices = field(default_factory=DocumentPipelineServices)
 
     def set_document(self, document: Document) -> None:
         self.document = document
@@ -45,34 +93,19 @@ class DocumentPipelineContext:
         return self.document
 
 
-# @dataclass
-# class DocumentPipelineConfig:
-#     """Configuration toggles determining which steps run."""
-
-#     enable_enrichment: bool = True
-#     enable_kg_extraction: bool = True
-#     enable_persistence: bool = True
-#     chunk_size: int = 1000
-#     chunk_overlap: int = 200
-
-#     chunker_type: str = "auto"
-
-
-# @dataclass
-# class DocumentPipelineServices:
-#     """External services required by pipeline steps."""
-
-#     llm_service: Optional[Any] = None
-#     kg_service: Optional[Any] = None
-#     db_client: Optional[Any] = None
-#     llm_provider: str = "openai"
-#     agent_service: Optional[Any] = None
-
-
 class PipelineStep:
     """Base class for pipeline steps."""
 
     name: str = "pipeline_step"
+    # Context slots read / written (see module docstring); None = sequential barrier
+    inputs: Optional[Tuple[str, ...]] = None
+    outputs: Tuple[str, ...] = ()
+    # Work the step mostly does: "cpu" (parse/transform), "io" (LLM, lookups) or
+    # "write" (persistence); picks the shared pool when ``executors`` are set
+    kind: str = "io"
+    # Step that produces the document's stored output (graph / document row);
+    # dedup only records a run completed when each of these ran without error
+    completes_document: bool = False
 
     def __init__(self, *, enabled: bool = True) -> None:
         self.enabled = enabled
@@ -84,19 +117,62 @@ class PipelineStep:
         raise NotImplementedError("Pipeline steps must implement 'run'")
 
 
+def step_dependencies(steps: List[PipelineStep]) -> List[Set[int]]:
+    """Indexes of the earlier steps each step must wait for."""
+    deps: List[Set[int]] = []
+    for i, step in enumerate(steps):
+        if step.inputs is None:
+            deps.append(set(range(i)))
+            continue
+        reads = set(step.inputs)
+        writes = set(step.outputs) | {step.name}
+        waits = set()
+        for j, earlier in enumerate(steps[:i]):
+            if earlier.inputs is None:
+                waits.add(j)
+                continue
+            earlier_writes = set(earlier.outputs) | {earlier.name}
+            if reads & earlier_writes or writes & earlier_writes or writes & set(earlier.inputs):
+                waits.add(j)
+        deps.append(waits)
+    return deps
+
+
+def critical_path_ms(steps: List[PipelineStep], deps: List[Set[int]], elapsed: Dict[str, int]) -> int:
+    """Longest chain of dependent step times (ms); skipped steps count as 0."""
+    finish: List[int] = []
+    for i, step in enumerate(steps):
+        finish.append(max((finish[j] for j in deps[i]), default=0) + elapsed.get(step.name, 0))
+    return max(finish, default=0)
+
+
 class DocumentPipeline:
-    """High-level orchestrator coordinating the configured pipeline steps."""
+    """High-level orchestrator coordinating the configured pipeline steps.
+
+    ``max_workers`` bounds the steps running at once; 1 (the default) runs
+    them one after another in list order on the calling thread. Raise it for
+    pipelines with independent branches. ``executors`` maps a step ``kind``
+    to a shared executor (batch ingestion shares CPU, I/O and writer pools
+    across documents); other steps run on the pipeline's own threads.
+    """
+
+    # Concurrent steps per document; opt in with max_workers for branching pipelines
+    DEFAULT_MAX_WORKERS = 1
 
     def __init__(
         self,
-        # services: DocumentPipelineServices,
-        # *,
-        # config: Optional[DocumentPipelineConfig] = None,
         steps: Optional[List[PipelineStep]] = None,
+        *,
+        services: Optional[DocumentPipelineServices] = None,
+        max_workers: Optional[int] = None,
+        executors: Optional[Dict[str, Executor]] = None,
     ) -> None:
-        # self.services = services
-        # self.config = config or DocumentPipelineConfig()
+        self.services = services or DocumentPipelineServices()
         self._steps = steps or []
+        self.max_workers = max_workers or self.DEFAULT_MAX_WORKERS
+        self.executors: Dict[str, Executor] = dict(executors or {})
+        # Results of the most recent run (step summaries, dedup outcome)
+        self.last_results: Dict[str, Any] = {}
 
     @property
     def steps(self) -> List[PipelineStep]:
@@ -109,6 +185,138 @@ class DocumentPipeline:
     def add_step(self, step: PipelineStep) -> None:
         self._steps.append(step)
 
+    def fingerprint(self) -> str:
+        """Configuration fingerprint of the step list (see ``dedup.pipeline_fingerprint``)."""
+        from .dedup import pipeline_fingerprint
+
+        return pipeline_fingerprint(self.steps)
+
+    def _run_step(self, step: PipelineStep, context: DocumentPipelineContext) -> DocumentPipelineContext:
+        """Run one step with timing and summary logging; errors surface as DocumentPipelineError."""
+        if not step.should_run(context):
+            logger.debug("Skipping disabled step '%s'", step.name)
+            return context
+
+        logger.info("Executing Document Ingestion Pipeline Step: '%s'", step.name)
+        try:
+            start_ts = time.time()
+            context = step.run(context) or context
+            elapsed_ms = int((time.time() - start_ts) * 1000)
+        except DocumentPipelineError:
+            # Propagate explicit pipeline errors without wrapping to preserve context.
+            logger.exception("Pipeline step '%s' failed", step.name)
+            raise
+        except Exception as exc:  # pragma: no cover - defensive guard
+            logger.exception("Unexpected error during step '%s': %s", step.name, exc)
+            raise DocumentPipelineError(f"Step '{step.name}' failed") from exc
+        else:
+            summary = context.results.get(step.name)
+            if isinstance(summary, dict):
+                summary["elapsed_ms"] = summary.get("elapsed_ms", 0) or elapsed_ms
+                context.results[step.name] = summary
+            if summary:
+                logger.info("✓ Step '%s' summary: %s", step.name, summary)
+            else:
+                logger.info("✓ Step '%s' completed", step.name)
+        return context
+
+    def _run_concurrently(self, context: DocumentPipelineContext, deps: List[Set[int]]) -> None:
+        """Run steps on a thread pool as soon as the steps they depend on have finished.
+
+        Steps share (and mutate) ``context``. On the first failure no further
+        steps start; running ones finish, then the error is raised.
+        """
+        pending = list(range(len(self.steps)))
+        done: Set[int] = set()
+        running: Dict[Future, int] = {}
+        failure: Optional[BaseException] = None
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="pipeline-step") as pool:
+            while pending or running:
+                if failure is None:
+                    for i in [i for i in pending if deps[i] <= done]:
+                        if len(running) >= self.max_workers:
+                            break
+                        pending.remove(i)
+                        # Each step gets its own copy so the doc/run logging context follows it
+                        step = self.steps[i]
+                        executor = self.executors.get(step.kind, pool)
+                        running[executor.submit(contextvars.copy_context().run, self._run_step, step, context)] = i
+                elif not running:
+                    break
+                finished, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in finished:
+                    done.add(running.pop(future))
+                    if failure is None and future.exception() is not None:
+                        failure = future.exception()
+        if failure is not None:
+            raise failure
+
+    def _dedup(self, context: DocumentPipelineContext, clone_duplicates: bool) -> Optional[Dict[str, Any]]:
+        """Skip or clone the run when a completed document has the same content and fingerprint."""
+        from .dedup import clone_duplicate, find_duplicate
+        from .parse_cache import file_content_hash
+        from ..persistence.sqlite.sql_lite import get_sql_lite
+
+        params = context.params
+        file_hash = file_content_hash(params.document_path)
+        fingerprint = self.fingerprint()
+        context.results["dedup"] = {"file_hash": file_hash, "fingerprint": fingerprint, "action": None}
+
+        sql_lite = get_sql_lite()
+        duplicate = find_duplicate(sql_lite, file_hash, fingerprint, params.kb_id)
+        if duplicate is None:
+            return None
+        info = context.results["dedup"]
+        info["duplicate_of"] = duplicate["document_id"]
+        if duplicate["kb_id"] == kb_db_id(params.kb_id):
+            info["action"] = "skipped"
+        elif clone_duplicates:
+            info.update(clone_duplicate(
+                sql_lite,
+                duplicate,
+                document_id=params.document_id,
+                kb_id=params.kb_id,
+                document_path=params.document_path,
+            ))
+            info["action"] = "cloned"
+        else:
+            return None
+        return info
+
+    def _incomplete_reason(self, context: DocumentPipelineContext) -> Optional[str]:
+        """Why the run must not count as completed: a step reported an error or an output step never ran."""
+        for step in self.steps:
+            summary = context.results.get(step.name)
+            if isinstance(summary, dict) and (summary.get("error") or summary.get("ok") is False):
+                return f"step '{step.name}' reported an error"
+        for step in self.steps:
+            if step.completes_document and step.enabled and step.name not in context.results:
+                return f"step '{step.name}' did not run"
+        return None
+
+    def _record_completed(self, context: DocumentPipelineContext) -> None:
+        from .dedup import record_completed
+        from ..persistence.sqlite.sql_lite import get_sql_lite
+
+        info = context.results.get("dedup") or {}
+        reason = self._incomplete_reason(context)
+        if reason is not None:
+            # A later run must process the file again rather than skip or clone a partial graph
+            logger.warning("Not recording document %s as completed: %s", context.params.document_id, reason)
+            info.update(recorded=False, incomplete=reason)
+            return
+        try:
+            recorded = record_completed(
+                get_sql_lite(),
+                context.params.document_id,
+                info.get("file_hash"),
+                info.get("fingerprint") or self.fingerprint(),
+            )
+        except Exception as exc:
+            logger.warning("Could not record completed document %s: %s", context.params.document_id, exc)
+        else:
+            info["recorded"] = recorded
+
     def run(
         self,
         *,
@@ -117,14 +325,34 @@ class DocumentPipeline:
         kb_id: Optional[str] = None,  # ADD THIS
         domain: Optional[str] = None,
         tags: Optional[List[str]] = None,
+        dedup: bool = False,
+        clone_duplicates: bool = True,
+        record_completed: Optional[bool] = None,
     ) -> Optional[Document]:
-        """Execute the configured steps and return the processed document."""
+        """Execute the configured steps and return the processed document.
+
+        With ``dedup``, a file whose content was already ingested by a pipeline
+        with the same fingerprint is not processed again: in the same KB the run
+        is skipped, in another KB the existing graph is cloned (unless
+        ``clone_duplicates`` is False). Both return None and report the outcome
+        in ``last_results["dedup"]``. Dedup relies on the ``documents`` row a
+        pipeline persists; runs that persist none are never found as duplicates,
+        and neither are runs where a step reported an error or a
+        ``completes_document`` step did not run.
+
+        ``record_completed`` (defaults to ``dedup``) records a successful run
+        for later dedup without the lookup, e.g. when re-ingesting a document
+        under its existing id.
+        """
         params = DocumentPipelineParams(
             document_path=document_path,
             document_id=document_id,
-            kb_id=kb_id
+            kb_id=kb_id,
+            domain=domain,
+            tags=tags,
         )
-        context = DocumentPipelineContext(params=params)
+        context = DocumentPipelineContext(params=params, services=self.services)
+        self.last_results = context.results
 
         # Establish a run_id for correlation and inject into logging context
         run_id = str(uuid.uuid4())
@@ -133,40 +361,43 @@ class DocumentPipeline:
 
         logger.info("Starting document pipeline for %s", document_path)
 
-        import time
         try:
-            for step in self.steps:
-                if not step.should_run(context):
-                    logger.debug("Skipping disabled step '%s'", step.name)
-                    continue
-
-                logger.info("Executing Document Ingestion Pipeline Step: '%s'", step.name)
-                try:
-                    start_ts = time.time()
-                    context = step.run(context)
-                    elapsed_ms = int((time.time() - start_ts) * 1000)
-                except DocumentPipelineError:
-                    # Propagate explicit pipeline errors without wrapping to preserve context.
-                    logger.exception("Pipeline step '%s' failed", step.name)
-                    raise
-                except Exception as exc:  # pragma: no cover - defensive guard
-                    logger.exception("Unexpected error during step '%s': %s", step.name, exc)
-                    raise DocumentPipelineError(f"Step '{step.name}' failed") from exc
-                else:
-                    summary = context.results.get(step.name)
-                    if isinstance(summary, dict):
-                        summary["elapsed_ms"] = summary.get("elapsed_ms", 0) or elapsed_ms
-                        context.results[step.name] = summary
-                    if summary:
-                        logger.info("✓ Step '%s' summary: %s", step.name, summary)
-                    else:
-                        logger.info("✓ Step '%s' completed", step.name)
+            if dedup:
+                duplicate = self._dedup(context, clone_duplicates)
+                if duplicate is not None:
+                    logger.info(
+                        "Document %s duplicates completed document %s: %s",
+                        document_path,
+                        duplicate["duplicate_of"],
+                        duplicate["action"],
+                    )
+                    return None
+
+            started = time.time()
+            deps = step_dependencies(self.steps)
+            if self.executors or (self.max_workers > 1 and len(self.steps) > 1):
+                self._run_concurrently(context, deps)
+            else:
+                for step in self.steps:
+                    context = self._run_step(step, context)
+            elapsed = {
+                step.name: context.results[step.name].get("elapsed_ms", 0)
+                for step in self.steps
+                if isinstance(context.results.get(step.name), dict)
+            }
+            context.results["run"].update(
+                elapsed_ms=int((time.time() - started) * 1000),
+                critical_path_ms=critical_path_ms(self.steps, deps, elapsed),
+            )
 
             # Report route decision if available
             route_info = context.results.get("route_document", {})
             if route_info:
                 logger.info("Routing: %s", route_info)
 
+            if dedup if record_completed is None else record_completed:
+                self._record_completed(context)
+
             logger.info(
                 "Document pipeline finished for %s with document id %s",
                 document_path,
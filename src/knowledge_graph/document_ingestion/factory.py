@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from typing import Optional
 
-from .document_pipeline import DocumentPipeline # , DocumentPipelineConfig, DocumentPipelineServices
+from .document_pipeline import DocumentPipeline, DocumentPipelineConfig, DocumentPipelineServices
 from .pdf.steps import (
     LoadDocumentStep,
     CleanContentStep,
@@ -23,7 +23,10 @@ from .tabular.steps import (
     GenerateMappingFromOntologyStep,
     PopulateMissingPrimaryKeysStep,
     TransformAndPersistKGStep,
+    ReuseCachedMappingStep,
+    CacheMappingStep,
 )
+from .tabular.columnar import is_columnar
 
 
 class PipelineFactory:
@@ -32,44 +35,51 @@ class PipelineFactory:
     @staticmethod
     def for_file(
         file_path: str,
-        # services: DocumentPipelineServices,
+        services: Optional[DocumentPipelineServices] = None,
         *,
         config: Optional[DocumentPipelineConfig] = None,
+        incremental: Optional[bool] = None,
     ) -> DocumentPipeline:
         file_type = (file_path.split(".")[-1] if "." in file_path else "").lower()
         if file_type == "csv":
-            return PipelineFactory.csv_pipeline()
+            return PipelineFactory.csv_pipeline(services, incremental=incremental)
+        if is_columnar(file_path):
+            # Parquet / Arrow / Feather: same tabular steps over a ColumnarSource
+            return PipelineFactory.csv_pipeline(services, incremental=incremental)
         # Default/general pipeline
-        return PipelineFactory.general_pipeline()
+        return PipelineFactory.general_pipeline(services, config=config)
 
     @staticmethod
     def csv_pipeline(
-        # services: DocumentPipelineServices,
-        # *,
-        # config: Optional[DocumentPipelineConfig] = None,
+        services: Optional[DocumentPipelineServices] = None,
+        *,
+        incremental: Optional[bool] = None,
     ) -> DocumentPipeline:
-        # cfg = config or DocumentPipelineConfig()
         steps = [
             LoadCSVStep(),
+            # full_profile=None follows DBSettings.csv_full_profile
             GenerateCsvProfileStep(enabled=True, sample_rows=50),
+            ReuseCachedMappingStep(enabled=True),
             AnalyseCsvWithAgentStep(enabled=True, sample_rows=30),
             GenerateOntologyWithAgentStep(enabled=True),
             GenerateMappingFromOntologyStep(enabled=True),
             BindAttributesFromOntologyStep(enabled=True),
             PopulateMissingPrimaryKeysStep(enabled=True),
-            TransformAndPersistKGStep(enabled=True),
+            CacheMappingStep(enabled=True),
+            # incremental=None follows DBSettings.csv_incremental
+            TransformAndPersistKGStep(enabled=True, incremental=incremental),
         ]
-        return DocumentPipeline(steps=steps)
+        return DocumentPipeline(steps=steps, services=services)
 
     @staticmethod
     def general_pipeline(
-        # services: DocumentPipelineServices,
-        # *,
-        # config: Optional[DocumentPipelineConfig] = None,
+        services: Optional[DocumentPipelineServices] = None,
+        *,
+        config: Optional[DocumentPipelineConfig] = None,
     ) -> DocumentPipeline:
-        # cfg = config or DocumentPipelineConfig()
+        cfg = config or DocumentPipelineConfig()
         steps = [
-            LoadDocumentStep(),
+            LoadDocumentStep(cache=cfg.cache),
             CleanContentStep(),
             RouteDocumentStep(),
             ChunkContentStep(
@@ -83,6 +93,6 @@ class PipelineFactory:
                 chunk_overlap=cfg.chunk_overlap,
                 chunker_type=cfg.chunker_type,
             ),
-            PersistDocumentStep(enabled=True),
+            PersistDocumentStep(enabled=cfg.enable_persistence),
         ]
-        return DocumentPipeline(steps=steps)
+        return DocumentPipeline(steps=steps, services=services)
@@ -0,0 +1,265 @@
+"""Content hashing and a persistent cache of parsed documents.
+
+``file_content_hash`` streams a file through SHA-256 (fixed-size reads, so
+memory does not grow with the file); the digest fills ``file_hash`` on
+document rows.
+
+``ParseCache`` stores what a parser extracted from a file (raw text and
+pages), zlib-compressed, in a small SQLite database under
+``CacheConfig.location``. Entries are keyed by (content hash, parser class,
+parser ``version``), so re-ingesting the same bytes (into another KB, or
+after changing later pipeline steps) skips parsing, while a parser change
+that bumps its version misses. Content-addressed entries never go stale:
+only the size bound (``CacheConfig.max_size_mb``, least recently used
+first) removes them. Hits refresh ``last_accessed`` in buffered batches
+rather than one write transaction each.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from hashlib import sha256
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple
+import json
+import logging
+import os
+import time
+import zlib
+
+from ..config import CacheConfig
+from ..persistence.sqlite.core.connection import get_connection_pool
+
+logger = logging.getLogger("knowledgeAgent.pipeline.parse_cache")
+
+CACHE_FILE_NAME = "document_parse_cache.db"
+
+# Bytes per read when hashing
+HASH_BLOCK_SIZE = 1024 * 1024
+
+# Re-check the size bound after this many writes instead of on every put
+_EVICTION_CHECK_EVERY = 16
+
+# Buffered last_accessed refreshes written per batch
+_TOUCH_FLUSH_EVERY = 16
+
+CREATE_PARSE_CACHE_TABLE = """
+CREATE TABLE IF NOT EXISTS document_parse_cache (
+  cache_key     TEXT PRIMARY KEY,
+  content_hash  TEXT NOT NULL,
+  parser        TEXT NOT NULL,
+  payload       BLOB NOT NULL,
+  size_bytes    INTEGER NOT NULL,
+  created_at    REAL NOT NULL,
+  last_accessed REAL NOT NULL
+);
+"""
+
+CREATE_INDEX_PARSE_CACHE_LAST_ACCESSED = """
+CREATE INDEX IF NOT EXISTS idx_document_parse_cache_last_accessed ON document_parse_cache(last_accessed);
+"""
+
+
+def file_content_hash(path: str, block_size: int = HASH_BLOCK_SIZE) -> str:
+    """Hex SHA-256 of the file's bytes, read in ``block_size`` blocks."""
+    digest = sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def parse_cache_key(content_hash: str, parser: Any) -> str:
+    """Cache key for ``parser``'s output on content ``content_hash``."""
+    name = type(parser).__qualname__
+    version = str(getattr(parser, "version", ""))
+    return sha256(f"{content_hash}\x1f{name}\x1f{version}".encode("utf-8")).hexdigest()
+
+
+@dataclass
+class ParseCacheStats:
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    evicted: int = 0
+
+
+class ParseCache:
+    """SQLite-backed, size-bounded cache of (raw text, pages) per file content and parser."""
+
+    def __init__(self, config: Optional[CacheConfig] = None):
+        self.config = config or CacheConfig()
+        location = self.config.location or os.path.join(os.getcwd(), ".kg_cache")
+        os.makedirs(location, exist_ok=True)
+        self.db_path = str(Path(location) / CACHE_FILE_NAME)
+        self.max_size_bytes = int(self.config.max_size_mb) * 1024 * 1024
+        self.stats = ParseCacheStats()
+        self._stats_lock = Lock()
+        self._writes_since_check = 0
+        # cache_key -> last hit time, not yet written
+        self._touched: Dict[str, float] = {}
+        self._touch_lock = Lock()
+        self._pool = get_connection_pool(self.db_path, readers=2)
+        self._ensure_schema()
+
+    def _ensure_schema(self) -> None:
+        if self._pool.is_initialised("document_parse_cache"):
+            return
+        with self._pool.writer() as conn:
+            conn.execute(CREATE_PARSE_CACHE_TABLE)
+            conn.execute(CREATE_INDEX_PARSE_CACHE_LAST_ACCESSED)
+        self._pool.mark_initialised("document_parse_cache")
+
+    def _count(self, field: str, amount: int = 1) -> None:
+        with self._stats_lock:
+            setattr(self.stats, field, getattr(self.stats, field) + amount)
+
+    def _record_write(self) -> bool:
+        """Count a write; True on every ``_EVICTION_CHECK_EVERY``-th one, when the size bound is due a check."""
+        with self._stats_lock:
+            self.stats.writes += 1
+            self._writes_since_check += 1
+            if self._writes_since_check < _EVICTION_CHECK_EVERY:
+                return False
+            self._writes_since_check = 0
+            return True
+
+    def get(self, key: str) -> Optional[Tuple[str, List[str]]]:
+        """Return cached (raw text, pages) for ``key`` or None on a miss."""
+        try:
+            with self._pool.reader() as conn:
+                row = conn.execute("SELECT payload FROM document_parse_cache WHERE cache_key = ?", (key,)).fetchone()
+            if row is None:
+                self._count("misses")
+                return None
+            self._touch(key, time.time())
+            payload = json.loads(zlib.decompress(row[0]))
+            self._count("hits")
+            return payload["raw"], list(payload["pages"])
+        except Exception as e:
+            logger.warning(f"Parse cache read failed: {e}")
+            self._count("misses")
+            return None
+
+    def put(self, key: str, content_hash: str, parser: Any, raw: str, pages: List[str]) -> None:
+        """Store a parse result, evicting LRU entries when over the size bound."""
+        payload = zlib.compress(
+            json.dumps({"raw": raw, "pages": pages}, ensure_ascii=False, separators=(",", ":")).encode("utf-8"),
+            6,
+        )
+        now = time.time()
+        try:
+            with self._pool.writer() as conn:
+                conn.execute(
+                    """
+                    INSERT INTO document_parse_cache (cache_key, content_hash, parser, payload, size_bytes, created_at, last_accessed)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(cache_key) DO UPDATE SET
+                      payload = excluded.payload,
+                      size_bytes = excluded.size_bytes,
+                      created_at = excluded.created_at,
+                      last_accessed = excluded.last_accessed
+                    """,
+                    (key, content_hash, type(parser).__qualname__, payload, len(payload), now, now),
+                )
+            if self._record_write():
+                self.evict()
+        except Exception as e:
+            logger.warning(f"Parse cache write failed: {e}")
+
+    def _touch(self, key: str, now: float) -> None:
+        with self._touch_lock:
+            self._touched[key] = now
+            if len(self._touched) < _TOUCH_FLUSH_EVERY:
+                return
+        self.flush_access_times()
+
+    def flush_access_times(self) -> None:
+        """Write buffered ``last_accessed`` refreshes in one transaction."""
+        with self._touch_lock:
+            touched, self._touched = self._touched, {}
+        if not touched:
+            return
+        with self._pool.writer() as conn:
+            conn.executemany(
+                "UPDATE document_parse_cache SET last_accessed = MAX(last_accessed, ?) WHERE cache_key = ?",
+                [(when, key) for key, when in touched.items()],
+            )
+
+    def evict(self) -> int:
+        """Drop least recently used entries until under max size."""
+        removed = 0
+        # Recent hits must count before choosing LRU victims
+        self.flush_access_times()
+        with self._pool.writer() as conn:
+            total = conn.execute("SELECT COALESCE(SUM(size_bytes), 0) FROM document_parse_cache").fetchone()[0]
+            if self.max_size_bytes and total > self.max_size_bytes:
+                excess = total - self.max_size_bytes
+                freed = 0
+                victims = []
+                for cache_key, size_bytes in conn.execute(
+                    "SELECT cache_key, size_bytes FROM document_parse_cache ORDER BY last_accessed"
+                ):
+                    victims.append((cache_key,))
+                    freed += size_bytes
+                    if freed >= excess:
+                        break
+                conn.executemany("DELETE FROM document_parse_cache WHERE cache_key = ?", victims)
+                removed = len(victims)
+        if removed:
+            self._count("evicted", removed)
+            logger.info(f"Parse cache evicted {removed} entries")
+        return removed
+
+    def clear(self) -> None:
+        with self._pool.writer() as conn:
+            conn.execute("DELETE FROM document_parse_cache")
+
+    def summary(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return {
+                "hits": self.stats.hits,
+                "misses": self.stats.misses,
+                "writes": self.stats.writes,
+                "evicted": self.stats.evicted,
+            }
+
+
+# One ParseCache per cache file, so pipelines built per document share hit
+# counters and buffered access times
+_shared_lock = Lock()
+_shared: Dict[Tuple[str, int], ParseCache] = {}
+
+
+def resolve_parse_cache(cache: Any) -> Optional[ParseCache]:
+    """Return the parse cache for a ParseCache, CacheConfig, dict or None (default config); None when disabled."""
+    if cache is False:
+        return None
+    if isinstance(cache, ParseCache):
+        return cache
+    if isinstance(cache, dict):
+        cache = CacheConfig(**cache)
+    cache_config = cache if isinstance(cache, CacheConfig) else CacheConfig()
+    if not cache_config.enabled:
+        return None
+    location = cache_config.location or os.path.join(os.getcwd(), ".kg_cache")
+    key = (str(Path(location).resolve()), int(cache_config.max_size_mb))
+    try:
+        with _shared_lock:
+            shared = _shared.get(key)
+            if shared is None:
+                shared = _shared[key] = ParseCache(cache_config)
+        return shared
+    except Exception as e:
+        logger.warning(f"Parse cache unavailable ({e}); documents will be parsed every time")
+        return None
+
+
+__all__ = [
+    "ParseCache",
+    "ParseCacheStats",
+    "file_content_hash",
+    "parse_cache_key",
+    "resolve_parse_cache",
+]
@@ -47,6 +47,9 @@ class ChunkContentStep(PipelineStep):
     """Generate structured chunks and associated metadata."""
 
     name = "chunk_content"
+    inputs = ("document", "document.clean_content", "route_document")
+    outputs = ("document.chunks",)
+    kind = "cpu"
 
     def __init__(
         self,
@@ -73,6 +73,9 @@ class CleanContentStep(PipelineStep):
     """Normalize document text for subsequent pipeline steps."""
 
     name = "clean_content"
+    inputs = ("document",)
+    outputs = ("document.clean_content",)
+    kind = "cpu"
 
     def run(self, context: DocumentPipelineContext) -> DocumentPipelineContext:
         document = context.ensure_document()
@@ -30,7 +30,7 @@ def _clean_list_from_response(response: Any, key: str) -> List[str]:
     return cleaned
 
 
-def enrich_chunks_with_llm(document, llm_service):
+def enrich_chunks_with_llm(document, llm_service, *, max_concurrency: int = 8, include_summary: bool = False):
     if not llm_service:
         logger.warning("LLM service not available; skipping enrichment")
         return document
@@ -39,14 +39,37 @@ def enrich_chunks_with_llm(document, llm_service):
         logger.warning("Document %s has no chunks to enrich", document.id)
         return document
 
-    for chunk in document.textChunks:
-        raw_topics = llm_service.extract_topics(chunk.content)
-        raw_keywords = llm_service.extract_keywords(chunk.content)
-
-        chunk.metadata.topics = _clean_list_from_response(raw_topics, "topics")
-        chunk.metadata.keywords = _clean_list_from_response(raw_keywords, "keywords")
-
-    logger.debug("Enriched %d chunks for document %s", len(document.textChunks), document.id)
+    chunks = document.textChunks
+    if hasattr(llm_service, "extract_chunk_metadata_batch"):
+        # One fused topics+keywords call per chunk, run concurrently
+        responses = llm_service.extract_chunk_metadata_batch(
+            [chunk.content for chunk in chunks],
+            max_concurrency=max_concurrency,
+            include_summary=include_summary,
+        )
+    else:
+        responses = [
+            {
+                "topics": _clean_list_from_response(llm_service.extract_topics(chunk.content), "topics"),
+                "keywords": _clean_list_from_response(llm_service.extract_keywords(chunk.content), "keywords"),
+            }
+            for chunk in chunks
+        ]
+
+    failed = 0
+    for chunk, response in zip(chunks, responses):
+        if response is None:
+            failed += 1
+            continue
+        chunk.metadata.topics = _clean_list_from_response(response, "topics")
+        chunk.metadata.keywords = _clean_list_from_response(response, "keywords")
+        summary = response.get("summary") if isinstance(response, dict) else None
+        if summary:
+            chunk.summary = summary.strip()
+
+    if failed:
+        logger.warning("Enrichment failed for %d of %d chunks in document %s", failed, len(chunks), document.id)
+    logger.debug("Enriched %d chunks for document %s", len(chunks) - failed, document.id)
     return document
 
 
@@ -54,16 +77,25 @@ class EnrichChunksStep(PipelineStep):
     """Optional enrichment step that augments chunk metadata."""
 
     name = "enrich_chunks"
+    inputs = ("document.chunks",)
+    outputs = ("document.chunk_metadata",)
 
-    def __init__(self, *, enabled: bool = True) -> None:
+    def __init__(self, *, enabled: bool = True, max_concurrency: int = 8, include_summary: bool = False) -> None:
         super().__init__(enabled=enabled)
+        self.max_concurrency = max_concurrency
+        self.include_summary = include_summary
 
     def run(self, context: DocumentPipelineContext) -> DocumentPipelineContext:
         if not self.should_run(context):
             return context
 
         document = context.ensure_document()
-        document = enrich_chunks_with_llm(document, context.services.llm_service)
+        document = enrich_chunks_with_llm(
+            document,
+            context.services.llm_service,
+            max_concurrency=self.max_concurrency,
+            include_summary=self.include_summary,
+        )
         context.set_document(document)
         context.results[self.name] = {
             "chunk_count": len(document.textChunks or []),
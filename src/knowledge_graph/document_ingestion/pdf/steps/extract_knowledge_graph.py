@@ -104,6 +104,8 @@ class ExtractKnowledgeGraphStep(PipelineStep):
     """Run KG extraction through the existing document manager logic."""
 
     name = "extract_knowledge_graph"
+    inputs = ("document", "document.clean_content", "document.chunks", "route_document", "chunk_content")
+    outputs = ("document.knowledge_graph",)
 
     def __init__(
         self,
@@ -63,6 +63,8 @@ class GenerateMetadataStep(PipelineStep):
     """Populate document-level metadata such as tags and categories."""
 
     name = "generate_metadata"
+    inputs = ("document",)
+    outputs = ("document.metadata",)
 
     def run(self, context: DocumentPipelineContext) -> DocumentPipelineContext:
         document = context.ensure_document()
@@ -5,6 +5,7 @@ from __future__ import annotations
 import logging
 import os
 import uuid
+from typing import Any, List, Optional
 
 from ...document_pipeline import (
     DocumentPipelineContext,
@@ -14,6 +15,7 @@ from ...document_pipeline import (
 from ....data_structs.document import Document
 from ....data_structs.document import DocumentMetadata
 from ..utils import ParserFactory
+from ...parse_cache import ParseCache, file_content_hash, parse_cache_key, resolve_parse_cache
 
 
 logger = logging.getLogger("knowledgeAgent.pipeline.load")
@@ -23,8 +25,13 @@ class DocumentLoadError(Exception):
     """Raised when a document cannot be loaded from disk."""
 
 
-def load_document_from_path(document_path: str, document_id: str) -> Document:
-    """Create a Document populated with raw content and metadata."""
+def load_document_from_path(document_path: str, document_id: str, *, cache: Optional[ParseCache] = None) -> Document:
+    """Create a Document populated with raw content and metadata.
+
+    The file's content hash is always computed (``Document.file_hash``); with
+    a ``cache``, a previous parse of the same bytes by the same parser version
+    is reused instead of parsing again (``Document.is_cached``).
+    """
     if not os.path.exists(document_path):
         raise DocumentLoadError(f"File not found: {document_path}")
 
@@ -54,13 +61,28 @@ def load_document_from_path(document_path: str, document_id: str) -> Document:
     parser = ParserFactory.get_parser(document.file_type)
     parser_name = parser.__class__.__name__
     logger.info("Parser selected for %s (%s): %s", filename, document.file_type, parser_name)
-    raw_content = parser.parse(document.file_path)
+    document.file_hash = file_content_hash(document_path)
+    document.is_hash_generated = True
+    cache_key = parse_cache_key(document.file_hash, parser) if cache is not None else None
+    cached = cache.get(cache_key) if cache_key else None
+    pages: Optional[List[str]] = None
+    if cached is not None:
+        raw_content, pages = cached
+        document.is_cached = True
+        document.cache_location = cache.db_path
+        logger.info("Parse cache hit for %s (%s)", filename, document.file_hash[:12])
+    else:
+        raw_content = parser.parse(document.file_path)
     document.raw_content = raw_content
     
     # Populate pages for PDFs (and optionally for others as single page)
     ft = (document.file_type or "").lower()
     try:
-        if ft in {".pdf", "pdf"}:
+        if pages is not None:
+            document.pages = pages
+            if document.metadata and (ft in {".pdf", "pdf"} or not getattr(document.metadata, "num_pages", None)):
+                document.metadata.num_pages = len(pages)
+        elif ft in {".pdf", "pdf"}:
             pages = raw_content.split("\f") if "\f" in (raw_content or "") else [(raw_content or "")]
             document.pages = pages
             if document.metadata:
@@ -74,6 +96,8 @@ def load_document_from_path(document_path: str, document_id: str) -> Document:
         # Defensive: do not fail load step if page derivation fails
         document.pages = [raw_content or ""]
     document.is_parsed = True
+    if cache_key and cached is None:
+        cache.put(cache_key, document.file_hash, parser, raw_content or "", document.pages)
 
     nl_count = (raw_content or "").count("\n")
     logger.info(
@@ -89,12 +113,20 @@ class LoadDocumentStep(PipelineStep):
     """Create the Document instance and populate core metadata."""
 
     name = "load_document"
+    inputs = ()
+    outputs = ("document",)
+    kind = "cpu"
+
+    def __init__(self, *, cache: Any = None, enabled: bool = True) -> None:
+        super().__init__(enabled=enabled)
+        # Parsed-document cache: ParseCache, CacheConfig, dict, None (default config) or False (off)
+        self.cache: Optional[ParseCache] = resolve_parse_cache(cache)
 
     def run(self, context: DocumentPipelineContext) -> DocumentPipelineContext:
         params = context.params
 
         try:
-            document = load_document_from_path(params.document_path, params.document_id)
+            document = load_document_from_path(params.document_path, params.document_id, cache=self.cache)
         except DocumentLoadError as exc:
             raise DocumentPipelineError(str(exc)) from exc
 
@@ -117,5 +149,7 @@ class LoadDocumentStep(PipelineStep):
         context.results[self.name] = {
             "file": params.document_path,
             "chars_raw": len(document.raw_content or ""),
+            "file_hash": document.file_hash,
+            "parse_cache_hit": document.is_cached,
         }
         return context
@@ -2,14 +2,24 @@
 
 from __future__ import annotations
 
-from knowledge_graph.persistence.sqlite.sql_lite import SqlLite
-from knowledge_graph.settings.settings import get_settings
+from knowledge_graph.persistence.sqlite.sql_lite import get_sql_lite
 from ...document_pipeline import DocumentPipelineContext, PipelineStep
 
 class PersistDocumentStep(PipelineStep):
     """Write the final document record to the database."""
 
     name = "persist_document"
+    inputs = (
+        "document",
+        "document.clean_content",
+        "document.chunks",
+        "document.chunk_metadata",
+        "document.metadata",
+        "document.knowledge_graph",
+    )
+    outputs = ()
+    kind = "write"
+    completes_document = True
 
     def __init__(self,enabled: bool = True) -> None:
         super().__init__(enabled=enabled)
@@ -20,10 +30,13 @@ class PersistDocumentStep(PipelineStep):
 
         document = context.ensure_document()
         try:
-            sqlite = SqlLite(settings=get_settings())  # uses default repo path resolution
+            sqlite = get_sql_lite()  # shared facade/connection pool
             doc_repo = sqlite.document_repository()
-            doc_repo.save_document(document)
-            context.results[self.name] = {"persisted": True}
+            if doc_repo.save_document(document):
+                context.results[self.name] = {"persisted": True}
+            else:
+                # The repository logs and swallows the failure; report it so the run is not recorded as completed
+                context.results[self.name] = {"persisted": False, "error": "document row was not saved"}
         except Exception as exc:  # pragma: no cover - defensive guard
             context.results[self.name] = {"persisted": False, "error": str(exc)}
             raise
@@ -19,6 +19,9 @@ class RouteDocumentStep(PipelineStep):
     """Decide whether to skip, use document-level, or chunk-level processing."""
 
     name = "route_document"
+    inputs = ("document", "document.clean_content")
+    outputs = ()
+    kind = "cpu"
 
     def run(self, context: DocumentPipelineContext) -> DocumentPipelineContext:
         document = context.ensure_document()
@@ -3,16 +3,20 @@
 from __future__ import annotations
 
 import re
-from typing import Any, List, Optional
+from typing import Any, List, Optional, Tuple
 import logging
 
-from langchain_core.documents import Document
-from langchain_text_splitters import RecursiveCharacterTextSplitter
 
 from ....data_structs.document import ChunkMetadata, TextChunk
+from .spans import MappedText, RecursiveSpanSplitter, Span
 
 logger = logging.getLogger("knowledgeAgent.pipeline.chunk")
 
+# Line boundaries recognised by str.splitlines()
+_LINE_BREAK = re.compile(r"\r\n|[\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]")
+_HYPHEN_BREAK = re.compile(re.escape("-\n"))
+_BLANK_LINES = re.compile(r"\n\s*\n\s*\n+")
+
 
 class MarkdownSection:
     """Represents a section in a markdown document with hierarchical structure."""
@@ -25,6 +29,7 @@ class MarkdownSection:
         self.parent: Optional["MarkdownSection"] = None
         self.start_index = 0
         self.end_index = 0
+        self.content_start = 0  # offset of `content` in the source text
 
     def add_subsection(self, section: "MarkdownSection") -> None:
         section.parent = self
@@ -42,6 +47,12 @@ class MarkdownSection:
     def size(self) -> int:
         return len(self.full_content())
 
+    def span_end(self) -> int:
+        """End offset of this section including all of its subsections."""
+        if self.subsections:
+            return self.subsections[-1].span_end()
+        return self.end_index
+
     def get_full_path(self) -> str:
         if self.parent is None:
             return self.title
@@ -61,7 +72,7 @@ class StructuredMarkdownChunker:
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
         self.max_depth = max_depth
-        self.fallback_splitter = RecursiveCharacterTextSplitter(
+        self.fallback_splitter = RecursiveSpanSplitter(
             chunk_size=chunk_size,
             chunk_overlap=chunk_overlap,
         )
@@ -82,15 +93,13 @@ class StructuredMarkdownChunker:
                 continue
 
             content_start = start + len("#" * level) + len(title) + 2
-            content = text[content_start:next_start].strip()
-
-            content_lines = content.split("\n")
-            if content_lines and content_lines[0].strip() == "":
-                content = "\n".join(content_lines[1:])
+            raw_content = text[content_start:next_start]
+            content = raw_content.strip()
 
             section = MarkdownSection(level, title, content)
             section.start_index = start
             section.end_index = next_start
+            section.content_start = content_start + (len(raw_content) - len(raw_content.lstrip()))
 
             while section_stack and section_stack[-1].level >= level:
                 section_stack.pop()
@@ -105,10 +114,14 @@ class StructuredMarkdownChunker:
         return root_sections
 
     def chunk_section(self, section: MarkdownSection, max_size: int, depth: int = 1) -> List[str]:
-        chunks: List[str] = []
+        return [chunk for chunk, _ in self.chunk_section_spans(section, max_size, depth)]
+
+    def chunk_section_spans(self, section: MarkdownSection, max_size: int, depth: int = 1) -> List[Tuple[str, Span]]:
+        """Chunks of a section, each with the (start, end) span of source text it covers."""
+        chunks: List[Tuple[str, Span]] = []
 
         if section.size() <= max_size:
-            chunks.append(section.full_content())
+            chunks.append((section.full_content(), (section.start_index, section.span_end())))
             return chunks
 
         if depth >= self.max_depth or not section.subsections:
@@ -121,10 +134,17 @@ class StructuredMarkdownChunker:
                 current = current.parent
 
             full_text = context + section.content
-            chunks.extend(self.fallback_splitter.split_text(full_text))
+            # Positions inside the synthetic header context map to the section start
+            offset = len(context)
+            for start, end in self.fallback_splitter.split_spans(full_text):
+                src_start = section.content_start + (start - offset) if start >= offset else section.start_index
+                src_end = section.content_start + (end - offset) if end > offset else section.content_start
+                chunks.append((full_text[start:end], (src_start, src_end)))
             return chunks
 
         current_chunk = ""
+        current_start = section.start_index
+        current_end = section.end_index
         section_header = ("#" * section.level) + " " + section.title + "\n\n" if section.title else ""
 
         if section.content:
@@ -137,17 +157,22 @@ class StructuredMarkdownChunker:
 
             if subsection_size > max_size:
                 if current_chunk:
-                    chunks.append(current_chunk)
+                    chunks.append((current_chunk, (current_start, current_end)))
                     current_chunk = ""
-                chunks.extend(self.chunk_section(subsection, max_size, depth + 1))
+                chunks.extend(self.chunk_section_spans(subsection, max_size, depth + 1))
+                current_start = current_end = subsection.span_end()
             elif len(current_chunk) + subsection_size > max_size:
-                chunks.append(current_chunk)
+                chunks.append((current_chunk, (current_start, current_end)))
                 current_chunk = section_header + subsection.full_content()
+                current_start, current_end = subsection.start_index, subsection.span_end()
             else:
+                if not current_chunk:
+                    current_start = subsection.start_index
                 current_chunk += subsection.full_content()
+                current_end = subsection.span_end()
 
         if current_chunk:
-            chunks.append(current_chunk)
+            chunks.append((current_chunk, (current_start, current_end)))
 
         return chunks
 
@@ -174,9 +199,12 @@ class StructuredMarkdownChunker:
             total_sections,
         )
 
-        chunks: List[str] = []
+        pairs: List[Tuple[str, Span]] = []
         for section in root_sections:
-            chunks.extend(self.chunk_section(section, self.chunk_size))
+            pairs.extend(self.chunk_section_spans(section, self.chunk_size))
+        chunks = [chunk for chunk, _ in pairs]
+        # Stash spans for metadata construction (aligned with the returned chunks)
+        setattr(document, "_chunk_spans", [span for _, span in pairs])
 
         if chunks:
             sizes = [len(c) for c in chunks]
@@ -191,23 +219,18 @@ class StructuredMarkdownChunker:
     def create_chunk_metadata(self, document: Any, chunks: List[str]) -> List[ChunkMetadata]:
         logger.debug("Creating metadata for %d chunks for %s", len(chunks), document.id)
 
-        chunk_metadatas: List[ChunkMetadata] = []
-        current_position = 0
-
-        for chunk_text in chunks:
-            word_count = len(chunk_text.split())
-
-            start_index = document.raw_content.find(chunk_text, current_position)
-            if start_index == -1:
-                start_index = document.raw_content.find(chunk_text)
-            end_index = start_index + len(chunk_text) if start_index != -1 else -1
-
-            current_position = end_index if end_index != -1 else current_position
+        spans: List[Span] = getattr(document, "_chunk_spans", None) or []
+        if len(spans) != len(chunks):
+            # Chunks did not come from chunk_document; positions are unknown
+            logger.debug("%s: no chunk spans available; offsets set to -1", document.id)
+            spans = [(-1, -1)] * len(chunks)
 
+        chunk_metadatas: List[ChunkMetadata] = []
+        for chunk_text, (start_index, end_index) in zip(chunks, spans):
             metadata = ChunkMetadata(
                 start_index=start_index,
                 end_index=end_index,
-                word_count=word_count,
+                word_count=len(chunk_text.split()),
                 language=getattr(document.metadata, "language", "en"),
             )
             chunk_metadatas.append(metadata)
@@ -244,7 +267,7 @@ class Chunker:
         self.chunk_overlap = chunk_overlap
         self.chunker_type = chunker_type
 
-        self.recursive_character_splitter = RecursiveCharacterTextSplitter(
+        self.recursive_character_splitter = RecursiveSpanSplitter(
             chunk_size=chunk_size,
             chunk_overlap=chunk_overlap,
         )
@@ -272,8 +295,10 @@ class Chunker:
             return self.structured_markdown_chunker.chunk_document(document)
 
         logger.info("%s: using recursive text chunker", document.id)
-        doc_chunks = self.recursive_character_splitter.split_text(document.raw_content)
-        return [chunk.page_content if isinstance(chunk, Document) else chunk for chunk in doc_chunks]
+        raw = document.raw_content
+        spans = self.recursive_character_splitter.split_spans(raw)
+        setattr(document, "_chunk_spans", spans)
+        return [raw[start:end] for start, end in spans]
 
     def create_chunk_metadata(self, document, chunks: List[str]) -> List[ChunkMetadata]:
         return self.structured_markdown_chunker.create_chunk_metadata(document, chunks)
@@ -288,14 +313,15 @@ class PageLevelChunker:
     - Splits document.raw_content by form-feed (\f) markers inserted by the PDF parser.
     - Detects repeated headers/footers and removes them.
     - Fixes common hyphenation issues across line breaks.
-    - For long pages, uses RecursiveCharacterTextSplitter to sub-split.
-    - Produces ChunkMetadata with page_number and chunk_strategy ('page' or 'page+recursive').
+    - For long pages, uses RecursiveSpanSplitter to sub-split.
+    - Produces ChunkMetadata with page_number and chunk_strategy ('page' or 'page+recursive');
+      start/end offsets are mapped back to raw_content through normalisation.
     """
 
     def __init__(self, chunk_size: int = 1000, chunk_overlap: int = 200) -> None:
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
-        self.splitter = RecursiveCharacterTextSplitter(
+        self.splitter = RecursiveSpanSplitter(
             chunk_size=chunk_size,
             chunk_overlap=chunk_overlap,
         )
@@ -327,20 +353,41 @@ class PageLevelChunker:
 
         Returns: (normalized_text, removed_count)
         """
-        lines = (text or "").splitlines()
+        mapped, removed = self._normalize_page_mapped(text, headers, footers)
+        return mapped.text, removed
+
+    def _normalize_page_mapped(
+        self, text: str, headers: set[str], footers: set[str], offset: int = 0
+    ) -> tuple[MappedText, int]:
+        """Like _normalize_page, but keeps a map from normalized positions to raw offsets."""
+        text = text or ""
+        lines: list[Span] = []
+        pos = 0
+        for match in _LINE_BREAK.finditer(text):
+            lines.append((pos, match.start()))
+            pos = match.end()
+        if pos < len(text):
+            lines.append((pos, len(text)))
+
         removed = 0
         # Strip global headers/footers if they match exactly after strip
-        if lines and lines[0].strip() in headers:
+        if lines and text[lines[0][0]:lines[0][1]].strip() in headers:
             lines = lines[1:]
             removed += 1
-        if len(lines) > 1 and lines[-1].strip() in footers:
+        if len(lines) > 1 and text[lines[-1][0]:lines[-1][1]].strip() in footers:
             lines = lines[:-1]
             removed += 1
-        page = "\n".join(lines)
+
+        parts: list[tuple[str, int, bool]] = []
+        for i, (start, end) in enumerate(lines):
+            if i:
+                parts.append(("\n", offset + lines[i - 1][1], False))
+            parts.append((text[start:end], offset + start, True))
+        page = MappedText.build(parts)
         # Fix hyphenation across newlines: "foo-\nbar" -> "foobar"
-        page = page.replace("-\n", "")
+        page = page.sub(_HYPHEN_BREAK, "")
         # Collapse 3+ consecutive blank lines into 2
-        page = re.sub(r"\n\s*\n\s*\n+", "\n\n", page)
+        page = page.sub(_BLANK_LINES, "\n\n")
         return page.strip(), removed
 
     def chunk_document_by_page(self, document) -> list[str]:
@@ -355,24 +402,33 @@ class PageLevelChunker:
             setattr(document, "_page_chunks", [])
             return []
 
+        # Raw offset of each page; only valid when raw_content is the form-feed join of pages
+        offsets: Optional[list[int]] = None
+        if sum(len(p or "") for p in pages) + len(pages) - 1 == len(raw):
+            offsets, pos = [], 0
+            for p in pages:
+                offsets.append(pos)
+                pos += len(p or "") + 1
+
         headers, footers = self._detect_headers_footers(pages)
 
-        chunk_pairs: list[tuple[int, str]] = []  # (page_number, text)
+        chunk_triples: list[tuple[int, str, Span]] = []  # (page_number, text, raw span)
         for idx, ptxt in enumerate(pages, start=1):
-            norm, removed = self._normalize_page(ptxt, headers, footers)
-            if not norm:
+            norm, removed = self._normalize_page_mapped(ptxt, headers, footers, offsets[idx - 1] if offsets else 0)
+            if not norm.text:
                 continue
+
+            def _span(start: int, end: int) -> Span:
+                return norm.source_span(start, end) if offsets else (-1, -1)
+
             if len(norm) <= self.chunk_size:
-                chunk_pairs.append((idx, norm))
+                chunk_triples.append((idx, norm.text, _span(0, len(norm))))
                 sub_count = 1
             else:
-                subs = self.splitter.split_text(norm)
                 sub_count = 0
-                for sub in subs:
-                    sub_txt = sub.page_content if isinstance(sub, Document) else sub
-                    if sub_txt and sub_txt.strip():
-                        chunk_pairs.append((idx, sub_txt))
-                        sub_count += 1
+                for start, end in self.splitter.split_spans(norm.text):
+                    chunk_triples.append((idx, norm.text[start:end], _span(start, end)))
+                    sub_count += 1
 
             try:
                 logger.info(
@@ -380,7 +436,7 @@ class PageLevelChunker:
                     getattr(document, "id", "doc"),
                     idx,
                     len(ptxt or ""),
-                    len(norm or ""),
+                    len(norm),
                     sub_count,
                     removed,
                 )
@@ -388,36 +444,26 @@ class PageLevelChunker:
                 pass
 
         # Stash for metadata construction
-        setattr(document, "_page_chunks", chunk_pairs)
-        return [t for _, t in chunk_pairs]
+        setattr(document, "_page_chunks", chunk_triples)
+        return [t for _, t, _ in chunk_triples]
 
     def create_page_chunk_metadata(self, document, chunks: list[str]) -> list[ChunkMetadata]:
-        pairs: list[tuple[int, str]] = getattr(document, "_page_chunks", []) or []
+        triples: list[tuple[int, str, Span]] = getattr(document, "_page_chunks", []) or []
         # Safety: ensure length alignment
-        if len(pairs) != len(chunks):
-            # rebuild pairs from chunks assuming page 1 if unknown
-            pairs = [(1, c) for c in chunks]
+        if len(triples) != len(chunks):
+            # rebuild from chunks assuming page 1 and unknown offsets
+            triples = [(1, c, (-1, -1)) for c in chunks]
 
         # Determine which pages were sub-split
         from collections import Counter
-        counts = Counter([pg for pg, _ in pairs])
+        counts = Counter([pg for pg, _, _ in triples])
 
         metas: list[ChunkMetadata] = []
-        cursor = 0
-        for page_num, text in pairs:
-            word_count = len((text or "").split())
-            # Try to locate in original raw content for positional metadata; may fail due to normalization
-            start_index = (document.raw_content or "").find(text, cursor)
-            if start_index == -1:
-                start_index = (document.raw_content or "").find(text)
-            end_index = start_index + len(text) if start_index != -1 else -1
-            if end_index != -1:
-                cursor = end_index
-
+        for page_num, text, (start_index, end_index) in triples:
             meta = ChunkMetadata(
                 start_index=start_index,
                 end_index=end_index,
-                word_count=word_count,
+                word_count=len((text or "").split()),
                 language=getattr(document.metadata, "language", "en"),
                 page_number=page_num,
                 chunk_strategy="page+recursive" if counts.get(page_num, 0) > 1 else "page",
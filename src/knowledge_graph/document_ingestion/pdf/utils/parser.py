@@ -3,8 +3,13 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Dict, Type
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple, Type
 import logging
+import os
+import threading
+import time
 
 try:  # Optional dependency for PDF parsing
     import PyPDF2  # type: ignore
@@ -19,9 +24,58 @@ except ImportError:  # pragma: no cover - optional dependency
 logger = logging.getLogger("knowledgeAgent.pipeline.parser")
 
 
+@dataclass
+class PageText:
+    """Text extracted from one PDF page."""
+
+    number: int  # 1-based page number
+    text: str
+    seconds: float
+    error: Optional[str] = None
+
+
+def _extract_page(reader, index: int) -> PageText:
+    started = time.perf_counter()
+    try:
+        text, error = reader.pages[index].extract_text() or "", None
+    except Exception as e:  # pragma: no cover - depends on PDF content
+        logger.warning("PDF page %d extract_text failed: %s", index + 1, e)
+        text, error = "", str(e) or e.__class__.__name__
+    return PageText(index + 1, text, time.perf_counter() - started, error)
+
+
+def _extract_page_range(task: Tuple[str, int, int]) -> List[PageText]:
+    """Extract pages ``[start, end)`` with a reader of its own (runs in pool workers)."""
+    path, start, end = task
+    with open(path, "rb") as pdf_file:
+        reader = PyPDF2.PdfReader(pdf_file)
+        return [_extract_page(reader, i) for i in range(start, end)]
+
+
+def page_ranges(page_count: int, workers: int, ranges_per_worker: int = 4) -> List[Tuple[int, int]]:
+    """Split ``page_count`` pages into contiguous ``[start, end)`` ranges.
+
+    A few ranges per worker keep the pool busy when page costs are uneven
+    (scanned pages, large content streams).
+    """
+    if page_count <= 0:
+        return []
+    parts = max(1, min(page_count, workers * ranges_per_worker))
+    size, extra = divmod(page_count, parts)
+    ranges, start = [], 0
+    for part in range(parts):
+        end = start + size + (1 if part < extra else 0)
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+
 class DocumentParser(ABC):
     """Base class for document parsers."""
 
+    # Part of the parse cache key: bump when a parser's output changes
+    version = "1"
+
     @abstractmethod
     def parse(self, file_path: str) -> str:
         """Parse document and extract raw content."""
@@ -131,34 +185,112 @@ class ParserFactory:
 
     if PyPDF2 is not None:
         class PDFParser(DocumentParser):
-            """Parser for PDF documents using PyPDF2."""
+            """Parser for PDF documents using PyPDF2.
+
+            PDFs of at least ``parallel_min_pages`` pages are extracted by a
+            process pool: page ranges are spread over ``workers`` processes,
+            each opening its own ``PdfReader``. Pages come back in order with
+            their extraction time (``last_pages``); a page that fails reads
+            as "", and a range whose worker fails is re-extracted serially.
+
+            ``executor`` lets callers share one process pool across parsers;
+            it is not shut down here. Without it, ``workers`` defaults to the
+            CPU count on the main thread and to 1 (serial) elsewhere, so
+            parsers running on ``BatchIngestor`` threads neither start a pool
+            each nor fork a process that has other threads running.
+            """
+
+            # Below this many pages starting the pool costs more than it saves
+            parallel_min_pages = 64
+
+            def __init__(
+                self,
+                *,
+                workers: Optional[int] = None,
+                parallel_min_pages: Optional[int] = None,
+                executor: Optional[Executor] = None,
+            ) -> None:
+                self.workers = workers
+                self.executor = executor
+                if parallel_min_pages is not None:
+                    self.parallel_min_pages = parallel_min_pages
+                self.last_pages: List[PageText] = []
+
+            def _workers(self) -> int:
+                if self.workers is not None:
+                    return self.workers
+                if self.executor is not None or threading.current_thread() is threading.main_thread():
+                    return os.cpu_count() or 1
+                return 1
 
             def parse(self, file_path: str) -> str:
                 try:
-                    with open(file_path, "rb") as pdf_file:
-                        reader = PyPDF2.PdfReader(pdf_file)
-                        pages = []
-                        for i, page in enumerate(reader.pages):
-                            try:
-                                txt = page.extract_text() or ""
-                            except Exception as e:  # pragma: no cover - depends on PDF content
-                                logger.warning("PDF page %d extract_text failed: %s", i + 1, e)
-                                txt = ""
-                            pages.append(txt)
+                    started = time.perf_counter()
+                    pages = self.parse_pages(file_path)
                     # Join pages with form-feed so downstream chunkers can split by page reliably
-                    text = "\f".join(pages)
+                    text = "\f".join(page.text for page in pages)
+                    slowest = max(pages, key=lambda page: page.seconds, default=None)
                     logger.info(
-                        "Parsed PDF %s: pages=%d chars=%d newlines=%d",
+                        "Parsed PDF %s: pages=%d chars=%d newlines=%d failed=%d seconds=%.2f slowest_page=%s",
                         file_path,
                         len(pages),
                         len(text),
                         text.count("\n"),
+                        sum(1 for page in pages if page.error),
+                        time.perf_counter() - started,
+                        f"{slowest.number} ({slowest.seconds:.2f}s)" if slowest else "-",
                     )
                     return text
                 except Exception as exc:  # pragma: no cover - depends on PyPDF2 internals
                     logger.error("Error parsing PDF file %s: %s", file_path, exc)
                     return ""
 
+            def parse_pages(self, file_path: str) -> List[PageText]:
+                """Every page of ``file_path`` in order, in parallel for large documents."""
+                workers = self._workers()
+                with open(file_path, "rb") as pdf_file:
+                    reader = PyPDF2.PdfReader(pdf_file)
+                    page_count = len(reader.pages)
+                    if workers <= 1 or page_count < self.parallel_min_pages:
+                        pages = [_extract_page(reader, i) for i in range(page_count)]
+                    else:
+                        pages = None
+                if pages is None:
+                    pages = self._parse_parallel(file_path, page_count, workers)
+                self.last_pages = pages
+                return pages
+
+            def _parse_parallel(self, file_path: str, page_count: int, workers: int) -> List[PageText]:
+                ranges = page_ranges(page_count, workers)
+                logger.info("PDF %s: extracting %d pages in %d ranges with %d workers", file_path, page_count, len(ranges), workers)
+                owned = self.executor is None
+                pool = self.executor
+                futures = []
+                try:
+                    if pool is None:
+                        pool = ProcessPoolExecutor(max_workers=min(workers, len(ranges)))
+                    for start, end in ranges:
+                        futures.append(pool.submit(_extract_page_range, (file_path, start, end)))
+                except Exception as exc:  # spawn/fork failure, broken or shut-down pool
+                    logger.warning("PDF %s: process pool unavailable (%s); extracting serially", file_path, exc)
+                    for future in futures:
+                        future.cancel()
+                    if owned and pool is not None:
+                        pool.shutdown(wait=False, cancel_futures=True)
+                    return _extract_page_range((file_path, 0, page_count))
+                pages: List[PageText] = []
+                try:
+                    for (start, end), future in zip(ranges, futures):
+                        try:
+                            pages.extend(future.result())
+                        except Exception as exc:
+                            logger.warning("PDF %s: pages %d-%d failed in worker (%s); extracting serially", file_path, start + 1, end, exc)
+                            pages.extend(_extract_page_range((file_path, start, end)))
+                finally:
+                    if owned:
+                        pool.shutdown()
+                return pages
+
         _parsers.update({
             "pdf": PDFParser,
             ".pdf": PDFParser,
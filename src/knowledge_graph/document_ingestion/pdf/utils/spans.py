@@ -0,0 +1,221 @@
+"""Span-carrying text splitting and offset maps for chunk metadata.
+
+Chunkers used to recover each chunk's position with ``raw_content.find``
+after splitting, which is quadratic on large documents and misses whenever
+the chunk text was normalised. The helpers here track positions while
+splitting instead:
+
+- ``RecursiveSpanSplitter`` mirrors LangChain's RecursiveCharacterTextSplitter
+  (same separators, keep-separator-at-start, merge and overlap rules) but
+  returns ``(start, end)`` spans into the input, so chunk text is always
+  ``text[start:end]``.
+- ``MappedText`` is a string plus a piecewise map from its positions back to
+  positions in the source it was derived from, maintained through regex
+  substitutions and slicing (used for PDF page normalisation).
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+import re
+from typing import Iterable, List, Optional, Pattern, Sequence, Tuple, Union
+
+Span = Tuple[int, int]
+
+DEFAULT_SEPARATORS: Tuple[str, ...] = ("\n\n", "\n", " ", "")
+
+
+class RecursiveSpanSplitter:
+    """Recursive character splitter that yields spans instead of copies."""
+
+    def __init__(
+        self,
+        chunk_size: int = 1000,
+        chunk_overlap: int = 200,
+        separators: Sequence[str] = DEFAULT_SEPARATORS,
+    ) -> None:
+        if chunk_overlap > chunk_size:
+            raise ValueError(f"chunk_overlap ({chunk_overlap}) is larger than chunk_size ({chunk_size})")
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.separators = list(separators)
+
+    def split_spans(self, text: str, start: int = 0, end: Optional[int] = None) -> List[Span]:
+        """Chunk spans of ``text[start:end]``, in order, whitespace-trimmed."""
+        end = len(text) if end is None else end
+        return self._split(text, start, end, self.separators)
+
+    def split_text(self, text: str) -> List[str]:
+        return [text[s:e] for s, e in self.split_spans(text)]
+
+    # Internals (same control flow as RecursiveCharacterTextSplitter._split_text)
+    def _split(self, text: str, start: int, end: int, separators: List[str]) -> List[Span]:
+        separator = separators[-1]
+        remaining: List[str] = []
+        for i, sep in enumerate(separators):
+            if sep == "":
+                separator = sep
+                break
+            if text.find(sep, start, end) != -1:
+                separator = sep
+                remaining = separators[i + 1:]
+                break
+
+        chunks: List[Span] = []
+        good: List[Span] = []
+        for piece in self._pieces(text, start, end, separator):
+            if piece[1] - piece[0] < self.chunk_size:
+                good.append(piece)
+                continue
+            if good:
+                chunks.extend(self._merge(text, good))
+                good = []
+            if not remaining:
+                chunks.append(piece)
+            else:
+                chunks.extend(self._split(text, piece[0], piece[1], remaining))
+        if good:
+            chunks.extend(self._merge(text, good))
+        return chunks
+
+    @staticmethod
+    def _pieces(text: str, start: int, end: int, separator: str) -> Iterable[Span]:
+        """Split points at each separator occurrence, separator kept at the start of the next piece."""
+        if separator == "":
+            return ((i, i + 1) for i in range(start, end))
+        pieces: List[Span] = []
+        prev = start
+        step = len(separator)
+        pos = text.find(separator, start, end)
+        while pos != -1:
+            if pos > prev:
+                pieces.append((prev, pos))
+            prev = pos
+            pos = text.find(separator, pos + step, end)
+        if end > prev:
+            pieces.append((prev, end))
+        return pieces
+
+    def _merge(self, text: str, pieces: List[Span]) -> List[Span]:
+        """Greedy merge of contiguous pieces into chunks with overlap."""
+        spans: List[Span] = []
+        window: List[Span] = []
+        total = 0
+        for piece in pieces:
+            length = piece[1] - piece[0]
+            if total + length > self.chunk_size and window:
+                span = _strip_span(text, window[0][0], window[-1][1])
+                if span is not None:
+                    spans.append(span)
+                while total > self.chunk_overlap or (total + length > self.chunk_size and total > 0):
+                    total -= window[0][1] - window[0][0]
+                    window.pop(0)
+            window.append(piece)
+            total += length
+        if window:
+            span = _strip_span(text, window[0][0], window[-1][1])
+            if span is not None:
+                spans.append(span)
+        return spans
+
+
+def _strip_span(text: str, start: int, end: int) -> Optional[Span]:
+    """Narrow a span to exclude leading/trailing whitespace; None if it is all whitespace."""
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return (start, end) if end > start else None
+
+
+class MappedText:
+    """Text derived from a source string, with a map back to source positions.
+
+    Pieces are ``(text_start, source_start, length, verbatim)``: verbatim
+    pieces were copied from the source (positions map one-to-one), synthetic
+    ones (e.g. regex replacements) map entirely to ``source_start``.
+    """
+
+    def __init__(self, text: str, pieces: List[Tuple[int, int, int, bool]]) -> None:
+        self.text = text
+        self.pieces = pieces
+        self._starts = [p[0] for p in pieces]
+
+    @classmethod
+    def from_source(cls, source: str, offset: int = 0) -> "MappedText":
+        return cls(source, [(0, offset, len(source), True)] if source else [])
+
+    @classmethod
+    def build(cls, parts: Iterable[Tuple[str, int, bool]]) -> "MappedText":
+        """Concatenate ``(text, source_start, verbatim)`` parts."""
+        chunks: List[str] = []
+        pieces: List[Tuple[int, int, int, bool]] = []
+        pos = 0
+        for text, source_start, verbatim in parts:
+            if not text:
+                continue
+            chunks.append(text)
+            pieces.append((pos, source_start, len(text), verbatim))
+            pos += len(text)
+        return cls("".join(chunks), pieces)
+
+    def __len__(self) -> int:
+        return len(self.text)
+
+    def source_pos(self, pos: int) -> int:
+        """Source position of character ``pos`` (clamped to the text)."""
+        if not self.pieces:
+            return -1
+        pos = min(max(pos, 0), max(len(self.text) - 1, 0))
+        i = bisect_right(self._starts, pos) - 1
+        text_start, source_start, _, verbatim = self.pieces[i]
+        return source_start + (pos - text_start) if verbatim else source_start
+
+    def source_span(self, start: int, end: int) -> Span:
+        """Source span covering ``text[start:end]``."""
+        if not self.pieces or end <= start:
+            return (-1, -1)
+        return self.source_pos(start), self.source_pos(end - 1) + 1
+
+    def _parts_between(self, start: int, end: int) -> List[Tuple[str, int, bool]]:
+        parts: List[Tuple[str, int, bool]] = []
+        i = max(bisect_right(self._starts, start) - 1, 0)
+        while i < len(self.pieces) and start < end:
+            text_start, source_start, length, verbatim = self.pieces[i]
+            piece_end = text_start + length
+            if piece_end > start:
+                take_end = min(piece_end, end)
+                src = source_start + (start - text_start) if verbatim else source_start
+                parts.append((self.text[start:take_end], src, verbatim))
+                start = take_end
+            i += 1
+        return parts
+
+    def sub(self, pattern: Union[str, Pattern[str]], repl: str) -> "MappedText":
+        """``re.sub`` with a literal replacement, keeping the source map."""
+        regex = re.compile(pattern) if isinstance(pattern, str) else pattern
+        parts: List[Tuple[str, int, bool]] = []
+        prev = 0
+        for match in regex.finditer(self.text):
+            parts.extend(self._parts_between(prev, match.start()))
+            if repl:
+                parts.append((repl, self.source_pos(match.start()), False))
+            prev = match.end()
+        if prev == 0 and not parts:
+            return self
+        parts.extend(self._parts_between(prev, len(self.text)))
+        return MappedText.build(parts)
+
+    def slice(self, start: int, end: int) -> "MappedText":
+        return MappedText.build(self._parts_between(start, end))
+
+    def strip(self) -> "MappedText":
+        span = _strip_span(self.text, 0, len(self.text))
+        if span is None:
+            return MappedText("", [])
+        if span == (0, len(self.text)):
+            return self
+        return self.slice(*span)
+
+
+__all__ = ["DEFAULT_SEPARATORS", "MappedText", "RecursiveSpanSplitter", "Span"]
@@ -6,10 +6,12 @@ pipeline and agent code paths share consistent behavior and logging.
 
 from __future__ import annotations
 
+from collections import Counter
 import csv
+import io
 import os
 import logging
-from typing import List, Tuple, Optional
+from typing import Iterator, List, Tuple, Optional
 
 
 logger = logging.getLogger("knowledgeAgent.tabular.tools")
@@ -74,12 +76,63 @@ def _emit_preview(header: str, body: str) -> None:
         pass
 
 
+# Head of the file used for delimiter detection (covers the ~50 rows scored below)
+SNIFF_HEAD_CHARS = 64 * 1024
+
+
+def sniff_delimiter(text: str, sample_size: int = 2048) -> str:
+    """Pick a delimiter for CSV text (typically the head of a file).
+
+    Candidates are scored by how consistently they split the first ~50
+    rows; ``csv.Sniffer`` on the first ``sample_size`` chars is the fallback.
+    """
+    sniffer_choice = None
+    try:
+        sniffer_choice = csv.Sniffer().sniff(text[:sample_size])
+    except Exception:
+        sniffer_choice = None
+    # Log a short, sanitized snippet of the sample for debugging
+    if _should_log_preview():
+        try:
+            snippet = (text[:sample_size] or "")[: _PREVIEW_STR_MAX]
+            safe = snippet.replace("\r", "\\r").replace("\n", "\\n")
+            _emit_preview("[tools] sniff_csv sample (first %d chars): %s" % (len(snippet), safe), "")
+        except Exception:
+            pass
+    # Try candidates and pick the most stable by column count across first N rows
+    candidates = [',', '\t', ';', '|']
+    best = (',', -1)
+    for d in candidates:
+        # Score this delimiter by consistency of columns across first ~50 rows
+        reader = csv.reader(io.StringIO(text, newline=""), delimiter=d)
+        cols = []
+        try:
+            for i, row in enumerate(reader):
+                cols.append(len(row))
+                if i >= 50:
+                    break
+        except Exception:
+            cols = []
+        score = 0
+        if cols:
+            c = Counter(cols)
+            mode_ct = max(c.values())
+            score = mode_ct  # higher is better
+        if score > best[1]:
+            best = (d, score)
+    # Compare sniffer vs best candidate; prefer best if it has a positive score
+    if best[1] > 0:
+        return best[0]
+    return getattr(sniffer_choice, 'delimiter', None) or ','
+
+
 def sniff_csv(path: str, sample_size: int = 2048, *, delimiter: Optional[str] = None):
     """Detect a CSV delimiter using a small sample.
 
     Returns a simple value representing the delimiter (a string), instead of
     defining a csv.Dialect subclass. This keeps usage simple and avoids scope
-    issues in class bodies.
+    issues in class bodies. The file head is read once; see ``CsvSource`` to
+    also reuse it for headers and sample rows.
     """
     logger.info("[tools] sniff_csv start path=%s sample_size=%d", path, sample_size)
     if not os.path.exists(path):
@@ -88,49 +141,8 @@ def sniff_csv(path: str, sample_size: int = 2048, *, delimiter: Optional[str] =
         delim = delimiter
     else:
         with open(path, "r", encoding="utf-8", newline="") as f:
-            sample = f.read(sample_size)
-            f.seek(0)
-            sniffer_choice = None
-            try:
-                sniffer_choice = csv.Sniffer().sniff(sample)
-            except Exception:
-                sniffer_choice = None
-            # Log a short, sanitized snippet of the sample for debugging
-            if _should_log_preview():
-                try:
-                    snippet = (sample or "")[: _PREVIEW_STR_MAX]
-                    safe = snippet.replace("\r", "\\r").replace("\n", "\\n")
-                    _emit_preview("[tools] sniff_csv sample (first %d chars): %s" % (len(snippet), safe), "")
-                except Exception:
-                    pass
-            # Try candidates and pick the most stable by column count across first N rows
-            candidates = [',', '\t', ';', '|']
-            best = (',', -1)
-            for d in candidates:
-                # Score this delimiter by consistency of columns across first ~50 rows
-                f.seek(0)
-                reader = csv.reader(f, delimiter=d)
-                cols = []
-                try:
-                    for i, row in enumerate(reader):
-                        cols.append(len(row))
-                        if i >= 50:
-                            break
-                except Exception:
-                    cols = []
-                score = 0
-                if cols:
-                    from collections import Counter
-                    c = Counter(cols)
-                    mode_ct = max(c.values())
-                    score = mode_ct  # higher is better
-                if score > best[1]:
-                    best = (d, score)
-            # Compare sniffer vs best candidate; prefer best if it has a positive score
-            if best[1] > 0:
-                delim = best[0]
-            else:
-                delim = getattr(sniffer_choice, 'delimiter', None) or ','
+            head = f.read(max(sample_size, SNIFF_HEAD_CHARS))
+        delim = sniff_delimiter(head, sample_size)
     logger.info(
         "[tools] sniff_csv done delimiter='%s'",
         delim,
@@ -169,6 +181,18 @@ def read_rows(path: str, dialect, limit: int = 1000) -> List[List[str]]:
     return rows
 
 
+def iter_rows(path: str, dialect) -> Iterator[List[str]]:
+    """Lazily yield every row (header first) using a provided dialect.
+
+    Unlike ``read_rows`` nothing is buffered, so whole-file passes run in
+    constant memory.
+    """
+    delim = dialect if isinstance(dialect, str) else (getattr(dialect, "delimiter", ",") or ",")
+    logger.info("[tools] iter_rows start path=%s delimiter='%s'", path, delim)
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        yield from csv.reader(f, delimiter=delim)
+
+
 def read_headers_and_sample(path: str, sample_rows: int = 30, *, delimiter: Optional[str] = None) -> Tuple[List[str], List[List[str]], str]:
     """Convenience: returns (headers, data_rows_sample, delimiter)."""
     logger.info("[tools] read_headers_and_sample start path=%s sample_rows=%d", path, sample_rows)
@@ -197,6 +221,8 @@ def read_headers_and_sample(path: str, sample_rows: int = 30, *, delimiter: Opti
 
 __all__ = [
     "sniff_csv",
+    "sniff_delimiter",
     "read_rows",
+    "iter_rows",
     "read_headers_and_sample",
 ]
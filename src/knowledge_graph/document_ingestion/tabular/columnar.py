@@ -0,0 +1,176 @@
+"""Columnar (Parquet / Arrow IPC / Feather) sources for the tabular pipeline.
+
+``ColumnarSource`` mirrors the ``CsvSource`` interface (``headers``,
+``delimiter``, ``encoding``, ``sample``, ``rows``) so the profile, agent,
+mapping and transform steps run unchanged on warehouse exports, without a
+CSV round-trip:
+
+- the schema, row count and a sample come from the file metadata and the
+  first record batch;
+- ``rows()`` reads record batches and turns each column into strings with
+  one vectorized cast (nulls become ``""``, as empty CSV cells);
+- ``select(columns)`` narrows the source to the columns the mapping reads,
+  so the transform only decodes those (Parquet column pruning; Arrow / Feather
+  files are memory-mapped and unselected columns are never touched).
+
+``open_source`` picks the source class from the file extension.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field, replace
+from itertools import islice
+import logging
+import os
+from typing import Iterable, Iterator, List, Optional, Union
+
+from .source import CsvSource
+
+try:  # Optional dependency for columnar input
+    import pyarrow as pa  # type: ignore
+    import pyarrow.compute as pc  # type: ignore
+    import pyarrow.ipc as ipc  # type: ignore
+    import pyarrow.parquet as pq  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+
+logger = logging.getLogger("knowledgeAgent.pipeline.csv.columnar")
+
+PARQUET_EXTENSIONS = (".parquet", ".pq")
+ARROW_EXTENSIONS = (".arrow", ".feather", ".ipc")
+COLUMNAR_EXTENSIONS = PARQUET_EXTENSIONS + ARROW_EXTENSIONS
+
+# Rows per record batch read from Parquet
+DEFAULT_BATCH_ROWS = 64 * 1024
+
+
+def is_columnar(path: str) -> bool:
+    return os.path.splitext(path)[1].lower() in COLUMNAR_EXTENSIONS
+
+
+def _require_pyarrow() -> None:
+    if pa is None:
+        raise ImportError("pyarrow is required to ingest Parquet/Arrow/Feather files (pip install pyarrow)")
+
+
+def _string_columns(batch: "pa.RecordBatch") -> List[List[str]]:
+    """One list of strings per column of ``batch``."""
+    out: List[List[str]] = []
+    for array in batch.columns:
+        if not (pa.types.is_string(array.type) or pa.types.is_large_string(array.type)):
+            try:
+                array = pc.cast(array, pa.string())
+            except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+                # Nested / binary types have no string cast; fall back to Python values
+                out.append(["" if v is None else str(v) for v in array.to_pylist()])
+                continue
+        out.append(pc.fill_null(array, "").to_pylist())
+    return out
+
+
+@dataclass
+class ColumnarSource:
+    """Parquet or Arrow IPC file exposed like a ``CsvSource``; rows are lists of strings."""
+
+    path: str
+    format: str
+    headers: List[str]
+    # None when the file does not record it (Arrow stream format)
+    num_rows: Optional[int]
+    size: int
+    sample_rows: List[List[str]] = field(default_factory=list)
+    sample_complete: bool = False
+    batch_rows: int = DEFAULT_BATCH_ROWS
+    # CsvSource compatibility: profiles and cached mappings record these
+    delimiter: str = ","
+    encoding: str = "utf-8"
+    data_offset: int = 0
+
+    @classmethod
+    def open(
+        cls,
+        path: str,
+        *,
+        sample_rows: int = 50,
+        batch_rows: int = DEFAULT_BATCH_ROWS,
+    ) -> "ColumnarSource":
+        _require_pyarrow()
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"File not found: {path}")
+        fmt = "parquet" if os.path.splitext(path)[1].lower() in PARQUET_EXTENSIONS else "arrow"
+        if fmt == "parquet":
+            meta = pq.ParquetFile(path).metadata
+            headers, num_rows = list(meta.schema.to_arrow_schema().names), meta.num_rows
+        else:
+            with pa.memory_map(path) as mm:
+                try:
+                    reader = ipc.open_file(mm)
+                    headers = list(reader.schema.names)
+                    num_rows = sum(reader.get_batch(i).num_rows for i in range(reader.num_record_batches))
+                except pa.ArrowInvalid:
+                    mm.seek(0)
+                    headers, num_rows = list(ipc.open_stream(mm).schema.names), None
+
+        source = cls(path=path, format=fmt, headers=headers, num_rows=num_rows, size=os.path.getsize(path), batch_rows=batch_rows)
+        # Small batches for the sample so only its rows are decoded
+        source.sample_rows = list(replace(source, batch_rows=sample_rows + 1).rows(limit=sample_rows + 1))
+        source.sample_complete = len(source.sample_rows) <= sample_rows
+        del source.sample_rows[sample_rows:]
+        logger.info(
+            "[source] opened path=%s format=%s columns=%d rows=%s",
+            path,
+            fmt,
+            len(headers),
+            num_rows if num_rows is not None else "?",
+        )
+        return source
+
+    def select(self, columns: Iterable[str]) -> "ColumnarSource":
+        """Source restricted to ``columns`` (file order; unknown names are ignored)."""
+        wanted = set(columns)
+        headers = [h for h in self.headers if h in wanted]
+        positions = [self.headers.index(h) for h in headers]
+        sample = [[row[i] for i in positions] for row in self.sample_rows]
+        return replace(self, headers=headers, sample_rows=sample)
+
+    def batches(self) -> Iterator[List[List[str]]]:
+        """String columns (in ``headers`` order) for each record batch."""
+        _require_pyarrow()
+        if self.format == "parquet":
+            parquet = pq.ParquetFile(self.path, memory_map=True)
+            for batch in parquet.iter_batches(batch_size=self.batch_rows, columns=self.headers):
+                yield _string_columns(batch)
+            return
+        with pa.memory_map(self.path) as mm:
+            try:
+                reader = ipc.open_file(mm)
+                batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+            except pa.ArrowInvalid:
+                mm.seek(0)
+                batches = iter(ipc.open_stream(mm))
+            for batch in batches:
+                yield _string_columns(batch.select(self.headers))
+
+    def rows(self, limit: Optional[int] = None) -> Iterator[List[str]]:
+        """Fresh lazy reader over the rows, one list of strings per row."""
+        rows = (list(row) for columns in self.batches() for row in zip(*columns))
+        yield from (islice(rows, limit) if limit is not None else rows)
+
+    def sample(self, n: int) -> List[List[str]]:
+        """First ``n`` rows, from the cached sample when it covers them."""
+        if n <= len(self.sample_rows) or self.sample_complete:
+            return self.sample_rows[:n]
+        return list(self.rows(limit=n))
+
+
+TabularSource = Union[CsvSource, ColumnarSource]
+
+
+def open_source(path: str, **kwargs) -> TabularSource:
+    """``ColumnarSource`` for Parquet / Arrow / Feather files, else ``CsvSource``."""
+    if is_columnar(path):
+        return ColumnarSource.open(path, sample_rows=kwargs.get("sample_rows", 50))
+    return CsvSource.open(path, **kwargs)
+
+
+__all__ = ["COLUMNAR_EXTENSIONS", "ColumnarSource", "TabularSource", "is_columnar", "open_source"]
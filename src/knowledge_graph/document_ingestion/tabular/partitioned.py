@@ -0,0 +1,189 @@
+"""Partitioned CSV -> KG transform across worker processes.
+
+A large CSV is split into byte-range partitions whose edges fall on record
+boundaries, each partition is transformed in a ``ProcessPoolExecutor`` worker
+with its own compiled ``MappingPlan``, and the per-partition entity
+accumulators and relation sets are reduced in partition order. The reducer
+applies the same keep-first-non-empty rule as the sequential transform
+(column-wise, see ``EntityAccumulator.merge``), so the result does not depend
+on worker scheduling and matches a single-process run.
+
+Record boundaries are found without parsing: a newline ends a record when the
+number of quote characters before it is even. This holds for RFC 4180 quoting
+(quotes only around fields, doubled inside them); files that use bare quote
+characters inside unquoted fields should use the sequential transform.
+
+Unlike the streaming transform, the reduced graph is held in memory until it
+is persisted: partitioned mode trades memory for cores.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+import csv
+import logging
+import os
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from knowledge_graph.agent.mapping_plan import EntityAccumulator, MappingPlan, Relation, merge_staged
+
+logger = logging.getLogger("knowledgeAgent.pipeline.csv.partitioned")
+
+DEFAULT_BLOCK_SIZE = 8 * 1024 * 1024
+
+
+@dataclass
+class PartitionResult:
+    entities: EntityAccumulator = field(default_factory=EntityAccumulator)
+    relations: Set[Relation] = field(default_factory=set)
+    rows: int = 0
+
+
+def record_boundaries(path: str, targets: Sequence[int], *, block_size: int = DEFAULT_BLOCK_SIZE) -> List[int]:
+    """Offset just past the first record-ending newline at or after each target.
+
+    Targets are processed in ascending order and each boundary is strictly
+    after the previous one; targets with no record end after them map to the
+    file size.
+    """
+    size = os.path.getsize(path)
+    pending = sorted(targets)
+    boundaries: List[int] = []
+    quotes = 0  # quote characters before the current block
+    pos = 0
+    with open(path, "rb") as f:
+        while pending:
+            block = f.read(block_size)
+            if not block:
+                break
+            block_end = pos + len(block)
+            while pending and pending[0] < block_end:
+                target = max(pending[0], boundaries[-1] if boundaries else 0, pos)
+                if target >= block_end:
+                    break
+                at = target - pos
+                q = quotes + block.count(b'"', 0, at)
+                nl = block.find(b"\n", at)
+                while nl != -1:
+                    q += block.count(b'"', at, nl)
+                    at = nl
+                    if q % 2 == 0:
+                        break
+                    nl = block.find(b"\n", nl + 1)
+                if nl == -1:
+                    # No record end in this block: resume the search in the next one
+                    pending[0] = block_end
+                    break
+                boundaries.append(pos + nl + 1)
+                pending.pop(0)
+            quotes += block.count(b'"')
+            pos = block_end
+    boundaries.extend(size for _ in pending)
+    return boundaries
+
+
+def partition_csv(
+    path: str,
+    partitions: int,
+    *,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    data_start: Optional[int] = None,
+) -> List[Tuple[int, int]]:
+    """Split the data records (after the header) into up to ``partitions`` byte ranges.
+
+    ``data_start`` is the offset of the first data record when already known
+    (``CsvSource.data_offset``); otherwise the header end is located here.
+    """
+    size = os.path.getsize(path)
+    if data_start is None:
+        data_start = record_boundaries(path, [0], block_size=block_size)[0]
+    span = size - data_start
+    partitions = max(1, int(partitions))
+    targets = [data_start + (span * k) // partitions for k in range(1, partitions)]
+    edges = [data_start] + record_boundaries(path, targets, block_size=block_size) + [size]
+    return [(start, end) for start, end in zip(edges, edges[1:]) if end > start]
+
+
+def _iter_lines(path: str, start: int, end: int, encoding: str) -> Iterator[str]:
+    with open(path, "rb") as f:
+        f.seek(start)
+        while f.tell() < end:
+            line = f.readline()
+            if not line:
+                break
+            yield line.decode(encoding)
+
+
+def transform_partition(
+    path: str,
+    start: int,
+    end: int,
+    mapping: Dict[str, Any],
+    headers: Sequence[str],
+    delimiter: str,
+    encoding: str = "utf-8",
+) -> PartitionResult:
+    """Transform the records in ``[start, end)`` (worker entry point)."""
+    plan = MappingPlan.compile(mapping, headers)
+    result = PartitionResult(entities=plan.accumulator())
+    for raw in csv.reader(_iter_lines(path, start, end, encoding), delimiter=delimiter):
+        plan.stage_row(plan.fit(raw), result.entities, result.relations)
+        result.rows += 1
+    return result
+
+
+def _transform_task(task: tuple) -> PartitionResult:
+    return transform_partition(*task)
+
+
+def reduce_partitions(results: Sequence[PartitionResult]) -> PartitionResult:
+    """Merge partition results in partition order (deterministic for any completion order)."""
+    merged = PartitionResult()
+    for result in results:
+        merge_staged(merged.entities, result.entities)
+        merged.relations |= result.relations
+        merged.rows += result.rows
+    return merged
+
+
+def transform_csv_partitioned(
+    path: str,
+    mapping: Dict[str, Any],
+    headers: Sequence[str],
+    dialect: Any,
+    *,
+    workers: int,
+    partitions: Optional[int] = None,
+    encoding: str = "utf-8",
+    data_start: Optional[int] = None,
+) -> PartitionResult:
+    """Transform a CSV with ``workers`` processes; returns the reduced result."""
+    delimiter = dialect if isinstance(dialect, str) else (getattr(dialect, "delimiter", ",") or ",")
+    ranges = partition_csv(path, partitions or workers, data_start=data_start)
+    tasks = [(path, start, end, mapping, list(headers), delimiter, encoding) for start, end in ranges]
+    logger.info("[partitioned] path=%s partitions=%d workers=%d", path, len(tasks), workers)
+    if len(tasks) <= 1 or workers <= 1:
+        results = [_transform_task(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            # map() yields in submission order, so the reduction order is fixed
+            results = list(pool.map(_transform_task, tasks))
+    merged = reduce_partitions(results)
+    logger.info(
+        "[partitioned] done rows=%d entities=%d relations=%d",
+        merged.rows,
+        len(merged.entities),
+        len(merged.relations),
+    )
+    return merged
+
+
+__all__ = [
+    "PartitionResult",
+    "partition_csv",
+    "record_boundaries",
+    "reduce_partitions",
+    "transform_csv_partitioned",
+    "transform_partition",
+]
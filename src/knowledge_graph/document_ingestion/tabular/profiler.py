@@ -0,0 +1,292 @@
+"""Single-pass, bounded-memory column profiler for CSV files.
+
+Every row is streamed once; each column keeps constant-size state:
+
+- distinct count: exact set up to ``exact_distinct_limit`` values, then a
+  HyperLogLog sketch (2**p registers, ~1.04/sqrt(2**p) relative error);
+- null (empty after strip) and non-null counts;
+- a type-inference state machine: candidate types are dropped as values
+  contradict them (integer -> float -> string, bool and date separately);
+- min/max (numeric when the column is numeric, else lexicographic), value
+  length min/max and a power-of-two length histogram;
+- a reservoir sample of non-null values (Algorithm R, seeded).
+
+The result fills ``ColumnStat`` for the CSV profile, giving key selection
+real cardinalities on files too large to load.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import hashlib
+import math
+import random
+import re
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set
+
+from ...data_structs.tabular import ColumnStat
+
+_DATE_PATTERNS = [
+    re.compile(r"^\d{4}-\d{2}-\d{2}$"),           # 2024-05-14
+    re.compile(r"^\d{2}/\d{2}/\d{4}$"),           # 05/14/2024
+    re.compile(r"^\d{4}/\d{2}/\d{2}$"),           # 2024/05/14
+    re.compile(r"^\d{2}-\d{2}-\d{4}$"),           # 14-05-2024
+]
+_BOOL_VALUES = {"true", "false", "t", "f", "yes", "no", "0", "1"}
+_NON_FINITE = {"nan", "inf", "+inf", "-inf", "infinity", "+infinity", "-infinity"}
+
+
+def _stable_hash64(value: str) -> int:
+    """64-bit hash that is stable across processes (unlike ``hash``)."""
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8", "surrogatepass"), digest_size=8).digest(), "big")
+
+
+class HyperLogLog:
+    """HyperLogLog cardinality sketch with small-range (linear counting) correction."""
+
+    def __init__(self, p: int = 12) -> None:
+        if not 4 <= p <= 18:
+            raise ValueError(f"HyperLogLog precision must be in [4, 18], got {p}")
+        self.p = p
+        self.m = 1 << p
+        self.registers = bytearray(self.m)
+        self._rest_bits = 64 - p
+
+    def add(self, value: str) -> None:
+        self.add_hash(_stable_hash64(value))
+
+    def add_hash(self, h: int) -> None:
+        idx = h >> self._rest_bits
+        rest = h & ((1 << self._rest_bits) - 1)
+        rank = self._rest_bits - rest.bit_length() + 1
+        if rank > self.registers[idx]:
+            self.registers[idx] = rank
+
+    def merge(self, other: "HyperLogLog") -> None:
+        if other.p != self.p:
+            raise ValueError("Cannot merge HyperLogLog sketches with different precision")
+        self.registers = bytearray(max(a, b) for a, b in zip(self.registers, other.registers))
+
+    def estimate(self) -> int:
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m) if m >= 128 else {16: 0.673, 32: 0.697, 64: 0.709}[m]
+        raw = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if raw <= 2.5 * m and zeros:
+            return int(round(m * math.log(m / zeros)))
+        return int(round(raw))
+
+
+class DistinctCounter:
+    """Exact distinct count for small columns, HyperLogLog beyond ``exact_limit`` values."""
+
+    def __init__(self, exact_limit: int = 10_000, p: int = 12) -> None:
+        self.exact_limit = exact_limit
+        self.p = p
+        self._exact: Optional[Set[str]] = set()
+        self._sketch: Optional[HyperLogLog] = None
+
+    @property
+    def exact(self) -> bool:
+        return self._exact is not None
+
+    def add(self, value: str) -> None:
+        if self._exact is not None:
+            self._exact.add(value)
+            if len(self._exact) <= self.exact_limit:
+                return
+            self._sketch = HyperLogLog(self.p)
+            for seen in self._exact:
+                self._sketch.add(seen)
+            self._exact = None
+            return
+        self._sketch.add(value)
+
+    def count(self) -> int:
+        return len(self._exact) if self._exact is not None else self._sketch.estimate()
+
+
+class TypeInference:
+    """Narrowing type state machine; ``inferred`` follows integer > float > bool > date > string."""
+
+    __slots__ = ("integer", "float", "bool", "date", "seen")
+
+    def __init__(self) -> None:
+        self.integer = self.float = self.bool = self.date = True
+        self.seen = False
+
+    def observe(self, value: str) -> None:
+        self.seen = True
+        if self.integer:
+            try:
+                int(value)
+            except ValueError:
+                self.integer = False
+        if self.float and not self.integer:
+            try:
+                float(value)
+                self.float = value.lower() not in _NON_FINITE
+            except ValueError:
+                self.float = False
+        if self.bool and value.lower() not in _BOOL_VALUES:
+            self.bool = False
+        if self.date and not any(rx.match(value) for rx in _DATE_PATTERNS):
+            self.date = False
+
+    @property
+    def inferred(self) -> str:
+        if not self.seen:
+            return "string"
+        for name in ("integer", "float", "bool", "date"):
+            if getattr(self, name):
+                return name
+        return "string"
+
+
+def _length_bucket(length: int) -> str:
+    """Power-of-two bucket label: 0, 1, 2-3, 4-7, ..."""
+    if length < 2:
+        return str(length)
+    low = 1 << (length.bit_length() - 1)
+    return f"{low}-{2 * low - 1}"
+
+
+class ColumnProfiler:
+    """Constant-memory statistics for one column."""
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        reservoir_size: int = 20,
+        exact_distinct_limit: int = 10_000,
+        hll_precision: int = 12,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        self.name = name
+        self.non_null = 0
+        self.nulls = 0
+        self.distinct = DistinctCounter(exact_distinct_limit, hll_precision)
+        self.types = TypeInference()
+        self.min_str: Optional[str] = None
+        self.max_str: Optional[str] = None
+        self.min_num: Optional[float] = None
+        self.max_num: Optional[float] = None
+        self.min_length: Optional[int] = None
+        self.max_length: Optional[int] = None
+        self.length_histogram: Dict[str, int] = {}
+        self.examples: List[str] = []
+        self.reservoir: List[str] = []
+        self.reservoir_size = reservoir_size
+        self._rng = rng or random.Random(0)
+
+    def add(self, raw: Optional[str]) -> None:
+        value = (raw or "").strip()
+        if not value:
+            self.nulls += 1
+            return
+        self.non_null += 1
+        self.distinct.add(value)
+        types = self.types
+        types.observe(value)
+        if types.float or types.integer:
+            number = float(value)
+            if self.min_num is None or number < self.min_num:
+                self.min_num = number
+            if self.max_num is None or number > self.max_num:
+                self.max_num = number
+        if self.min_str is None or value < self.min_str:
+            self.min_str = value
+        if self.max_str is None or value > self.max_str:
+            self.max_str = value
+
+        length = len(value)
+        if self.min_length is None or length < self.min_length:
+            self.min_length = length
+        if self.max_length is None or length > self.max_length:
+            self.max_length = length
+        bucket = _length_bucket(length)
+        self.length_histogram[bucket] = self.length_histogram.get(bucket, 0) + 1
+
+        if len(self.examples) < 3 and value not in self.examples:
+            self.examples.append(value)
+        if len(self.reservoir) < self.reservoir_size:
+            self.reservoir.append(value)
+        else:
+            slot = self._rng.randrange(self.non_null)
+            if slot < self.reservoir_size:
+                self.reservoir[slot] = value
+
+    def to_column_stat(self) -> ColumnStat:
+        inferred = self.types.inferred
+        numeric = inferred in ("integer", "float")
+        min_value: Any = self.min_str
+        max_value: Any = self.max_str
+        if numeric and self.min_num is not None:
+            min_value, max_value = self.min_num, self.max_num
+            if inferred == "integer":
+                min_value, max_value = int(min_value), int(max_value)
+        return ColumnStat(
+            name=self.name,
+            non_null=self.non_null,
+            nulls=self.nulls,
+            # An HLL estimate can overshoot the number of values it saw
+            distinct=min(self.distinct.count(), self.non_null),
+            inferred_type=inferred,
+            example_values=list(self.examples),
+            distinct_exact=self.distinct.exact,
+            min_value=min_value,
+            max_value=max_value,
+            min_length=self.min_length,
+            max_length=self.max_length,
+            length_histogram=dict(self.length_histogram),
+            sample_values=list(self.reservoir),
+        )
+
+
+@dataclass
+class TableProfile:
+    rows: int = 0
+    columns: List[ColumnStat] = field(default_factory=list)
+
+
+def profile_rows(
+    headers: Sequence[str],
+    rows: Iterable[Sequence[str]],
+    *,
+    reservoir_size: int = 20,
+    exact_distinct_limit: int = 10_000,
+    hll_precision: int = 12,
+    seed: int = 0,
+) -> TableProfile:
+    """Profile data rows (header excluded) in one pass; rows are padded/truncated to the headers."""
+    rng = random.Random(seed)
+    profilers = [
+        ColumnProfiler(
+            str(name),
+            reservoir_size=reservoir_size,
+            exact_distinct_limit=exact_distinct_limit,
+            hll_precision=hll_precision,
+            rng=rng,
+        )
+        for name in headers
+    ]
+    width = len(profilers)
+    count = 0
+    for row in rows:
+        count += 1
+        for profiler, value in zip(profilers, row):
+            profiler.add(value)
+        for profiler in profilers[len(row):width]:
+            profiler.add("")
+    return TableProfile(rows=count, columns=[p.to_column_stat() for p in profilers])
+
+
+__all__ = [
+    "ColumnProfiler",
+    "DistinctCounter",
+    "HyperLogLog",
+    "TableProfile",
+    "TypeInference",
+    "profile_rows",
+]
@@ -0,0 +1,183 @@
+"""Per-entity-type projection of staged CSV entities into graph records.
+
+Which column labels an entity and which columns become its properties depend
+only on the entity type (its mapped attributes and their ontology
+definitions), not on the entity. ``EntityProjection.compile`` runs the label
+heuristic once per type; ``project`` then applies it column by column to
+every staged entity of that type in an ``EntityAccumulator``.
+
+Label choice, in order (first non-empty, stripped value wins):
+
+1. the highest-priority label candidate (name/title/label attribute, then
+   ontology description, display-like names, string-typed attributes, any
+   non-ID non-numeric attribute);
+2. any non-ID attribute, in mapping order;
+3. the first mapped attribute (even an ID);
+
+falling back to the entity id. Properties are the mapped attributes with a
+non-empty value.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from knowledge_graph.agent.mapping_plan import EntityAccumulator
+
+logger = logging.getLogger("knowledgeAgent.pipeline.csv.projection")
+
+_NO_LABEL = 999
+
+
+def _label_priority(attr_name: str, attr_def: Dict[str, Any]) -> int:
+    """Rank an attribute as a label source (lower is better, ``_NO_LABEL`` = never)."""
+    attr_type = str(attr_def.get("type", "") or "").lower()
+    description = str(attr_def.get("description", "") or "").lower()
+    if any(kw in attr_name for kw in ("name", "title", "label")):
+        return 1
+    if any(kw in description for kw in ("name", "label", "display", "title", "identifier")):
+        return 2
+    if any(kw in attr_name for kw in ("display", "description", "full_name")):
+        return 3
+    if attr_type == "string" and not attr_name.endswith("_id") and "date" not in attr_name:
+        return 4
+    if not attr_name.endswith("_id") and attr_type not in ("integer", "float", "date", "datetime"):
+        return 5
+    return _NO_LABEL
+
+
+def ontology_entities_by_name(ontology_spec: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Map entity name -> ontology entity definition (list or dict ``entities``)."""
+    entities = (ontology_spec or {}).get("entities", [])
+    if isinstance(entities, dict):
+        return entities
+    out: Dict[str, Any] = {}
+    for entity in entities if isinstance(entities, list) else []:
+        if isinstance(entity, dict) and entity.get("name"):
+            out[entity["name"]] = entity
+    return out
+
+
+@dataclass(frozen=True)
+class EntityProjection:
+    """Label and property columns for one entity type."""
+
+    entity_type: str
+    # Columns tried in order for the label
+    label_columns: Tuple[str, ...]
+    # (property name, column) for each mapped attribute
+    properties: Tuple[Tuple[str, str], ...]
+
+    @classmethod
+    def compile(
+        cls,
+        entity_name: str,
+        entity_spec: Dict[str, Any],
+        ontology_entity: Dict[str, Any],
+        available: Iterable[str],
+    ) -> "EntityProjection":
+        """Resolve the label order and properties for ``entity_name`` against the columns in ``available``."""
+        available = set(available)
+        attributes = [a for a in (entity_spec.get("attributes", []) or []) if isinstance(a, dict)]
+        attr_defs = {
+            str(oa.get("name", "")).lower(): oa
+            for oa in (ontology_entity.get("attributes", []) or [])
+            if isinstance(oa, dict) and oa.get("name")
+        }
+
+        best: Optional[Tuple[int, str]] = None
+        for attr in attributes:
+            column = attr.get("column")
+            if not column:
+                continue
+            attr_name = str(attr.get("name", "")).lower()
+            priority = _label_priority(attr_name, attr_defs.get(attr_name, {}))
+            if priority < _NO_LABEL and (best is None or priority < best[0]):
+                best = (priority, column)
+
+        order: List[str] = [best[1]] if best else []
+        order += [a.get("column") for a in attributes if not str(a.get("name", "")).lower().endswith("_id")]
+        if attributes:
+            order.append(attributes[0].get("column"))
+        label_columns: List[str] = []
+        for column in order:
+            if column and column in available and column not in label_columns:
+                label_columns.append(column)
+
+        properties = tuple(
+            (str(a.get("name", "")), a["column"]) for a in attributes if a.get("column") in available
+        )
+        return cls(
+            entity_type=entity_name.lower() if entity_name else "concept",
+            label_columns=tuple(label_columns),
+            properties=properties,
+        )
+
+    def project(self, node_ids: Sequence[str], columns: Dict[str, Sequence[str]]) -> List[Dict[str, Any]]:
+        """Graph records for ``node_ids`` given their column values (one sequence per column)."""
+        labels = list(node_ids)
+        pending = range(len(node_ids))
+        for column in self.label_columns:
+            values = columns[column]
+            unresolved = []
+            for slot in pending:
+                value = values[slot].strip()
+                if value:
+                    labels[slot] = value
+                else:
+                    unresolved.append(slot)
+            pending = unresolved
+            if not pending:
+                break
+
+        props = [(name, columns[column]) for name, column in self.properties]
+        entity_type = self.entity_type
+        return [
+            {
+                "id": node_id,
+                "type": entity_type,
+                "label": labels[slot],
+                "properties": {name: values[slot] for name, values in props if values[slot]},
+            }
+            for slot, node_id in enumerate(node_ids)
+        ]
+
+
+class GraphProjector:
+    """Projects an ``EntityAccumulator`` into graph records, compiling one ``EntityProjection`` per type."""
+
+    def __init__(self, mapping_entities: Dict[str, Any], ontology_spec: Optional[Dict[str, Any]] = None) -> None:
+        self._mapping_entities = mapping_entities
+        self._ontology_entities = ontology_entities_by_name(ontology_spec)
+        self._projections: Dict[Tuple[str, Tuple[str, ...]], EntityProjection] = {}
+
+    def projection(self, entity_name: str, columns: Sequence[str]) -> EntityProjection:
+        key = (entity_name, tuple(columns))
+        projection = self._projections.get(key)
+        if projection is None:
+            projection = EntityProjection.compile(
+                entity_name,
+                self._mapping_entities.get(entity_name, {}) or {},
+                self._ontology_entities.get(entity_name, {}) or {},
+                columns,
+            )
+            if not projection.label_columns:
+                logger.warning("Entity type '%s': no label column among %s; ids are used as labels", entity_name, list(columns))
+            if not projection.properties:
+                logger.warning("Entity type '%s': no mapped attribute columns; entities have no properties", entity_name)
+            self._projections[key] = projection
+        return projection
+
+    def records(self, staged: EntityAccumulator) -> List[Dict[str, Any]]:
+        """Graph records for every staged entity, sorted by id."""
+        records: List[Dict[str, Any]] = []
+        for t in staged.types():
+            projection = self.projection(t.name, t.columns)
+            records.extend(projection.project(t.node_ids, dict(zip(t.columns, t.values))))
+        records.sort(key=lambda record: record["id"])
+        return records
+
+
+__all__ = ["EntityProjection", "GraphProjector", "ontology_entities_by_name"]
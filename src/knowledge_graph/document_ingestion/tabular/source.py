@@ -0,0 +1,166 @@
+"""Per-document CSV source: sniff once, stream many times.
+
+``CsvSource.open`` reads the head of the file once and derives everything the
+tabular steps used to recompute independently (each with its own file pass):
+
+- the encoding (``utf-8-sig`` when a BOM is present, else ``utf-8`` when the
+  head decodes, else ``latin-1``);
+- the delimiter (``sniff_delimiter`` over the head);
+- the header row and the byte offset of the first data record;
+- a sample of leading data rows.
+
+``rows()`` then hands out fresh, lazy readers that seek straight to the first
+data record, so whole-file passes (profiling, transform) never re-read or
+re-parse the header, and ``data_offset`` lets byte-range partitioning start
+from the same position.
+
+The header end is found by quote parity (a newline ends a record when the
+number of quote characters before it is even), the same rule the partitioned
+transform uses for its record boundaries.
+"""
+
+from __future__ import annotations
+
+import codecs
+import csv
+from dataclasses import dataclass, field
+import io
+from itertools import islice
+import logging
+import os
+from typing import Iterator, List, Optional
+
+from .agents_tools import sniff_delimiter
+
+logger = logging.getLogger("knowledgeAgent.pipeline.csv.source")
+
+# Bytes read up front; large enough for delimiter scoring and a sample of rows
+HEAD_BYTES = 256 * 1024
+
+
+def _record_ends(data: bytes, start: int = 0) -> Iterator[int]:
+    """Offsets just past each record-ending newline in ``data[start:]``."""
+    quotes = 0
+    pos = start
+    nl = data.find(b"\n", pos)
+    while nl != -1:
+        quotes += data.count(b'"', pos, nl)
+        pos = nl
+        if quotes % 2 == 0:
+            yield nl + 1
+        nl = data.find(b"\n", nl + 1)
+
+
+def _detect_encoding(head: bytes) -> str:
+    if head.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    try:
+        # Incremental decode tolerates a multi-byte character cut at the end of the head
+        codecs.getincrementaldecoder("utf-8")().decode(head, final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        return "latin-1"
+
+
+@dataclass
+class CsvSource:
+    """Sniffed CSV file: headers, delimiter, encoding and data offset, with lazy row readers."""
+
+    path: str
+    delimiter: str
+    encoding: str
+    headers: List[str]
+    # Byte offset of the first data record (just past the header row)
+    data_offset: int
+    size: int
+    sample_rows: List[List[str]] = field(default_factory=list)
+    # True when ``sample_rows`` holds every data row of the file
+    sample_complete: bool = False
+
+    @classmethod
+    def open(
+        cls,
+        path: str,
+        *,
+        delimiter: Optional[str] = None,
+        sample_rows: int = 50,
+        head_bytes: int = HEAD_BYTES,
+    ) -> "CsvSource":
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"File not found: {path}")
+        size = os.path.getsize(path)
+        with open(path, "rb") as f:
+            head = f.read(head_bytes)
+        truncated = len(head) < size
+        encoding = _detect_encoding(head)
+        text_codec = "utf-8" if encoding == "utf-8-sig" else encoding
+        bom = len(codecs.BOM_UTF8) if encoding == "utf-8-sig" else 0
+
+        header_end = next(_record_ends(head, bom), None)
+        if header_end is None and truncated:
+            # Header row longer than the head: extend the read until it ends
+            with open(path, "rb") as f:
+                head = f.read()
+            truncated = False
+            header_end = next(_record_ends(head, bom), None)
+        if header_end is None:
+            header_end = len(head)
+
+        # Only complete records are parsed for the sample
+        sample_end = len(head)
+        if truncated:
+            sample_end = header_end
+            for sample_end in _record_ends(head, header_end):
+                pass
+
+        def decode(chunk: bytes) -> str:
+            return chunk.decode(text_codec, errors="replace")
+
+        delim = delimiter or sniff_delimiter(decode(head[bom:sample_end]))
+        header_rows = list(csv.reader(io.StringIO(decode(head[bom:header_end]), newline=""), delimiter=delim))
+        headers = header_rows[0] if header_rows else []
+        reader = csv.reader(io.StringIO(decode(head[header_end:sample_end]), newline=""), delimiter=delim)
+        sample = list(islice(reader, sample_rows + 1))
+        complete = not truncated and len(sample) <= sample_rows
+
+        source = cls(
+            path=path,
+            delimiter=delim,
+            encoding=encoding,
+            headers=headers,
+            data_offset=header_end,
+            size=size,
+            sample_rows=sample[:sample_rows],
+            sample_complete=complete,
+        )
+        logger.info(
+            "[source] opened path=%s delimiter='%s' encoding=%s columns=%d data_offset=%d",
+            path,
+            delim,
+            encoding,
+            len(headers),
+            header_end,
+        )
+        return source
+
+    @property
+    def data_encoding(self) -> str:
+        """Codec for bytes from ``data_offset`` on (the BOM is already behind it)."""
+        return "utf-8" if self.encoding == "utf-8-sig" else self.encoding
+
+    def rows(self, limit: Optional[int] = None) -> Iterator[List[str]]:
+        """Fresh lazy reader over the data rows (header excluded); the file opens on first use."""
+        with open(self.path, "rb") as raw:
+            raw.seek(self.data_offset)
+            with io.TextIOWrapper(raw, encoding=self.data_encoding, newline="") as text:
+                reader = csv.reader(text, delimiter=self.delimiter)
+                yield from (islice(reader, limit) if limit is not None else reader)
+
+    def sample(self, n: int) -> List[List[str]]:
+        """First ``n`` data rows, from the cached sample when it covers them."""
+        if n <= len(self.sample_rows) or self.sample_complete:
+            return self.sample_rows[:n]
+        return list(self.rows(limit=n))
+
+
+__all__ = ["CsvSource"]
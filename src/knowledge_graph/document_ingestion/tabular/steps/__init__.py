@@ -8,6 +8,7 @@ from .s5_compile_mapping_from_ontology import GenerateMappingFromOntologyStep
 from .s6_bind_attributes_from_ontology import BindAttributesFromOntologyStep
 from .s7_populate_missing_primary_keys import PopulateMissingPrimaryKeysStep
 from .s8_transform_and_persist_kg import TransformAndPersistKGStep
+from .reuse_cached_mapping import ReuseCachedMappingStep, CacheMappingStep
 __all__ = [
     "LoadCSVStep",
     "GenerateCsvProfileStep",
@@ -17,4 +18,6 @@ __all__ = [
     "GenerateMappingFromOntologyStep",
     "PopulateMissingPrimaryKeysStep",
     "TransformAndPersistKGStep",
+    "ReuseCachedMappingStep",
+    "CacheMappingStep",
 ]
@@ -0,0 +1,131 @@
+"""Reuse ontology + mapping across CSVs that share a schema.
+
+``ReuseCachedMappingStep`` runs right after profiling. It looks up
+``CSVProfile.schema_fingerprint()`` (normalized headers + delimiter + inferred
+column types) in ``csv_mappings``; on a hit it puts the cached ontology and
+mapping on the context and sets ``mapping_cache_hit`` so the agent analysis,
+ontology generation and mapping steps skip straight to the transform.
+
+``CacheMappingStep`` runs after the mapping is complete (keys populated) on a
+miss and stores it under the fingerprint for the next upload.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, List
+
+from ...document_pipeline import DocumentPipelineContext, PipelineStep
+from knowledge_graph.persistence.sqlite.sql_lite import get_sql_lite
+
+logger = logging.getLogger("knowledgeAgent.pipeline.csv.mapping_cache")
+
+
+def _norm_header(name: Any) -> str:
+    return " ".join(str(name).strip().lower().split())
+
+
+def rebind_columns(spec: Any, headers: List[str]) -> Any:
+    """Rewrite every ``column`` in a mapping spec to this file's spelling of the header.
+
+    The fingerprint matches on normalized headers, so a cached mapping may say
+    ``Employee_ID`` where the new file has ``employee_id``.
+    """
+    by_norm = {_norm_header(h): h for h in headers}
+
+    def rebind(node: Any) -> Any:
+        if isinstance(node, dict):
+            out = {k: rebind(v) for k, v in node.items()}
+            column = node.get("column")
+            if isinstance(column, str):
+                out["column"] = by_norm.get(_norm_header(column), column)
+            return out
+        if isinstance(node, list):
+            return [rebind(v) for v in node]
+        return node
+
+    return rebind(spec)
+
+
+def mapping_cache_hit(context: DocumentPipelineContext) -> bool:
+    """True when the ontology and mapping were reused from the fingerprint cache."""
+    return bool(getattr(context, "mapping_cache_hit", False))
+
+
+class ReuseCachedMappingStep(PipelineStep):
+    name = "reuse_cached_mapping"
+    inputs = ("document", "csv_profile")
+    outputs = ("mapping_cache_hit", "schema_fingerprint", "mapping_spec", "ontology_id", "ontology_specification")
+
+    def __init__(self, *, enabled: bool = True) -> None:
+        super().__init__(enabled=enabled)
+
+    def should_run(self, context: DocumentPipelineContext) -> bool:
+        return self.enabled and bool(getattr(context, "csv_profile", None))
+
+    def run(self, context: DocumentPipelineContext) -> DocumentPipelineContext:
+        profile = getattr(context, "csv_profile")
+        fingerprint = profile.schema_fingerprint()
+        setattr(context, "schema_fingerprint", fingerprint)
+
+        doc_repo = get_sql_lite().tabular_document_repository()
+        cached = doc_repo.find_csv_mapping_by_fingerprint(fingerprint)
+        if not cached:
+            logger.info("%s: no cached mapping for schema %s", getattr(context.document, "id", "-"), fingerprint)
+            context.results[self.name] = {"hit": False, "fingerprint": fingerprint}
+            return context
+
+        doc_repo.record_csv_mapping_hit(cached["mapping_id"])
+        setattr(context, "ontology_specification", cached["ontology_specification"])
+        setattr(context, "ontology_id", cached["ontology_id"])
+        setattr(context, "mapping_spec", rebind_columns(cached["mapping_spec"], profile.headers_original))
+        setattr(context, "mapping_cache_hit", True)
+        logger.info(
+            "%s: reusing mapping %s (ontology %s, from document %s) for schema %s",
+            getattr(context.document, "id", "-"),
+            cached["mapping_id"],
+            cached["ontology_id"],
+            cached["document_id"],
+            fingerprint,
+        )
+        context.results[self.name] = {
+            "hit": True,
+            "fingerprint": fingerprint,
+            "mapping_id": cached["mapping_id"],
+            "source_document_id": cached["document_id"],
+            "hit_count": cached["hit_count"] + 1,
+        }
+        return context
+
+
+class CacheMappingStep(PipelineStep):
+    name = "cache_mapping"
+    inputs = ("document", "mapping_cache_hit", "mapping_spec", "ontology_id", "schema_fingerprint")
+    outputs = ()
+    kind = "write"
+
+    def __init__(self, *, enabled: bool = True) -> None:
+        super().__init__(enabled=enabled)
+
+    def should_run(self, context: DocumentPipelineContext) -> bool:
+        return (
+            self.enabled
+            and not mapping_cache_hit(context)
+            and bool(getattr(context, "mapping_spec", None))
+            and getattr(context, "ontology_id", None) is not None
+            and bool(getattr(context, "schema_fingerprint", None))
+        )
+
+    def run(self, context: DocumentPipelineContext) -> DocumentPipelineContext:
+        document = context.ensure_document()
+        mapping: Dict[str, Any] = getattr(context, "mapping_spec")
+        fingerprint: str = getattr(context, "schema_fingerprint")
+
+        mapping_id = get_sql_lite().tabular_document_repository().save_csv_mapping(
+            ontology_id=int(getattr(context, "ontology_id")),
+            document_id=int(document.id),
+            mapping_spec=mapping,
+            schema_fingerprint=fingerprint,
+        )
+        context.results[self.name] = {"ok": mapping_id is not None, "mapping_id": mapping_id, "fingerprint": fingerprint}
+        return context
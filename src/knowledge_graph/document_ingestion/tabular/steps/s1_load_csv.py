@@ -3,7 +3,10 @@
 
 This is intentionally lightweight so you can run the pipeline end-to-end with
 just a single step. It does not parse or chunk the CSV; it only constructs the
-Document object with basic metadata filled in.
+Document object with basic metadata filled in. The file is sniffed once here
+(``CsvSource``, or ``ColumnarSource`` for Parquet / Arrow / Feather files):
+later steps reuse its delimiter, encoding, headers and sample
+and stream rows from it instead of re-opening and re-sniffing the file.
 """
 
 from __future__ import annotations
@@ -17,8 +20,10 @@ from ...document_pipeline import (
     PipelineStep,
 )
 from ....data_structs.document import DocumentNew
-from knowledge_graph.persistence.sqlite.sql_lite import SqlLite
-from knowledge_graph.settings.settings import get_settings
+from ..columnar import is_columnar, open_source
+from ...parse_cache import file_content_hash
+from knowledge_graph.persistence.sqlite.sql_lite import get_sql_lite
+from knowledge_graph.persistence.sqlite.core.ids import document_db_id, kb_db_id
 
 logger = logging.getLogger("knowledgeAgent.pipeline.load_csv")
 
@@ -27,6 +32,9 @@ class LoadCSVStep(PipelineStep):
     """Create a Document instance for a CSV file and attach it to context."""
 
     name = "load_csv"
+    inputs = ()
+    outputs = ("document", "csv_source", "csv_document")
+    kind = "cpu"
 
     def run(self, context: DocumentPipelineContext) -> DocumentPipelineContext:
         params = context.params
@@ -41,32 +49,18 @@ class LoadCSVStep(PipelineStep):
         filename = os.path.basename(file_path)
         title = os.path.splitext(filename)[0]
 
-        # Convert document_id to integer (or None for auto-increment)
-        doc_id_int = None
-        if document_id:
-            try:
-                doc_id_int = int(document_id)
-            except (ValueError, TypeError):
-                # If document_id is a string like "doc_xxx", generate a consistent int
-                doc_id_int = abs(hash(document_id)) % (10 ** 9)
-
-        # Convert kb_id to integer (required, default to 0 if None/invalid)
-        kb_id_int = 0
-        if kb_id:
-            try:
-                kb_id_int = int(kb_id)
-            except (ValueError, TypeError):
-                if isinstance(kb_id, str):
-                    try:
-                        kb_id_int = int(kb_id)
-                    except ValueError:
-                        kb_id_int = abs(hash(kb_id)) % (10 ** 9)
-                else:
-                    kb_id_int = 0
+        # Convert ids to integers: numeric ids pass through, string ids such as
+        # "doc_xxx" map to a stable 64-bit id (same value in every process)
+        doc_id_int = document_db_id(document_id) if document_id else None
+        kb_id_int = kb_db_id(kb_id)
 
         # Normalize file_type: remove leading dot and uppercase
         file_ext = os.path.splitext(filename)[1]  # Get extension with dot, e.g., ".csv"
         file_type_clean = file_ext.lstrip('.').upper() if file_ext else "CSV"  # "CSV"
+        if is_columnar(filename):
+            # documents.file_type only admits PDF/MD/TXT/CSV: columnar exports are
+            # tabular documents too (file_name keeps the real extension)
+            file_type_clean = "CSV"
 
 
         csv_doc = DocumentNew(
@@ -77,12 +71,12 @@ class LoadCSVStep(PipelineStep):
             file_path=file_path,
             file_type=file_type_clean,  # "CSV" not ".csv"
             file_size=file_size,
-            file_hash=None,
+            file_hash=file_content_hash(file_path),
             status="pending",
             processed_at=None,  # Will be set when processing completes
         )
 
-        sqlite = SqlLite(settings=get_settings())
+        sqlite = get_sql_lite()
         doc_repo = sqlite.document_repository()
         doc_repo.save_document(csv_doc)
 
@@ -90,11 +84,16 @@ class LoadCSVStep(PipelineStep):
         context.set_document(csv_doc)
         # Also expose the CSVDocument on context for tabular-aware steps
         setattr(context, "csv_document", csv_doc)
+        source = open_source(file_path)
+        setattr(context, "csv_source", source)
         context.results[self.name] = {
             "file": file_path,
             "document_id": document_id,
             "size_bytes": file_size,
             "type": csv_doc.file_type,
+            "delimiter": source.delimiter,
+            "encoding": source.encoding,
+            "file_hash": csv_doc.file_hash,
         }
         logger.info("Loaded CSV document %s (%d bytes)", filename, file_size)
         return context
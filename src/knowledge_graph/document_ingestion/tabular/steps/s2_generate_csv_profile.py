@@ -1,18 +1,23 @@
 """Build a lightweight CSVProfile (headers + delimiter + small sample).
 
 Kept minimal so mapping/agent steps have reliable headers and delimiter
-without doing heavy parsing at this stage.
+without doing heavy parsing at this stage. With ``full_profile`` (defaults
+to ``DBSettings.csv_full_profile``) the whole
+file is streamed once through the bounded-memory column profiler and
+``CSVProfile.columns`` carries per-column statistics (distinct estimates,
+nulls, inferred types, ranges, samples).
 """
 
 from __future__ import annotations
 
 import logging
-from typing import List
+from typing import List, Optional
 
 from ...document_pipeline import DocumentPipelineContext, PipelineStep
 from ....data_structs.tabular import CSVProfile, ColumnStat
-from ..agents_tools import sniff_csv, read_rows
-from knowledge_graph.persistence.sqlite.sql_lite import SqlLite
+from ..profiler import profile_rows
+from ..columnar import open_source
+from knowledge_graph.persistence.sqlite.sql_lite import get_sql_lite
 from knowledge_graph.settings.settings import get_settings
 from knowledge_graph.logging_utils import green
 
@@ -22,10 +27,14 @@ logger = logging.getLogger("knowledgeAgent.pipeline.csv.profile")
 
 class GenerateCsvProfileStep(PipelineStep):
     name = "generate_csv_profile"
+    inputs = ("document", "csv_source")
+    outputs = ("csv_profile", "csv_source")
+    kind = "cpu"
 
-    def __init__(self, *, sample_rows: int = 50, enabled: bool = True) -> None:
+    def __init__(self, *, sample_rows: int = 50, full_profile: Optional[bool] = None, enabled: bool = True) -> None:
         super().__init__(enabled=enabled)
         self.sample_rows = sample_rows
+        self.full_profile = full_profile
 
     def should_run(self, context: DocumentPipelineContext) -> bool:
         return self.enabled and context.document is not None
@@ -40,30 +49,37 @@ class GenerateCsvProfileStep(PipelineStep):
             logger.error("Document missing required ID. Cannot create CSV profile without document_id.")
             raise ValueError("Document must have an ID to create a CSV profile")
 
-        # Detect delimiter and read a small sample (header + data rows)
-        delim = sniff_csv(document.file_path)
-        rows = read_rows(document.file_path, delim, limit=self.sample_rows + 1)
-        headers: List[str] = rows[0] if rows else []
-        data_rows: List[List[str]] = rows[1:] if rows else []
+        # Delimiter, headers and sample come from the source sniffed at load time
+        source = getattr(context, "csv_source", None) or open_source(document.file_path, sample_rows=self.sample_rows)
+        delim = source.delimiter
+        headers: List[str] = source.headers
+        data_rows: List[List[str]] = source.sample(self.sample_rows)
 
         logger.debug(f"headers: {headers}")
         logger.debug(f"data_rows: {data_rows}")
         logger.debug(f"delim: {data_rows}")
 
+        columns: List[ColumnStat] = []
+        row_count = len(data_rows)
+        full_profile = bool(self.full_profile if self.full_profile is not None else get_settings().db.csv_full_profile)
+        if full_profile and headers:
+            table = profile_rows(headers, source.rows())
+            columns, row_count = table.columns, table.rows
+            logger.info(f"Profiled {row_count} rows x {len(columns)} columns for document_id={document.id}")
 
         profile = CSVProfile(
             document_id=document.id,  # Integer foreign key to documents table
             headers_original=headers,
             headers_normalized=[str(h).strip().lower() for h in headers],
             delimiter=delim or ",",
-            encoding="utf-8",
-            row_count_sampled=len(data_rows),
+            encoding=source.encoding,
+            row_count_sampled=row_count,
             column_count=len(headers),
-            columns=[],  # keep minimal for now
+            columns=columns,
             sample_rows=data_rows[: min(10, len(data_rows))],
             path_label=document.file_name,
         )
-        sqlite = SqlLite(settings=get_settings())
+        sqlite = get_sql_lite()
         doc_repo = sqlite.tabular_document_repository()
         logger.info(f"Saving CSV profile for document_id={document.id} to database")
         success = doc_repo.save_csv_profile(profile)
@@ -73,10 +89,12 @@ class GenerateCsvProfileStep(PipelineStep):
         logger.info(f"CSV profile saved successfully for document_id={document.id}")
 
         setattr(context, "csv_profile", profile)
+        setattr(context, "csv_source", source)
         context.results[self.name] = {
             "headers": len(headers),
-            "rows_sampled": len(data_rows),
+            "rows_sampled": row_count,
             "delimiter": profile.delimiter,
+            "full_profile": bool(columns),
         }
 
 
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import logging
 from ...document_pipeline import DocumentPipelineContext, PipelineStep
+from .reuse_cached_mapping import mapping_cache_hit
 from knowledge_graph.agent.agent import CsvAnalysisAgent
 from knowledge_graph.logging_utils import red
 logger = logging.getLogger("knowledgeAgent.pipeline.csv.agent_analyze")
@@ -12,11 +13,16 @@ import os
 
 class AnalyseCsvWithAgentStep(PipelineStep):
     name = "agent_analyze_csv"
+    inputs = ("document", "csv_profile", "csv_source", "mapping_cache_hit")
+    outputs = ("agent_analysis_text",)
 
     def __init__(self, *, sample_rows: int = 30, enabled: bool = True) -> None:
         super().__init__(enabled=enabled)
         self.sample_rows = sample_rows
 
+    def should_run(self, context: DocumentPipelineContext) -> bool:
+        return self.enabled and not mapping_cache_hit(context)
+
     def run(self, context: DocumentPipelineContext) -> DocumentPipelineContext:
         logger.info(green("--------------------------------- Step 3: Analyse CSV with Agent---------------------------------"))
         document = context.ensure_document()
@@ -29,6 +35,7 @@ class AnalyseCsvWithAgentStep(PipelineStep):
                 document.file_path,
                 sample_rows=self.sample_rows,
                 delimiter=delimiter,
+                source=getattr(context, "csv_source", None),
             )
             setattr(context, "agent_analysis_text", analysis_text)
 
@@ -8,8 +8,7 @@ from dataclasses import dataclass
 from typing import Dict, Any, Optional
 from ...document_pipeline import DocumentPipelineContext, PipelineStep
 from knowledge_graph.logging_utils import green
-from knowledge_graph.persistence.sqlite.sql_lite import SqlLite
-from knowledge_graph.settings.settings import get_settings
+from knowledge_graph.persistence.sqlite.sql_lite import get_sql_lite
 from knowledge_graph.logging_utils import green
 logger = logging.getLogger("knowledgeAgent.pipeline.csv.agent_analyze")
 
@@ -34,6 +33,8 @@ class DocumentOntology:
 
 class GenerateOntologyWithAgentStep(PipelineStep):
     name = "generate_ontology_with_agent"
+    inputs = ("document", "agent_analysis_text")
+    outputs = ("ontology_id", "ontology_specification")
 
     def should_run(self, context: DocumentPipelineContext) -> bool:
         return self.enabled and hasattr(context, "agent_analysis_text") and bool(getattr(context, "agent_analysis_text", None))
@@ -73,9 +74,11 @@ class GenerateOntologyWithAgentStep(PipelineStep):
                 is_canonical=False
             )
             
-            sqlite = SqlLite(settings=get_settings())
+            sqlite = get_sql_lite()
             doc_repo = sqlite.tabular_document_repository()
             saved_ontology = doc_repo.save_document_ontology(doc_ontology)
+            if saved_ontology is not None:
+                setattr(context, "ontology_id", saved_ontology.id)
             
         except Exception as exc:
             logger.exception(f"❌ [STEP 4] Generate ontology failed: {exc}")
@@ -12,6 +12,7 @@ import logging
 import json
 from typing import Dict, Any, List, Tuple
 from ...document_pipeline import DocumentPipelineContext, PipelineStep
+from .reuse_cached_mapping import mapping_cache_hit
 
 logger = logging.getLogger("knowledgeAgent.pipeline.csv.generate_mapping")
 
@@ -126,12 +127,15 @@ def _match_target_to_header(target_entity: str, headers_lc: List[str], attrs: Li
 
 class GenerateMappingFromOntologyStep(PipelineStep):
     name = "generate_mapping_from_ontology"
+    inputs = ("document", "mapping_cache_hit", "ontology_specification", "csv_profile")
+    outputs = ("mapping_spec",)
+    kind = "cpu"
 
     def __init__(self, *, enabled: bool = True) -> None:
         super().__init__(enabled=enabled)
 
     def should_run(self, context: DocumentPipelineContext) -> bool:
-        return self.enabled and bool(getattr(context, "ontology_specification", None))
+        return self.enabled and not mapping_cache_hit(context) and bool(getattr(context, "ontology_specification", None))
 
     def run(self, context: DocumentPipelineContext) -> DocumentPipelineContext:
         ontology: Dict[str, Any] = getattr(context, "ontology_specification", {}) or {}
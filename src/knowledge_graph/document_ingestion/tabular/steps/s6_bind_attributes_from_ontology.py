@@ -14,6 +14,7 @@ import logging
 from typing import Dict, Any, List
 import json
 from ...document_pipeline import DocumentPipelineContext, PipelineStep
+from .reuse_cached_mapping import mapping_cache_hit
 from knowledge_graph.logging_utils import green
 logger = logging.getLogger("knowledgeAgent.pipeline.csv.bind_attributes")
 
@@ -25,6 +26,9 @@ def _to_snake(name: str) -> str:
 
 class BindAttributesFromOntologyStep(PipelineStep):
     name = "bind_attributes_from_ontology"
+    inputs = ("document", "mapping_cache_hit", "ontology_specification", "mapping_spec", "csv_profile")
+    outputs = ("mapping_spec",)
+    kind = "cpu"
 
     def __init__(self, *, enabled: bool = True) -> None:
         super().__init__(enabled=enabled)
@@ -32,6 +36,7 @@ class BindAttributesFromOntologyStep(PipelineStep):
     def should_run(self, context: DocumentPipelineContext) -> bool:
         return (
             self.enabled
+            and not mapping_cache_hit(context)
             and bool(getattr(context, "ontology_specification", None))
             and bool(getattr(context, "mapping_spec", None))
             and bool(getattr(context, "csv_profile", None))
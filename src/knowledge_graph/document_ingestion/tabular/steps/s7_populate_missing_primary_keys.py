@@ -5,6 +5,9 @@ Strategy:
  - For missing keys:
     * Prefer a header that looks like '<entity>_id' (snake-case), if present
     * Else, reuse a join column from edges referencing this entity (target/source), if present
+    * Else, when the profile carries column statistics (full-file profile), pick the
+      column named after the entity (preferring id/key/code-like names) with the
+      highest distinct ratio, or failing that the most distinct column without nulls
     * Else, fallback to the first header (noisy) and log a warning
 
 This ensures downstream transforms can build node identifiers deterministically.
@@ -13,8 +16,9 @@ This ensures downstream transforms can build node identifiers deterministically.
 from __future__ import annotations
 
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Sequence
 from ...document_pipeline import DocumentPipelineContext, PipelineStep
+from .reuse_cached_mapping import mapping_cache_hit
 
 logger = logging.getLogger("knowledgeAgent.pipeline.csv.populate_keys")
 
@@ -24,14 +28,51 @@ def _to_snake(name: str) -> str:
     return re.sub(r"[^A-Za-z0-9]+", "_", (name or "").strip()).strip("_").lower()
 
 
+_KEY_SUFFIXES = ("id", "key", "code", "no", "number", "uuid")
+
+
+def _distinct_ratio(col: Any, rows: int) -> float:
+    total = max(rows, (col.non_null or 0) + (col.nulls or 0), 1)
+    return (col.distinct or 0) / total
+
+
+def _key_from_stats(entity_name: str, columns: Sequence[Any], rows: int) -> Optional[tuple]:
+    """Pick a key column from profile statistics; returns (column, reason) or None."""
+    snake = _to_snake(entity_name)
+    named = []
+    for col in columns:
+        if not col.non_null:
+            continue
+        col_snake = _to_snake(col.name)
+        if snake and snake in col_snake:
+            key_like = col_snake.rsplit("_", 1)[-1] in _KEY_SUFFIXES
+            named.append((key_like, _distinct_ratio(col, rows), col.name))
+    if named:
+        key_like, ratio, name = max(named, key=lambda c: (c[0], c[1]))
+        return name, f"named after entity (distinct ratio {ratio:.2f})"
+    complete = [(_distinct_ratio(col, rows), col.name) for col in columns if col.non_null and not col.nulls]
+    if complete:
+        ratio, name = max(complete, key=lambda c: c[0])
+        return name, f"most distinct non-null column (distinct ratio {ratio:.2f})"
+    return None
+
+
 class PopulateMissingPrimaryKeysStep(PipelineStep):
     name = "populate_missing_primary_keys"
+    inputs = ("document", "mapping_cache_hit", "mapping_spec", "csv_profile")
+    outputs = ("mapping_spec",)
+    kind = "cpu"
 
     def __init__(self, *, enabled: bool = True) -> None:
         super().__init__(enabled=enabled)
 
     def should_run(self, context: DocumentPipelineContext) -> bool:
-        return self.enabled and bool(getattr(context, "mapping_spec", None)) and bool(getattr(context, "csv_profile", None))
+        return (
+            self.enabled
+            and not mapping_cache_hit(context)
+            and bool(getattr(context, "mapping_spec", None))
+            and bool(getattr(context, "csv_profile", None))
+        )
 
     def run(self, context: DocumentPipelineContext) -> DocumentPipelineContext:
         mapping: Dict[str, Any] = getattr(context, "mapping_spec", {}) or {}
@@ -39,6 +80,8 @@ class PopulateMissingPrimaryKeysStep(PipelineStep):
         headers: List[str] = getattr(profile, "headers_original", []) or []
         headers_lc: List[str] = [str(h).strip().lower() for h in headers]
         norm_to_orig: Dict[str, str] = {h.lower(): h for h in headers}
+        columns = [c for c in (getattr(profile, "columns", None) or []) if getattr(c, "name", None) in headers]
+        rows: int = getattr(profile, "row_count_sampled", 0) or 0
 
         ents: Dict[str, Any] = mapping.get("entities", {}) if isinstance(mapping.get("entities"), dict) else {}
         edges: List[Dict[str, Any]] = mapping.get("edges", []) or []
@@ -83,7 +126,14 @@ class PopulateMissingPrimaryKeysStep(PipelineStep):
                     except Exception:
                         pass
 
-            # 3) Fallback: first header, warn
+            # 3) Column statistics from a full-file profile (real cardinalities)
+            if not chosen and columns:
+                picked = _key_from_stats(entity_name, columns, rows)
+                if picked:
+                    chosen, reason = picked
+                    warnings.append(f"entity '{entity_name}': synthesized key '{chosen}' from column stats ({reason})")
+
+            # 4) Fallback: first header, warn
             if not chosen and headers:
                 chosen = headers[0]
                 warnings.append(f"entity '{entity_name}': synthesized key using first header '{chosen}' (fallback)")
@@ -11,6 +11,9 @@ logger = logging.getLogger("knowledgeAgent.pipeline.csv.validate_ontology")
 
 class ValidateOntologyStep(PipelineStep):
     name = "validate_ontology"
+    inputs = ("csv_profile", "ontology_spec")
+    outputs = ()
+    kind = "cpu"
 
     def __init__(self, *, min_entities: int = 1, enabled: bool = True) -> None:
         super().__init__(enabled=enabled)
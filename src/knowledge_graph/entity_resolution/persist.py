@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 import sqlite3
+from contextlib import AbstractContextManager
 from typing import Iterable, List, Dict, Tuple, Optional, Any
 from dataclasses import asdict
 
 
 from .models import EntityMention, ResolvedEntity
+from ..persistence.sqlite.core.connection import get_connection_pool
 
 
 DDL = {
@@ -62,12 +64,15 @@ DDL = {
 }
 
 
-def _conn(db: DatabaseClient) -> sqlite3.Connection:
-    svc = getattr(db, "sqlite_service", None)
-    if not svc or not hasattr(svc, "repository"):
-        raise ValueError("SQLite service not initialized on DatabaseClient")
-    path = svc.repository.db_path
-    return sqlite3.connect(path)
+def _conn(db: DatabaseClient) -> AbstractContextManager[sqlite3.Connection]:
+    """Borrow the shared writer connection (commits on exit) for the db's path."""
+    pool = getattr(db, "pool", None)
+    if pool is None:
+        svc = getattr(db, "sqlite_service", None)
+        if not svc or not hasattr(svc, "repository"):
+            raise ValueError("SQLite service not initialized on DatabaseClient")
+        pool = get_connection_pool(svc.repository.db_path)
+    return pool.writer()
 
 
 def ensure_schema(db: DatabaseClient) -> None:
@@ -75,7 +80,6 @@ def ensure_schema(db: DatabaseClient) -> None:
         cur = conn.cursor()
         for sql in DDL.values():
             cur.execute(sql)
-        conn.commit()
 
 
 def fetch_mentions(db: DatabaseClient, doc_ids: Optional[List[str]] = None) -> List[EntityMention]:
@@ -135,7 +139,6 @@ def upsert_resolved_entities(db: DatabaseClient, items: Iterable[ResolvedEntity]
         if batch:
             cur.executemany(sql, batch)
             count = cur.rowcount if cur.rowcount is not None else len(batch)
-        conn.commit()
     return count
 
 
@@ -158,7 +161,6 @@ def upsert_entity_resolution_map(db: DatabaseClient, mappings: List[Tuple[str, s
         cur = conn.cursor()
         if mappings:
             cur.executemany(sql, mappings)
-        conn.commit()
         return cur.rowcount if cur.rowcount is not None else len(mappings)
 
 
@@ -192,7 +194,6 @@ def insert_resolved_relationship_mentions(
         cur = conn.cursor()
         if rows:
             cur.executemany(sql, rows)
-        conn.commit()
 
 
 def upsert_resolved_relationships_base(
@@ -212,7 +213,6 @@ def upsert_resolved_relationships_base(
         cur = conn.cursor()
         if rows:
             cur.executemany(sql, rows)
-        conn.commit()
 
 
 def recompute_resolved_relationship_counts(db: DatabaseClient, rel_ids: List[str]) -> None:
@@ -238,7 +238,6 @@ def recompute_resolved_relationship_counts(db: DatabaseClient, rel_ids: List[str
             """,
             tuple(rel_ids),
         )
-        conn.commit()
 
 
 def fetch_resolved_graph_snapshot(db: DatabaseClient, doc_ids: Optional[List[str]] = None) -> Dict[str, Any]:
@@ -1,5 +1,7 @@
+from ..config import CacheConfig, KGExtractionConfig, KnowledgeGraphConfig
 from ..llm.kg_extractor.service import KGExtractionService
-from typing import Dict, Any, List, Optional
+from dataclasses import asdict
+from typing import Dict, Any, List, Optional, Union
 import logging
 
 logger = logging.getLogger(__name__)
@@ -12,7 +14,14 @@ class KnowledgeGraphService:
     wrapping the KGExtractionService and providing higher-level KG operations.
     """
 
-    def __init__(self, db_client, llm_service, llm_provider: str = "openai", kg_extraction_config: Optional[dict] = None):
+    def __init__(
+        self,
+        db_client,
+        llm_service,
+        llm_provider: str = "openai",
+        kg_extraction_config: Optional[Union[KGExtractionConfig, dict]] = None,
+        cache_config: Optional[CacheConfig] = None,
+    ):
         self.db_client = db_client
         self.llm_service = llm_service
 
@@ -21,10 +30,16 @@ class KnowledgeGraphService:
         if hasattr(llm_service, 'config'):
             llm_config = llm_service.config
 
-        # Merge LLM config with optional KG extraction config (for parallelism, etc.)
+        # Merge LLM config with KG extraction config (parallelism, rate limits, batching);
+        # a KGExtractionConfig is passed whole so every engine field reaches the extractor
         merged_cfg = {**llm_config}
+        if isinstance(kg_extraction_config, KGExtractionConfig):
+            kg_extraction_config = asdict(kg_extraction_config)
         if kg_extraction_config:
             merged_cfg.update(kg_extraction_config)
+        if cache_config is not None:
+            # Extraction cache (opt-in via CacheConfig.enabled)
+            merged_cfg["cache"] = cache_config
 
         self.kg_extractor = KGExtractionService(
             llm_provider=llm_provider,
@@ -33,6 +48,17 @@ class KnowledgeGraphService:
 
         logger.info(f"KnowledgeGraphService initialized with {llm_provider} provider")
 
+    @classmethod
+    def from_config(cls, config: KnowledgeGraphConfig, db_client=None, llm_service=None) -> "KnowledgeGraphService":
+        """Build the service from a KnowledgeGraphConfig (LLM provider, extraction and cache sections)."""
+        return cls(
+            db_client=db_client,
+            llm_service=llm_service,
+            llm_provider=config.llm.provider,
+            kg_extraction_config=config.kg_extraction,
+            cache_config=config.cache,
+        )
+
     def extract_from_document(self, document) -> Dict[str, Any]:
         """
         Extract knowledge graph from a document object.
@@ -1,3 +1,5 @@
 from .service import KGExtractionService
+from .cache import ExtractionCache
+from .engine import AsyncExtractionEngine, AIMDController, RateLimiter
 
-__all__ = ['KGExtractionService']
\ No newline at end of file
+__all__ = ['KGExtractionService', 'ExtractionCache', 'AsyncExtractionEngine', 'AIMDController', 'RateLimiter']
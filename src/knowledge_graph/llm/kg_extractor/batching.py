@@ -0,0 +1,102 @@
+"""Multi-chunk batched prompting for KG extraction.
+
+Small chunks (e.g. one per PDF page) are packed, up to a token budget, into a
+single kg-gen request whose input marks each chunk with a numbered header.
+kg-gen returns one flat graph, so results are demultiplexed back to their
+source chunks by mention: an entity belongs to every chunk of the batch whose
+text mentions it, a relation to the chunks mentioning both endpoints (falling
+back to either endpoint, then to the whole batch).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+import re
+
+from .engine import estimate_tokens
+
+CHUNK_HEADER = "### Chunk {number}"
+_SPACES = re.compile(r"\s+")
+
+
+def _fold(text: str) -> str:
+    return _SPACES.sub(" ", text).strip().casefold()
+
+
+@dataclass
+class ChunkBatch:
+    """Chunks sent together in one extraction request."""
+
+    indices: List[int] = field(default_factory=list)
+    texts: List[str] = field(default_factory=list)
+    contexts: List[str] = field(default_factory=list)
+    tokens: int = 0
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def prompt_text(self) -> str:
+        """Chunk texts under numbered headers, in batch order."""
+        return "\n\n".join(
+            f"{CHUNK_HEADER.format(number=n + 1)}\n{text.strip()}" for n, text in enumerate(self.texts)
+        )
+
+    def prompt_context(self, document_id: str) -> str:
+        """One context line per chunk so the model keeps per-chunk grounding."""
+        lines = [f"{len(self)} chunks of document {document_id}, each under a '### Chunk N' header:"]
+        lines.extend(f"Chunk {n + 1}: {ctx}" for n, ctx in enumerate(self.contexts))
+        return "\n".join(lines)
+
+
+def pack_chunks(
+    items: Sequence[Tuple[int, str, str]],
+    token_budget: int,
+    max_chunks_per_batch: Optional[int] = None,
+) -> List[ChunkBatch]:
+    """Greedily pack (index, text, context) items into batches of at most ``token_budget``.
+
+    Order is preserved. A chunk larger than the budget gets a batch of its own.
+    """
+    batches: List[ChunkBatch] = []
+    current = ChunkBatch()
+    for index, text, ctx in items:
+        cost = estimate_tokens(text) + estimate_tokens(ctx)
+        full = max_chunks_per_batch is not None and len(current) >= max_chunks_per_batch
+        if current.indices and (full or current.tokens + cost > token_budget):
+            batches.append(current)
+            current = ChunkBatch()
+        current.indices.append(index)
+        current.texts.append(text)
+        current.contexts.append(ctx)
+        current.tokens += cost
+    if current.indices:
+        batches.append(current)
+    return batches
+
+
+def demultiplex(
+    batch: ChunkBatch, entities: Set[str], relations: List[tuple]
+) -> Dict[int, Tuple[Set[str], List[tuple]]]:
+    """Attribute a batch's entities/relations to its source chunks (keyed by chunk index)."""
+    folded = [_fold(text) for text in batch.texts]
+    everywhere = list(range(len(batch)))
+
+    def mentioned_in(name: str) -> List[int]:
+        needle = _fold(name)
+        return [pos for pos, text in enumerate(folded) if needle and needle in text]
+
+    per_chunk: Dict[int, Tuple[Set[str], List[tuple]]] = {index: (set(), []) for index in batch.indices}
+    for entity in entities:
+        for pos in mentioned_in(entity) or everywhere:
+            per_chunk[batch.indices[pos]][0].add(entity)
+    for relation in relations:
+        source_hits = set(mentioned_in(relation[0]))
+        target_hits = set(mentioned_in(relation[2]))
+        positions = (source_hits & target_hits) or (source_hits | target_hits) or set(everywhere)
+        for pos in sorted(positions):
+            per_chunk[batch.indices[pos]][1].append(relation)
+    return per_chunk
+
+
+__all__ = ["ChunkBatch", "demultiplex", "pack_chunks"]
@@ -0,0 +1,252 @@
+"""Persistent, content-addressed cache for KG extraction results.
+
+Entries are keyed by a SHA-256 of (model, prompt version, normalized chunk
+text, context) and stored in a small SQLite database under
+``CacheConfig.location``. Hits refresh ``last_accessed`` so size-bounded
+eviction drops the least recently used entries first; the refreshes are
+buffered and written in one batch (every ``_TOUCH_FLUSH_EVERY`` hits and
+before eviction), so a hit does not take the write lock. Entries older than
+``CacheConfig.ttl_hours`` are treated as misses and removed.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from hashlib import sha256
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, List, Optional, Set, Tuple
+import json
+import logging
+import os
+import re
+import time
+import unicodedata
+
+from ...config import CacheConfig
+from ...persistence.sqlite.core.connection import get_connection_pool
+
+logger = logging.getLogger(__name__)
+
+CACHE_FILE_NAME = "kg_extraction_cache.db"
+
+# Re-check the size bound after this many writes instead of on every put
+_EVICTION_CHECK_EVERY = 64
+
+# Buffered last_accessed refreshes written per batch
+_TOUCH_FLUSH_EVERY = 64
+
+CREATE_EXTRACTION_CACHE_TABLE = """
+CREATE TABLE IF NOT EXISTS kg_extraction_cache (
+  cache_key     TEXT PRIMARY KEY,
+  model         TEXT,
+  payload       TEXT NOT NULL,
+  size_bytes    INTEGER NOT NULL,
+  created_at    REAL NOT NULL,
+  last_accessed REAL NOT NULL
+);
+"""
+
+CREATE_INDEX_EXTRACTION_CACHE_LAST_ACCESSED = """
+CREATE INDEX IF NOT EXISTS idx_kg_extraction_cache_last_accessed ON kg_extraction_cache(last_accessed);
+"""
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_chunk_text(text: Optional[str]) -> str:
+    """Normalize text so cosmetic differences (unicode form, whitespace) share a key."""
+    if not text:
+        return ""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+def extraction_cache_key(model: str, prompt_version: str, text: str, context: Optional[str]) -> str:
+    """Stable cache key for one extraction request."""
+    digest = sha256()
+    for part in (model, prompt_version, normalize_chunk_text(text), normalize_chunk_text(context)):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x1f")
+    return digest.hexdigest()
+
+
+@dataclass
+class ExtractionCacheStats:
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    expired: int = 0
+    evicted: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class ExtractionCache:
+    """SQLite-backed LRU/TTL cache of (entities, relations) extraction results."""
+
+    def __init__(self, config: Optional[CacheConfig] = None):
+        self.config = config or CacheConfig()
+        location = self.config.location or os.path.join(os.getcwd(), ".kg_cache")
+        self.db_path = str(Path(location) / CACHE_FILE_NAME)
+        self.max_size_bytes = int(self.config.max_size_mb) * 1024 * 1024
+        self.ttl_seconds = float(self.config.ttl_hours) * 3600 if self.config.ttl_hours else None
+        self.stats = ExtractionCacheStats()
+        self._stats_lock = Lock()
+        self._writes_since_check = 0
+        # cache_key -> last hit time, not yet written
+        self._touched: Dict[str, float] = {}
+        self._touch_lock = Lock()
+        self._pool = get_connection_pool(self.db_path, readers=2)
+        self._ensure_schema()
+
+    def _ensure_schema(self) -> None:
+        if self._pool.is_initialised("kg_extraction_cache"):
+            return
+        with self._pool.writer() as conn:
+            conn.execute(CREATE_EXTRACTION_CACHE_TABLE)
+            conn.execute(CREATE_INDEX_EXTRACTION_CACHE_LAST_ACCESSED)
+        self._pool.mark_initialised("kg_extraction_cache")
+
+    def _count(self, field: str, amount: int = 1) -> None:
+        with self._stats_lock:
+            setattr(self.stats, field, getattr(self.stats, field) + amount)
+
+    def _record_write(self) -> bool:
+        """Count a write; True on every ``_EVICTION_CHECK_EVERY``-th one, when the size bound is due a check."""
+        with self._stats_lock:
+            self.stats.writes += 1
+            self._writes_since_check += 1
+            if self._writes_since_check < _EVICTION_CHECK_EVERY:
+                return False
+            self._writes_since_check = 0
+            return True
+
+    # Lookups --------------------------------------------------------------
+    def get(self, key: str) -> Optional[Tuple[Set[str], List[tuple]]]:
+        """Return cached (entities, relations) for ``key`` or None on a miss."""
+        now = time.time()
+        try:
+            with self._pool.reader() as conn:
+                row = conn.execute(
+                    "SELECT payload, created_at FROM kg_extraction_cache WHERE cache_key = ?", (key,)
+                ).fetchone()
+            if row is None:
+                self._count("misses")
+                return None
+            if self.ttl_seconds is not None and now - row[1] > self.ttl_seconds:
+                with self._pool.writer() as conn:
+                    conn.execute("DELETE FROM kg_extraction_cache WHERE cache_key = ?", (key,))
+                self._count("expired")
+                self._count("misses")
+                return None
+            self._touch(key, now)
+            payload = json.loads(row[0])
+            self._count("hits")
+            return set(payload["entities"]), [tuple(rel) for rel in payload["relations"]]
+        except Exception as e:
+            logger.warning(f"KG extraction cache read failed: {e}")
+            self._count("misses")
+            return None
+
+    def put(self, key: str, entities: Set[str], relations: List[tuple], *, model: Optional[str] = None) -> None:
+        """Store an extraction result, evicting LRU entries when over the size bound."""
+        payload = json.dumps(
+            {"entities": sorted(entities), "relations": [list(rel) for rel in relations]},
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        now = time.time()
+        try:
+            with self._pool.writer() as conn:
+                conn.execute(
+                    """
+                    INSERT INTO kg_extraction_cache (cache_key, model, payload, size_bytes, created_at, last_accessed)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(cache_key) DO UPDATE SET
+                      payload = excluded.payload,
+                      size_bytes = excluded.size_bytes,
+                      created_at = excluded.created_at,
+                      last_accessed = excluded.last_accessed
+                    """,
+                    (key, model, payload, len(payload), now, now),
+                )
+            if self._record_write():
+                self.evict()
+        except Exception as e:
+            logger.warning(f"KG extraction cache write failed: {e}")
+
+    # Maintenance ----------------------------------------------------------
+    def _touch(self, key: str, now: float) -> None:
+        with self._touch_lock:
+            self._touched[key] = now
+            if len(self._touched) < _TOUCH_FLUSH_EVERY:
+                return
+        self.flush_access_times()
+
+    def flush_access_times(self) -> None:
+        """Write buffered ``last_accessed`` refreshes in one transaction."""
+        with self._touch_lock:
+            touched, self._touched = self._touched, {}
+        if not touched:
+            return
+        with self._pool.writer() as conn:
+            conn.executemany(
+                "UPDATE kg_extraction_cache SET last_accessed = MAX(last_accessed, ?) WHERE cache_key = ?",
+                [(when, key) for key, when in touched.items()],
+            )
+
+    def evict(self) -> int:
+        """Drop expired entries, then least recently used ones until under max size."""
+        removed = 0
+        # Recent hits must count before choosing LRU victims
+        self.flush_access_times()
+        with self._pool.writer() as conn:
+            if self.ttl_seconds is not None:
+                cur = conn.execute(
+                    "DELETE FROM kg_extraction_cache WHERE created_at < ?", (time.time() - self.ttl_seconds,)
+                )
+                removed += cur.rowcount or 0
+            total = conn.execute("SELECT COALESCE(SUM(size_bytes), 0) FROM kg_extraction_cache").fetchone()[0]
+            if self.max_size_bytes and total > self.max_size_bytes:
+                excess = total - self.max_size_bytes
+                freed = 0
+                victims = []
+                for cache_key, size_bytes in conn.execute(
+                    "SELECT cache_key, size_bytes FROM kg_extraction_cache ORDER BY last_accessed"
+                ):
+                    victims.append((cache_key,))
+                    freed += size_bytes
+                    if freed >= excess:
+                        break
+                conn.executemany("DELETE FROM kg_extraction_cache WHERE cache_key = ?", victims)
+                removed += len(victims)
+        if removed:
+            self._count("evicted", removed)
+            logger.info(f"KG extraction cache evicted {removed} entries")
+        return removed
+
+    def clear(self) -> None:
+        with self._pool.writer() as conn:
+            conn.execute("DELETE FROM kg_extraction_cache")
+
+    def summary(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return {
+                "hits": self.stats.hits,
+                "misses": self.stats.misses,
+                "writes": self.stats.writes,
+                "expired": self.stats.expired,
+                "evicted": self.stats.evicted,
+                "hit_rate": round(self.stats.hit_rate, 3),
+            }
+
+
+__all__ = [
+    "ExtractionCache",
+    "ExtractionCacheStats",
+    "extraction_cache_key",
+    "normalize_chunk_text",
+]
@@ -0,0 +1,337 @@
+"""asyncio extraction engine: rate limiting, adaptive concurrency, retries.
+
+Chunk extractions run as coroutines behind three controls:
+
+- ``RateLimiter``: token buckets for requests/min and tokens/min, so we stay
+  under provider quotas instead of discovering them through 429s.
+- ``AIMDController``: additive-increase / multiplicative-decrease of the
+  number of in-flight requests, driven by observed latency and throttling.
+- jittered exponential backoff for throttled or failed calls.
+
+The engine is transport-agnostic: it is given an ``extract`` callable (sync or
+async) and treats any exception that looks like a 429 as throttling, which
+makes it easy to exercise offline against a fake LLM.
+
+The limiter and controller outlive a single run: the service shares them
+across documents, and each sync call runs its own event loop, possibly on
+another thread. They hold no loop-bound state and guard their counters with
+a ``threading.Lock`` that is never held across an ``await``.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, List, Optional, Sequence, Tuple, Union
+import asyncio
+import inspect
+import logging
+import random
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Rough chars-per-token ratio for English prose; used for tokens/min budgeting
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: Optional[str], overhead: int = 0) -> int:
+    """Cheap token estimate for rate budgeting (no tokenizer dependency)."""
+    return overhead + (len(text) // CHARS_PER_TOKEN if text else 0)
+
+
+def is_rate_limit_error(exc: BaseException) -> bool:
+    """Heuristically detect provider throttling (HTTP 429 / rate limit errors)."""
+    status = getattr(exc, "status_code", None) or getattr(exc, "status", None)
+    if status == 429:
+        return True
+    name = type(exc).__name__.lower()
+    message = str(exc).lower()
+    return "ratelimit" in name or "rate limit" in message or "429" in message or "too many requests" in message
+
+
+SleepFn = Callable[[float], Awaitable[Any]]
+
+
+class TokenBucket:
+    """Continuous-refill token bucket, shareable across threads and event loops."""
+
+    def __init__(
+        self,
+        rate_per_minute: float,
+        capacity: Optional[float] = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: SleepFn = asyncio.sleep,
+    ):
+        self.rate_per_second = float(rate_per_minute) / 60.0
+        self.capacity = float(capacity if capacity is not None else rate_per_minute)
+        self.tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate_per_second)
+        self._updated = now
+
+    async def acquire(self, amount: float = 1.0) -> float:
+        """Wait until ``amount`` tokens are available and take them; returns seconds waited."""
+        amount = min(float(amount), self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return waited
+                delay = (amount - self.tokens) / self.rate_per_second
+            waited += delay
+            await self._sleep(delay)
+
+
+class RateLimiter:
+    """Requests/min and tokens/min budgets; either may be disabled with None."""
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: SleepFn = asyncio.sleep,
+    ):
+        self.requests = TokenBucket(requests_per_minute, clock=clock, sleep=sleep) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute, clock=clock, sleep=sleep) if tokens_per_minute else None
+
+    async def acquire(self, tokens: int = 0) -> float:
+        waited = 0.0
+        if self.requests:
+            waited += await self.requests.acquire(1)
+        if self.tokens and tokens:
+            waited += await self.tokens.acquire(tokens)
+        return waited
+
+
+class AIMDController:
+    """Additive-increase / multiplicative-decrease concurrency limit.
+
+    Each success below the latency target grows the limit by ``increase``
+    per window of ``limit`` completions (about +1 per round trip); throttling,
+    or latency above target, multiplies it by ``decrease``, at most once per
+    ``cooldown_s`` so a single burst of 429s only backs off once.
+    """
+
+    def __init__(
+        self,
+        initial: int = 4,
+        *,
+        minimum: int = 1,
+        maximum: int = 16,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        latency_target_s: Optional[float] = None,
+        cooldown_s: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.minimum = max(1, int(minimum))
+        self.maximum = max(self.minimum, int(maximum))
+        self.limit = float(min(max(int(initial), self.minimum), self.maximum))
+        self.increase = float(increase)
+        self.decrease = float(decrease)
+        self.latency_target_s = latency_target_s
+        self.cooldown_s = float(cooldown_s)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._last_decrease = float("-inf")
+
+    @property
+    def current(self) -> int:
+        return int(self.limit)
+
+    def on_success(self, latency_s: float) -> None:
+        with self._lock:
+            if self.latency_target_s is not None and latency_s > self.latency_target_s:
+                self._back_off()
+                return
+            self.limit = min(float(self.maximum), self.limit + self.increase / max(self.limit, 1.0))
+
+    def on_throttle(self) -> None:
+        with self._lock:
+            self._back_off()
+
+    def _back_off(self) -> None:
+        # Caller holds self._lock
+        now = self._clock()
+        if now - self._last_decrease < self.cooldown_s:
+            return
+        self._last_decrease = now
+        self.limit = max(float(self.minimum), self.limit * self.decrease)
+
+
+@dataclass
+class ExtractionOutcome:
+    index: int
+    result: Any = None
+    error: Optional[BaseException] = None
+    attempts: int = 0
+    latency_s: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class EngineStats:
+    requests: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    throttled: int = 0
+    retries: int = 0
+    rate_wait_s: float = 0.0
+    concurrency_trace: List[int] = field(default_factory=list)
+
+    def summary(self) -> dict:
+        return {
+            "requests": self.requests,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "throttled": self.throttled,
+            "retries": self.retries,
+            "rate_wait_s": round(self.rate_wait_s, 3),
+            "final_concurrency": self.concurrency_trace[-1] if self.concurrency_trace else None,
+            "peak_concurrency": max(self.concurrency_trace) if self.concurrency_trace else None,
+        }
+
+
+ExtractFn = Callable[..., Union[Any, Awaitable[Any]]]
+
+
+class AsyncExtractionEngine:
+    """Run ``extract(text, context)`` over many chunks with limits and retries.
+
+    Sync ``extract`` callables are run in worker threads via
+    ``asyncio.to_thread``; coroutine functions are awaited directly.
+    """
+
+    def __init__(
+        self,
+        extract: ExtractFn,
+        *,
+        rate_limiter: Optional[RateLimiter] = None,
+        controller: Optional[AIMDController] = None,
+        max_retries: int = 4,
+        base_backoff_s: float = 0.5,
+        max_backoff_s: float = 30.0,
+        prompt_overhead_tokens: int = 600,
+        rng: Optional[random.Random] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: SleepFn = asyncio.sleep,
+    ):
+        self.extract = extract
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.controller = controller or AIMDController()
+        self.max_retries = max(0, int(max_retries))
+        self.base_backoff_s = float(base_backoff_s)
+        self.max_backoff_s = float(max_backoff_s)
+        self.prompt_overhead_tokens = int(prompt_overhead_tokens)
+        self.stats = EngineStats()
+        self._rng = rng or random.Random()
+        self._is_async = inspect.iscoroutinefunction(extract)
+        self._clock = clock
+        self._sleep = sleep
+
+    def _backoff(self, attempt: int, exc: BaseException) -> float:
+        """Full-jitter exponential backoff, honouring a Retry-After hint when present."""
+        retry_after = getattr(exc, "retry_after", None)
+        if retry_after:
+            return float(retry_after) * (1.0 + self._rng.random() * 0.1)
+        cap = min(self.max_backoff_s, self.base_backoff_s * (2 ** attempt))
+        return self._rng.uniform(0.0, cap)
+
+    async def _call(self, text: str, context: Optional[str]) -> Any:
+        if self._is_async:
+            return await self.extract(text, context)
+        return await asyncio.to_thread(self.extract, text, context)
+
+    async def _run_one(self, index: int, text: str, context: Optional[str], slots: asyncio.Condition, in_flight: List[int]) -> ExtractionOutcome:
+        outcome = ExtractionOutcome(index=index)
+        tokens = estimate_tokens(text, self.prompt_overhead_tokens)
+        for attempt in range(self.max_retries + 1):
+            outcome.attempts = attempt + 1
+            self.stats.rate_wait_s += await self.rate_limiter.acquire(tokens)
+
+            async with slots:
+                await slots.wait_for(lambda: in_flight[0] < self.controller.current)
+                in_flight[0] += 1
+            self.stats.requests += 1
+            started = self._clock()
+            error: Optional[BaseException] = None
+            try:
+                outcome.result = await self._call(text, context)
+            except Exception as exc:  # classified below
+                error = exc
+            finally:
+                outcome.latency_s = self._clock() - started
+                async with slots:
+                    in_flight[0] -= 1
+                    slots.notify_all()
+
+            if error is None:
+                self.controller.on_success(outcome.latency_s)
+                self.stats.concurrency_trace.append(self.controller.current)
+                self.stats.succeeded += 1
+                outcome.error = None
+                return outcome
+
+            outcome.error = error
+            if is_rate_limit_error(error):
+                self.stats.throttled += 1
+                self.controller.on_throttle()
+                self.stats.concurrency_trace.append(self.controller.current)
+            if attempt >= self.max_retries:
+                break
+            self.stats.retries += 1
+            delay = self._backoff(attempt, error)
+            logger.debug(f"Chunk {index} attempt {attempt + 1} failed ({error}); retrying in {delay:.2f}s")
+            await self._sleep(delay)
+
+        self.stats.failed += 1
+        logger.warning(f"Chunk {index} failed after {outcome.attempts} attempts: {outcome.error}")
+        return outcome
+
+    async def run(self, items: Sequence[Tuple[str, Optional[str]]]) -> List[ExtractionOutcome]:
+        """Extract every (text, context) item; outcomes are returned in input order."""
+        slots = asyncio.Condition()
+        in_flight = [0]
+        tasks = [self._run_one(i, text, ctx, slots, in_flight) for i, (text, ctx) in enumerate(items)]
+        return list(await asyncio.gather(*tasks))
+
+
+def run_coroutine_sync(coro: Awaitable[Any]) -> Any:
+    """Run ``coro`` to completion from sync code, even if this thread already has a running loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    # Called from inside an event loop (e.g. an async web handler): use a helper thread
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="kg-async") as pool:
+        return pool.submit(asyncio.run, coro).result()
+
+
+__all__ = [
+    "AIMDController",
+    "AsyncExtractionEngine",
+    "EngineStats",
+    "ExtractionOutcome",
+    "RateLimiter",
+    "TokenBucket",
+    "estimate_tokens",
+    "is_rate_limit_error",
+    "run_coroutine_sync",
+]
@@ -9,14 +9,21 @@ import time
 import os
 import tempfile
 from typing import Dict, List, Set, Any, Optional
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from threading import Lock
 
 from kg_gen import KGGen
 
+from ...config import CacheConfig
+from .cache import ExtractionCache, extraction_cache_key
+from .batching import ChunkBatch, demultiplex, pack_chunks
+from .engine import AIMDController, AsyncExtractionEngine, RateLimiter, run_coroutine_sync
+
 logger = logging.getLogger(__name__)
 
+# Part of the extraction cache key: bump when prompts/post-processing change
+EXTRACTION_PROMPT_VERSION = "kg-gen/1"
+
 # Reuse a single KGGen instance across requests to avoid repeated DSPy configuration.
 _kggen_lock: Lock = Lock()
 _kggen_instance: Optional[KGGen] = None
@@ -51,10 +58,50 @@ class KGExtractionService:
         self.is_configured = False
         # Parallelism controls
         self.max_concurrent_chunks: int = int(kwargs.get("max_concurrent_chunks", 4) or 4)
+        # Async engine limits (see engine.py); the AIMD controller persists across calls
+        self.max_retries: int = int(kwargs.get("max_retries", 4))
+        self.rate_limiter = RateLimiter(
+            requests_per_minute=kwargs.get("requests_per_minute"),
+            tokens_per_minute=kwargs.get("tokens_per_minute"),
+        )
+        ceiling = int(kwargs.get("max_concurrency", 16) or 16) if self.max_concurrent_chunks > 1 else 1
+        self.concurrency = AIMDController(
+            initial=self.max_concurrent_chunks,
+            maximum=max(self.max_concurrent_chunks, ceiling),
+            latency_target_s=kwargs.get("latency_target_s"),
+        )
+        self.last_engine_stats: Dict[str, Any] = {}
+        # Multi-chunk batched prompting (0 = one request per chunk)
+        self.batch_token_budget: int = int(kwargs.get("batch_token_budget", 0) or 0)
+        self.max_chunks_per_batch: Optional[int] = kwargs.get("max_chunks_per_batch")
+        self.model_identifier: Optional[str] = None
         
         # Setup LLM (simplified without DSPy)
         self._setup_llm()
 
+        # Content-addressed extraction cache (CacheConfig); cache_bypass skips lookups and writes
+        self.cache_bypass: bool = bool(kwargs.get("cache_bypass", False))
+        self.cache: Optional[ExtractionCache] = self._setup_cache(kwargs.get("cache"))
+
+    def _setup_cache(self, cache: Any) -> Optional[ExtractionCache]:
+        """Build the extraction cache from an ExtractionCache, CacheConfig or dict."""
+        if isinstance(cache, ExtractionCache):
+            return cache
+        if isinstance(cache, dict):
+            cache = CacheConfig(**cache)
+        cache_config = cache if isinstance(cache, CacheConfig) else CacheConfig()
+        if not cache_config.enabled:
+            return None
+        try:
+            return ExtractionCache(cache_config)
+        except Exception as e:
+            logger.warning(f"KG extraction cache unavailable ({e}); continuing without cache")
+            return None
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for the extraction cache."""
+        return self.cache.summary() if self.cache else {}
+
 
     def _setup_llm(self):
         """Setup LLM based on provider - simplified like quickstart"""
@@ -70,6 +117,7 @@ class KGExtractionService:
                 
                 try:
                     model_identifier = f"openai/{model_name}"
+                    self.model_identifier = model_identifier
                     self.kg_gen = _get_shared_kggen(model_identifier, api_key)
                     self.is_configured = True
                     logger.info(f"KGGen initialized successfully with model: openai/{model_name}")
@@ -97,6 +145,7 @@ class KGExtractionService:
         track_metadata: bool = False,
         *,
         log_label: Optional[str] = None,
+        use_cache: bool = True,
     ) -> Dict[str, Any]:
         """
         Extract knowledge graph from text
@@ -106,6 +155,7 @@ class KGExtractionService:
             context: Optional context for better extraction
             strategy: Extraction strategy ("simple", "detailed")
             track_metadata: Whether to track extraction metadata
+            use_cache: Set False to bypass the extraction cache for this call
 
         Returns:
             Dictionary with 'entities' (set), 'relations' (list), and optionally 'metadata'
@@ -147,13 +197,16 @@ class KGExtractionService:
                 }
             return result
 
+        cache_hit = False
         if not self.is_configured or not self.kg_gen:
             logger.warning("KGExtractionService is not fully configured; returning empty extraction")
             entities: Set[str] = set()
             relations: List[tuple] = []
         else:
             try:
-                entities, relations = self._kg_gen_extract(text, context, strategy, log_label=log_label)
+                entities, relations, cache_hit = self._extract_cached(
+                    text, context, strategy, log_label=log_label, use_cache=use_cache
+                )
             except Exception as e:
                 logger.error(f"kg-gen extraction failed: {e}")
                 entities = set()
@@ -169,11 +222,36 @@ class KGExtractionService:
                 'extraction_time': time.time() - start_time,
                 'entity_count': len(entities),
                 'relation_count': len(relations),
-                'strategy_used': strategy
+                'strategy_used': strategy,
+                'cache_hit': cache_hit,
             }
 
         return result
 
+    def _extract_cached(
+        self,
+        text: str,
+        context: Optional[str],
+        strategy: str,
+        *,
+        log_label: Optional[str] = None,
+        use_cache: bool = True,
+    ) -> tuple[Set[str], List[tuple], bool]:
+        """Cache lookup, then kg-gen on a miss. Raises on LLM failure (nothing is cached)."""
+        cache = self.cache if (use_cache and not self.cache_bypass) else None
+        cache_key = (
+            extraction_cache_key(self.model_identifier or "", f"{EXTRACTION_PROMPT_VERSION}:{strategy}", text, context)
+            if cache else None
+        )
+        cached = cache.get(cache_key) if cache else None
+        if cached is not None:
+            logger.debug(f"KG extraction cache hit ({log_label or 'text'})")
+            return cached[0], cached[1], True
+        entities, relations = self._kg_gen_extract(text, context, strategy, log_label=log_label)
+        if cache:
+            cache.put(cache_key, entities, relations, model=self.model_identifier)
+        return entities, relations, False
+
     def _kg_gen_extract(self, text: str, context: Optional[str], strategy: str, *, log_label: Optional[str] = None) -> tuple[Set[str], List[tuple]]:
         """
         Use kg-gen to extract entities and relations - simplified like quickstart
@@ -225,8 +303,9 @@ class KGExtractionService:
             return entities, relations
             
         except Exception as e:
+            # Re-raise so callers do not cache an empty result for a failed call
             logger.error(f"kg-gen extraction failed: {e}")
-            return set(), []
+            raise
 
    
     def extract_from_document(self, document) -> Dict[str, Any]:
@@ -256,6 +335,83 @@ class KGExtractionService:
 
         return result
 
+    def _normalize_chunks(
+        self, chunks: List[Any], document_id: str, contexts: Optional[List[str]]
+    ) -> List[tuple[int, str, str]]:
+        """(index, text, context) for every non-empty chunk, with a fallback context."""
+        normalized: List[tuple[int, str, str]] = []
+        for idx, item in enumerate(chunks):
+            if isinstance(item, tuple) and len(item) >= 1:
+                text = item[0]
+                ctx = item[1] if len(item) > 1 else None
+            else:
+                text = str(item)
+                ctx = contexts[idx] if contexts and idx < len(contexts) else None
+            # Same guard as extract_from_text: empty/very short chunks yield nothing
+            if not text or len(text.strip()) <= 10:
+                continue
+            normalized.append((idx, text, ctx or f"Chunk {idx+1} of document {document_id}"))
+        return normalized
+
+    async def extract_from_chunks_async(
+        self, chunks: List[Any], document_id: str, contexts: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """Async variant of :meth:`extract_from_chunks` for callers already on an event loop."""
+        all_entities: Set[str] = set()
+        all_relations: List[tuple] = []
+        provenance: Dict[int, Dict[str, Any]] = {}
+        normalized = self._normalize_chunks(chunks, document_id, contexts)
+        total = len(chunks)
+
+        if normalized and self.is_configured and self.kg_gen:
+            # Batched mode packs several chunks into one request; otherwise one request per chunk
+            if self.batch_token_budget > 0 and len(normalized) > 1:
+                batches = pack_chunks(normalized, self.batch_token_budget, self.max_chunks_per_batch)
+            else:
+                batches = [ChunkBatch([idx], [text], [ctx]) for idx, text, ctx in normalized]
+            requests = [
+                (batch.texts[0], batch.contexts[0]) if len(batch) == 1
+                else (batch.prompt_text(), batch.prompt_context(document_id))
+                for batch in batches
+            ]
+
+            engine = AsyncExtractionEngine(
+                lambda text, ctx: self._extract_cached(text, ctx, "simple"),
+                rate_limiter=self.rate_limiter,
+                controller=self.concurrency,
+                max_retries=self.max_retries,
+            )
+            logger.info(
+                f"Async KG extraction for {len(normalized)} chunks in {len(batches)} requests "
+                f"(concurrency={self.concurrency.current}, max={self.concurrency.maximum})"
+            )
+            outcomes = await engine.run(requests)
+            for batch, outcome in zip(batches, outcomes):
+                label = ", ".join(f"chunk {idx+1}/{total}" for idx in batch.indices)
+                if not outcome.ok:
+                    logger.error(f"Chunk extraction failed ({label}): {outcome.error}")
+                    continue
+                entities, relations, _ = outcome.result
+                all_entities.update(entities)
+                all_relations.extend(relations)
+                for idx, (chunk_entities, chunk_relations) in demultiplex(batch, entities, relations).items():
+                    provenance[idx] = {"entities": chunk_entities, "relations": chunk_relations}
+            self.last_engine_stats = {**engine.stats.summary(), "chunks": len(normalized), "batches": len(batches)}
+            logger.info(f"KG extraction engine for {document_id}: {self.last_engine_stats}")
+        elif normalized:
+            logger.warning("KGExtractionService is not fully configured; returning empty extraction")
+
+        if self.cache and not self.cache_bypass:
+            logger.info(f"KG extraction cache for {document_id}: {self.cache_stats()}")
+
+        # Order-preserving dedupe so merged output is deterministic
+        unique_relations = list(dict.fromkeys(all_relations))
+        return {
+            'entities': all_entities,
+            'relations': unique_relations,
+            'chunk_provenance': provenance,
+        }
+
     def extract_from_chunks(self, chunks: List[Any], document_id: str, contexts: Optional[List[str]] = None) -> Dict[str, Any]:
         """
         Extract knowledge graph from text chunks and merge results.
@@ -264,6 +420,14 @@ class KGExtractionService:
         - chunks: List[str] and optional contexts: List[str] of same length
         - chunks: List[tuple[str, str]] where tuple = (text, context)
 
+        With ``batch_token_budget`` > 0, consecutive chunks are packed into one
+        request up to that many (estimated) tokens and the results are mapped
+        back to their chunks in ``chunk_provenance`` (chunk index -> entities/relations).
+
+        Chunks run on the asyncio engine: requests/tokens per minute are
+        rate limited, concurrency adapts (AIMD) to latency and 429s, and
+        throttled or failed calls are retried with jittered backoff.
+
         Args:
             chunks: List of chunk texts or (text, context) tuples
             document_id: Document ID for context fallback
@@ -272,69 +436,7 @@ class KGExtractionService:
         Returns:
             Merged knowledge graph results
         """
-        all_entities = set()
-        all_relations: List[tuple] = []
-
-        # Normalize input into list of (text, context)
-        normalized: List[tuple[str, Optional[str]]] = []
-        for idx, item in enumerate(chunks):
-            if isinstance(item, tuple) and len(item) >= 1:
-                text = item[0]
-                ctx = item[1] if len(item) > 1 else None
-            else:
-                text = str(item)
-                ctx = contexts[idx] if contexts and idx < len(contexts) else None
-            normalized.append((text, ctx))
-
-        total = len(normalized)
-
-        # Fast path: small number of chunks or parallelism disabled
-        if total <= 1 or (self.max_concurrent_chunks is not None and self.max_concurrent_chunks <= 1):
-            for i, (chunk_text, ctx) in enumerate(normalized):
-                if not chunk_text or not chunk_text.strip():
-                    continue
-                effective_ctx = ctx or f"Chunk {i+1} of document {document_id}"
-                chunk_result = self.extract_from_text(
-                    chunk_text,
-                    context=effective_ctx,
-                    log_label=f"chunk {i+1}/{total}"
-                )
-                all_entities.update(chunk_result.get('entities', set()))
-                all_relations.extend(chunk_result.get('relations', []))
-        else:
-            # Threaded parallelism (I/O-bound LLM calls)
-            max_workers = max(1, min(self.max_concurrent_chunks, total))
-            logger.info(
-                f"Parallel KG extraction for {total} chunks with max_workers={max_workers}"
-            )
-
-            def _task(i_and_item: tuple[int, tuple[str, Optional[str]]]) -> Dict[str, Any]:
-                i, (chunk_text, ctx) = i_and_item
-                if not chunk_text or not chunk_text.strip():
-                    return {'entities': set(), 'relations': []}
-                effective_ctx = ctx or f"Chunk {i+1} of document {document_id}"
-                return self.extract_from_text(
-                    chunk_text,
-                    context=effective_ctx,
-                    log_label=f"chunk {i+1}/{total}"
-                )
-
-            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="kg-chunk") as executor:
-                futures = [executor.submit(_task, (i, item)) for i, item in enumerate(normalized)]
-                for fut in as_completed(futures):
-                    try:
-                        chunk_result = fut.result()
-                    except Exception as e:
-                        logger.error(f"Chunk extraction task failed: {e}")
-                        continue
-                    all_entities.update(chunk_result.get('entities', set()))
-                    all_relations.extend(chunk_result.get('relations', []))
-
-        unique_relations = list(set(all_relations))
-        return {
-            'entities': all_entities,
-            'relations': unique_relations
-        }
+        return run_coroutine_sync(self.extract_from_chunks_async(chunks, document_id, contexts))
 
     def extract_and_save(
         self,
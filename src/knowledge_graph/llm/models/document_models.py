@@ -19,3 +19,19 @@ class KeyWordModel(BaseModel):
     )
 
 
+class ChunkMetadataModel(BaseModel):
+    """Topics, keywords and an optional summary for one chunk, in a single response"""
+    topics: List[str] = Field(
+        description="Main topics in the text, max 3",
+        max_length=3
+    )
+    keywords: List[str] = Field(
+        description="Key terms from the text, max 3",
+        max_length=3
+    )
+    summary: Optional[str] = Field(
+        default=None,
+        description="One-sentence summary of the text, only when requested"
+    )
+
+
@@ -33,6 +33,26 @@ KEYWORD_EXTRACTION_PROMPT = prompts.ChatPromptTemplate.from_messages([
 ])
 
 
+CHUNK_METADATA_EXTRACTION_PROMPT = prompts.ChatPromptTemplate.from_messages([
+    ("system", """Analyze this text chunk from a larger document and identify its 3 most significant topics and its 3 most important keywords.
+
+    A good topic should:
+    - Represent a major theme or subject matter discussed
+    - Be specific enough to distinguish from other topics
+    - Be expressed in 1-3 words when possible
+
+    A good keyword should:
+    - Represent a specific concept, term, or entity mentioned
+    - Typically be a noun, proper noun, or technical term
+    - Be expressed in 1-2 words, with underscores between words and a '#' prefix (e.g., #artificial_intelligence)
+
+    {summary_instructions}
+
+    {format_instructions}"""),
+    ("human", "{chunk}")
+])
+
+
 ONTOLOGY_EXTRACTION_PROMPT = prompts.ChatPromptTemplate.from_messages([
     ("system", """
      You are a knowledge graph extraction system designed to process informal, markdown-formatted notes. 
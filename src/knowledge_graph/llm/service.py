@@ -1,4 +1,4 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
@@ -6,8 +6,8 @@ from langchain.chains import LLMChain
 import os
 import logging
 
-from .models.document_models import TopicModel, KeyWordModel
-from .prompts.templates import TOPICS_EXTRACTION_PROMPT, KEYWORD_EXTRACTION_PROMPT
+from .models.document_models import TopicModel, KeyWordModel, ChunkMetadataModel
+from .prompts.templates import TOPICS_EXTRACTION_PROMPT, KEYWORD_EXTRACTION_PROMPT, CHUNK_METADATA_EXTRACTION_PROMPT
 from .models.kg_extraction_models import ChunkKnowledgeGraphExtraction
 from .prompts.templates import ONTOLOGY_EXTRACTION_PROMPT
 
@@ -44,18 +44,28 @@ class LLMService:
             temperature=self.config.get("temperature", 0.2),
             api_key=api_key
         )
+        self._build_chains()
         self.logger.info("LLM service initialized successfully")
 
+    def _build_chains(self):
+        """Build output parsers and prompt|llm|parser chains once; they are stateless and reusable."""
+        self._topics_parser = JsonOutputParser(pydantic_object=TopicModel)
+        self._topics_chain = TOPICS_EXTRACTION_PROMPT | self.llm | self._topics_parser
+        self._keywords_parser = JsonOutputParser(pydantic_object=KeyWordModel)
+        self._keywords_chain = KEYWORD_EXTRACTION_PROMPT | self.llm | self._keywords_parser
+        self._chunk_metadata_parser = JsonOutputParser(pydantic_object=ChunkMetadataModel)
+        self._chunk_metadata_chain = CHUNK_METADATA_EXTRACTION_PROMPT | self.llm | self._chunk_metadata_parser
+        self._ontology_parser = JsonOutputParser(pydantic_object=ChunkKnowledgeGraphExtraction)
+        self._ontology_chain = ONTOLOGY_EXTRACTION_PROMPT | self.llm | self._ontology_parser
+
     def extract_topics(self, text):
         """Generate metadata for each chunk"""
         self.logger.info("Extracting topics from text")
         try:
-            parser = JsonOutputParser(pydantic_object=TopicModel)
-            chain = TOPICS_EXTRACTION_PROMPT | self.llm| parser
-            output = chain.invoke(
+            output = self._topics_chain.invoke(
                 {
                     "chunk": text,
-                    "format_instructions": parser.get_format_instructions()}
+                    "format_instructions": self._topics_parser.get_format_instructions()}
             )
             self.logger.debug(f"Extracted topics: {output}")
             return output
@@ -67,12 +77,10 @@ class LLMService:
         """Generate metadata for each chunk"""
         self.logger.info("Extracting keywords from text")
         try:
-            parser = JsonOutputParser(pydantic_object=KeyWordModel)
-            chain = KEYWORD_EXTRACTION_PROMPT | self.llm | parser
-            output = chain.invoke(
+            output = self._keywords_chain.invoke(
                 {
                     "chunk": text,
-                    "format_instructions": parser.get_format_instructions()}
+                    "format_instructions": self._keywords_parser.get_format_instructions()}
             )
             self.logger.debug(f"Extracted keywords: {output}")
             return output
@@ -80,17 +88,56 @@ class LLMService:
             self.logger.error(f"Error extracting keywords: {str(e)}")
             raise
 
+    def _chunk_metadata_input(self, text, include_summary: bool) -> Dict[str, Any]:
+        return {
+            "chunk": text,
+            "summary_instructions": (
+                "Also write a one-sentence summary of the chunk in the 'summary' field."
+                if include_summary else "Leave the 'summary' field empty."
+            ),
+            "format_instructions": self._chunk_metadata_parser.get_format_instructions(),
+        }
+
+    def extract_chunk_metadata(self, text, include_summary: bool = False):
+        """Extract topics, keywords (and optionally a summary) in one LLM call"""
+        self.logger.info("Extracting chunk metadata from text")
+        try:
+            output = self._chunk_metadata_chain.invoke(self._chunk_metadata_input(text, include_summary))
+            self.logger.debug(f"Extracted chunk metadata: {output}")
+            return output
+        except Exception as e:
+            self.logger.error(f"Error extracting chunk metadata: {str(e)}")
+            raise
+
+    def extract_chunk_metadata_batch(
+        self, texts: List[str], max_concurrency: int = 8, include_summary: bool = False
+    ) -> List[Optional[Dict[str, Any]]]:
+        """Run extract_chunk_metadata over many texts with at most ``max_concurrency`` calls in flight.
+
+        Results are returned in input order; a failed chunk yields None instead of aborting the batch.
+        """
+        self.logger.info(f"Extracting chunk metadata for {len(texts)} chunks (max_concurrency={max_concurrency})")
+        inputs = [self._chunk_metadata_input(text, include_summary) for text in texts]
+        outputs = self._chunk_metadata_chain.batch(
+            inputs, config={"max_concurrency": max_concurrency}, return_exceptions=True
+        )
+        results: List[Optional[Dict[str, Any]]] = []
+        for i, output in enumerate(outputs):
+            if isinstance(output, Exception):
+                self.logger.error(f"Error extracting chunk metadata for chunk {i}: {output}")
+                results.append(None)
+            else:
+                results.append(output)
+        return results
 
     def extract_ontology(self, text):
         """Extract ontology from text"""
         self.logger.info("Extracting ontology from text")
         try:
-            parser = JsonOutputParser(pydantic_object=ChunkKnowledgeGraphExtraction)
-            chain = ONTOLOGY_EXTRACTION_PROMPT | self.llm | parser
-            output = chain.invoke(
+            output = self._ontology_chain.invoke(
                 {
                     "chunk": text,
-                    "format_instructions": parser.get_format_instructions()
+                    "format_instructions": self._ontology_parser.get_format_instructions()
                 }
             )
             self.logger.debug(f"Extracted ontology: {output}")
@@ -0,0 +1,244 @@
+"""Long-lived SQLite connection pool shared by all repositories.
+
+Each database file gets one process-wide pool holding a single writer
+connection (serialised behind a lock) plus a small set of reader
+connections. Connections are opened and configured once (WAL journal,
+synchronous=NORMAL, mmap, page cache, in-memory temp store, foreign keys)
+so repository methods no longer pay connect/PRAGMA cost per statement.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from pathlib import Path
+from queue import Empty, LifoQueue
+from threading import Lock, RLock, local
+from typing import Dict, Iterator, List, Optional, Set
+import logging
+import sqlite3
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_READERS = 4
+DEFAULT_MMAP_SIZE = 256 * 1024 * 1024  # bytes
+DEFAULT_CACHE_SIZE_KIB = 64 * 1024  # PRAGMA cache_size uses negative values for KiB
+DEFAULT_BUSY_TIMEOUT_MS = 5000
+
+
+class SQLiteConnectionPool:
+    """Thread-aware pool: one writer connection plus up to N reader connections.
+
+    Usage:
+        pool = get_connection_pool(db_path)
+        with pool.writer() as conn:   # BEGIN ... COMMIT/ROLLBACK
+            conn.execute("INSERT ...")
+        with pool.reader() as conn:
+            rows = conn.execute("SELECT ...").fetchall()
+
+    The writer is re-entrant on the same thread (nested ``writer()`` calls
+    join the outer transaction), and ``reader()`` called while the current
+    thread holds the writer returns the writer connection so callers see
+    their own uncommitted rows.
+
+    ``close()`` releases every connection but leaves the pool usable: the
+    next borrow reconnects. Repositories and facades holding the pool (e.g.
+    the cached ``get_sql_lite()`` one) therefore keep working after another
+    owner closes it, and the file still has a single writer connection.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        *,
+        readers: int = DEFAULT_READERS,
+        mmap_size: int = DEFAULT_MMAP_SIZE,
+        cache_size_kib: int = DEFAULT_CACHE_SIZE_KIB,
+        busy_timeout_ms: int = DEFAULT_BUSY_TIMEOUT_MS,
+    ) -> None:
+        self.db_path = db_path
+        self.max_readers = max(1, int(readers))
+        self.mmap_size = int(mmap_size)
+        self.cache_size_kib = int(cache_size_kib)
+        self.busy_timeout_ms = int(busy_timeout_ms)
+
+        self._writer_lock = RLock()
+        self._writer_conn: Optional[sqlite3.Connection] = None
+        self._local = local()
+
+        self._readers: LifoQueue = LifoQueue()
+        self._reader_conns: List[sqlite3.Connection] = []
+        self._readers_lock = Lock()
+
+        # Schema bootstrap markers so repositories only run DDL once per pool
+        self._initialised: Set[str] = set()
+
+    # Connection setup ---------------------------------------------------
+    def _connect(self) -> sqlite3.Connection:
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.busy_timeout_ms / 1000.0,
+            check_same_thread=False,
+        )
+        cur = conn.cursor()
+        cur.execute("PRAGMA journal_mode=WAL")
+        cur.execute("PRAGMA synchronous=NORMAL")
+        cur.execute("PRAGMA foreign_keys=ON")
+        cur.execute("PRAGMA temp_store=MEMORY")
+        cur.execute(f"PRAGMA mmap_size={self.mmap_size}")
+        cur.execute(f"PRAGMA cache_size=-{self.cache_size_kib}")
+        cur.execute(f"PRAGMA busy_timeout={self.busy_timeout_ms}")
+        cur.close()
+        return conn
+
+    def _get_writer_conn(self) -> sqlite3.Connection:
+        if self._writer_conn is None:
+            self._writer_conn = self._connect()
+            logger.debug("Opened writer connection for %s", self.db_path)
+        return self._writer_conn
+
+    # Borrowing ----------------------------------------------------------
+    @contextmanager
+    def writer(self) -> Iterator[sqlite3.Connection]:
+        """Yield the writer connection inside a transaction.
+
+        Commits when the outermost ``writer()`` block exits cleanly and rolls
+        back if it raises.
+        """
+        with self._writer_lock:
+            conn = self._get_writer_conn()
+            depth = getattr(self._local, "writer_depth", 0)
+            self._local.writer_depth = depth + 1
+            try:
+                yield conn
+            except BaseException:
+                if depth == 0 and conn.in_transaction:
+                    conn.rollback()
+                raise
+            else:
+                if depth == 0 and conn.in_transaction:
+                    conn.commit()
+            finally:
+                self._local.writer_depth = depth
+
+    @contextmanager
+    def reader(self) -> Iterator[sqlite3.Connection]:
+        """Yield a read connection; returned to the pool on exit."""
+        if getattr(self._local, "writer_depth", 0) > 0:
+            # Same thread is mid-transaction: read through the writer to see its own rows
+            yield self._get_writer_conn()
+            return
+
+        conn = self._acquire_reader()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            with self._readers_lock:
+                # Borrowed before a close(): that generation of connections is gone
+                current = any(conn is c for c in self._reader_conns)
+            if current:
+                self._readers.put(conn)
+            else:
+                conn.close()
+
+    def _acquire_reader(self) -> sqlite3.Connection:
+        while True:
+            try:
+                return self._readers.get_nowait()
+            except Empty:
+                pass
+            with self._readers_lock:
+                if len(self._reader_conns) < self.max_readers:
+                    conn = self._connect()
+                    self._reader_conns.append(conn)
+                    logger.debug(
+                        "Opened reader connection %d/%d for %s",
+                        len(self._reader_conns),
+                        self.max_readers,
+                        self.db_path,
+                    )
+                    return conn
+                readers = self._readers
+            # All readers busy: wait for one to be returned (re-checking after a close())
+            try:
+                return readers.get(timeout=0.1)
+            except Empty:
+                continue
+
+    # Schema bootstrap ---------------------------------------------------
+    def is_initialised(self, key: str) -> bool:
+        return key in self._initialised
+
+    def mark_initialised(self, key: str) -> None:
+        self._initialised.add(key)
+
+    # Lifecycle ----------------------------------------------------------
+    def close(self) -> None:
+        """Close every connection held by the pool; later borrows reconnect."""
+        with self._writer_lock:
+            if self._writer_conn is not None:
+                try:
+                    # Let SQLite refresh planner stats for tables that changed
+                    self._writer_conn.execute("PRAGMA optimize")
+                    self._writer_conn.close()
+                except Exception as e:  # pragma: no cover - defensive
+                    logger.warning(f"Error closing writer connection: {e}")
+                self._writer_conn = None
+        with self._readers_lock:
+            for conn in self._reader_conns:
+                try:
+                    conn.close()
+                except Exception as e:  # pragma: no cover - defensive
+                    logger.warning(f"Error closing reader connection: {e}")
+            self._reader_conns = []
+            self._readers = LifoQueue()
+        self._initialised.clear()
+        logger.debug("Closed connection pool for %s", self.db_path)
+
+
+# Process-wide registry, keyed by resolved database path.
+_pools_lock: Lock = Lock()
+_pools: Dict[str, SQLiteConnectionPool] = {}
+
+
+def _pool_key(db_path: str) -> str:
+    return str(Path(db_path).resolve())
+
+
+def get_connection_pool(db_path: str, **options) -> SQLiteConnectionPool:
+    """Return the shared pool for ``db_path``, creating it on first use.
+
+    Options (readers, mmap_size, cache_size_kib, busy_timeout_ms) only apply
+    when the pool is first created.
+    """
+    key = _pool_key(db_path)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = SQLiteConnectionPool(key, **options)
+            _pools[key] = pool
+            logger.info("SQLite connection pool created for %s (readers=%d)", key, pool.max_readers)
+        return pool
+
+
+def close_connection_pool(db_path: str) -> None:
+    """Close the connections of the shared pool for ``db_path`` if one exists.
+
+    The pool stays registered, so every holder (and later
+    ``get_connection_pool`` callers) reconnects through the same pool.
+    """
+    key = _pool_key(db_path)
+    with _pools_lock:
+        pool = _pools.get(key)
+    if pool is not None:
+        pool.close()
+
+
+__all__ = [
+    "SQLiteConnectionPool",
+    "get_connection_pool",
+    "close_connection_pool",
+]
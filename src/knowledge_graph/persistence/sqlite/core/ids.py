@@ -0,0 +1,64 @@
+"""Deterministic 64-bit row ids for documents, entities and relationships.
+
+Ids are derived from a keyed BLAKE2b digest of the natural key, so the same
+(kb, document, entity) always maps to the same integer regardless of process,
+worker or restart (unlike Python's salted ``hash()``). Values fit SQLite's
+signed 64-bit INTEGER PRIMARY KEY and are never zero.
+"""
+
+from __future__ import annotations
+
+from hashlib import blake2b
+from typing import Any, Optional
+
+# Bump the key to re-namespace every derived id (requires re-ingestion)
+_ID_KEY = b"knowledge_graph.ids.v1"
+_SEPARATOR = "\x1f"
+_MAX_ID = (1 << 63) - 1
+
+
+def stable_id(*parts: Any) -> int:
+    """Return a positive 63-bit integer id for the given key parts."""
+    payload = _SEPARATOR.join("" if p is None else str(p) for p in parts).encode("utf-8")
+    digest = blake2b(payload, digest_size=8, key=_ID_KEY).digest()
+    return (int.from_bytes(digest, "big") & _MAX_ID) or 1
+
+
+def _as_int(value: Any) -> Optional[int]:
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def document_db_id(document_id: Any) -> int:
+    """Database id for a document: numeric ids pass through, others are hashed."""
+    numeric = _as_int(document_id)
+    return numeric if numeric is not None else stable_id("document", document_id)
+
+
+def kb_db_id(kb_id: Any) -> int:
+    """Database id for a knowledge base reference (0 when missing)."""
+    if not kb_id:
+        return 0
+    numeric = _as_int(kb_id)
+    return numeric if numeric is not None else stable_id("kb", kb_id)
+
+
+def entity_db_id(kb_id: Any, document_id: Any, natural_key: Any) -> int:
+    """Database id for an entity identified by ``natural_key`` within a document."""
+    return stable_id("entity", kb_id, document_id, natural_key)
+
+
+def relationship_db_id(kb_id: Any, document_id: Any, source_key: Any, predicate: Any, target_key: Any) -> int:
+    """Database id for a (source, predicate, target) edge within a document."""
+    return stable_id("relationship", kb_id, document_id, source_key, predicate, target_key)
+
+
+__all__ = [
+    "stable_id",
+    "document_db_id",
+    "kb_db_id",
+    "entity_db_id",
+    "relationship_db_id",
+]
@@ -51,6 +51,31 @@ CREATE TABLE IF NOT EXISTS entities (
 );
 """
 
+INSERT_ENTITY = """
+INSERT INTO entities (
+  id, kb_id, document_id, entity_definition_id, entity_type, entity_label, properties
+) VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Ids are deterministic (core.ids), so re-ingesting a document updates rows in place
+UPSERT_ENTITY = INSERT_ENTITY.rstrip() + """
+ON CONFLICT(id) DO UPDATE SET
+  kb_id = excluded.kb_id,
+  document_id = excluded.document_id,
+  entity_type = excluded.entity_type,
+  entity_label = excluded.entity_label,
+  properties = excluded.properties
+"""
+
+# Streaming writes: an entity seen again later in the same load keeps its
+# existing values and only fills gaps (label still defaulted to its key ?8,
+# properties missing from the stored JSON)
+MERGE_ENTITY = INSERT_ENTITY.rstrip() + """
+ON CONFLICT(id) DO UPDATE SET
+  entity_label = CASE WHEN entities.entity_label = ?8 THEN excluded.entity_label ELSE entities.entity_label END,
+  properties = json_patch(excluded.properties, entities.properties)
+"""
+
 CREATE_INDEX_ENTITIES_KB_ID = """
 CREATE INDEX IF NOT EXISTS idx_entities_kb_id ON entities(kb_id);
 """
@@ -91,6 +116,24 @@ CREATE TABLE IF NOT EXISTS relationships (
 );
 """
 
+INSERT_RELATIONSHIP = """
+INSERT INTO relationships (
+  id, kb_id, document_id, relationship_definition_id, relationship_type,
+  source_entity_id, target_entity_id, properties, confidence_score
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+UPSERT_RELATIONSHIP = INSERT_RELATIONSHIP.rstrip() + """
+ON CONFLICT(id) DO UPDATE SET
+  kb_id = excluded.kb_id,
+  document_id = excluded.document_id,
+  relationship_type = excluded.relationship_type,
+  source_entity_id = excluded.source_entity_id,
+  target_entity_id = excluded.target_entity_id,
+  properties = excluded.properties,
+  confidence_score = excluded.confidence_score
+"""
+
 CREATE_INDEX_RELATIONSHIPS_KB_ID = """
 CREATE INDEX IF NOT EXISTS idx_relationships_kb_id ON relationships(kb_id);
 """
@@ -114,3 +157,103 @@ CREATE INDEX IF NOT EXISTS idx_relationships_type ON relationships(relationship_
 CREATE_INDEX_RELATIONSHIPS_DEFINITION_ID = """
 CREATE INDEX IF NOT EXISTS idx_relationships_definition_id ON relationships(relationship_definition_id);
 """
+
+# Targeted deletes for incremental re-ingestion (relationships of a deleted
+# entity go with it through the ON DELETE CASCADE foreign keys)
+DELETE_ENTITY_BY_ID = """
+DELETE FROM entities WHERE id = ?;
+"""
+
+DELETE_RELATIONSHIP_BY_ID = """
+DELETE FROM relationships WHERE id = ?;
+"""
+
+DELETE_DOCUMENT_RELATIONSHIPS = """
+DELETE FROM relationships WHERE document_id = ?;
+"""
+
+DELETE_DOCUMENT_ENTITIES = """
+DELETE FROM entities WHERE document_id = ?;
+"""
+
+# Bulk loads only drop the graph indexes while both tables are empty
+GRAPH_HAS_ROWS = """
+SELECT 1 WHERE EXISTS (SELECT 1 FROM entities) OR EXISTS (SELECT 1 FROM relationships);
+"""
+
+# Copy a document's graph to another document / KB in one statement each;
+# kg_clone_id(document_id, old_id) is registered on the connection by the
+# repository and maps every source row id to a stable id in the target
+CLONE_DOCUMENT_ENTITIES = """
+INSERT INTO entities (
+  id, kb_id, document_id, entity_definition_id, entity_type, entity_label, source_row_index, properties
+)
+SELECT kg_clone_id(?, id), ?, ?, entity_definition_id, entity_type, entity_label, source_row_index, properties
+FROM entities
+WHERE document_id = ?;
+"""
+
+CLONE_DOCUMENT_RELATIONSHIPS = """
+INSERT INTO relationships (
+  id, kb_id, document_id, relationship_definition_id, relationship_type,
+  source_entity_id, target_entity_id, properties, confidence_score
+)
+SELECT kg_clone_id(?, id), ?, ?, relationship_definition_id, relationship_type,
+  kg_clone_id(?, source_entity_id), kg_clone_id(?, target_entity_id), properties, confidence_score
+FROM relationships
+WHERE document_id = ?;
+"""
+
+# Snapshot reads (filters, keyset and LIMIT are appended by the repository)
+SELECT_SNAPSHOT_NODES = """
+SELECT e.id, e.entity_label, e.entity_type, e.properties, e.document_id, e.kb_id
+FROM entities e
+""".strip()
+
+SELECT_SNAPSHOT_EDGES = """
+SELECT r.id, r.relationship_type, r.source_entity_id, r.target_entity_id,
+       r.properties, r.confidence_score, r.document_id, r.kb_id
+FROM relationships r
+""".strip()
+
+# Snapshot and neighbor indexes. The (kb_id, document_id, id) indexes serve
+# snapshots filtered by both kb and document in id order; kb-only keyset pages
+# use the kb_id indexes instead ((kb_id, rowid), i.e. (kb_id, id)). Snapshots
+# select every column, so none of these cover them: each matched row is read
+# from the table. The (endpoint, type, other endpoint) indexes answer
+# neighbor queries without touching the table and back the FK cascades on
+# entity delete.
+CREATE_INDEX_ENTITIES_KB_DOCUMENT = """
+CREATE INDEX IF NOT EXISTS idx_entities_kb_document ON entities(kb_id, document_id, id);
+"""
+
+CREATE_INDEX_RELATIONSHIPS_KB_DOCUMENT = """
+CREATE INDEX IF NOT EXISTS idx_relationships_kb_document ON relationships(kb_id, document_id, id);
+"""
+
+CREATE_INDEX_RELATIONSHIPS_OUTGOING = """
+CREATE INDEX IF NOT EXISTS idx_relationships_outgoing ON relationships(source_entity_id, relationship_type, target_entity_id);
+"""
+
+CREATE_INDEX_RELATIONSHIPS_INCOMING = """
+CREATE INDEX IF NOT EXISTS idx_relationships_incoming ON relationships(target_entity_id, relationship_type, source_entity_id);
+"""
+
+# Graph indexes installed by SQLiteGraphRepository.create_indexes(). The single
+# column source_entity_id / target_entity_id indexes are left out: the
+# outgoing/incoming indexes share their leading column and supersede them.
+GRAPH_INDEXES = (
+    CREATE_INDEX_ENTITIES_KB_ID,
+    CREATE_INDEX_ENTITIES_KB_DOCUMENT,
+    CREATE_INDEX_ENTITIES_DOCUMENT_ID,
+    CREATE_INDEX_ENTITIES_DEFINITION_ID,
+    CREATE_INDEX_ENTITIES_TYPE,
+    CREATE_INDEX_ENTITIES_TYPE_LABEL,
+    CREATE_INDEX_RELATIONSHIPS_KB_ID,
+    CREATE_INDEX_RELATIONSHIPS_KB_DOCUMENT,
+    CREATE_INDEX_RELATIONSHIPS_DOCUMENT_ID,
+    CREATE_INDEX_RELATIONSHIPS_OUTGOING,
+    CREATE_INDEX_RELATIONSHIPS_INCOMING,
+    CREATE_INDEX_RELATIONSHIPS_TYPE,
+    CREATE_INDEX_RELATIONSHIPS_DEFINITION_ID,
+)
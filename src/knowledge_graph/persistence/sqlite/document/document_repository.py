@@ -6,13 +6,15 @@ This adapter implements direct SQL operations for persisting and retrieving
 documents and chunks without relying on a shared repository.
 """
 
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 import sqlite3
 import json
 import logging
 from pathlib import Path
 from datetime import datetime
 
+from ..core.connection import SQLiteConnectionPool, get_connection_pool
+from ..core.ids import document_db_id
 from .tabular.tabular_doc_repository import SQLiteTabularDocumentRepository
 from .pdf.pdf_doc_repository import SQLitePdfDocumentRepository
 from ....data_structs.document import Document, DocumentNew
@@ -21,6 +23,12 @@ from .queries import (
     CREATE_DOCUMENTS_TABLE,
     CREATE_DOCUMENT_ONTOLOGIES_TABLE,
     SAVE_DOCUMENT,
+    DOCUMENTS_ADDED_COLUMNS,
+    CREATE_INDEX_DOCUMENTS_DEDUP,
+    MARK_DOCUMENT_COMPLETED,
+    SELECT_DUPLICATE_DOCUMENT,
+    CLONE_DOCUMENT,
+    SELECT_DOCUMENT_KB_ID,
 )
 
 logger = logging.getLogger(__name__)
@@ -29,9 +37,10 @@ logger = logging.getLogger(__name__)
 class SQLiteDocumentRepository():
     """SQLite implementation of DocumentRepository port."""
     
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, pool: Optional[SQLiteConnectionPool] = None):
         self.db_path = db_path
         self._ensure_db_dir()
+        self._pool = pool or get_connection_pool(db_path)
     
     def _ensure_db_dir(self) -> None:
         """Ensure the database directory exists."""
@@ -40,28 +49,33 @@ class SQLiteDocumentRepository():
     
     def create_tables(self) -> bool:
         """Ensure tables are initialized."""
+        if self._pool.is_initialised("documents"):
+            return True
         logger.info("Creating document tables...")
-        tabular_document_repository = SQLiteTabularDocumentRepository(self.db_path)
+        tabular_document_repository = SQLiteTabularDocumentRepository(self.db_path, pool=self._pool)
         logger.info("Creating tabular document tables...")
         tabular_document_repository.create_tables()
         logger.info("Creating pdf document tables...")
-        pdf_document_repository = SQLitePdfDocumentRepository(self.db_path)
+        pdf_document_repository = SQLitePdfDocumentRepository(self.db_path, pool=self._pool)
         pdf_document_repository.create_tables()
         logger.info("Creating document ontologies tables...")
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._pool.writer() as conn:
                 cur = conn.cursor()
-                cur.execute("PRAGMA foreign_keys=ON")
                 
                 # Create pdf_document table
                 cur.execute(CREATE_DOCUMENTS_TABLE)
+                existing = {row[1] for row in cur.execute("PRAGMA table_info(documents)")}
+                for column, decl in DOCUMENTS_ADDED_COLUMNS.items():
+                    if column not in existing:
+                        cur.execute(f"ALTER TABLE documents ADD COLUMN {column} {decl}")
+                cur.execute(CREATE_INDEX_DOCUMENTS_DEDUP)
                 # Create document_ontologies table
                 cur.execute(CREATE_DOCUMENT_ONTOLOGIES_TABLE)
-                
-                
-                conn.commit()
-                logger.info("Document tables created/verified")
-                return True
+
+            self._pool.mark_initialised("documents")
+            logger.info("Document tables created/verified")
+            return True
         except Exception as e:
             logger.error(f"Error creating document tables: {e}")
             return False
@@ -69,10 +83,9 @@ class SQLiteDocumentRepository():
     def save_pdf_document(self, document: Document) -> bool:
         """Save a PDF document to the database."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._pool.writer() as conn:
                 cur = conn.cursor()
                 cur.execute(SAVE_DOCUMENT, (document.id, document.kb_id, document.file_name, document.file_path, document.file_type, document.file_size, document.file_hash, document.chunks))
-                conn.commit()
                 return True
         except Exception as e:
             logger.error(f"Error saving PDF document: {e}")
@@ -82,10 +95,9 @@ class SQLiteDocumentRepository():
     def save_document_ontology(self, document_ontology: DocumentOntology) -> bool:
         """Save a document ontology to the database."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._pool.writer() as conn:
                 cur = conn.cursor()
                 cur.execute(UPSERT_DOCUMENT_ONTOLOGY, (document_ontology.id, document_ontology.document_id, document_ontology.specification, document_ontology.status, document_ontology.version, document_ontology.proposed_by, document_ontology.reviewed_by, document_ontology.created_at, document_ontology.approved_at, document_ontology.is_canonical))
-                conn.commit()
                 return True
         except Exception as e:
             logger.error(f"Error saving document ontology: {e}")
@@ -94,7 +106,7 @@ class SQLiteDocumentRepository():
     def save_document(self, document: DocumentNew) -> bool:
         """Insert or update a document (and associated chunks if present)."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._pool.writer() as conn:
                 cur = conn.cursor()
                 cur.execute(SAVE_DOCUMENT, (
                             document.id,
@@ -108,7 +120,6 @@ class SQLiteDocumentRepository():
                             document.status,
                             document.processed_at,
                         ))
-                conn.commit()
                 return True
         except Exception as e:
             logger.error(f"Error saving document: {e}")
@@ -117,14 +128,10 @@ class SQLiteDocumentRepository():
     def get_document(self, document_id: str) -> Optional[Document]:
         """Retrieve a document by its identifier."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._pool.reader() as conn:
                 cur = conn.cursor()
                 
-                # Try to convert to int, otherwise use hash
-                try:
-                    doc_id_int = int(document_id)
-                except (ValueError, TypeError):
-                    doc_id_int = abs(hash(document_id)) % (10 ** 9)
+                doc_id_int = document_db_id(document_id)
                 
                 # Get document
                 cur.execute(
@@ -212,6 +219,53 @@ class SQLiteDocumentRepository():
             logger.error(f"Error retrieving document {document_id}: {e}")
             return None
     
+    # Document-level dedup ------------------------------------------------
+    def mark_document_completed(self, document_id: int, *, file_hash: Optional[str], pipeline_fingerprint: str) -> bool:
+        """Mark a document completed and record the content hash and pipeline fingerprint it was built with."""
+        try:
+            with self._pool.writer() as conn:
+                cur = conn.execute(MARK_DOCUMENT_COMPLETED, (file_hash, pipeline_fingerprint, document_id))
+                return cur.rowcount > 0
+        except Exception as e:
+            logger.error(f"Error marking document {document_id} completed: {e}")
+            return False
+
+    def find_duplicate_document(self, file_hash: str, pipeline_fingerprint: str, kb_id: int) -> Optional[Dict[str, Any]]:
+        """Completed document with the same content and pipeline fingerprint, preferring ``kb_id``."""
+        try:
+            with self._pool.reader() as conn:
+                row = conn.execute(SELECT_DUPLICATE_DOCUMENT, (file_hash, pipeline_fingerprint, kb_id)).fetchone()
+        except Exception as e:
+            logger.error(f"Error looking up duplicate of {file_hash}: {e}")
+            return None
+        if row is None:
+            return None
+        return {"document_id": int(row[0]), "kb_id": int(row[1]), "file_name": row[2]}
+
+    def clone_document(self, source_document_id: int, document_id: int, kb_id: int, *, file_path: Optional[str] = None) -> bool:
+        """Copy a document row under a new id / KB. Joins the caller's write transaction when one is open.
+
+        Unlike the other methods, errors are logged and re-raised so the
+        caller's transaction (e.g. the graph clone) rolls back with it.
+        """
+        try:
+            with self._pool.writer() as conn:
+                cur = conn.execute(CLONE_DOCUMENT, (document_id, kb_id, file_path, source_document_id))
+                return cur.rowcount > 0
+        except Exception as e:
+            logger.error(f"Error cloning document {source_document_id} to {document_id}: {e}")
+            raise
+
+    def get_document_kb_id(self, document_id: int) -> Optional[int]:
+        """Knowledge base of a ``documents`` row; None when the document does not exist."""
+        try:
+            with self._pool.reader() as conn:
+                row = conn.execute(SELECT_DOCUMENT_KB_ID, (document_id,)).fetchone()
+                return int(row[0]) if row else None
+        except Exception as e:
+            logger.error(f"Error retrieving knowledge base of document {document_id}: {e}")
+            return None
+
     def update_document(self, document: Document) -> bool:
         """Update an existing document."""
         # save_document uses INSERT ... ON CONFLICT DO UPDATE, so it handles updates
@@ -220,19 +274,13 @@ class SQLiteDocumentRepository():
     def delete_document(self, document_id: str) -> bool:
         """Delete a document and its related rows."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._pool.writer() as conn:
                 cur = conn.cursor()
-                cur.execute("PRAGMA foreign_keys=ON")
                 
-                # Try to convert to int, otherwise use hash
-                try:
-                    doc_id_int = int(document_id)
-                except (ValueError, TypeError):
-                    doc_id_int = abs(hash(document_id)) % (10 ** 9)
+                doc_id_int = document_db_id(document_id)
                 
                 # Delete document (chunks will be deleted via CASCADE)
                 cur.execute("DELETE FROM pdf_document WHERE id = ?", (doc_id_int,))
-                conn.commit()
                 
                 logger.debug(f"Document deleted: {document_id}")
                 return cur.rowcount > 0
@@ -243,7 +291,7 @@ class SQLiteDocumentRepository():
     def list_documents(self, *, kb_id: Optional[str] = None) -> List[str]:
         """List document identifiers (optionally filtered by knowledge base)."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._pool.reader() as conn:
                 cur = conn.cursor()
                 
                 if kb_id:
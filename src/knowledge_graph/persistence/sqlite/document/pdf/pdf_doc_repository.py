@@ -1,5 +1,6 @@
 import sqlite3
-from typing import Any
+from typing import Any, Optional
+from ...core.connection import SQLiteConnectionPool, get_connection_pool
 from .queries import (
     CREATE_PDF_DOCUMENT_TABLE,
     CREATE_PDF_DOCUMENT_CHUNKS_TABLE,
@@ -13,15 +14,17 @@ logger = logging.getLogger(__name__)
 
 
 class SQLitePdfDocumentRepository():
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, pool: Optional[SQLiteConnectionPool] = None):
         self.db_path = db_path
+        self._pool = pool or get_connection_pool(db_path)
 
     def create_tables(self) -> bool:
+        if self._pool.is_initialised("pdf_documents"):
+            return True
         logger.info("Creating pdf document table if it doesn't exist")
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._pool.writer() as conn:
                 cur = conn.cursor()
-                cur.execute("PRAGMA foreign_keys=ON")
 
                 # csv_profiles
                 logger.info("Creating pdf_document table if it doesn't exist")
@@ -39,7 +42,6 @@ class SQLitePdfDocumentRepository():
                 logger.info("Creating indexes for pdf_document_chunks table")
                 cur.execute(CREATE_INDEX_PDF_DOCUMENT_CHUNKS_DOC_IDX)
 
-                conn.commit()
                 return True
         except Exception as e:
             logger.error(f"Error creating table: {e}")
@@ -49,7 +51,7 @@ class SQLitePdfDocumentRepository():
 
     def save_pdf_document(self, pdf_document: Any) -> bool:
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._pool.writer() as conn:
                 cur = conn.cursor()
                 cur.execute(
                     UPSERT_PDF_DOCUMENT,
@@ -64,7 +66,6 @@ class SQLitePdfDocumentRepository():
                         pdf_document.chunks,
                     ),
                 )
-                conn.commit()
                 return True
         except Exception as e:
             logger.error(f"Error saving pdf document: {e}")
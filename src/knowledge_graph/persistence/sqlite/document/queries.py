@@ -57,6 +57,49 @@ ON CONFLICT(id) DO UPDATE SET
   processed_at = excluded.processed_at;
 """
 
+# Document-level dedup: content hash + pipeline configuration fingerprint of
+# the last completed run. Columns are added to older databases by create_tables.
+DOCUMENTS_ADDED_COLUMNS = {
+    "pipeline_fingerprint": "TEXT",
+}
+
+CREATE_INDEX_DOCUMENTS_DEDUP = """
+CREATE INDEX IF NOT EXISTS idx_documents_dedup ON documents(file_hash, pipeline_fingerprint);
+"""
+
+MARK_DOCUMENT_COMPLETED = """
+UPDATE documents
+SET status = 'completed',
+    processed_at = CURRENT_TIMESTAMP,
+    file_hash = COALESCE(?, file_hash),
+    pipeline_fingerprint = ?
+WHERE id = ?;
+"""
+
+# Completed documents with the same content and pipeline, the given KB first
+SELECT_DUPLICATE_DOCUMENT = """
+SELECT id, kb_id, file_name
+FROM documents
+WHERE file_hash = ? AND pipeline_fingerprint = ? AND status = 'completed'
+ORDER BY (kb_id = ?) DESC, processed_at DESC
+LIMIT 1;
+"""
+
+CLONE_DOCUMENT = """
+INSERT INTO documents (
+  id, kb_id, ontology_id, file_name, file_path, file_type, file_size, file_hash,
+  status, processed_at, pipeline_fingerprint
+)
+SELECT ?, ?, ontology_id, file_name, COALESCE(?, file_path), file_type, file_size, file_hash,
+  status, CURRENT_TIMESTAMP, pipeline_fingerprint
+FROM documents
+WHERE id = ?;
+"""
+
+SELECT_DOCUMENT_KB_ID = """
+SELECT kb_id FROM documents WHERE id = ?;
+"""
+
 UPDATE_DOCUMENT_ONTOLOGY_ID = """
 UPDATE documents SET ontology_id = ? WHERE id = ?;
 """
@@ -39,15 +39,20 @@ RETURNING id;
 
 
 
-# CSV mappings: mapping spec from CSV to KG ontology
+# CSV mappings: mapping spec from CSV to KG ontology. schema_fingerprint
+# (CSVProfile.schema_fingerprint) lets later uploads with the same schema
+# reuse the ontology + mapping; hit_count/last_hit_at record that reuse.
 CREATE_CSV_MAPPINGS_TABLE = """
 CREATE TABLE IF NOT EXISTS csv_mappings (
-  id           INTEGER PRIMARY KEY,
-  ontology_id  INTEGER NOT NULL UNIQUE,
-  document_id  INTEGER NOT NULL,
-  mapping_spec TEXT    NOT NULL CHECK (json_valid(mapping_spec)),
-  created_at   TEXT DEFAULT (CURRENT_TIMESTAMP),
-  validated_at TEXT,
+  id                 INTEGER PRIMARY KEY,
+  ontology_id        INTEGER NOT NULL UNIQUE,
+  document_id        INTEGER NOT NULL,
+  mapping_spec       TEXT    NOT NULL CHECK (json_valid(mapping_spec)),
+  created_at         TEXT DEFAULT (CURRENT_TIMESTAMP),
+  validated_at       TEXT,
+  schema_fingerprint TEXT,
+  hit_count          INTEGER NOT NULL DEFAULT 0,
+  last_hit_at        TEXT,
   FOREIGN KEY (ontology_id) REFERENCES document_ontologies(id) ON DELETE CASCADE,
   FOREIGN KEY (document_id) REFERENCES documents(id)          ON DELETE CASCADE
 );
@@ -61,12 +66,83 @@ CREATE_INDEX_CSV_MAPPINGS_ONTOLOGY = """
 CREATE INDEX IF NOT EXISTS idx_csv_mappings_ontology ON csv_mappings(ontology_id);
 """
 
+# Columns added after csv_mappings first shipped; added to older databases on init
+CSV_MAPPINGS_ADDED_COLUMNS = (
+    ("schema_fingerprint", "TEXT"),
+    ("hit_count", "INTEGER NOT NULL DEFAULT 0"),
+    ("last_hit_at", "TEXT"),
+)
+
+CREATE_INDEX_CSV_MAPPINGS_FINGERPRINT = """
+CREATE INDEX IF NOT EXISTS idx_csv_mappings_fingerprint ON csv_mappings(schema_fingerprint, id);
+"""
+
 INSERT_CSV_MAPPING = """
-INSERT INTO csv_mappings (ontology_id, document_id, mapping_spec, validated_at)
-VALUES (?, ?, ?, ?)
+INSERT INTO csv_mappings (ontology_id, document_id, mapping_spec, validated_at, schema_fingerprint)
+VALUES (?, ?, ?, ?, ?)
 ON CONFLICT(ontology_id) DO UPDATE SET
   document_id = excluded.document_id,
   mapping_spec = excluded.mapping_spec,
-  validated_at = excluded.validated_at;
+  validated_at = excluded.validated_at,
+  schema_fingerprint = excluded.schema_fingerprint
+RETURNING id;
+"""
+
+# Most recent mapping for a schema, with the ontology it was compiled from
+SELECT_CSV_MAPPING_BY_FINGERPRINT = """
+SELECT m.id, m.ontology_id, m.document_id, m.mapping_spec, o.specification, m.hit_count
+FROM csv_mappings m
+JOIN document_ontologies o ON o.id = m.ontology_id
+WHERE m.schema_fingerprint = ?
+ORDER BY m.id DESC
+LIMIT 1;
 """
 
+RECORD_CSV_MAPPING_HIT = """
+UPDATE csv_mappings
+SET hit_count = hit_count + 1, last_hit_at = CURRENT_TIMESTAMP
+WHERE id = ?;
+"""
+
+SELECT_CSV_MAPPING_CACHE_STATS = """
+SELECT COUNT(*), COALESCE(SUM(hit_count), 0)
+FROM csv_mappings
+WHERE schema_fingerprint IS NOT NULL;
+"""
+
+
+# Per-row state for incremental CSV ingestion: content hash per mapped row key
+# plus the graph rows (entity / relationship ids as packed int64 blobs) the
+# row produced, so a re-upload can be diffed and only the delta applied.
+CREATE_CSV_ROW_STATE_TABLE = """
+CREATE TABLE IF NOT EXISTS csv_row_state (
+  document_id      INTEGER NOT NULL,
+  row_key          TEXT    NOT NULL,
+  row_hash         INTEGER NOT NULL,
+  entity_ids       BLOB,
+  relationship_ids BLOB,
+  PRIMARY KEY (document_id, row_key),
+  FOREIGN KEY (document_id) REFERENCES documents(id) ON DELETE CASCADE
+) WITHOUT ROWID;
+"""
+
+SELECT_CSV_ROW_HASHES = """
+SELECT row_key, row_hash FROM csv_row_state WHERE document_id = ?;
+"""
+
+SELECT_CSV_ROW_CONTRIBUTIONS = """
+SELECT row_key, entity_ids, relationship_ids FROM csv_row_state WHERE document_id = ?;
+"""
+
+UPSERT_CSV_ROW_STATE = """
+INSERT INTO csv_row_state (document_id, row_key, row_hash, entity_ids, relationship_ids)
+VALUES (?, ?, ?, ?, ?)
+ON CONFLICT(document_id, row_key) DO UPDATE SET
+  row_hash = excluded.row_hash,
+  entity_ids = excluded.entity_ids,
+  relationship_ids = excluded.relationship_ids;
+"""
+
+DELETE_CSV_ROW_STATE = """
+DELETE FROM csv_row_state WHERE document_id = ? AND row_key = ?;
+"""
@@ -1,6 +1,8 @@
 import sqlite3
 import json
-from typing import Any, Optional
+from array import array
+from typing import Any, Collection, Dict, Iterable, Optional, Set, Tuple
+from ...core.connection import SQLiteConnectionPool, get_connection_pool
 from ..queries import (
     CREATE_DOCUMENT_ONTOLOGIES_TABLE,
     INSERT_DOCUMENT_ONTOLOGY,
@@ -11,22 +13,34 @@ from .queries import (
     CREATE_CSV_PROFILES_TABLE,
     UPSERT_CSV_PROFILE,
     CREATE_CSV_MAPPINGS_TABLE,
+    CSV_MAPPINGS_ADDED_COLUMNS,
+    CREATE_INDEX_CSV_MAPPINGS_FINGERPRINT,
     INSERT_CSV_MAPPING,
+    SELECT_CSV_MAPPING_BY_FINGERPRINT,
+    RECORD_CSV_MAPPING_HIT,
+    SELECT_CSV_MAPPING_CACHE_STATS,
+    CREATE_CSV_ROW_STATE_TABLE,
+    SELECT_CSV_ROW_HASHES,
+    SELECT_CSV_ROW_CONTRIBUTIONS,
+    UPSERT_CSV_ROW_STATE,
+    DELETE_CSV_ROW_STATE,
 )
 import logging
 
 logger = logging.getLogger(__name__)
 
 class SQLiteTabularDocumentRepository():
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, pool: Optional[SQLiteConnectionPool] = None):
         self.db_path = db_path
+        self._pool = pool or get_connection_pool(db_path)
 
     def create_tables(self) -> bool:
+        if self._pool.is_initialised("tabular_documents"):
+            return True
         logger.info("📦 [INIT] Creating tabular document tables if they don't exist")
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._pool.writer() as conn:
                 cur = conn.cursor()
-                cur.execute("PRAGMA foreign_keys=ON")
 
                 # csv_profiles
                 logger.info("  → Creating csv_profiles table...")
@@ -35,6 +49,16 @@ class SQLiteTabularDocumentRepository():
                 # csv_mappings
                 logger.info("  → Creating csv_mappings table...")
                 cur.execute(CREATE_CSV_MAPPINGS_TABLE)
+                existing = {row[1] for row in cur.execute("PRAGMA table_info(csv_mappings)")}
+                for column, decl in CSV_MAPPINGS_ADDED_COLUMNS:
+                    if column not in existing:
+                        logger.info(f"  → Adding csv_mappings.{column}...")
+                        cur.execute(f"ALTER TABLE csv_mappings ADD COLUMN {column} {decl}")
+                cur.execute(CREATE_INDEX_CSV_MAPPINGS_FINGERPRINT)
+
+                # csv_row_state (incremental ingestion)
+                logger.info("  → Creating csv_row_state table...")
+                cur.execute(CREATE_CSV_ROW_STATE_TABLE)
 
                 # document_ontologies table + indexes
                 logger.info("  → Creating document_ontologies table...")
@@ -43,9 +67,9 @@ class SQLiteTabularDocumentRepository():
                 cur.execute(CREATE_INDEX_DOCUMENT_ONTOLOGIES_DOCUMENT_VERSION)
                 cur.execute(CREATE_INDEX_DOCUMENT_ONTOLOGIES_STATUS)
 
-                conn.commit()
-                logger.info("✅ [INIT] Tabular document tables created successfully")
-                return True
+            self._pool.mark_initialised("tabular_documents")
+            logger.info("✅ [INIT] Tabular document tables created successfully")
+            return True
         except Exception as e:
             logger.error(f"❌ [INIT] Error creating tabular document tables: {e}", exc_info=True)
             return False
@@ -73,9 +97,8 @@ class SQLiteTabularDocumentRepository():
             
         logger.info(f"💾 [SAVE] Starting CSV profile save for document_id={doc_id}")
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._pool.writer() as conn:
                 cur = conn.cursor()
-                cur.execute("PRAGMA foreign_keys=ON")
                 
                 # Verify document exists (foreign key constraint check)
                 cur.execute("SELECT id FROM documents WHERE id = ?", (doc_id,))
@@ -111,6 +134,13 @@ class SQLiteTabularDocumentRepository():
                             "distinct": getattr(col, "distinct", 0),
                             "inferred_type": col.inferred_type,
                             "example_values": col.example_values,
+                            "distinct_exact": getattr(col, "distinct_exact", True),
+                            "min_value": getattr(col, "min_value", None),
+                            "max_value": getattr(col, "max_value", None),
+                            "min_length": getattr(col, "min_length", None),
+                            "max_length": getattr(col, "max_length", None),
+                            "length_histogram": getattr(col, "length_histogram", {}),
+                            "sample_values": getattr(col, "sample_values", []),
                         }
                         for col in profile.columns
                     ]
@@ -167,7 +197,6 @@ class SQLiteTabularDocumentRepository():
                     else:
                         raise
                 
-                conn.commit()
                 
                 # Verify the save worked by checking if the profile exists
                 cur.execute("SELECT id FROM csv_profiles WHERE document_id = ?", (doc_id,))
@@ -200,9 +229,8 @@ class SQLiteTabularDocumentRepository():
         logger.debug(f"  → Ontology data: status={doc_ontology.status}, version={doc_ontology.version}, is_canonical={doc_ontology.is_canonical}")
         
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._pool.writer() as conn:
                 cur = conn.cursor()
-                cur.execute("PRAGMA foreign_keys=ON")
                 
                 # Convert specification dict to JSON string
                 spec_json = json.dumps(doc_ontology.specification) if doc_ontology.specification else "{}"
@@ -232,7 +260,6 @@ class SQLiteTabularDocumentRepository():
                         is_canonical_int,
                     ),
                 )
-                conn.commit()
                 
                 # Set the id on the ontology object
                 ontology_id = cur.lastrowid
@@ -244,3 +271,116 @@ class SQLiteTabularDocumentRepository():
             logger.error(f"❌ [SAVE] Failed to save document ontology for document_id={doc_id}: {e}", exc_info=True)
             logger.error(f"  → Error details: {type(e).__name__}: {str(e)}")
             return None
+
+    def save_csv_mapping(
+        self,
+        *,
+        ontology_id: int,
+        document_id: int,
+        mapping_spec: Dict[str, Any],
+        schema_fingerprint: Optional[str] = None,
+        validated_at: Optional[str] = None,
+    ) -> Optional[int]:
+        """Save the mapping compiled from an ontology, keyed by the CSV's schema fingerprint.
+
+        Returns the csv_mappings row id, or None on error.
+        """
+        logger.info(f"💾 [SAVE] Saving CSV mapping for document_id={document_id}, ontology_id={ontology_id}")
+        try:
+            with self._pool.writer() as conn:
+                row = conn.execute(
+                    INSERT_CSV_MAPPING,
+                    (ontology_id, document_id, json.dumps(mapping_spec), validated_at, schema_fingerprint),
+                ).fetchone()
+            mapping_id = row[0] if row else None
+            logger.info(f"✅ [SAVE] CSV mapping saved: mapping_id={mapping_id}, fingerprint={schema_fingerprint}")
+            return mapping_id
+        except Exception as e:
+            logger.error(f"❌ [SAVE] Failed to save CSV mapping for document_id={document_id}: {e}", exc_info=True)
+            return None
+
+    def find_csv_mapping_by_fingerprint(self, schema_fingerprint: str) -> Optional[Dict[str, Any]]:
+        """Return the latest mapping + ontology saved for a schema fingerprint, or None.
+
+        The returned dict has keys 'mapping_id', 'ontology_id', 'document_id',
+        'mapping_spec', 'ontology_specification' and 'hit_count'.
+        """
+        try:
+            with self._pool.reader() as conn:
+                row = conn.execute(SELECT_CSV_MAPPING_BY_FINGERPRINT, (schema_fingerprint,)).fetchone()
+        except Exception as e:
+            logger.error(f"❌ [LOAD] CSV mapping lookup failed for fingerprint={schema_fingerprint}: {e}", exc_info=True)
+            return None
+        if row is None:
+            return None
+        return {
+            "mapping_id": row[0],
+            "ontology_id": row[1],
+            "document_id": row[2],
+            "mapping_spec": json.loads(row[3]),
+            "ontology_specification": json.loads(row[4]),
+            "hit_count": row[5],
+        }
+
+    def record_csv_mapping_hit(self, mapping_id: int) -> None:
+        """Count one reuse of a cached mapping."""
+        try:
+            with self._pool.writer() as conn:
+                conn.execute(RECORD_CSV_MAPPING_HIT, (mapping_id,))
+        except Exception as e:
+            logger.warning(f"Failed to record hit for csv mapping {mapping_id}: {e}")
+
+    def csv_mapping_cache_stats(self) -> Dict[str, int]:
+        """Number of fingerprinted mappings and how often they were reused."""
+        with self._pool.reader() as conn:
+            entries, hits = conn.execute(SELECT_CSV_MAPPING_CACHE_STATS).fetchone()
+        return {"entries": int(entries), "hits": int(hits)}
+
+    # Incremental ingestion row state ------------------------------------
+    @staticmethod
+    def _pack_ids(ids: Iterable[int]) -> bytes:
+        return array("q", ids).tobytes()
+
+    @staticmethod
+    def _unpack_ids(blob: Optional[bytes]) -> array:
+        ids = array("q")
+        if blob:
+            ids.frombytes(blob)
+        return ids
+
+    def load_csv_row_hashes(self, document_id: int) -> Dict[str, int]:
+        """Row key -> content hash recorded by the last ingestion of ``document_id``."""
+        with self._pool.reader() as conn:
+            return dict(conn.execute(SELECT_CSV_ROW_HASHES, (document_id,)))
+
+    def load_csv_row_contributions(self, document_id: int, row_keys: Collection[str]) -> Tuple[Set[int], Set[int]]:
+        """Entity and relationship ids produced by the given row keys at the last ingestion."""
+        entity_ids: Set[int] = set()
+        relationship_ids: Set[int] = set()
+        with self._pool.reader() as conn:
+            for row_key, entities, relationships in conn.execute(SELECT_CSV_ROW_CONTRIBUTIONS, (document_id,)):
+                if row_key in row_keys:
+                    entity_ids.update(self._unpack_ids(entities))
+                    relationship_ids.update(self._unpack_ids(relationships))
+        return entity_ids, relationship_ids
+
+    def save_csv_row_state(
+        self,
+        document_id: int,
+        rows: Iterable[Tuple[str, int, Iterable[int], Iterable[int]]],
+        *,
+        deleted: Iterable[str] = (),
+    ) -> int:
+        """Upsert (row key, hash, entity ids, relationship ids) rows and drop ``deleted`` keys.
+
+        Joins the caller's write transaction when one is open on this thread.
+        Returns the number of rows upserted.
+        """
+        payload = [
+            (document_id, row_key, row_hash, self._pack_ids(entities), self._pack_ids(relationships))
+            for row_key, row_hash, entities, relationships in rows
+        ]
+        with self._pool.writer() as conn:
+            conn.executemany(DELETE_CSV_ROW_STATE, [(document_id, row_key) for row_key in deleted])
+            conn.executemany(UPSERT_CSV_ROW_STATE, payload)
+        return len(payload)
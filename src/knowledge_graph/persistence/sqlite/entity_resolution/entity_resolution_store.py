@@ -12,6 +12,7 @@ import logging
 from pathlib import Path
 
 from ....ports.entity_resolution_store import EntityResolutionRepository
+from ..core.connection import SQLiteConnectionPool, get_connection_pool
 from ....entity_resolution import persist as er_persist
 
 logger = logging.getLogger(__name__)
@@ -20,8 +21,9 @@ logger = logging.getLogger(__name__)
 class _DbAdapter:
     """Minimal adapter to provide what persist functions expect from DatabaseClient."""
     
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, pool: Optional[SQLiteConnectionPool] = None):
         self.db_path = db_path
+        self.pool = pool or get_connection_pool(db_path)
         # Create a mock sqlite_service with repository
         self.sqlite_service = type('obj', (object,), {
             'repository': type('obj', (object,), {'db_path': db_path})()
@@ -29,10 +31,10 @@ class _DbAdapter:
 
 
 class SQLiteEntityResolutionRepository(EntityResolutionRepository):
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, pool: Optional[SQLiteConnectionPool] = None):
         self.db_path = db_path
         self._ensure_db_dir()
-        self._db_adapter = _DbAdapter(db_path)
+        self._db_adapter = _DbAdapter(db_path, pool=pool)
     
     def _ensure_db_dir(self) -> None:
         """Ensure the database directory exists."""
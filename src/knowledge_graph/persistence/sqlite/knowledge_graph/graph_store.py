@@ -6,85 +6,158 @@ This adapter implements direct SQL operations for persisting and querying
 knowledge graphs without relying on a shared repository.
 """
 
-from typing import Optional, Dict, Any
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, Iterable, Iterator, List, Set, Tuple
 import sqlite3
 import json
 import logging
+import time
 from pathlib import Path
 from datetime import datetime
 
 from ....ports.graph_repository import GraphRepository
+from ..core.connection import SQLiteConnectionPool, get_connection_pool
+from ..core.ids import document_db_id, entity_db_id, kb_db_id, relationship_db_id, stable_id
 from ..core.queries import (
+    CLONE_DOCUMENT_ENTITIES,
+    CLONE_DOCUMENT_RELATIONSHIPS,
     CREATE_ENTITIES_TABLE,
     CREATE_RELATIONSHIPS_TABLE,
-    CREATE_INDEX_ENTITIES_KB_ID,
-    CREATE_INDEX_ENTITIES_DOCUMENT_ID,
-    CREATE_INDEX_ENTITIES_DEFINITION_ID,
-    CREATE_INDEX_ENTITIES_TYPE,
-    CREATE_INDEX_ENTITIES_TYPE_LABEL,
-    CREATE_INDEX_RELATIONSHIPS_KB_ID,
-    CREATE_INDEX_RELATIONSHIPS_DOCUMENT_ID,
-    CREATE_INDEX_RELATIONSHIPS_SOURCE_ID,
-    CREATE_INDEX_RELATIONSHIPS_TARGET_ID,
-    CREATE_INDEX_RELATIONSHIPS_TYPE,
-    CREATE_INDEX_RELATIONSHIPS_DEFINITION_ID,
+    DELETE_DOCUMENT_ENTITIES,
+    DELETE_DOCUMENT_RELATIONSHIPS,
+    DELETE_ENTITY_BY_ID,
+    DELETE_RELATIONSHIP_BY_ID,
+    GRAPH_HAS_ROWS,
+    GRAPH_INDEXES,
+    MERGE_ENTITY,
+    SELECT_SNAPSHOT_NODES,
+    SELECT_SNAPSHOT_EDGES,
+    UPSERT_ENTITY,
+    UPSERT_RELATIONSHIP,
 )
 
 logger = logging.getLogger(__name__)
 
+# Rows per executemany() call on the bulk write path
+DEFAULT_WRITE_BATCH_SIZE = 5000
+
+# Keyset pagination page sizes for snapshot reads
+DEFAULT_PAGE_SIZE = 1000
+MAX_PAGE_SIZE = 10000
+
+# Compact encoder bound once; avoids json.dumps() option handling per row
+_encode_json = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
 
 class SQLiteGraphRepository():
     """SQLite implementation of GraphRepository port."""
     
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, pool: Optional[SQLiteConnectionPool] = None):
         self.db_path = db_path
         self._ensure_db_dir()
+        self._pool = pool or get_connection_pool(db_path)
+        self.last_write_stats: Dict[str, Any] = {}
     
     def _ensure_db_dir(self) -> None:
         """Ensure the database directory exists."""
         db_file = Path(self.db_path)
         db_file.parent.mkdir(parents=True, exist_ok=True)
     
-    def create_tables(self) -> bool:
-        """Ensure tables are initialized."""
+    def create_tables(self, *, build_indexes: bool = True) -> bool:
+        """Ensure tables are initialized.
+
+        Pass ``build_indexes=False`` ahead of a large initial load; indexes are
+        then built once by the first bulk ``save_to_knowledge_graph`` call (or
+        an explicit ``create_indexes()``) instead of being maintained per row.
+        """
+        if not self._pool.is_initialised("graph"):
+            try:
+                with self._pool.writer() as conn:
+                    cur = conn.cursor()
+                    # Create entities table
+                    cur.execute(CREATE_ENTITIES_TABLE)
+                    # Create relationships table
+                    cur.execute(CREATE_RELATIONSHIPS_TABLE)
+                self._pool.mark_initialised("graph")
+                logger.info("Graph tables created/verified")
+            except Exception as e:
+                logger.error(f"Error creating graph tables: {e}")
+                return False
+        if build_indexes:
+            return self.create_indexes()
+        return True
+
+    # Index management ---------------------------------------------------
+    def create_indexes(self) -> bool:
+        """Install the entity/relationship indexes (idempotent)."""
+        if self._pool.is_initialised("graph_indexes"):
+            return True
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            started = time.perf_counter()
+            with self._pool.writer() as conn:
                 cur = conn.cursor()
-                cur.execute("PRAGMA foreign_keys=ON")
-                # Create entities table
-                cur.execute(CREATE_ENTITIES_TABLE)
-                # Create relationships table
-                cur.execute(CREATE_RELATIONSHIPS_TABLE)
-                conn.commit()
-                logger.info("Graph tables created/verified")
-                return True
+                for sql in GRAPH_INDEXES:
+                    cur.execute(sql)
+            self._pool.mark_initialised("graph_indexes")
+            logger.info(f"Graph indexes created/verified ({len(GRAPH_INDEXES)} in {time.perf_counter() - started:.3f}s)")
+            return True
         except Exception as e:
-            logger.error(f"Error creating graph tables: {e}")
+            logger.error(f"Error creating graph indexes: {e}")
             return False
 
-    def save_to_knowledge_graph(self, document_id: str, kg_data: Dict[str, Any], *, kb_id: Optional[str] = None) -> bool:
-        """Persist a document-level knowledge graph payload."""
-        # Convert IDs to integers (outside try block for error logging)
+    def optimize(self, *, analyze: bool = False) -> None:
+        """Refresh query planner statistics.
+
+        ``PRAGMA optimize`` is cheap and only re-analyzes tables that need it;
+        ``analyze=True`` forces a full ``ANALYZE`` of the graph tables, which
+        is worth doing after a bulk load or index rebuild.
+        """
         try:
-            doc_id_int = int(document_id)
-        except (ValueError, TypeError):
-            doc_id_int = abs(hash(document_id)) % (10 ** 9)
+            started = time.perf_counter()
+            with self._pool.writer() as conn:
+                if analyze:
+                    conn.execute("ANALYZE entities")
+                    conn.execute("ANALYZE relationships")
+                else:
+                    conn.execute("PRAGMA optimize")
+            logger.info(f"Graph tables {'analyzed' if analyze else 'optimized'} in {time.perf_counter() - started:.3f}s")
+        except Exception as e:
+            logger.error(f"Error optimizing graph tables: {e}")
+
+    def save_to_knowledge_graph(
+        self,
+        document_id: str,
+        kg_data: Dict[str, Any],
+        *,
+        kb_id: Optional[str] = None,
+        batch_size: int = DEFAULT_WRITE_BATCH_SIZE,
+        defer_foreign_keys: bool = False,
+        rebuild_indexes: bool = False,
+    ) -> bool:
+        """Persist a document-level knowledge graph payload.
+
+        Rows are staged as tuples and written with ``executemany`` in batches of
+        ``batch_size`` inside a single transaction. For very large loads,
+        ``defer_foreign_keys`` postpones FK checks to commit time and
+        ``rebuild_indexes`` drops the entity/relationship indexes before the
+        insert and recreates them afterwards, but only while the graph tables
+        are still empty: on a populated graph one document's load would pay
+        for re-indexing every other document. Throughput is logged and kept
+        in ``self.last_write_stats``.
+        """
+        # Convert IDs to integers (outside try block for error logging)
+        doc_id_int = document_db_id(document_id)
         
-        kb_id_int = 0
-        if kb_id:
-            try:
-                kb_id_int = int(kb_id)
-            except (ValueError, TypeError):
-                kb_id_int = 0
+        kb_id_int = kb_db_id(kb_id)
         
         # Extract entities and relationships from kg_data
         entities = kg_data.get('entities', [])
         relationships = kg_data.get('relationships', [])
+        batch_size = max(1, int(batch_size or DEFAULT_WRITE_BATCH_SIZE))
         
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._pool.writer() as conn:
                 cur = conn.cursor()
-                cur.execute("PRAGMA foreign_keys=ON")
                 
                 # Verify document exists
                 cur.execute("SELECT id FROM documents WHERE id = ?", (doc_id_int,))
@@ -104,79 +177,96 @@ class SQLiteGraphRepository():
                         return False
                 
                 logger.info(f"✅ [SAVE] Verified document {doc_id_int} and KB {kb_id_int} exist. Proceeding with KG save...")
+                started = time.perf_counter()
+
+                # One explicit transaction for the whole load (DDL included when rebuilding indexes)
+                if not conn.in_transaction:
+                    cur.execute("BEGIN")
+                if defer_foreign_keys:
+                    cur.execute("PRAGMA defer_foreign_keys=ON")
+                dropped_indexes = self._drop_graph_indexes(cur) if rebuild_indexes else []
                 
                 # Delete existing entities and relationships for this document
                 #cur.execute("DELETE FROM relationships WHERE document_id = ?", (doc_id_int,))
                 #cur.execute("DELETE FROM entities WHERE document_id = ?", (doc_id_int,))
                 
-                # Insert entities
+                # Stage entity rows
                 entity_id_map = {}  # Map from entity ID in kg_data to database ID
+                entity_rows = []
                 for idx, entity in enumerate(entities):
                     entity_id = entity.get('id') or f"entity_{idx}"
-                    entity_type = entity.get('type', 'concept')
-                    entity_label = entity.get('label', entity_id)
-                    properties = json.dumps(entity.get('properties', {}))
+                    properties = entity.get('properties')
                     
-                    # Use hash of entity_id for database ID
-                    entity_db_id = abs(hash(entity_id)) % (10 ** 9)
-                    entity_id_map[entity_id] = entity_db_id
+                    # Stable id scoped to kb + document + natural key
+                    entity_row_id = entity_db_id(kb_id_int, doc_id_int, entity_id)
+                    entity_id_map[entity_id] = entity_row_id
                     
-                    cur.execute(
-                        """INSERT INTO entities (
-                            id, 
-                            kb_id, 
-                            document_id, 
-                            entity_definition_id, 
-                            entity_type, 
-                            entity_label, 
-                            properties
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?)""",
-                        (
-                            entity_db_id,
-                            kb_id_int,
-                            doc_id_int,
-                            0,  # entity_definition_id - default to 0
-                            entity_type,
-                            entity_label,
-                            properties,
-                        )
-                    )
+                    entity_rows.append((
+                        entity_row_id,
+                        kb_id_int,
+                        doc_id_int,
+                        0,  # entity_definition_id - default to 0
+                        entity.get('type', 'concept'),
+                        entity.get('label', entity_id),
+                        _encode_json(properties) if properties else "{}",
+                    ))
+                entity_count = self._executemany_batched(cur, UPSERT_ENTITY, entity_rows, batch_size)
+                del entity_rows
                 
-                # Insert relationships
+                # Stage relationship rows
+                relationship_rows = []
                 for rel in relationships:
                     source_id = rel.get('source')
                     target_id = rel.get('target')
                     rel_type = rel.get('predicate') or rel.get('type', 'related_to')
-                    properties = json.dumps(rel.get('properties', {}))
-                    confidence = rel.get('confidence', rel.get('weight'))
                     
                     # Get database entity IDs
                     source_db_id = entity_id_map.get(source_id)
                     target_db_id = entity_id_map.get(target_id)
                     
                     if source_db_id and target_db_id:
-                        rel_db_id = abs(hash(f"{source_id}_{target_id}_{rel_type}")) % (10 ** 9)
-                        cur.execute(
-                            """INSERT INTO relationships (
-                                id, kb_id, document_id, relationship_definition_id, relationship_type,
-                                source_entity_id, target_entity_id, properties, confidence_score
-                            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                            (
-                                rel_db_id,
-                                kb_id_int,
-                                doc_id_int,
-                                None,  # relationship_definition_id
-                                rel_type,
-                                source_db_id,
-                                target_db_id,
-                                properties,
-                                confidence,
-                            )
-                        )
-                
-                conn.commit()
-                logger.debug(f"Knowledge graph saved for document: {document_id}")
-                return True
+                        properties = rel.get('properties')
+                        relationship_rows.append((
+                            relationship_db_id(kb_id_int, doc_id_int, source_id, rel_type, target_id),
+                            kb_id_int,
+                            doc_id_int,
+                            None,  # relationship_definition_id
+                            rel_type,
+                            source_db_id,
+                            target_db_id,
+                            _encode_json(properties) if properties else "{}",
+                            rel.get('confidence', rel.get('weight')),
+                        ))
+                relationship_count = self._executemany_batched(cur, UPSERT_RELATIONSHIP, relationship_rows, batch_size)
+                del relationship_rows
+
+                if dropped_indexes:
+                    self._restore_graph_indexes(cur, dropped_indexes)
+                build_indexes = rebuild_indexes and not self._pool.is_initialised("graph_indexes")
+                if build_indexes:
+                    # Lazy build: tables were created without indexes ahead of this load
+                    for sql in GRAPH_INDEXES:
+                        cur.execute(sql)
+            if build_indexes:
+                self._pool.mark_initialised("graph_indexes")
+            
+            elapsed = time.perf_counter() - started
+            total_rows = entity_count + relationship_count
+            rows_per_sec = total_rows / elapsed if elapsed > 0 else float(total_rows)
+            self.last_write_stats = {
+                "entities": entity_count,
+                "relationships": relationship_count,
+                "batch_size": batch_size,
+                "seconds": round(elapsed, 4),
+                "rows_per_sec": round(rows_per_sec, 1),
+                "indexes_rebuilt": len(GRAPH_INDEXES) if build_indexes else len(dropped_indexes),
+            }
+            logger.info(
+                f"✅ [SAVE] Knowledge graph saved for document {document_id}: "
+                f"{entity_count} entities, {relationship_count} relationships in {elapsed:.3f}s "
+                f"({rows_per_sec:,.0f} rows/sec, batch_size={batch_size})"
+            )
+            return True
         except Exception as e:
             logger.error(f"❌ [SAVE] Error saving knowledge graph for document {document_id}: {e}", exc_info=True)
             logger.error(f"  → Document ID (int): {doc_id_int}")
@@ -185,151 +275,481 @@ class SQLiteGraphRepository():
             logger.error(f"  → Relationships count: {len(relationships)}")
             return False
 
+    @contextmanager
+    def bulk_writer(
+        self,
+        document_id: str,
+        *,
+        kb_id: Optional[str] = None,
+        batch_size: int = DEFAULT_WRITE_BATCH_SIZE,
+        defer_foreign_keys: bool = False,
+        rebuild_indexes: bool = False,
+    ) -> Iterator["GraphBulkWriter"]:
+        """Streaming counterpart of ``save_to_knowledge_graph``.
+
+        Yields a ``GraphBulkWriter`` whose ``write()`` can be called once per
+        flushed batch; everything lands in one transaction that commits when
+        the block exits (and rolls back if it raises). Raises ValueError if
+        the document or knowledge base does not exist.
+        """
+        doc_id_int = document_db_id(document_id)
+        kb_id_int = kb_db_id(kb_id)
+        batch_size = max(1, int(batch_size or DEFAULT_WRITE_BATCH_SIZE))
+
+        with self._pool.writer() as conn:
+            cur = conn.cursor()
+            if cur.execute("SELECT id FROM documents WHERE id = ?", (doc_id_int,)).fetchone() is None:
+                raise ValueError(f"Document {doc_id_int} does not exist in documents table")
+            if kb_id_int and cur.execute("SELECT id FROM knowledge_bases WHERE id = ?", (kb_id_int,)).fetchone() is None:
+                raise ValueError(f"Knowledge base {kb_id_int} does not exist in knowledge_bases table")
+
+            started = time.perf_counter()
+            if not conn.in_transaction:
+                cur.execute("BEGIN")
+            if defer_foreign_keys:
+                cur.execute("PRAGMA defer_foreign_keys=ON")
+            dropped_indexes = self._drop_graph_indexes(cur) if rebuild_indexes else []
+
+            writer = GraphBulkWriter(cur, kb_id_int, doc_id_int, batch_size)
+            yield writer
+
+            if dropped_indexes:
+                self._restore_graph_indexes(cur, dropped_indexes)
+            build_indexes = rebuild_indexes and not self._pool.is_initialised("graph_indexes")
+            if build_indexes:
+                for sql in GRAPH_INDEXES:
+                    cur.execute(sql)
+        if build_indexes:
+            self._pool.mark_initialised("graph_indexes")
+
+        elapsed = time.perf_counter() - started
+        total_rows = writer.entity_rows + writer.relationship_rows
+        rows_per_sec = total_rows / elapsed if elapsed > 0 else float(total_rows)
+        self.last_write_stats = {
+            "entities": writer.entity_count,
+            "relationships": writer.relationship_count,
+            "batch_size": batch_size,
+            "flushes": writer.flushes,
+            "skipped_relationships": writer.skipped_relationships,
+            "deleted_entities": writer.deleted_entities,
+            "deleted_relationships": writer.deleted_relationships,
+            "seconds": round(elapsed, 4),
+            "rows_per_sec": round(rows_per_sec, 1),
+            "indexes_rebuilt": len(GRAPH_INDEXES) if build_indexes else len(dropped_indexes),
+        }
+        logger.info(
+            f"✅ [SAVE] Knowledge graph streamed for document {document_id}: "
+            f"{writer.entity_count} entities, {writer.relationship_count} relationships "
+            f"in {writer.flushes} flushes, {elapsed:.3f}s ({rows_per_sec:,.0f} rows/sec)"
+        )
+
+    def clone_document_graph(self, source_document_id: int, target_document_id: int, kb_id: int) -> Dict[str, int]:
+        """Copy every entity and relationship of one document to another (possibly in another KB).
+
+        Runs as two ``INSERT ... SELECT`` statements; cloned row ids are
+        ``stable_id("clone", target, source row id)``, so endpoints stay
+        consistent. The target document row must exist. Joins the caller's
+        write transaction when one is open on this thread.
+        """
+        with self._pool.writer() as conn:
+            conn.create_function(
+                "kg_clone_id", 2, lambda target, row_id: stable_id("clone", target, row_id), deterministic=True
+            )
+            entities = conn.execute(
+                CLONE_DOCUMENT_ENTITIES, (target_document_id, kb_id, target_document_id, source_document_id)
+            ).rowcount
+            relationships = conn.execute(
+                CLONE_DOCUMENT_RELATIONSHIPS,
+                (target_document_id, kb_id, target_document_id, target_document_id, target_document_id, source_document_id),
+            ).rowcount
+        logger.info(
+            "Cloned graph of document %s into document %s (kb %s): %d entities, %d relationships",
+            source_document_id,
+            target_document_id,
+            kb_id,
+            entities,
+            relationships,
+        )
+        return {"entities": entities, "relationships": relationships}
+
+    @staticmethod
+    def _executemany_batched(cur: sqlite3.Cursor, sql: str, rows: List[tuple], batch_size: int) -> int:
+        """Run ``executemany`` over ``rows`` in slices of ``batch_size``; returns rows written."""
+        for offset in range(0, len(rows), batch_size):
+            cur.executemany(sql, rows[offset:offset + batch_size])
+        return len(rows)
+
+    @staticmethod
+    def _drop_graph_indexes(cur: sqlite3.Cursor) -> List[Tuple[str, str]]:
+        """Drop user-defined indexes on entities/relationships, returning their DDL.
+
+        Only an empty graph is bulk loaded without indexes; otherwise nothing
+        is dropped and the rows go through the existing indexes.
+        """
+        if cur.execute(GRAPH_HAS_ROWS).fetchone() is not None:
+            logger.info("  → Graph already has rows; keeping indexes for this load")
+            return []
+        cur.execute(
+            "SELECT name, sql FROM sqlite_master "
+            "WHERE type = 'index' AND tbl_name IN ('entities', 'relationships') AND sql IS NOT NULL"
+        )
+        indexes = [(row[0], row[1]) for row in cur.fetchall()]
+        for name, _ in indexes:
+            cur.execute(f'DROP INDEX IF EXISTS "{name}"')
+        if indexes:
+            logger.info(f"  → Dropped {len(indexes)} graph indexes for bulk load")
+        return indexes
+
+    @staticmethod
+    def _restore_graph_indexes(cur: sqlite3.Cursor, indexes: List[Tuple[str, str]]) -> None:
+        """Recreate indexes captured by ``_drop_graph_indexes``."""
+        for _, sql in indexes:
+            cur.execute(sql)
+        logger.info(f"  → Rebuilt {len(indexes)} graph indexes after bulk load")
+
+    # Snapshot reads ------------------------------------------------------
+    @staticmethod
+    def _snapshot_filters(alias: str, *, kb_id: Optional[str], document_id: Optional[str], document_column: str = "document_id") -> Tuple[List[str], List[Any]]:
+        """WHERE clauses/params for kb and/or document scoped snapshot queries."""
+        clauses: List[str] = []
+        params: List[Any] = []
+        if kb_id:
+            clauses.append(f"{alias}.kb_id = ?")
+            params.append(kb_db_id(kb_id))
+        if document_id:
+            clauses.append(f"{alias}.{document_column} = ?")
+            params.append(document_db_id(document_id))
+        return clauses, params
+
+    def _fetch_snapshot_page(
+        self,
+        kind: str,
+        *,
+        kb_id: Optional[str],
+        document_id: Optional[str],
+        after_id: Optional[int],
+        limit: Optional[int],
+    ) -> List[tuple]:
+        """Fetch one id-ordered (keyset) page of node or edge rows."""
+        sql, params = self._snapshot_page_query(kind, kb_id=kb_id, document_id=document_id, after_id=after_id, limit=limit)
+        with self._pool.reader() as conn:
+            return conn.execute(sql, params).fetchall()
+
+    @classmethod
+    def _snapshot_page_query(
+        cls,
+        kind: str,
+        *,
+        kb_id: Optional[str],
+        document_id: Optional[str],
+        after_id: Optional[int],
+        limit: Optional[int],
+    ) -> Tuple[str, List[Any]]:
+        """SQL and params for one keyset page; every filter combination has an index in id order."""
+        alias, sql = ("e", SELECT_SNAPSHOT_NODES) if kind == "nodes" else ("r", SELECT_SNAPSHOT_EDGES)
+        clauses, params = cls._snapshot_filters(alias, kb_id=kb_id, document_id=document_id)
+        if after_id is not None:
+            clauses.append(f"{alias}.id > ?")
+            params.append(after_id)
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += f" ORDER BY {alias}.id"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return sql, params
+
+    @staticmethod
+    def _node_from_row(row: tuple) -> Dict[str, Any]:
+        node_id = str(row[0])
+        return {
+            "id": node_id,
+            "label": row[1] or node_id,
+            "type": row[2] or "concept",
+            "properties": json.loads(row[3]) if row[3] else {},
+            "document_id": str(row[4]) if row[4] else None,
+            "kb_id": str(row[5]) if row[5] else None,
+        }
+
+    @staticmethod
+    def _edge_from_row(row: tuple) -> Dict[str, Any]:
+        return {
+            "id": str(row[0]),
+            "source": str(row[2]),
+            "target": str(row[3]),
+            "predicate": row[1] or "related_to",
+            "properties": json.loads(row[4]) if row[4] else {},
+            "confidence": row[5],
+            "document_id": str(row[6]) if row[6] else None,
+            "kb_id": str(row[7]) if row[7] else None,
+        }
+
+    def get_graph_documents(self, *, kb_id: Optional[str] = None, document_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Return the documents list shown alongside a snapshot."""
+        clauses, params = self._snapshot_filters("d", kb_id=kb_id, document_id=document_id, document_column="id")
+        sql = "SELECT DISTINCT d.id, d.file_name, d.file_path, d.file_type FROM pdf_document d"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        try:
+            with self._pool.reader() as conn:
+                rows = conn.execute(sql, params).fetchall()
+            return [
+                {"id": str(row[0]), "name": row[1] or "", "path": row[2] or "", "type": row[3] or ""}
+                for row in rows
+            ]
+        except Exception as e:
+            logger.error(f"Error getting graph documents: {e}")
+            return []
+
     def get_graph_snapshot(self, *, kb_id: Optional[str] = None, document_id: Optional[str] = None) -> Dict[str, Any]:
-        """Return a node/edge/documents snapshot filtered by kb and/or document."""
+        """Return a node/edge/documents snapshot filtered by kb and/or document.
+
+        Materialises the whole result; prefer ``get_graph_page`` or
+        ``iter_graph_snapshot`` for large knowledge bases.
+        """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cur = conn.cursor()
-                
-                # Build WHERE clause
-                where_clauses = []
-                params = []
-                
-                if kb_id:
-                    try:
-                        kb_id_int = int(kb_id)
-                        where_clauses.append("e.kb_id = ?")
-                        params.append(kb_id_int)
-                    except (ValueError, TypeError):
-                        pass
-                
-                if document_id:
-                    try:
-                        doc_id_int = int(document_id)
-                        where_clauses.append("e.document_id = ?")
-                        params.append(doc_id_int)
-                    except (ValueError, TypeError):
-                        doc_id_int = abs(hash(document_id)) % (10 ** 9)
-                        where_clauses.append("e.document_id = ?")
-                        params.append(doc_id_int)
-                
-                where_sql = "WHERE " + " AND ".join(where_clauses) if where_clauses else ""
-                
-                # Fetch entities (nodes)
-                nodes_query = f"""
-                    SELECT DISTINCT
-                        e.id, e.entity_label, e.entity_type, e.properties,
-                        e.document_id, e.kb_id
-                    FROM entities e
-                    {where_sql}
-                """
-                cur.execute(nodes_query, params)
-                entity_rows = cur.fetchall()
-                
-                nodes = []
-                entity_id_to_node = {}
-                for row in entity_rows:
-                    node_id = str(row[0])
-                    properties = json.loads(row[3]) if row[3] else {}
-                    node = {
-                        "id": node_id,
-                        "label": row[1] or node_id,
-                        "type": row[2] or "concept",
-                        "properties": properties,
-                        "document_id": str(row[4]) if row[4] else None,
-                        "kb_id": str(row[5]) if row[5] else None,
-                    }
-                    nodes.append(node)
-                    entity_id_to_node[row[0]] = node
-                
-                # Fetch relationships (edges)
-                rel_where_clauses = []
-                if kb_id:
-                    try:
-                        kb_id_int = int(kb_id)
-                        rel_where_clauses.append("r.kb_id = ?")
-                    except (ValueError, TypeError):
-                        pass
-                
-                if document_id:
-                    try:
-                        doc_id_int = int(document_id)
-                        rel_where_clauses.append("r.document_id = ?")
-                    except (ValueError, TypeError):
-                        doc_id_int = abs(hash(document_id)) % (10 ** 9)
-                        rel_where_clauses.append("r.document_id = ?")
-                
-                rel_where_sql = "WHERE " + " AND ".join(rel_where_clauses) if rel_where_clauses else ""
-                
-                edges_query = f"""
-                    SELECT DISTINCT
-                        r.id, r.relationship_type, r.source_entity_id, r.target_entity_id,
-                        r.properties, r.confidence_score, r.document_id, r.kb_id
-                    FROM relationships r
-                    {rel_where_sql}
-                """
-                cur.execute(edges_query, params)
-                rel_rows = cur.fetchall()
-                
-                edges = []
-                for row in rel_rows:
-                    edge = {
-                        "id": str(row[0]),
-                        "source": str(row[2]),
-                        "target": str(row[3]),
-                        "predicate": row[1] or "related_to",
-                        "properties": json.loads(row[4]) if row[4] else {},
-                        "confidence": row[5],
-                        "document_id": str(row[6]) if row[6] else None,
-                        "kb_id": str(row[7]) if row[7] else None,
-                    }
-                    edges.append(edge)
-                
-                # Fetch documents
-                doc_where_clauses = []
-                doc_params = []
-                if kb_id:
-                    try:
-                        kb_id_int = int(kb_id)
-                        doc_where_clauses.append("d.kb_id = ?")
-                        doc_params.append(kb_id_int)
-                    except (ValueError, TypeError):
-                        pass
-                
-                if document_id:
-                    try:
-                        doc_id_int = int(document_id)
-                        doc_where_clauses.append("d.id = ?")
-                        doc_params.append(doc_id_int)
-                    except (ValueError, TypeError):
-                        doc_id_int = abs(hash(document_id)) % (10 ** 9)
-                        doc_where_clauses.append("d.id = ?")
-                        doc_params.append(doc_id_int)
-                
-                doc_where_sql = "WHERE " + " AND ".join(doc_where_clauses) if doc_where_clauses else ""
-                
-                docs_query = f"""
-                    SELECT DISTINCT d.id, d.file_name, d.file_path, d.file_type
-                    FROM pdf_document d
-                    {doc_where_sql}
-                """
-                cur.execute(docs_query, doc_params)
-                doc_rows = cur.fetchall()
-                
-                documents = []
-                for row in doc_rows:
-                    documents.append({
-                        "id": str(row[0]),
-                        "name": row[1] or "",
-                        "path": row[2] or "",
-                        "type": row[3] or "",
-                    })
-                
-                return {
-                    "nodes": nodes,
-                    "edges": edges,
-                    "documents": documents,
-                }
+            scope = {"kb_id": kb_id, "document_id": document_id, "after_id": None, "limit": None}
+            return {
+                "nodes": [self._node_from_row(row) for row in self._fetch_snapshot_page("nodes", **scope)],
+                "edges": [self._edge_from_row(row) for row in self._fetch_snapshot_page("edges", **scope)],
+                "documents": self.get_graph_documents(kb_id=kb_id, document_id=document_id),
+            }
         except Exception as e:
             logger.error(f"Error getting graph snapshot: {e}")
             return {"nodes": [], "edges": [], "documents": []}
+
+    def get_graph_page(
+        self,
+        kind: str,
+        *,
+        kb_id: Optional[str] = None,
+        document_id: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+    ) -> Dict[str, Any]:
+        """Return one keyset-paginated page of ``kind`` ("nodes" or "edges").
+
+        ``cursor`` is the ``next_cursor`` of the previous page (the last id
+        seen); ``next_cursor`` is None once the last page has been returned.
+        """
+        if kind not in ("nodes", "edges"):
+            raise ValueError(f"Unknown snapshot page kind: {kind}")
+        limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+        after_id = int(cursor) if cursor else None
+        try:
+            rows = self._fetch_snapshot_page(kind, kb_id=kb_id, document_id=document_id, after_id=after_id, limit=limit)
+        except Exception as e:
+            logger.error(f"Error getting graph page ({kind}): {e}")
+            rows = []
+        to_item = self._node_from_row if kind == "nodes" else self._edge_from_row
+        return {
+            "kind": kind,
+            "items": [to_item(row) for row in rows],
+            "next_cursor": str(rows[-1][0]) if len(rows) == limit else None,
+        }
+
+    def iter_graph_snapshot(
+        self,
+        *,
+        kb_id: Optional[str] = None,
+        document_id: Optional[str] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Yield ("document" | "node" | "edge", record) pairs with bounded memory.
+
+        Rows are read page by page (keyset on id); a reader connection is only
+        borrowed while a page is fetched, never while the consumer holds a record.
+        """
+        for document in self.get_graph_documents(kb_id=kb_id, document_id=document_id):
+            yield "document", document
+        for kind, record, to_item in (("nodes", "node", self._node_from_row), ("edges", "edge", self._edge_from_row)):
+            after_id: Optional[int] = None
+            while True:
+                rows = self._fetch_snapshot_page(kind, kb_id=kb_id, document_id=document_id, after_id=after_id, limit=page_size)
+                for row in rows:
+                    yield record, to_item(row)
+                if len(rows) < page_size:
+                    break
+                after_id = rows[-1][0]
+
+    def get_neighbors(
+        self,
+        entity_id: str,
+        *,
+        direction: str = "both",
+        relationship_type: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Return edges adjacent to an entity.
+
+        Reads only the outgoing/incoming covering indexes, so it never touches
+        the relationships table itself.
+
+        Args:
+            entity_id: Database id of the entity
+            direction: "out", "in" or "both"
+            relationship_type: Optional predicate filter
+            limit: Optional cap on edges returned per direction
+        """
+        try:
+            entity_id_int = int(entity_id)
+        except (ValueError, TypeError):
+            return []
+        queries = []
+        if direction in ("out", "both"):
+            queries.append(("source_entity_id", "target_entity_id"))
+        if direction in ("in", "both"):
+            queries.append(("target_entity_id", "source_entity_id"))
+
+        edges: List[Dict[str, Any]] = []
+        try:
+            with self._pool.reader() as conn:
+                cur = conn.cursor()
+                for anchor, other in queries:
+                    sql = f"SELECT id, relationship_type, {anchor}, {other} FROM relationships WHERE {anchor} = ?"
+                    params: List[Any] = [entity_id_int]
+                    if relationship_type:
+                        sql += " AND relationship_type = ?"
+                        params.append(relationship_type)
+                    if limit:
+                        sql += " LIMIT ?"
+                        params.append(int(limit))
+                    cur.execute(sql, params)
+                    for row in cur.fetchall():
+                        source, target = (row[2], row[3]) if anchor == "source_entity_id" else (row[3], row[2])
+                        edges.append({
+                            "id": str(row[0]),
+                            "source": str(source),
+                            "target": str(target),
+                            "predicate": row[1] or "related_to",
+                        })
+            return edges
+        except Exception as e:
+            logger.error(f"Error getting neighbors for entity {entity_id}: {e}")
+            return []
+
+
+class GraphBulkWriter:
+    """Write handle yielded by ``SQLiteGraphRepository.bulk_writer``.
+
+    Entity payloads use the same shape as ``save_to_knowledge_graph``. The
+    first write of an entity in a session upserts it (so re-ingesting a
+    document replaces stale values); later writes of the same entity merge
+    into the stored row, keeping existing values and filling gaps. Relations
+    are only written when both endpoints have been written in this session.
+    ``merge`` and ``delete`` serve incremental re-ingestion.
+    """
+
+    def __init__(self, cur: sqlite3.Cursor, kb_id: int, document_id: int, batch_size: int):
+        self._cur = cur
+        self.kb_id = kb_id
+        self.document_id = document_id
+        self.batch_size = batch_size
+        self._written: Set[int] = set()
+        self._written_relationships: Set[int] = set()
+        self.entity_rows = 0
+        self.relationship_rows = 0
+        self.skipped_relationships = 0
+        self.deleted_entities = 0
+        self.deleted_relationships = 0
+        self.flushes = 0
+
+    @property
+    def entity_count(self) -> int:
+        """Distinct entities written in this session."""
+        return len(self._written)
+
+    @property
+    def relationship_count(self) -> int:
+        """Distinct relationships written in this session."""
+        return len(self._written_relationships)
+
+    def _entity_row(self, entity: Dict[str, Any]) -> Tuple[int, tuple]:
+        key = entity["id"]
+        row_id = entity_db_id(self.kb_id, self.document_id, key)
+        properties = entity.get("properties")
+        return row_id, (
+            row_id,
+            self.kb_id,
+            self.document_id,
+            0,
+            entity.get("type", "concept"),
+            entity.get("label", key),
+            _encode_json(properties) if properties else "{}",
+        )
+
+    def write(self, entities: Iterable[Dict[str, Any]], relationships: Iterable[Dict[str, Any]] = ()) -> None:
+        upserts: List[tuple] = []
+        merges: List[tuple] = []
+        for entity in entities:
+            row_id, row = self._entity_row(entity)
+            if row_id in self._written:
+                merges.append(row + (entity["id"],))
+            else:
+                self._written.add(row_id)
+                upserts.append(row)
+        self.entity_rows += SQLiteGraphRepository._executemany_batched(self._cur, UPSERT_ENTITY, upserts, self.batch_size)
+        self.entity_rows += SQLiteGraphRepository._executemany_batched(self._cur, MERGE_ENTITY, merges, self.batch_size)
+        self._write_relationships(relationships)
+        self.flushes += 1
+
+    def merge(self, entities: Iterable[Dict[str, Any]], relationships: Iterable[Dict[str, Any]] = ()) -> None:
+        """Like ``write`` but never replaces a stored entity: values only fill its gaps.
+
+        Used by incremental ingestion for entities that unchanged rows also
+        produce, so their stored values are kept.
+        """
+        merges: List[tuple] = []
+        for entity in entities:
+            row_id, row = self._entity_row(entity)
+            self._written.add(row_id)
+            merges.append(row + (entity["id"],))
+        self.entity_rows += SQLiteGraphRepository._executemany_batched(self._cur, MERGE_ENTITY, merges, self.batch_size)
+        self._write_relationships(relationships)
+        self.flushes += 1
+
+    def delete(self, entity_ids: Iterable[int] = (), relationship_ids: Iterable[int] = ()) -> None:
+        """Delete graph rows by database id (relationships of deleted entities cascade)."""
+        rel_rows = [(rid,) for rid in relationship_ids]
+        ent_rows = [(eid,) for eid in entity_ids]
+        self.deleted_relationships += SQLiteGraphRepository._executemany_batched(
+            self._cur, DELETE_RELATIONSHIP_BY_ID, rel_rows, self.batch_size
+        )
+        self.deleted_entities += SQLiteGraphRepository._executemany_batched(
+            self._cur, DELETE_ENTITY_BY_ID, ent_rows, self.batch_size
+        )
+
+    def clear(self) -> None:
+        """Delete every graph row of the document, e.g. before a full reload replaces an earlier version."""
+        self.deleted_relationships += self._cur.execute(DELETE_DOCUMENT_RELATIONSHIPS, (self.document_id,)).rowcount
+        self.deleted_entities += self._cur.execute(DELETE_DOCUMENT_ENTITIES, (self.document_id,)).rowcount
+
+    def _write_relationships(self, relationships: Iterable[Dict[str, Any]]) -> None:
+
+        rel_rows: List[tuple] = []
+        for rel in relationships:
+            source_id = rel.get("source")
+            target_id = rel.get("target")
+            rel_type = rel.get("predicate") or rel.get("type", "related_to")
+            source_db_id = entity_db_id(self.kb_id, self.document_id, source_id)
+            target_db_id = entity_db_id(self.kb_id, self.document_id, target_id)
+            if source_db_id not in self._written or target_db_id not in self._written:
+                self.skipped_relationships += 1
+                continue
+            properties = rel.get("properties")
+            rel_row_id = relationship_db_id(self.kb_id, self.document_id, source_id, rel_type, target_id)
+            self._written_relationships.add(rel_row_id)
+            rel_rows.append((
+                rel_row_id,
+                self.kb_id,
+                self.document_id,
+                None,
+                rel_type,
+                source_db_id,
+                target_db_id,
+                _encode_json(properties) if properties else "{}",
+                rel.get("confidence", rel.get("weight")),
+            ))
+        self.relationship_rows += SQLiteGraphRepository._executemany_batched(
+            self._cur, UPSERT_RELATIONSHIP, rel_rows, self.batch_size
+        )
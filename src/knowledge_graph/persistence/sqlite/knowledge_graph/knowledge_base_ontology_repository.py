@@ -9,6 +9,7 @@ from typing import Optional, List, Dict, Any
 import logging
 import sqlite3
 from datetime import datetime
+from ..core.connection import SQLiteConnectionPool, get_connection_pool
 from .queries import CREATE_KNOWLEDGE_BASE_ONTOLOGIES_TABLE
 
 logger = logging.getLogger(__name__)
@@ -17,23 +18,26 @@ logger = logging.getLogger(__name__)
 class SQLiteKnowledgeBaseOntologyRepository:
     """SQLite implementation for knowledge base ontology persistence."""
 
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, pool: Optional[SQLiteConnectionPool] = None):
         """Initialize repository with database path.
         
         Args:
             db_path: Path to SQLite database file
+            pool: Shared connection pool (defaults to the pool for db_path)
         """
         self.db_path = db_path
+        self._pool = pool or get_connection_pool(db_path)
         self._ensure_schema()
         self._logger = logging.getLogger("knowledge_graph.persistence.sqlite.kb_ontology")
 
     def _ensure_schema(self) -> None:
         """Ensure knowledge_base_ontologies table schema exists."""
-        with sqlite3.connect(self.db_path) as conn:
+        if self._pool.is_initialised("knowledge_base_ontologies"):
+            return
+        with self._pool.writer() as conn:
             cur = conn.cursor()
-            cur.execute("PRAGMA foreign_keys=ON")
             cur.execute(CREATE_KNOWLEDGE_BASE_ONTOLOGIES_TABLE)
-            conn.commit()
+        self._pool.mark_initialised("knowledge_base_ontologies")
 
     def create(
         self,
@@ -61,7 +65,7 @@ class SQLiteKnowledgeBaseOntologyRepository:
         
         spec_json = json.dumps(specification) if specification else None
         
-        with sqlite3.connect(self.db_path) as conn:
+        with self._pool.writer() as conn:
             cur = conn.cursor()
             cur.execute(
                 """
@@ -71,7 +75,6 @@ class SQLiteKnowledgeBaseOntologyRepository:
                 """,
                 (kb_id, document_id, name, spec_json, status, version),
             )
-            conn.commit()
             return cur.lastrowid
 
     def get_by_id(self, ontology_id: int) -> Optional[Dict[str, Any]]:
@@ -85,7 +88,7 @@ class SQLiteKnowledgeBaseOntologyRepository:
         """
         import json
         
-        with sqlite3.connect(self.db_path) as conn:
+        with self._pool.reader() as conn:
             cur = conn.cursor()
             cur.execute(
                 """
@@ -127,7 +130,7 @@ class SQLiteKnowledgeBaseOntologyRepository:
         """
         import json
         
-        with sqlite3.connect(self.db_path) as conn:
+        with self._pool.reader() as conn:
             cur = conn.cursor()
             cur.execute(
                 """
@@ -171,7 +174,7 @@ class SQLiteKnowledgeBaseOntologyRepository:
         """
         import json
         
-        with sqlite3.connect(self.db_path) as conn:
+        with self._pool.reader() as conn:
             cur = conn.cursor()
             cur.execute(
                 """
@@ -247,13 +250,12 @@ class SQLiteKnowledgeBaseOntologyRepository:
         
         params.append(ontology_id)
         
-        with sqlite3.connect(self.db_path) as conn:
+        with self._pool.writer() as conn:
             cur = conn.cursor()
             cur.execute(
                 f"UPDATE knowledge_base_ontologies SET {', '.join(updates)} WHERE id = ?",
                 params,
             )
-            conn.commit()
             return cur.rowcount > 0
 
     def delete(self, ontology_id: int) -> bool:
@@ -265,10 +267,9 @@ class SQLiteKnowledgeBaseOntologyRepository:
         Returns:
             True if deletion succeeded, False otherwise
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._pool.writer() as conn:
             cur = conn.cursor()
             cur.execute("DELETE FROM knowledge_base_ontologies WHERE id = ?", (ontology_id,))
-            conn.commit()
             return cur.rowcount > 0
 
     def delete_by_kb_id(self, kb_id: int) -> int:
@@ -280,9 +281,8 @@ class SQLiteKnowledgeBaseOntologyRepository:
         Returns:
             Number of deleted records
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._pool.writer() as conn:
             cur = conn.cursor()
             cur.execute("DELETE FROM knowledge_base_ontologies WHERE kb_id = ?", (kb_id,))
-            conn.commit()
             return cur.rowcount
 
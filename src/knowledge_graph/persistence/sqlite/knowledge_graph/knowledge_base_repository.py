@@ -6,6 +6,7 @@ from ....ports.knowledge_base import KnowledgeBaseRepository
 from ....data_structs.knowledge_base import KnowledgeBase
 import sqlite3
 from datetime import datetime
+from ..core.connection import SQLiteConnectionPool, get_connection_pool
 from .queries import (
     CREATE_KNOWLEDGE_BASES_TABLE,
     CREATE_INDEX_KB_CREATED_AT,
@@ -19,17 +20,19 @@ class SQLiteKnowledgeBaseRepository(KnowledgeBaseRepository):
     Note: Keep SQL inline for now; migrate to central queries if needed.
     """
 
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, pool: Optional[SQLiteConnectionPool] = None):
         self.db_path = db_path
-        self._ensure_schema()
+        self._pool = pool or get_connection_pool(db_path)
         self._logger = logging.getLogger("knowledge_graph.persistence.sqlite.kb")
+        self._ensure_schema()
     
     def create_tables(self) -> bool:
+        if self._pool.is_initialised("knowledge_base_ontologies"):
+            return True
         self._logger.info("Ensuring Knowledge Base and KB Ontologies tables exist")
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._pool.writer() as conn:
                 cur = conn.cursor()
-                cur.execute("PRAGMA foreign_keys=ON")
 
                 # Ensure base KB schema
                 self._ensure_schema()
@@ -37,8 +40,8 @@ class SQLiteKnowledgeBaseRepository(KnowledgeBaseRepository):
                 # Ensure KB ontologies table (nullable kb_id/document_id FKs)
                 cur.execute(CREATE_KNOWLEDGE_BASE_ONTOLOGIES_TABLE)
 
-                conn.commit()
-                return True
+            self._pool.mark_initialised("knowledge_base_ontologies")
+            return True
         except Exception as e:
             self._logger.error(f"Error creating KB tables: {e}")
             return False
@@ -51,9 +54,8 @@ class SQLiteKnowledgeBaseRepository(KnowledgeBaseRepository):
             return existing
 
         now = datetime.utcnow()
-        with sqlite3.connect(self.db_path) as conn:
+        with self._pool.writer() as conn:
             cur = conn.cursor()
-            cur.execute("PRAGMA foreign_keys=ON")
             
             # Use RETURNING to get the ID directly (SQLite 3.35.0+)
             try:
@@ -78,7 +80,6 @@ class SQLiteKnowledgeBaseRepository(KnowledgeBaseRepository):
                 )
                 row = cur.fetchone()
                 kb_id = row[0] if row else None
-                conn.commit()
             except sqlite3.OperationalError:
                 # Fallback for older SQLite versions that don't support RETURNING
                 cur.execute(
@@ -99,7 +100,6 @@ class SQLiteKnowledgeBaseRepository(KnowledgeBaseRepository):
                         now.isoformat(),
                     ),
                 )
-                conn.commit()
                 kb_id = cur.lastrowid
                 if kb_id == 0:
                     # UPDATE happened, query for ID
@@ -127,7 +127,7 @@ class SQLiteKnowledgeBaseRepository(KnowledgeBaseRepository):
         return created
 
     def get_by_id(self, kb_id: str) -> Optional[KnowledgeBase]:
-        with sqlite3.connect(self.db_path) as conn:
+        with self._pool.reader() as conn:
             cur = conn.cursor()
             cur.execute(
                 "SELECT id, slug, name, owner_id, description, created_at, updated_at FROM knowledge_bases WHERE id = ?",
@@ -141,7 +141,7 @@ class SQLiteKnowledgeBaseRepository(KnowledgeBaseRepository):
             )
 
     def get_by_slug(self, slug: str, *, owner_id: Optional[str] = None) -> Optional[KnowledgeBase]:
-        with sqlite3.connect(self.db_path) as conn:
+        with self._pool.reader() as conn:
             cur = conn.cursor()
             if owner_id is not None:
                 cur.execute(
@@ -161,7 +161,7 @@ class SQLiteKnowledgeBaseRepository(KnowledgeBaseRepository):
             )
 
     def list(self, *, owner_id: Optional[str] = None) -> List[KnowledgeBase]:
-        with sqlite3.connect(self.db_path) as conn:
+        with self._pool.reader() as conn:
             cur = conn.cursor()
             if owner_id is not None:
                 cur.execute(
@@ -182,13 +182,14 @@ class SQLiteKnowledgeBaseRepository(KnowledgeBaseRepository):
             ]
 
     def _ensure_schema(self) -> None:
-        """Ensure knowledge_bases table schema exists."""
-        with sqlite3.connect(self.db_path) as conn:
+        """Ensure knowledge_bases table schema exists (once per connection pool)."""
+        if self._pool.is_initialised("knowledge_bases"):
+            return
+        with self._pool.writer() as conn:
             cur = conn.cursor()
-            cur.execute("PRAGMA foreign_keys=ON")
             cur.execute(CREATE_KNOWLEDGE_BASES_TABLE)
             cur.execute(CREATE_INDEX_KB_CREATED_AT)
             cur.execute(CREATE_INDEX_KB_OWNER_SLUG)
-            conn.commit()
+        self._pool.mark_initialised("knowledge_bases")
 
 
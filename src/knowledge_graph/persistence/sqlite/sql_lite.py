@@ -4,12 +4,15 @@ from __future__ import annotations
 
 This class centralizes SQLite wiring so callers can construct one object
 with a db_path and obtain typed repositories/stores implementing the
-corresponding ports.
+corresponding ports. All repositories borrow connections from one shared
+SQLiteConnectionPool per database file.
 """
 
+from functools import lru_cache
 from typing import Optional
 import logging
 import os
+import sqlite3
 from pathlib import Path
 
 from .document.document_repository import SQLiteDocumentRepository
@@ -18,7 +21,8 @@ from .document.pdf.pdf_doc_repository import SQLitePdfDocumentRepository
 from .knowledge_graph.graph_store import SQLiteGraphRepository
 from .entity_resolution.entity_resolution_store import SQLiteEntityResolutionRepository
 from .knowledge_graph.knowledge_base_repository import SQLiteKnowledgeBaseRepository
-from ...settings.settings import Settings
+from .core.connection import SQLiteConnectionPool, get_connection_pool, close_connection_pool
+from ...settings.settings import Settings, get_settings
 
 logger = logging.getLogger(__name__)
 
@@ -40,21 +44,39 @@ class SqlLite:
             db_path = str(Path(db_path).resolve())
         self.db_path = db_path
         self._ensure_db_dir()
+        db = settings.db
+        self._pool_options = {
+            "readers": getattr(db, "pool_readers", 4),
+            "mmap_size": getattr(db, "mmap_size", 256 * 1024 * 1024),
+            "cache_size_kib": getattr(db, "cache_size_kib", 64 * 1024),
+            "busy_timeout_ms": getattr(db, "busy_timeout_ms", 5000),
+        }
+        self._repositories = {}
     
     def _ensure_db_dir(self) -> None:
         """Ensure the database directory exists."""
         db_file = Path(self.db_path)
         db_file.parent.mkdir(parents=True, exist_ok=True)
 
+    @property
+    def pool(self) -> SQLiteConnectionPool:
+        """Shared connection pool for this database file."""
+        return get_connection_pool(self.db_path, **self._pool_options)
+
+    def close(self) -> None:
+        """Close pooled connections for this database file; the shared pool reconnects on next use."""
+        close_connection_pool(self.db_path)
+        self._repositories = {}
+
     def drop_all_tables(self, delete_file: bool = True) -> None:
         """Drop all tables in the database. Use with caution - this deletes all data!
         
         Args:
             delete_file: If True, delete the entire database file instead of just dropping tables
         """
-        import sqlite3
-        import os
-        
+        # Release pooled connections before touching the file or schema
+        self.close()
+
         # If delete_file is True, just delete the file and return
         if delete_file:
             if os.path.exists(self.db_path):
@@ -123,35 +145,42 @@ class SqlLite:
     def create_tables(self) -> None:
         """Ensure database file exists and base tables are created."""
         try:
-            # Create repositories (they handle their own table creation)
-            document_repository = SQLiteDocumentRepository(self.db_path)
-            knowledge_base_repository = SQLiteKnowledgeBaseRepository(self.db_path)
-            graph_repository = SQLiteGraphRepository(self.db_path)
-            entity_resolution_repository = SQLiteEntityResolutionRepository(self.db_path)
-            
-            # Initialize tables
+            # Repositories handle their own table creation (once per pool)
             logger.info("Initializing database tables...")
-            document_repository.create_tables()
-            knowledge_base_repository.create_tables()
-            graph_repository.create_tables()
-            entity_resolution_repository.ensure_schema()
+            self.document_repository().create_tables()
+            self.knowledge_base_repository().create_tables()
+            self.graph_repository().create_tables()
+            self.entity_resolution_repository().ensure_schema()
             logger.info("All database tables initialized successfully")
         except Exception as e:
             logger.error("Error creating tables: %s", e)
             raise
 
     # Adapters ----------------------------------------------------------
+    def _repository(self, key: str, factory):
+        repo = self._repositories.get(key)
+        if repo is None:
+            repo = factory(self.db_path, pool=self.pool)
+            self._repositories[key] = repo
+        return repo
+
     def document_repository(self) -> SQLiteDocumentRepository:
-        return SQLiteDocumentRepository(self.db_path)
+        return self._repository("document", SQLiteDocumentRepository)
     
     def tabular_document_repository(self) -> SQLiteTabularDocumentRepository:
-        return SQLiteTabularDocumentRepository(self.db_path)
+        return self._repository("tabular_document", SQLiteTabularDocumentRepository)
     
     def graph_repository(self) -> SQLiteGraphRepository:
-        return SQLiteGraphRepository(self.db_path)
+        return self._repository("graph", SQLiteGraphRepository)
 
     def entity_resolution_repository(self) -> SQLiteEntityResolutionRepository:
-        return SQLiteEntityResolutionRepository(self.db_path)
+        return self._repository("entity_resolution", SQLiteEntityResolutionRepository)
 
     def knowledge_base_repository(self) -> SQLiteKnowledgeBaseRepository:
-        return SQLiteKnowledgeBaseRepository(self.db_path)
+        return self._repository("knowledge_base", SQLiteKnowledgeBaseRepository)
+
+
+@lru_cache(maxsize=1)
+def get_sql_lite() -> SqlLite:
+    """Cached SqlLite facade for pipeline steps (one pool per process)."""
+    return SqlLite(settings=get_settings())
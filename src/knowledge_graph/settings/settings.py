@@ -14,6 +14,7 @@ Env convention:
       KG_CORE__LOG_LEVEL=INFO
       KG_GRAPH_DB__DB_TYPE=sqlite
       KG_GRAPH_DB__DB_LOCATION=database/sql_lite/knowledgebase.db
+      KG_DB__POOL_READERS=8
       KG_CACHE_DB__DB_TYPE=sqlite
       KG_CACHE_DB__DB_LOCATION=database/sql_lite/cache.db
       KG_KB_STORE__BACKEND=sqlite
@@ -22,6 +23,8 @@ Env convention:
       KG_LLM__API_KEY=...
       KG_PIPELINE__ENABLE_PERSISTENCE=true
       KG_PIPELINE__CHUNK_SIZE=1000
+      KG_CACHE__ENABLED=true
+      KG_CACHE__LOCATION=database/cache
       KG_FEATURES__CSV_PERSISTENCE_ENABLED=true
       KG_FEATURES__KB_DOCUMENT_MAPPING_ENABLED=true
 
@@ -52,6 +55,27 @@ class CoreSettings:
 class DBSettings:
     db_type: str = "sqlite"
     db_location: Optional[str] = "database/sql_lite/knowledgebase.db"
+    # SQLite connection pool (one writer + N readers, configured once)
+    pool_readers: int = 4
+    mmap_size: int = 256 * 1024 * 1024  # bytes
+    cache_size_kib: int = 64 * 1024
+    busy_timeout_ms: int = 5000
+    # Bulk KG writes: executemany batch size, and the row count above which
+    # FK checks are deferred and graph indexes are dropped/rebuilt
+    graph_write_batch_size: int = 5000
+    graph_bulk_load_rows: int = 100_000
+    # Streaming CSV -> KG transform: staged entities + relations per flush
+    graph_stream_buffer_rows: int = 50_000
+    # Partitioned CSV transform: worker processes (<= 1 = sequential), used
+    # for files of at least csv_partition_min_bytes
+    csv_partition_workers: int = 0
+    csv_partition_min_bytes: int = 256 * 1024 * 1024
+    # Incremental CSV re-ingestion: keep per-row hashes and apply only the
+    # delta when the same document is ingested again (always sequential)
+    csv_incremental: bool = False
+    # Full-file CSV column profile (distinct estimates, nulls, types) for key
+    # selection; off keeps the profile to headers and a sample
+    csv_full_profile: bool = False
 
 
 
@@ -90,6 +114,15 @@ class PipelineSettings:
     chunker_type: str = "auto"  # auto|regex|semantic
 
 
+@dataclass
+class CacheSettings:
+    # Parse and KG extraction caches (see config.CacheConfig); off unless enabled
+    enabled: bool = False
+    location: Optional[str] = None
+    max_size_mb: int = 1000
+    ttl_hours: int = 24
+
+
 @dataclass
 class FeaturesSettings:
     csv_persistence_enabled: bool = True
@@ -101,6 +134,7 @@ class Settings:
     core: CoreSettings = field(default_factory=CoreSettings)
     db: DBSettings = field(default_factory=DBSettings)
     llm: LLMSettings = field(default_factory=LLMSettings)
+    cache: CacheSettings = field(default_factory=CacheSettings)
 
 # ---------- Loader ----------
 
@@ -228,6 +262,7 @@ def _normalize_env_settings(env: Dict[str, Any]) -> Dict[str, Any]:
         "kb_store": env.get("kb_store", {}),
         "llm": llm,
         "pipeline": env.get("pipeline", {}),
+        "cache": env.get("cache", {}),
         "features": env.get("features", {}),
     }
     return out
@@ -260,6 +295,12 @@ def load_settings(overrides: Optional[Dict[str, Any]] = None) -> Settings:
         for key, value in env_struct["llm"].items():
             if hasattr(settings.llm, key):
                 setattr(settings.llm, key, value)
+
+    if env_struct.get("cache"):
+        for key, value in env_struct["cache"].items():
+            if hasattr(settings.cache, key):
+                # Env values are strings: "false" must not enable the cache
+                setattr(settings.cache, key, _coerce(value, type(getattr(settings.cache, key))))
     
     # Apply explicit overrides
     if overrides:
@@ -275,6 +316,10 @@ def load_settings(overrides: Optional[Dict[str, Any]] = None) -> Settings:
             for key, value in overrides["llm"].items():
                 if hasattr(settings.llm, key):
                     setattr(settings.llm, key, value)
+        if "cache" in overrides:
+            for key, value in overrides["cache"].items():
+                if hasattr(settings.cache, key):
+                    setattr(settings.cache, key, value)
     
     return settings
 
@@ -295,6 +340,7 @@ __all__ = [
     "KBStoreSettings",
     "LLMSettings",
     "PipelineSettings",
+    "CacheSettings",
     "FeaturesSettings",
     "Settings",
     "load_settings",
@@ -0,0 +1,73 @@
+"""Shared fixtures for tests that write a document graph into a throwaway SQLite database."""
+
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from knowledge_graph.document_ingestion.document_pipeline import DocumentPipelineContext, DocumentPipelineParams
+from knowledge_graph.document_ingestion.tabular.steps import s8_transform_and_persist_kg as s8
+from knowledge_graph.persistence.sqlite.core.ids import document_db_id
+from knowledge_graph.persistence.sqlite.sql_lite import SqlLite
+from knowledge_graph.settings.settings import load_settings
+
+
+def write_file(directory, name, text):
+    path = os.path.join(directory, name)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write(text)
+    return path
+
+
+def graph_of(sql_lite, document_id, properties=True):
+    """A document's graph keyed by labels, so graphs stored under different ids compare equal."""
+    snapshot = sql_lite.graph_repository().get_graph_snapshot(document_id=document_id)
+    labels = {node["id"]: node["label"] for node in snapshot["nodes"]}
+    if properties:
+        nodes = sorted((n["type"], n["label"], sorted(n["properties"].items())) for n in snapshot["nodes"])
+    else:
+        nodes = sorted((n["type"], n["label"]) for n in snapshot["nodes"])
+    edges = sorted((labels[e["source"]], e["predicate"], labels[e["target"]]) for e in snapshot["edges"])
+    return nodes, edges
+
+
+class SqliteGraphTestCase(unittest.TestCase):
+    """A fresh database with one knowledge base, and the CSV graph step run against it with ``mapping``."""
+
+    mapping = None
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.settings = load_settings({"db": {"db_location": os.path.join(self.tmp.name, "kb.db")}})
+        self.sql_lite = SqlLite(self.settings)
+        self.sql_lite.create_tables()
+        self.kb_id = self.sql_lite.knowledge_base_repository().create("Test", "test").id
+
+    def tearDown(self):
+        self.sql_lite.close()
+        self.tmp.cleanup()
+
+    def write_file(self, name, text):
+        return write_file(self.tmp.name, name, text)
+
+    def run_transform(self, document_id, path, register=True, **step_kwargs):
+        """Run ``TransformAndPersistKGStep`` on ``path``; ``register`` first stores the documents row it expects."""
+        if register:
+            with self.sql_lite.pool.writer() as conn:
+                conn.execute(
+                    "INSERT OR IGNORE INTO documents (id, kb_id, file_name, file_type) VALUES (?, ?, ?, 'CSV')",
+                    (document_db_id(document_id), int(self.kb_id), os.path.basename(path)),
+                )
+        context = DocumentPipelineContext(params=DocumentPipelineParams(path, document_id, self.kb_id))
+        context.document = SimpleNamespace(id=document_id, file_path=path)
+        context.mapping_spec = self.mapping
+        context.csv_profile = SimpleNamespace(delimiter=",")
+        step = s8.TransformAndPersistKGStep(**step_kwargs)
+        with mock.patch.object(s8, "get_sql_lite", return_value=self.sql_lite), \
+                mock.patch.object(s8, "get_settings", return_value=self.settings):
+            step.run(context)
+        return context.results[step.name]
+
+    def graph(self, document_id):
+        return graph_of(self.sql_lite, document_id)
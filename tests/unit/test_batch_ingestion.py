@@ -0,0 +1,163 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from knowledge_graph.document_ingestion.batch import BatchIngestor, discover_paths
+from knowledge_graph.document_ingestion.document_pipeline import DocumentPipeline, DocumentPipelineConfig, PipelineStep
+from knowledge_graph.document_ingestion.factory import PipelineFactory
+
+
+class RecordingStep(PipelineStep):
+    """Records the thread it ran on; fails for paths containing 'broken'."""
+
+    def __init__(self, name, kind, inputs, outputs, threads, *, gate=None):
+        super().__init__()
+        self.name = name
+        self.kind = kind
+        self.inputs = inputs
+        self.outputs = outputs
+        self._threads = threads
+        self._gate = gate
+
+    def run(self, context):
+        if self._gate is not None:
+            self._gate(context)
+        if "broken" in context.params.document_path:
+            raise RuntimeError("cannot parse")
+        self._threads.setdefault(self.kind, set()).add(threading.current_thread().name)
+        for slot in self.outputs:
+            setattr(context, slot, self.name)
+        context.results[self.name] = {"kind": self.kind}
+        return context
+
+
+def pipeline_factory(threads, gate=None):
+    def build(path):
+        return DocumentPipeline(steps=[
+            RecordingStep("parse", "cpu", (), ("parsed",), threads, gate=gate),
+            RecordingStep("extract", "io", ("parsed",), ("graph",), threads),
+            RecordingStep("summarise", "io", ("parsed",), ("summary",), threads),
+            RecordingStep("persist", "write", ("graph", "summary"), (), threads),
+        ])
+    return build
+
+
+class TestDiscoverPaths(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = self.tmp.name
+        os.makedirs(os.path.join(root, "nested"))
+        for name in ("a.csv", "b.md", "notes.xyz", os.path.join("nested", "c.parquet"), os.path.join("nested", "d.csv")):
+            with open(os.path.join(root, name), "w") as f:
+                f.write("x")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _names(self, paths):
+        return sorted(os.path.relpath(p, self.tmp.name) for p in paths)
+
+    def test_directory_glob_and_list(self):
+        root = self.tmp.name
+        self.assertEqual(
+            self._names(discover_paths(root)),
+            ["a.csv", os.path.join("nested", "c.parquet"), os.path.join("nested", "d.csv")],
+        )
+        self.assertEqual(self._names(discover_paths(root, "**/*.csv")), ["a.csv", os.path.join("nested", "d.csv")])
+        self.assertEqual(self._names(discover_paths(os.path.join(root, "*.md"))), ["b.md"])
+        self.assertEqual(list(discover_paths(["x.csv", "y.csv"])), ["x.csv", "y.csv"])
+
+
+class TestPipelineFactory(unittest.TestCase):
+    def test_general_pipeline_runs_with_domain_and_tags(self):
+        with tempfile.TemporaryDirectory() as root:
+            path = os.path.join(root, "notes.md")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("# Notes\n\nAlice works in Research.\n")
+            pipeline = PipelineFactory.for_file(path, config=DocumentPipelineConfig(enable_persistence=False))
+            self.assertEqual(pipeline.steps[0].name, "load_document")
+            pipeline.steps[0].cache = None
+
+            document = pipeline.run(document_path=path, document_id="doc_md", kb_id="1", domain="hr", tags=["team"])
+
+        self.assertEqual((document.metadata.categories, document.metadata.tags), (["hr"], ["team"]))
+        self.assertNotIn("persist_document", pipeline.last_results)
+
+
+class TestBatchIngestor(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.paths = []
+        for name in ("one.csv", "two.csv", "broken.csv", "three.csv", "four.csv"):
+            path = os.path.join(self.tmp.name, name)
+            with open(path, "w") as f:
+                f.write("id\n1\n")
+            self.paths.append(path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_steps_use_shared_pools_and_failures_are_reported(self):
+        threads = {}
+        ingestor = BatchIngestor(pipeline_factory(threads), documents=3, cpu_workers=2, io_workers=4)
+        report = ingestor.run(self.paths, "1", dedup=False)
+
+        summary = report.summary()
+        self.assertEqual((summary["files"], summary["ingested"], summary["failed"]), (5, 4, 1))
+        self.assertEqual(summary["bytes"], 5 * 5)
+        self.assertGreater(summary["files_per_sec"], 0)
+        self.assertEqual(set(summary["steps_ms"]), {"parse", "extract", "summarise", "persist"})
+        failed = [f for f in report.files if not f.ok]
+        self.assertEqual([os.path.basename(f.path) for f in failed], ["broken.csv"])
+        self.assertIn("cannot parse", failed[0].error)
+
+        # All persistence goes through the single writer thread
+        self.assertEqual(threads["write"], {"ingest-writer_0"})
+        self.assertTrue(all(name.startswith("ingest-cpu") for name in threads["cpu"]))
+        self.assertTrue(all(name.startswith("ingest-io") for name in threads["io"]))
+
+    def test_failing_on_result_callback_does_not_stall_the_batch(self):
+        seen = []
+
+        def on_result(result):
+            seen.append(result.path)
+            raise ValueError("callback bug")
+
+        ingestor = BatchIngestor(pipeline_factory({}), documents=1, queue_size=1)
+        runner = threading.Thread(
+            target=ingestor.run, args=(self.paths, "1"), kwargs={"dedup": False, "on_result": on_result}, daemon=True
+        )
+        runner.start()
+        runner.join(10)
+        self.assertFalse(runner.is_alive())
+        self.assertEqual(len(seen), 5)
+
+    def test_queue_bounds_paths_taken_ahead_of_workers(self):
+        taken = []
+        started, release = threading.Event(), threading.Event()
+
+        def paths():
+            for path in self.paths:
+                taken.append(path)
+                yield path
+
+        def gate(context):
+            started.set()
+            release.wait(5)
+
+        ingestor = BatchIngestor(pipeline_factory({}, gate=gate), documents=1, queue_size=1)
+        runner = threading.Thread(target=ingestor.run, args=(paths(), "1"), kwargs={"dedup": False})
+        runner.start()
+        self.assertTrue(started.wait(5))
+        time.sleep(0.2)
+        # One document in flight, one queued, one waiting to be put
+        self.assertLessEqual(len(taken), 3)
+        release.set()
+        runner.join(10)
+        self.assertEqual(len(taken), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
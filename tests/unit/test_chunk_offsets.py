@@ -0,0 +1,56 @@
+import unittest
+from types import SimpleNamespace
+
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from knowledge_graph.document_ingestion.pdf.utils.chunker import PageLevelChunker, StructuredMarkdownChunker
+from knowledge_graph.document_ingestion.pdf.utils.spans import RecursiveSpanSplitter
+
+
+def make_document(raw):
+    return SimpleNamespace(id="doc_1", raw_content=raw, pages=None, metadata=SimpleNamespace(language="en"))
+
+
+class TestChunkOffsets(unittest.TestCase):
+    """Test that chunkers carry source offsets through splitting."""
+
+    TEXT = ("Knowledge graphs link entities.\n\n" + "Relations carry a predicate and two endpoints. " * 12 + "\n") * 6
+
+    def test_span_splitter_matches_langchain(self):
+        for size, overlap in ((80, 0), (200, 40), (1000, 200)):
+            expected = RecursiveCharacterTextSplitter(chunk_size=size, chunk_overlap=overlap).split_text(self.TEXT)
+            self.assertEqual(RecursiveSpanSplitter(size, overlap).split_text(self.TEXT), expected)
+
+    def test_markdown_chunks_have_exact_spans(self):
+        raw = "# Intro\n\nShort intro.\n\n## Details\n\n" + self.TEXT
+        document = make_document(raw)
+        chunker = StructuredMarkdownChunker(chunk_size=300, chunk_overlap=50)
+        chunks = chunker.chunk_document(document)
+        metas = chunker.create_chunk_metadata(document, chunks)
+        self.assertTrue(all(0 <= m.start_index < m.end_index <= len(raw) for m in metas))
+        starts = [m.start_index for m in metas]
+        self.assertEqual(starts, sorted(starts))
+        # Fallback-split chunks without synthetic headers are verbatim slices of the source
+        plain = [(c, m) for c, m in zip(chunks, metas) if not c.startswith("#")]
+        self.assertTrue(plain)
+        for chunk, meta in plain:
+            self.assertEqual(raw[meta.start_index:meta.end_index], chunk)
+
+    def test_page_offsets_survive_normalisation(self):
+        pages = [
+            "ACME Report\nThe hyphen-\nated word on page one.\n\n\n\nMore text.\nPage footer",
+            "ACME Report\nSecond page body.\nPage footer",
+        ]
+        raw = "\f".join(pages)
+        document = make_document(raw)
+        chunker = PageLevelChunker(chunk_size=1000, chunk_overlap=0)
+        chunks = chunker.chunk_document_by_page(document)
+        metas = chunker.create_page_chunk_metadata(document, chunks)
+        self.assertEqual(chunks[0], "The hyphenated word on page one.\n\nMore text.")
+        self.assertEqual(raw[metas[0].start_index:metas[0].end_index], "The hyphen-\nated word on page one.\n\n\n\nMore text.")
+        self.assertEqual(raw[metas[1].start_index:metas[1].end_index], "Second page body.")
+        self.assertEqual([m.page_number for m in metas], [1, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import os
+import tempfile
+import unittest
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+
+from knowledge_graph.agent.mapping_plan import mapping_columns
+from knowledge_graph.document_ingestion.tabular.columnar import ColumnarSource, open_source
+from knowledge_graph.document_ingestion.tabular.source import CsvSource
+
+from .graph_store_fixtures import SqliteGraphTestCase
+
+CSV = (
+    "Employee_ID,Name,Dept_ID,Dept_Name,Notes\n"
+    "1,Alice,10,Research,a\n"
+    "2,Bob,10,,b\n"
+    "3,Carol,20,Sales,\n"
+)
+
+TABLE = None if pa is None else pa.table({
+    "Employee_ID": pa.array([1, 2, 3], pa.int64()),
+    "Name": ["Alice", "Bob", "Carol"],
+    "Dept_ID": pa.array([10, 10, 20], pa.int32()),
+    "Dept_Name": ["Research", None, "Sales"],
+    "Notes": ["a", "b", None],
+})
+
+MAPPING = {
+    "entities": {
+        "Employee": {
+            "key": {"column": "Employee_ID", "prefix": "emp:"},
+            "attributes": [{"name": "name", "column": "Name"}],
+        },
+        "Department": {
+            "key": {"template": "dept:{Dept_ID}"},
+            "attributes": [{"name": "dept_name", "column": "Dept_Name"}],
+        },
+    },
+    "edges": [{"predicate": "works_in", "source": {"entity": "Employee"}, "target": {"entity": "Department"}}],
+}
+
+
+@unittest.skipIf(pa is None, "pyarrow not installed")
+class TestColumnarSource(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.paths = {
+            "csv": os.path.join(self.tmp.name, "people.csv"),
+            "parquet": os.path.join(self.tmp.name, "people.parquet"),
+            "feather": os.path.join(self.tmp.name, "people.feather"),
+        }
+        with open(self.paths["csv"], "w", encoding="utf-8", newline="") as f:
+            f.write(CSV)
+        pq.write_table(TABLE, self.paths["parquet"], row_group_size=2)
+        feather.write_feather(TABLE, self.paths["feather"], chunksize=2)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_open_source_dispatches_on_extension(self):
+        self.assertIsInstance(open_source(self.paths["csv"]), CsvSource)
+        self.assertIsInstance(open_source(self.paths["parquet"]), ColumnarSource)
+        self.assertIsInstance(open_source(self.paths["feather"]), ColumnarSource)
+
+    def test_rows_match_csv(self):
+        expected = list(CsvSource.open(self.paths["csv"]).rows())
+        for fmt in ("parquet", "feather"):
+            source = ColumnarSource.open(self.paths[fmt], sample_rows=2)
+            self.assertEqual(source.headers, TABLE.column_names)
+            self.assertEqual(source.num_rows, 3)
+            self.assertEqual(list(source.rows()), expected, fmt)
+            self.assertEqual(source.sample(2), expected[:2])
+            self.assertEqual(source.sample(5), expected)
+
+    def test_select_reads_only_mapped_columns(self):
+        columns = mapping_columns(MAPPING)
+        self.assertEqual(columns, ["Employee_ID", "Name", "Dept_ID", "Dept_Name"])
+        source = ColumnarSource.open(self.paths["parquet"]).select(columns)
+        self.assertEqual(source.headers, ["Employee_ID", "Name", "Dept_ID", "Dept_Name"])
+        self.assertEqual(next(source.rows()), ["1", "Alice", "10", "Research"])
+        self.assertEqual(source.sample_rows[1], ["2", "Bob", "10", ""])
+
+
+@unittest.skipIf(pa is None, "pyarrow not installed")
+class TestColumnarTransform(SqliteGraphTestCase):
+    """A Parquet / Feather document produces the same graph as the equivalent CSV."""
+
+    mapping = MAPPING
+
+    def test_graph_matches_csv(self):
+        csv_path = self.write_file("people.csv", CSV)
+        parquet_path = os.path.join(self.tmp.name, "people.parquet")
+        pq.write_table(TABLE, parquet_path)
+        feather_path = os.path.join(self.tmp.name, "people.arrow")
+        feather.write_feather(TABLE, feather_path)
+
+        from_csv = self.run_transform("doc_csv", csv_path, buffer_rows=2)
+        from_parquet = self.run_transform("doc_parquet", parquet_path, buffer_rows=2)
+        from_feather = self.run_transform("doc_feather", feather_path, buffer_rows=2)
+
+        self.assertEqual((from_csv["entities_count"], from_csv["relationships_count"]), (5, 3))
+        self.assertEqual(from_parquet["columns_read"], 4)
+        self.assertEqual(from_csv["columns_read"], 5)
+        for result in (from_parquet, from_feather):
+            self.assertFalse(result["partitioned"])
+            for key in ("entities_count", "relationships_count", "rows_processed"):
+                self.assertEqual(result[key], from_csv[key])
+        self.assertEqual(self.graph("doc_parquet"), self.graph("doc_csv"))
+        self.assertEqual(self.graph("doc_feather"), self.graph("doc_csv"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,169 @@
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from knowledge_graph.api.client import KnowledgeGraphClient
+from knowledge_graph.document_ingestion.document_pipeline import DocumentPipelineContext, DocumentPipelineParams
+from knowledge_graph.document_ingestion.tabular.steps import GenerateCsvProfileStep, LoadCSVStep
+from knowledge_graph.document_ingestion.tabular.steps import s8_transform_and_persist_kg as s8
+from knowledge_graph.persistence.sqlite import sql_lite as sql_lite_module
+from knowledge_graph.persistence.sqlite.core.ids import document_db_id
+from knowledge_graph.persistence.sqlite.sql_lite import get_sql_lite
+from knowledge_graph.settings.settings import load_settings
+
+from .graph_store_fixtures import SqliteGraphTestCase, graph_of, write_file
+
+CSV = (
+    "Employee_ID,Name,Dept_ID,Dept_Name\n"
+    "1,Alice,10,Research\n"
+    "2,Bob,10,\n"
+    "3,Carol,20,Sales\n"
+    "4,Dan,30,Ops\n"
+)
+
+# Bob renamed, Dan (the only Ops employee) removed, Erin appended
+CSV_EDITED = (
+    "Employee_ID,Name,Dept_ID,Dept_Name\n"
+    "1,Alice,10,Research\n"
+    "2,Robert,10,\n"
+    "3,Carol,20,Sales\n"
+    "5,Erin,20,Sales\n"
+)
+
+MAPPING = {
+    "entities": {
+        "Employee": {
+            "key": {"column": "Employee_ID", "prefix": "emp:"},
+            "attributes": [{"name": "name", "column": "Name"}],
+        },
+        "Department": {
+            "key": {"column": "Dept_ID", "prefix": "dept:"},
+            "attributes": [{"name": "dept_name", "column": "Dept_Name"}],
+        },
+    },
+    "edges": [{"predicate": "works_in", "source": {"entity": "Employee"}, "target": {"entity": "Department"}}],
+}
+
+
+class TestIncrementalTransform(SqliteGraphTestCase):
+    """Re-ingesting a CSV applies only the delta against the stored row hashes."""
+
+    mapping = MAPPING
+
+    def _run(self, document_id, text, incremental=True, buffer_rows=2):
+        path = self.write_file(f"{document_id}.csv", text)
+        return self.run_transform(document_id, path, buffer_rows=buffer_rows, incremental=incremental)
+
+    def test_initial_load_records_row_state(self):
+        result = self._run("doc", CSV)
+        self.assertTrue(result["incremental"])
+        self.assertEqual((result["entities_count"], result["relationships_count"]), (7, 4))
+        hashes = self.sql_lite.tabular_document_repository().load_csv_row_hashes(document_db_id("doc"))
+        self.assertEqual(sorted(hashes), ["emp:1", "emp:2", "emp:3", "emp:4"])
+        self.assertEqual(self.graph("doc"), self._graph_of_full_load(CSV))
+
+    def test_unchanged_reupload_writes_nothing(self):
+        self._run("doc", CSV)
+        before = self.graph("doc")
+        result = self._run("doc", CSV)
+        self.assertEqual((result["changed_keys"], result["vanished_keys"], result["unchanged_keys"]), (0, 0, 4))
+        self.assertEqual((result["entities_count"], result["relationships_count"]), (0, 0))
+        self.assertEqual(self.graph("doc"), before)
+
+    def test_delta_matches_full_reload(self):
+        self._run("doc", CSV)
+        result = self._run("doc", CSV_EDITED)
+        self.assertEqual((result["changed_keys"], result["vanished_keys"], result["unchanged_keys"]), (2, 1, 2))
+        # Dan and the Ops department no longer come from any row
+        self.assertEqual(result["entities_deleted"], 2)
+        self.assertEqual(result["relationships_deleted"], 1)
+        self.assertEqual(self.graph("doc"), self._graph_of_full_load(CSV_EDITED))
+
+        hashes = self.sql_lite.tabular_document_repository().load_csv_row_hashes(document_db_id("doc"))
+        self.assertEqual(sorted(hashes), ["emp:1", "emp:2", "emp:3", "emp:5"])
+        again = self._run("doc", CSV_EDITED)
+        self.assertEqual(again["changed_keys"] + again["vanished_keys"], 0)
+
+    def _graph_of_full_load(self, text):
+        self._run("fresh", text, incremental=False, buffer_rows=10_000)
+        graph = self.graph("fresh")
+        with self.sql_lite.pool.writer() as conn:
+            conn.execute("DELETE FROM documents WHERE id = ?", (document_db_id("fresh"),))
+        return graph
+
+
+class TestReingestDocument(unittest.TestCase):
+    """KnowledgeGraphClient.reingest_document runs the CSV pipeline under the existing document id."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.settings = load_settings({"db": {"db_location": os.path.join(self.tmp.name, "kb.db")}})
+        patcher = mock.patch.object(sql_lite_module, "get_settings", return_value=self.settings)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        get_sql_lite.cache_clear()
+        self.addCleanup(get_sql_lite.cache_clear)
+        self.client = KnowledgeGraphClient(self.settings)
+        self.sql_lite = get_sql_lite()
+        self.kb_id = self.client.kb_repo.create("Test", "test").id
+        self._seed_mapping_cache()
+
+    def tearDown(self):
+        self.sql_lite.close()
+        self.tmp.cleanup()
+
+    def _write(self, name, text):
+        return write_file(self.tmp.name, name, text)
+
+    def _seed_mapping_cache(self):
+        # What the agent steps would have stored for this schema, so no LLM is needed
+        context = DocumentPipelineContext(params=DocumentPipelineParams(self._write("seed.csv", CSV), "seed", self.kb_id))
+        LoadCSVStep().run(context)
+        GenerateCsvProfileStep(sample_rows=50).run(context)
+        repo = self.sql_lite.tabular_document_repository()
+        ontology = repo.save_document_ontology(
+            SimpleNamespace(document_id=document_db_id("seed"), specification={"entities": [], "relationships": []},
+                            status="proposed", version=1, proposed_by=None, reviewed_by=None, created_at=None,
+                            approved_at=None, is_canonical=False)
+        )
+        repo.save_csv_mapping(
+            ontology_id=ontology.id,
+            document_id=document_db_id("seed"),
+            mapping_spec=MAPPING,
+            schema_fingerprint=context.csv_profile.schema_fingerprint(),
+        )
+
+    def _graph(self, document_id):
+        return graph_of(self.sql_lite, document_id, properties=False)
+
+    def test_reingest_replaces_untracked_graph_then_applies_deltas(self):
+        document_id = self.client.add_document(self._write("people.csv", CSV), self.kb_id, dedup=False)
+        self.assertIn(("employee", "Dan"), self._graph(document_id)[0])
+
+        # No row state from the first ingestion: full reload replacing the old graph
+        self.assertEqual(self.client.reingest_document(document_id, self._write("people_v2.csv", CSV_EDITED)), document_id)
+        nodes, edges = self._graph(document_id)
+        self.assertEqual(
+            nodes,
+            [("department", "Research"), ("department", "Sales"),
+             ("employee", "Alice"), ("employee", "Carol"), ("employee", "Erin"), ("employee", "Robert")],
+        )
+        self.assertEqual(len(edges), 4)
+
+        # Row state recorded: going back to the first version is a delta
+        with mock.patch.object(s8, "apply_csv_delta", wraps=s8.apply_csv_delta) as delta:
+            self.client.reingest_document(document_id, self._write("people_v3.csv", CSV))
+        self.assertEqual(delta.call_count, 1)
+        self.assertIn(("employee", "Dan"), self._graph(document_id)[0])
+        self.assertNotIn(("employee", "Erin"), self._graph(document_id)[0])
+        self.assertEqual(self.sql_lite.document_repository().get_document_kb_id(document_db_id(document_id)), int(self.kb_id))
+
+    def test_unknown_document_is_rejected(self):
+        with self.assertRaises(ValueError):
+            self.client.reingest_document("doc_missing", self._write("people.csv", CSV))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from knowledge_graph.data_structs.tabular import CSVProfile, ColumnStat
+from knowledge_graph.document_ingestion.document_pipeline import DocumentPipelineContext, DocumentPipelineParams
+from knowledge_graph.document_ingestion.tabular.steps import (
+    AnalyseCsvWithAgentStep,
+    GenerateMappingFromOntologyStep,
+    PopulateMissingPrimaryKeysStep,
+)
+from knowledge_graph.document_ingestion.tabular.steps import reuse_cached_mapping as rcm
+from knowledge_graph.persistence.sqlite.sql_lite import SqlLite
+from knowledge_graph.settings.settings import load_settings
+
+ONTOLOGY = {"entities": [{"name": "Employee", "key": "employee_id"}], "relationships": []}
+MAPPING = {
+    "entities": {"Employee": {"key": {"column": "Employee_ID"}, "attributes": [{"name": "name", "column": "Name"}]}},
+    "edges": [],
+}
+
+
+def _profile(document_id, headers, types=("integer", "string"), delimiter=","):
+    columns = [ColumnStat(name=h, non_null=1, nulls=0, distinct=1, inferred_type=t) for h, t in zip(headers, types)]
+    return CSVProfile(
+        document_id=document_id,
+        headers_original=list(headers),
+        headers_normalized=[h.strip().lower() for h in headers],
+        delimiter=delimiter,
+        encoding="utf-8",
+        row_count_sampled=1,
+        column_count=len(headers),
+        columns=columns,
+    )
+
+
+class TestMappingCache(unittest.TestCase):
+    """Ontology + mapping reuse keyed by CSV schema fingerprint."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        settings = load_settings({"db": {"db_location": os.path.join(self.tmp.name, "kb.db")}})
+        self.sql_lite = SqlLite(settings)
+        self.sql_lite.create_tables()
+        self.kb_id = int(self.sql_lite.knowledge_base_repository().create("Test", "test").id)
+        self.patch = mock.patch.object(rcm, "get_sql_lite", return_value=self.sql_lite)
+        self.patch.start()
+
+    def tearDown(self):
+        self.patch.stop()
+        self.sql_lite.close()
+        self.tmp.cleanup()
+
+    def _context(self, document_id, profile):
+        with self.sql_lite.pool.writer() as conn:
+            conn.execute(
+                "INSERT INTO documents (id, kb_id, file_name, file_type) VALUES (?, ?, 'x.csv', 'CSV')",
+                (document_id, self.kb_id),
+            )
+        context = DocumentPipelineContext(params=DocumentPipelineParams("x.csv", str(document_id), str(self.kb_id)))
+        context.document = SimpleNamespace(id=document_id)
+        context.csv_profile = profile
+        return context
+
+    def test_fingerprint_ignores_rows_and_header_case(self):
+        a = _profile(1, ["Employee_ID", "Name"])
+        b = _profile(2, ["employee_id ", "NAME"])
+        b.sample_rows = [["9", "Zed"]]
+        self.assertEqual(a.schema_fingerprint(), b.schema_fingerprint())
+        self.assertNotEqual(a.schema_fingerprint(), _profile(3, ["Employee_ID", "Name"], types=("string", "string")).schema_fingerprint())
+        self.assertNotEqual(a.schema_fingerprint(), _profile(4, ["Employee_ID", "Name"], delimiter=";").schema_fingerprint())
+
+    def test_repeat_schema_reuses_mapping_and_skips_agent_steps(self):
+        first = self._context(1, _profile(1, ["Employee_ID", "Name"]))
+        rcm.ReuseCachedMappingStep().run(first)
+        self.assertFalse(first.results["reuse_cached_mapping"]["hit"])
+        self.assertTrue(AnalyseCsvWithAgentStep().should_run(first))
+
+        # What the agent + mapping steps would have produced on the miss
+        saved = self.sql_lite.tabular_document_repository().save_document_ontology(
+            SimpleNamespace(document_id=1, specification=ONTOLOGY, status="proposed", version=1,
+                            proposed_by=None, reviewed_by=None, created_at=None, approved_at=None, is_canonical=False)
+        )
+        first.ontology_id = saved.id
+        first.mapping_spec = MAPPING
+        step = rcm.CacheMappingStep()
+        self.assertTrue(step.should_run(first))
+        step.run(first)
+        self.assertTrue(first.results["cache_mapping"]["ok"])
+
+        second = self._context(2, _profile(2, ["employee_id", "name"]))
+        rcm.ReuseCachedMappingStep().run(second)
+        self.assertTrue(second.results["reuse_cached_mapping"]["hit"])
+        self.assertEqual(second.ontology_specification, ONTOLOGY)
+        # Columns follow the new file's header spelling
+        self.assertEqual(second.mapping_spec["entities"]["Employee"]["key"], {"column": "employee_id"})
+        self.assertEqual(second.mapping_spec["entities"]["Employee"]["attributes"][0]["column"], "name")
+        for skipped in (AnalyseCsvWithAgentStep(), GenerateMappingFromOntologyStep(), PopulateMissingPrimaryKeysStep(), rcm.CacheMappingStep()):
+            self.assertFalse(skipped.should_run(second), skipped.name)
+
+        stats = self.sql_lite.tabular_document_repository().csv_mapping_cache_stats()
+        self.assertEqual(stats, {"entries": 1, "hits": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from knowledge_graph.document_ingestion.document_pipeline import DocumentPipelineContext, DocumentPipelineParams
+from knowledge_graph.document_ingestion.tabular.profiler import DistinctCounter, HyperLogLog, profile_rows
+from knowledge_graph.document_ingestion.tabular.steps import GenerateCsvProfileStep, PopulateMissingPrimaryKeysStep
+from knowledge_graph.document_ingestion.tabular.steps import s2_generate_csv_profile as s2
+from knowledge_graph.settings.settings import load_settings
+
+
+class TestSketches(unittest.TestCase):
+    """Distinct-count sketches."""
+
+    def test_hyperloglog_accuracy(self):
+        for n in (50, 5_000, 100_000):
+            hll = HyperLogLog(p=12)
+            for i in range(n):
+                hll.add(f"value-{i}")
+            self.assertLess(abs(hll.estimate() - n) / n, 0.05, n)
+
+    def test_distinct_counter_is_exact_until_limit(self):
+        counter = DistinctCounter(exact_limit=100)
+        for i in range(250):
+            counter.add(str(i % 80))
+        self.assertTrue(counter.exact)
+        self.assertEqual(counter.count(), 80)
+        for i in range(1_000):
+            counter.add(str(i))
+        self.assertFalse(counter.exact)
+        self.assertLess(abs(counter.count() - 1_000), 50)
+
+
+class TestProfileRows(unittest.TestCase):
+    """Single-pass column statistics."""
+
+    def setUp(self):
+        rows = [[str(i), f"name {i % 10}", "" if i % 4 == 0 else str(i * 0.5), "yes" if i % 2 else "no", "2024-01-0%d" % (i % 9 + 1)]
+                for i in range(1, 2001)]
+        rows.append(["2001"])  # short row: remaining columns count as nulls
+        self.table = profile_rows(["id", "name", "score", "active", "day"], rows, reservoir_size=5, exact_distinct_limit=500)
+        self.stats = {c.name: c for c in self.table.columns}
+
+    def test_counts_and_types(self):
+        self.assertEqual(self.table.rows, 2001)
+        ident, name, score = self.stats["id"], self.stats["name"], self.stats["score"]
+        self.assertEqual((ident.inferred_type, ident.nulls, ident.min_value, ident.max_value), ("integer", 0, 1, 2001))
+        self.assertFalse(ident.distinct_exact)
+        self.assertLess(abs(ident.distinct - 2001), 100)
+        self.assertEqual((name.inferred_type, name.distinct, name.distinct_exact), ("string", 10, True))
+        self.assertEqual((score.inferred_type, score.nulls), ("float", 501))
+        self.assertEqual(self.stats["active"].inferred_type, "bool")
+        self.assertEqual(self.stats["day"].inferred_type, "date")
+
+    def test_bounded_samples_and_lengths(self):
+        ident = self.stats["id"]
+        self.assertEqual(len(ident.sample_values), 5)
+        self.assertEqual((ident.min_length, ident.max_length), (1, 4))
+        self.assertEqual(sum(ident.length_histogram.values()), ident.non_null)
+        self.assertEqual(ident.length_histogram["2-3"], 990)
+
+
+class TestKeySelectionWithStats(unittest.TestCase):
+    """PopulateMissingPrimaryKeysStep uses profile cardinalities when available."""
+
+    def _run(self, columns):
+        profile = SimpleNamespace(
+            headers_original=["order_ref", "customer_name", "customer_code", "amount"],
+            columns=columns,
+            row_count_sampled=1000,
+        )
+        context = DocumentPipelineContext(params=DocumentPipelineParams("x.csv", "d", "1"))
+        context.document = SimpleNamespace(id="d")
+        context.csv_profile = profile
+        context.mapping_spec = {"entities": {"Customer": {}, "Order": {}}}
+        PopulateMissingPrimaryKeysStep().run(context)
+        return {name: spec["key"]["column"] for name, spec in context.mapping_spec["entities"].items()}
+
+    def test_prefers_entity_named_key_like_column_then_most_distinct(self):
+        rows = [["1", "a", "c1", "10"], ["2", "b", "c2", "10"], ["3", "a", "c1", "12"]]
+        columns = profile_rows(["order_ref", "customer_name", "customer_code", "amount"], rows).columns
+        keys = self._run(columns)
+        self.assertEqual(keys["Customer"], "customer_code")
+        self.assertEqual(keys["Order"], "order_ref")
+
+    def test_without_stats_falls_back_to_first_header(self):
+        self.assertEqual(self._run([])["Customer"], "order_ref")
+
+
+
+class TestProfileStepSetting(unittest.TestCase):
+    """The full-file profile only runs when asked for, by argument or DBSettings.csv_full_profile."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "people.csv")
+        with open(self.path, "w", encoding="utf-8", newline="") as f:
+            f.write("id,name\n" + "".join(f"{i},n{i}\n" for i in range(100)))
+        self.settings = load_settings()
+
+    def _run(self, **kwargs):
+        context = DocumentPipelineContext(params=DocumentPipelineParams(self.path, "d", "1"))
+        context.document = SimpleNamespace(id="d", file_path=self.path, file_name="people.csv")
+        step = GenerateCsvProfileStep(sample_rows=10, **kwargs)
+        with mock.patch.object(s2, "get_sql_lite"), mock.patch.object(s2, "get_settings", return_value=self.settings):
+            step.run(context)
+        return context.csv_profile
+
+    def test_sample_only_by_default(self):
+        profile = self._run()
+        self.assertEqual((profile.columns, profile.row_count_sampled), ([], 10))
+
+    def test_setting_and_argument(self):
+        self.settings.db.csv_full_profile = True
+        profile = self._run()
+        self.assertEqual((len(profile.columns), profile.row_count_sampled), (2, 100))
+        self.assertEqual(self._run(full_profile=False).columns, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+
+from knowledge_graph.agent.mapping_plan import EntityAccumulator
+from knowledge_graph.document_ingestion.tabular.projection import EntityProjection, GraphProjector
+
+ONTOLOGY = {
+    "entities": [
+        {
+            "name": "Employee",
+            "attributes": [
+                {"name": "employee_id", "type": "integer"},
+                {"name": "handle", "type": "string", "description": "Display handle"},
+                {"name": "full_name", "type": "string"},
+            ],
+        }
+    ]
+}
+MAPPING_ENTITIES = {
+    "Employee": {
+        "attributes": [
+            {"name": "employee_id", "column": "ID"},
+            {"name": "handle", "column": "Handle"},
+            {"name": "full_name", "column": "Full Name"},
+        ]
+    },
+    "Badge": {"attributes": [{"name": "badge_id", "column": "Badge"}]},
+}
+
+
+class TestEntityProjection(unittest.TestCase):
+    """Label/property columns resolved once per entity type."""
+
+    def test_label_order_follows_priorities(self):
+        projection = EntityProjection.compile(
+            "Employee", MAPPING_ENTITIES["Employee"], ONTOLOGY["entities"][0], ["ID", "Handle", "Full Name"]
+        )
+        # name-like attribute first, then non-ID attributes, then the first attribute
+        self.assertEqual(projection.label_columns, ("Full Name", "Handle", "ID"))
+        self.assertEqual(projection.entity_type, "employee")
+        self.assertEqual([name for name, _ in projection.properties], ["employee_id", "handle", "full_name"])
+
+    def test_unavailable_columns_are_skipped(self):
+        projection = EntityProjection.compile("Employee", MAPPING_ENTITIES["Employee"], {}, ["ID"])
+        self.assertEqual(projection.label_columns, ("ID",))
+        self.assertEqual(projection.properties, (("employee_id", "ID"),))
+
+    def test_records_fall_back_column_by_column(self):
+        columns = {
+            "Employee": (("ID", 0), ("Handle", 1), ("Full Name", 2)),
+            "Badge": (("Badge", 3),),
+        }
+        staged = EntityAccumulator(columns)
+        staged.stage("emp:2", "Employee", ["2", "bob", " ", "b1"])
+        staged.stage("emp:1", "Employee", ["1", "", "Ada Lovelace", ""])
+        staged.stage("emp:3", "Employee", ["", "", "", ""])
+        staged.stage("badge:b1", "Badge", ["", "", "", "b1"])
+
+        records = GraphProjector(MAPPING_ENTITIES, ONTOLOGY).records(staged)
+        self.assertEqual([r["id"] for r in records], ["badge:b1", "emp:1", "emp:2", "emp:3"])
+        by_id = {r["id"]: r for r in records}
+        self.assertEqual(by_id["emp:1"]["label"], "Ada Lovelace")
+        self.assertEqual(by_id["emp:2"]["label"], "bob")
+        self.assertEqual(by_id["emp:3"]["label"], "emp:3")
+        self.assertEqual(by_id["badge:b1"], {"id": "badge:b1", "type": "badge", "label": "b1", "properties": {"badge_id": "b1"}})
+        # Empty values are not properties; whitespace-only values are kept as-is
+        self.assertEqual(by_id["emp:2"]["properties"], {"employee_id": "2", "handle": "bob", "full_name": " "})
+        self.assertEqual(by_id["emp:3"]["properties"], {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import codecs
+import os
+import tempfile
+import unittest
+
+from knowledge_graph.document_ingestion.tabular.partitioned import partition_csv
+from knowledge_graph.document_ingestion.tabular.source import CsvSource
+
+
+class TestCsvSource(unittest.TestCase):
+    """Sniff-once CSV source shared by the tabular steps."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write(self, name, data: bytes) -> str:
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def test_headers_offset_and_sample(self):
+        data = b'id;"note\nwith newline";city\n1;"a;b";Oslo\n2;x;Bergen\n3;y;Molde\n'
+        path = self._write("semi.csv", data)
+        source = CsvSource.open(path, delimiter=";", sample_rows=2)
+
+        self.assertEqual(source.delimiter, ";")
+        self.assertEqual(source.encoding, "utf-8")
+        self.assertEqual(source.headers, ["id", "note\nwith newline", "city"])
+        self.assertEqual(source.data_offset, data.index(b"1;"))
+        self.assertEqual(source.sample_rows, [["1", "a;b", "Oslo"], ["2", "x", "Bergen"]])
+        self.assertFalse(source.sample_complete)
+        self.assertEqual(len(source.sample(3)), 3)
+
+    def test_rows_are_lazy_and_fresh(self):
+        path = self._write("people.csv", b"id,name\n1,Alice\n2,Bob\n3,Carol\n")
+        source = CsvSource.open(path)
+
+        rows = source.rows()
+        self.assertFalse(isinstance(rows, list))
+        self.assertEqual(next(rows), ["1", "Alice"])
+        # Every call starts again at the first data record
+        self.assertEqual([r[1] for r in source.rows()], ["Alice", "Bob", "Carol"])
+        self.assertEqual(len(list(source.rows(limit=2))), 2)
+        self.assertTrue(source.sample_complete)
+
+    def test_bom_and_latin1(self):
+        path = self._write("bom.csv", codecs.BOM_UTF8 + "id,navn\n1,Åse\n".encode("utf-8"))
+        source = CsvSource.open(path)
+        self.assertEqual(source.encoding, "utf-8-sig")
+        self.assertEqual(source.headers, ["id", "navn"])
+        self.assertEqual(list(source.rows()), [["1", "Åse"]])
+
+        path = self._write("latin.csv", "id,navn\n1,Åse\n".encode("latin-1"))
+        source = CsvSource.open(path)
+        self.assertEqual(source.encoding, "latin-1")
+        self.assertEqual(list(source.rows()), [["1", "Åse"]])
+
+    def test_truncated_head_samples_complete_records_only(self):
+        body = "".join(f'{i},"row {i}"\n' for i in range(200))
+        path = self._write("big.csv", ("id,label\n" + body).encode("utf-8"))
+        source = CsvSource.open(path, sample_rows=500, head_bytes=100)
+
+        self.assertEqual(source.headers, ["id", "label"])
+        self.assertTrue(all(len(row) == 2 for row in source.sample_rows))
+        self.assertLess(len(source.sample_rows), 200)
+        self.assertEqual(len(source.sample(200)), 200)
+
+    def test_partitions_start_at_data_offset(self):
+        path = self._write("p.csv", b"a,b\n1,2\n3,4\n5,6\n")
+        source = CsvSource.open(path)
+        self.assertEqual(partition_csv(path, 2, data_start=source.data_offset), partition_csv(path, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
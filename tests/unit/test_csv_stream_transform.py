@@ -0,0 +1,73 @@
+import unittest
+
+from .graph_store_fixtures import SqliteGraphTestCase
+
+CSV = (
+    "Employee_ID,Name,Dept_ID,Dept_Name,Notes\n"
+    "1,Alice,10,Research,a\n"
+    "2,Bob,10,,b\n"
+    "3,,20,Sales,c\n"
+    "3,Carol,20,Sales,\n"
+    "4,Dan,10,Research,d\n"
+)
+
+MAPPING = {
+    "entities": {
+        "Employee": {
+            "key": {"column": "Employee_ID", "prefix": "emp:"},
+            "attributes": [{"name": "name", "column": "Name"}, {"name": "employee_id", "column": "Employee_ID"}],
+        },
+        "Department": {
+            "key": {"column": "Dept_ID", "prefix": "dept:"},
+            "attributes": [{"name": "dept_name", "column": "Dept_Name"}],
+        },
+    },
+    "edges": [{"predicate": "works_in", "source": {"entity": "Employee"}, "target": {"entity": "Department"}}],
+}
+
+
+class TestStreamingTransform(SqliteGraphTestCase):
+    """CSV -> KG transform with a bounded staging buffer."""
+
+    mapping = MAPPING
+
+    def setUp(self):
+        super().setUp()
+        self.csv_path = self.write_file("people.csv", CSV)
+
+    def _run(self, document_id, buffer_rows, workers=None):
+        return self.run_transform(document_id, self.csv_path, buffer_rows=buffer_rows, workers=workers)
+
+    def test_multi_flush_matches_single_flush(self):
+        single = self._run("doc_single", buffer_rows=10_000)
+        streamed = self._run("doc_streamed", buffer_rows=2)
+
+        self.assertEqual(single["flushes"], 1)
+        self.assertGreater(streamed["flushes"], 1)
+        for key in ("entities_count", "relationships_count", "rows_processed"):
+            self.assertEqual(single[key], streamed[key])
+        self.assertEqual((single["entities_count"], single["relationships_count"]), (6, 4))
+        self.assertEqual(self.graph("doc_single"), self.graph("doc_streamed"))
+
+        nodes, _ = self.graph("doc_streamed")
+        # Gaps left by earlier rows are filled by later ones, first non-empty value wins
+        self.assertIn(("employee", "Carol", [("employee_id", "3"), ("name", "Carol")]), nodes)
+        self.assertIn(("department", "Research", [("dept_name", "Research")]), nodes)
+
+    def test_partitioned_matches_streaming(self):
+        self.settings.db.csv_partition_min_bytes = 0
+        streamed = self._run("doc_streamed", buffer_rows=10_000)
+        partitioned = self._run("doc_partitioned", buffer_rows=2, workers=2)
+
+        self.assertTrue(partitioned["partitioned"])
+        self.assertFalse(streamed["partitioned"])
+        for key in ("entities_count", "relationships_count", "rows_processed"):
+            self.assertEqual(streamed[key], partitioned[key])
+        self.assertEqual(self.graph("doc_streamed"), self.graph("doc_partitioned"))
+
+    def test_missing_document_reports_error(self):
+        result = self.run_transform("nope", self.csv_path, register=False, buffer_rows=2)
+        self.assertIn("error", result)
+
+if __name__ == "__main__":
+    unittest.main()
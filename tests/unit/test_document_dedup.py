@@ -0,0 +1,185 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from knowledge_graph.document_ingestion.dedup import pipeline_fingerprint
+from knowledge_graph.document_ingestion.document_pipeline import DocumentPipeline, PipelineStep
+from knowledge_graph.persistence.sqlite import sql_lite as sql_lite_module
+from knowledge_graph.persistence.sqlite.core.ids import document_db_id, entity_db_id, relationship_db_id
+from knowledge_graph.persistence.sqlite.sql_lite import SqlLite
+from knowledge_graph.settings.settings import load_settings
+
+from .graph_store_fixtures import graph_of
+
+
+class PersistGraphStep(PipelineStep):
+    """Writes a documents row and a two-node graph, as the CSV pipeline does."""
+
+    name = "persist_graph"
+    kind = "write"
+    completes_document = True
+
+    def __init__(self, sql_lite, *, predicate="works_in", enabled=True, fail=False):
+        super().__init__(enabled=enabled)
+        self.predicate = predicate
+        self._sql_lite = sql_lite
+        self._fail = fail
+        self.runs = []
+
+    def should_run(self, context):
+        return self.enabled and "skip" not in context.params.document_id
+
+    def run(self, context):
+        self.runs.append(context.params.document_id)
+        if self._fail:
+            # Like the CSV graph step: the failure is reported, not raised
+            context.results[self.name] = {"error": "Failed to persist KG"}
+            return context
+        params = context.params
+        doc_id, kb_id = document_db_id(params.document_id), int(params.kb_id)
+        alice = entity_db_id(kb_id, doc_id, "emp:1")
+        research = entity_db_id(kb_id, doc_id, "dept:10")
+        with self._sql_lite.pool.writer() as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO documents (id, kb_id, file_name, file_type) VALUES (?, ?, ?, 'CSV')",
+                (doc_id, kb_id, os.path.basename(params.document_path)),
+            )
+            conn.executemany(
+                "INSERT INTO entities (id, kb_id, document_id, entity_definition_id, entity_type, entity_label, properties) "
+                "VALUES (?, ?, ?, 0, ?, ?, '{}')",
+                [(alice, kb_id, doc_id, "Employee", "Alice"), (research, kb_id, doc_id, "Department", "Research")],
+            )
+            conn.execute(
+                "INSERT INTO relationships (id, kb_id, document_id, relationship_definition_id, relationship_type, "
+                "source_entity_id, target_entity_id, properties) VALUES (?, ?, ?, 0, ?, ?, ?, '{}')",
+                (
+                    relationship_db_id(kb_id, doc_id, "emp:1", self.predicate, "dept:10"),
+                    kb_id, doc_id, self.predicate, alice, research,
+                ),
+            )
+        context.results[self.name] = {"entities": 2, "relationships": 1}
+        return context
+
+
+class NoteStep(PipelineStep):
+    """Writes its own documents row, then leaves the graph to PersistGraphStep."""
+
+    name = "note"
+
+    def __init__(self, sql_lite):
+        super().__init__()
+        self._sql_lite = sql_lite
+
+    def run(self, context):
+        params = context.params
+        with self._sql_lite.pool.writer() as conn:
+            conn.execute(
+                "INSERT INTO documents (id, kb_id, file_name, file_type) VALUES (?, ?, ?, 'CSV')",
+                (document_db_id(params.document_id), int(params.kb_id), os.path.basename(params.document_path)),
+            )
+        return context
+
+
+class TestDocumentDedup(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        settings = load_settings({"db": {"db_location": os.path.join(self.tmp.name, "kb.db")}})
+        self.sql_lite = SqlLite(settings)
+        self.sql_lite.create_tables()
+        kb_repo = self.sql_lite.knowledge_base_repository()
+        self.kb_a = kb_repo.create("A", "a").id
+        self.kb_b = kb_repo.create("B", "b").id
+        self.path = os.path.join(self.tmp.name, "people.csv")
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write("Employee_ID,Name,Dept_ID\n1,Alice,10\n")
+        patcher = mock.patch.object(sql_lite_module, "get_sql_lite", return_value=self.sql_lite)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.sql_lite.close()
+        self.tmp.cleanup()
+
+    def _graph(self, document_id):
+        return graph_of(self.sql_lite, document_id)
+
+    def test_fingerprint_tracks_step_configuration(self):
+        step = PersistGraphStep(self.sql_lite)
+        self.assertEqual(pipeline_fingerprint([step]), pipeline_fingerprint([PersistGraphStep(self.sql_lite)]))
+        self.assertNotEqual(
+            pipeline_fingerprint([step]), pipeline_fingerprint([PersistGraphStep(self.sql_lite, predicate="member_of")])
+        )
+        self.assertNotEqual(
+            pipeline_fingerprint([step]), pipeline_fingerprint([PersistGraphStep(self.sql_lite, enabled=False)])
+        )
+
+    def test_same_kb_is_skipped_and_other_kb_is_cloned(self):
+        step = PersistGraphStep(self.sql_lite)
+        pipeline = DocumentPipeline(steps=[step])
+
+        pipeline.run(document_path=self.path, document_id="doc_a", kb_id=self.kb_a, dedup=True)
+        self.assertEqual(len(step.runs), 1)
+        self.assertIsNone(pipeline.last_results["dedup"]["action"])
+        self.assertTrue(pipeline.last_results["dedup"]["recorded"])
+
+        # Same content, same KB: nothing runs
+        self.assertIsNone(pipeline.run(document_path=self.path, document_id="doc_b", kb_id=self.kb_a, dedup=True))
+        self.assertEqual(len(step.runs), 1)
+        self.assertEqual(pipeline.last_results["dedup"]["action"], "skipped")
+        self.assertEqual(pipeline.last_results["dedup"]["duplicate_of"], document_db_id("doc_a"))
+
+        # Another KB: the graph is cloned instead of extracted again
+        pipeline.run(document_path=self.path, document_id="doc_c", kb_id=self.kb_b, dedup=True)
+        self.assertEqual(len(step.runs), 1)
+        result = pipeline.last_results["dedup"]
+        self.assertEqual((result["action"], result["entities"], result["relationships"]), ("cloned", 2, 1))
+        self.assertEqual(self._graph("doc_c"), self._graph("doc_a"))
+        self.assertEqual(
+            self.sql_lite.graph_repository().get_graph_snapshot(kb_id=self.kb_b)["nodes"][0]["kb_id"], str(self.kb_b)
+        )
+        # The clone is itself a completed document of the new KB
+        self.assertEqual(
+            self.sql_lite.document_repository().find_duplicate_document(
+                result["file_hash"], result["fingerprint"], int(self.kb_b)
+            )["document_id"],
+            document_db_id("doc_c"),
+        )
+
+    def test_changed_pipeline_or_disabled_dedup_runs_again(self):
+        pipeline = DocumentPipeline(steps=[PersistGraphStep(self.sql_lite)])
+        pipeline.run(document_path=self.path, document_id="doc_a", kb_id=self.kb_a, dedup=True)
+
+        changed = PersistGraphStep(self.sql_lite, predicate="member_of")
+        DocumentPipeline(steps=[changed]).run(document_path=self.path, document_id="doc_b", kb_id=self.kb_a, dedup=True)
+        self.assertEqual(len(changed.runs), 1)
+
+        step = PersistGraphStep(self.sql_lite)
+        DocumentPipeline(steps=[step]).run(
+            document_path=self.path, document_id="doc_c", kb_id=self.kb_b, dedup=True, clone_duplicates=False
+        )
+        DocumentPipeline(steps=[step]).run(document_path=self.path, document_id="doc_d", kb_id=self.kb_a)
+        self.assertEqual(len(step.runs), 2)
+
+    def test_failed_or_skipped_graph_step_is_not_recorded(self):
+        failing = PersistGraphStep(self.sql_lite, fail=True)
+        pipeline = DocumentPipeline(steps=[NoteStep(self.sql_lite), failing])
+        pipeline.run(document_path=self.path, document_id="doc_a", kb_id=self.kb_a, dedup=True)
+        self.assertFalse(pipeline.last_results["dedup"]["recorded"])
+        self.assertIn("persist_graph", pipeline.last_results["dedup"]["incomplete"])
+
+        skipped = DocumentPipeline(steps=[NoteStep(self.sql_lite), PersistGraphStep(self.sql_lite)])
+        skipped.run(document_path=self.path, document_id="doc_skip", kb_id=self.kb_a, dedup=True)
+        self.assertEqual(skipped.last_results["dedup"]["incomplete"], "step 'persist_graph' did not run")
+
+        # Neither partial run counts as a duplicate: the next run builds the graph
+        step = PersistGraphStep(self.sql_lite)
+        retry = DocumentPipeline(steps=[NoteStep(self.sql_lite), step])
+        retry.run(document_path=self.path, document_id="doc_b", kb_id=self.kb_a, dedup=True)
+        self.assertIsNone(retry.last_results["dedup"]["action"])
+        self.assertEqual(step.runs, ["doc_b"])
+        self.assertTrue(retry.last_results["dedup"]["recorded"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+import threading
+import time
+import unittest
+
+from knowledge_graph.document_ingestion.document_pipeline import (
+    DocumentPipeline,
+    DocumentPipelineError,
+    PipelineStep,
+    step_dependencies,
+)
+
+
+class SlotStep(PipelineStep):
+    """Copies its inputs into its outputs on the context, optionally meeting other steps at a barrier."""
+
+    def __init__(self, name, inputs=(), outputs=(), *, barrier=None, fail=False, log=None):
+        super().__init__()
+        self.name = name
+        self.inputs = inputs
+        self.outputs = outputs
+        self._barrier = barrier
+        self._fail = fail
+        self._log = log if log is not None else []
+
+    def run(self, context):
+        self._log.append(self.name)
+        if self._barrier is not None:
+            self._barrier.wait()
+        if self._fail:
+            raise RuntimeError(f"{self.name} failed")
+        seen = [getattr(context, slot, None) for slot in self.inputs]
+        for slot in self.outputs:
+            setattr(context, slot, f"{self.name}:{seen}")
+        context.results[self.name] = {"thread": threading.current_thread().name}
+        return context
+
+
+class TestStepDependencies(unittest.TestCase):
+    def test_read_after_write_write_after_read_and_results(self):
+        steps = [
+            SlotStep("load", (), ("source",)),
+            SlotStep("profile", ("source",), ("profile",)),
+            SlotStep("analyse", ("source",), ("analysis",)),
+            SlotStep("merge", ("profile", "analysis"), ("mapping",)),
+            SlotStep("rewrite_document", ("analyse",), ("source",)),
+            SlotStep("persist", ("mapping",), ()),
+        ]
+        deps = step_dependencies(steps)
+        self.assertEqual(deps[1], {0})
+        self.assertEqual(deps[2], {0})
+        self.assertEqual(deps[3], {1, 2})
+        # Reads analyse's results entry; overwrites a slot load wrote and profile/analyse read
+        self.assertEqual(deps[4], {0, 1, 2})
+        self.assertEqual(deps[5], {3})
+
+    def test_undeclared_step_is_a_barrier(self):
+        steps = [SlotStep("a", (), ("x",)), SlotStep("legacy", None), SlotStep("b", (), ("y",))]
+        self.assertEqual(step_dependencies(steps), [set(), {0}, {1}])
+
+    def test_csv_pipeline_persists_while_caching_the_mapping(self):
+        from knowledge_graph.document_ingestion.factory import PipelineFactory
+
+        steps = PipelineFactory.csv_pipeline().steps
+        names = [step.name for step in steps]
+        deps = step_dependencies(steps)
+        transform = names.index("transform_and_persist_kg")
+        self.assertNotIn(names.index("cache_mapping"), deps[transform])
+        self.assertIn(names.index("populate_missing_primary_keys"), deps[transform])
+
+
+class TestConcurrentPipeline(unittest.TestCase):
+    def _run(self, steps, max_workers=4, **kwargs):
+        pipeline = DocumentPipeline(steps=steps, max_workers=max_workers, **kwargs)
+        pipeline.run(document_path="doc.txt", document_id="doc_1", kb_id="1")
+        return pipeline.last_results
+
+    def test_independent_steps_overlap(self):
+        # Both branches must be inside run() at the same time to pass the barrier
+        barrier = threading.Barrier(2, timeout=5)
+        steps = [
+            SlotStep("load", (), ("source",)),
+            SlotStep("profile", ("source",), ("profile",), barrier=barrier),
+            SlotStep("analyse", ("source",), ("analysis",), barrier=barrier),
+            SlotStep("merge", ("profile", "analysis"), ("mapping",)),
+        ]
+        results = self._run(steps)
+        self.assertNotEqual(results["profile"]["thread"], results["analyse"]["thread"])
+        self.assertIn("elapsed_ms", results["merge"])
+        self.assertLessEqual(results["run"]["critical_path_ms"], results["run"]["elapsed_ms"] + 1)
+
+    def test_dependent_step_sees_outputs(self):
+        log = []
+        steps = [
+            SlotStep("load", (), ("source",), log=log),
+            SlotStep("profile", ("source",), ("profile",), log=log),
+            SlotStep("analyse", ("source",), ("analysis",), log=log),
+            SlotStep("merge", ("profile", "analysis"), ("mapping",), log=log),
+        ]
+        pipeline = DocumentPipeline(steps=steps, max_workers=4)
+        pipeline.run(document_path="doc.txt", document_id="doc_1", kb_id="1")
+        self.assertEqual(log[0], "load")
+        self.assertEqual(log[-1], "merge")
+
+    def test_failure_stops_later_steps(self):
+        log = []
+        steps = [
+            SlotStep("load", (), ("source",), log=log),
+            SlotStep("broken", ("source",), ("profile",), fail=True, log=log),
+            SlotStep("merge", ("profile",), ("mapping",), log=log),
+        ]
+        with self.assertRaises(DocumentPipelineError):
+            self._run(steps)
+        self.assertEqual(log, ["load", "broken"])
+
+    def test_single_worker_runs_in_list_order(self):
+        log = []
+        names = ["a", "b", "c", "d"]
+        steps = [SlotStep(name, (), (name,), log=log) for name in names]
+        results = self._run(steps, max_workers=1)
+        self.assertEqual(log, names)
+        self.assertEqual({results[name]["thread"] for name in names}, {threading.current_thread().name})
+
+    def test_default_is_sequential(self):
+        log = []
+        steps = [SlotStep(name, (), (name,), log=log) for name in ("a", "b", "c")]
+        pipeline = DocumentPipeline(steps=steps)
+        pipeline.run(document_path="doc.txt", document_id="doc_1", kb_id="1")
+        self.assertEqual(log, ["a", "b", "c"])
+        self.assertEqual({pipeline.last_results[name]["thread"] for name in "abc"}, {threading.current_thread().name})
+
+    def test_concurrent_run_is_faster_than_serial(self):
+        class SleepStep(SlotStep):
+            def run(self, context):
+                time.sleep(0.2)
+                return super().run(context)
+
+        steps = [SleepStep(name, (), (name,)) for name in ("a", "b", "c")]
+        start = time.time()
+        self._run(steps)
+        self.assertLess(time.time() - start, 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
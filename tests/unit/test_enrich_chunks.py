@@ -0,0 +1,46 @@
+import json
+import unittest
+from types import SimpleNamespace
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from knowledge_graph.data_structs.document.chunk import ChunkMetadata, TextChunk
+from knowledge_graph.document_ingestion.pdf.steps.enrich_chunks import enrich_chunks_with_llm
+from knowledge_graph.llm.service import LLMService
+
+
+def make_document(n):
+    chunks = [
+        TextChunk(id=f"c{i}", document_id="doc_1", content=f"Chunk {i} text", metadata=ChunkMetadata(start_index=0, end_index=0))
+        for i in range(n)
+    ]
+    return SimpleNamespace(id="doc_1", textChunks=chunks)
+
+
+class TestChunkEnrichment(unittest.TestCase):
+    """Test fused topic/keyword extraction over chunks."""
+
+    def setUp(self):
+        self.service = LLMService(config={"model": "gpt-4o-mini", "api_key": "sk-test"})
+        response = json.dumps({"topics": ["parks", "rest"], "keywords": ["#forest"], "summary": "A walk."})
+        self.service.llm = FakeListChatModel(responses=[response] * 10)
+        self.service._build_chains()
+
+    def test_one_call_per_chunk(self):
+        document = enrich_chunks_with_llm(make_document(5), self.service, max_concurrency=3, include_summary=True)
+        self.assertEqual(self.service.llm.i, 5)
+        for chunk in document.textChunks:
+            self.assertEqual(chunk.metadata.topics, ["parks", "rest"])
+            self.assertEqual(chunk.metadata.keywords, ["forest"])
+            self.assertEqual(chunk.summary, "A walk.")
+
+    def test_failed_chunk_does_not_abort_batch(self):
+        self.service.llm = FakeListChatModel(responses=["not json", json.dumps({"topics": ["a"], "keywords": ["b"]})])
+        self.service._build_chains()
+        results = self.service.extract_chunk_metadata_batch(["x", "y"], max_concurrency=1)
+        self.assertIsNone(results[0])
+        self.assertEqual(results[1]["topics"], ["a"])
+
+
+if __name__ == "__main__":
+    unittest.main()
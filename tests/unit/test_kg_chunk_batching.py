@@ -0,0 +1,54 @@
+import re
+import unittest
+from types import SimpleNamespace
+
+from knowledge_graph.llm.kg_extractor.batching import demultiplex, pack_chunks
+from knowledge_graph.llm.kg_extractor.service import KGExtractionService
+
+
+class EchoKGGen:
+    """Returns every 'EntityN' token in the input, linked in order."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def generate(self, input_data, context=None):
+        self.calls += 1
+        names = re.findall(r"Entity\d+", input_data)
+        return SimpleNamespace(entities=names, relations=[(a, "precedes", b) for a, b in zip(names, names[1:])])
+
+
+class TestChunkBatching(unittest.TestCase):
+    """Test packing chunks into shared requests and mapping results back."""
+
+    def setUp(self):
+        self.items = [(i, f"Entity{i} is described on this page in some detail.", f"Page {i+1}") for i in range(10)]
+
+    def test_pack_respects_budget_and_order(self):
+        batches = pack_chunks(self.items, token_budget=40)
+        self.assertGreater(len(batches), 1)
+        self.assertEqual([i for b in batches for i in b.indices], list(range(10)))
+        self.assertTrue(all(b.tokens <= 40 for b in batches))
+        self.assertEqual(len(pack_chunks(self.items, token_budget=10_000, max_chunks_per_batch=4)), 3)
+
+    def test_demultiplex_attributes_by_mention(self):
+        batch = pack_chunks(self.items[:2], token_budget=10_000)[0]
+        per_chunk = demultiplex(batch, {"Entity0", "Entity1"}, [("Entity0", "precedes", "Entity1")])
+        self.assertEqual(per_chunk[0][0], {"Entity0"})
+        self.assertEqual(per_chunk[1][0], {"Entity1"})
+        # Endpoints live in different chunks: the relation is kept by both
+        self.assertEqual(per_chunk[0][1], per_chunk[1][1])
+
+    def test_batched_mode_cuts_requests(self):
+        service = KGExtractionService(llm_provider="none", cache={"enabled": False}, batch_token_budget=80)
+        service.kg_gen = EchoKGGen()
+        service.is_configured = True
+        result = service.extract_from_chunks([text for _, text, _ in self.items], document_id="doc_1")
+        self.assertEqual(result["entities"], {f"Entity{i}" for i in range(10)})
+        self.assertLess(service.kg_gen.calls, 10)
+        self.assertEqual(service.last_engine_stats["batches"], service.kg_gen.calls)
+        self.assertEqual(result["chunk_provenance"][3]["entities"], {"Entity3"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest import mock
+
+from knowledge_graph.config import CacheConfig, DatabaseConfig, KnowledgeGraphConfig, LLMConfig
+from knowledge_graph.knowledge_graph.service import KnowledgeGraphService
+from knowledge_graph.llm.kg_extractor import cache as cache_module
+from knowledge_graph.llm.kg_extractor.cache import ExtractionCache, extraction_cache_key
+from knowledge_graph.llm.kg_extractor.service import KGExtractionService
+
+
+class FakeKGGen:
+    """Counts generate() calls and returns a fixed graph."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def generate(self, input_data, context=None):
+        self.calls += 1
+        return SimpleNamespace(entities=["Alice", "Bob"], relations=[("Alice", "knows", "Bob")])
+
+
+class TestExtractionCache(unittest.TestCase):
+    """Test the content-addressed KG extraction cache."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = ExtractionCache(CacheConfig(location=self.tmp.name, max_size_mb=1, ttl_hours=24))
+        self.service = KGExtractionService(llm_provider="none", cache=self.cache)
+        self.service.kg_gen = FakeKGGen()
+        self.service.is_configured = True
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_key_ignores_whitespace_noise(self):
+        self.assertEqual(
+            extraction_cache_key("m", "v1", "Alice  knows\nBob ", "ctx"),
+            extraction_cache_key("m", "v1", "Alice knows Bob", "ctx"),
+        )
+        self.assertNotEqual(
+            extraction_cache_key("m", "v1", "Alice knows Bob", "ctx"),
+            extraction_cache_key("m", "v2", "Alice knows Bob", "ctx"),
+        )
+
+    def test_repeat_extraction_hits_cache(self):
+        text = "Alice knows Bob from the chess club."
+        first = self.service.extract_from_text(text, context="ctx")
+        second = self.service.extract_from_text(text, context="ctx", track_metadata=True)
+        self.assertEqual(self.service.kg_gen.calls, 1)
+        self.assertEqual(first["entities"], second["entities"])
+        self.assertEqual(second["relations"], [("Alice", "knows", "Bob")])
+        self.assertTrue(second["metadata"]["cache_hit"])
+        self.assertEqual(self.service.cache_stats()["hits"], 1)
+
+    def test_bypass_skips_cache(self):
+        text = "Alice knows Bob from the chess club."
+        self.service.extract_from_text(text)
+        self.service.extract_from_text(text, use_cache=False)
+        self.assertEqual(self.service.kg_gen.calls, 2)
+
+    def test_eviction_respects_size_bound(self):
+        self.cache.max_size_bytes = 200
+        for i in range(10):
+            self.cache.put(f"k{i}", {f"entity-{i}-{'x' * 40}"}, [])
+        self.cache.evict()
+        self.assertIsNone(self.cache.get("k0"))
+        self.assertIsNotNone(self.cache.get("k9"))
+
+    def test_concurrent_writes_schedule_every_eviction_check(self):
+        every = cache_module._EVICTION_CHECK_EVERY
+        with mock.patch.object(self.cache, "evict") as evict, ThreadPoolExecutor(max_workers=4) as pool:
+            list(pool.map(lambda i: self.cache.put(f"k{i}", {"Alice"}, []), range(4 * every)))
+        self.assertEqual(self.cache.stats.writes, 4 * every)
+        self.assertEqual(evict.call_count, 4)
+
+    def test_hits_are_read_only_but_still_count_for_lru(self):
+        self.cache.put("k0", {"entity-0-" + "x" * 40}, [])
+        self.cache.put("k1", {"entity-1-" + "x" * 40}, [])
+        with mock.patch.object(self.cache._pool, "writer", side_effect=AssertionError("write on hit")):
+            self.assertIsNotNone(self.cache.get("k0"))
+        # Room for one entry: k1 is now the least recently used
+        self.cache.max_size_bytes = 100
+        self.cache.evict()
+        self.assertIsNotNone(self.cache.get("k0"))
+        self.assertIsNone(self.cache.get("k1"))
+
+    def test_cache_is_opt_in(self):
+        self.assertFalse(CacheConfig().enabled)
+        self.assertIsNone(KGExtractionService(llm_provider="none").cache)
+
+
+class TestCacheFromConfig(unittest.TestCase):
+    def test_knowledge_graph_config_cache_reaches_the_extractor(self):
+        with tempfile.TemporaryDirectory() as location:
+            config = KnowledgeGraphConfig(
+                graph_db=DatabaseConfig(db_type="sqlite"),
+                llm=LLMConfig(provider="none"),
+                cache=CacheConfig(enabled=True, location=location),
+            )
+            service = KnowledgeGraphService.from_config(config)
+            extractor = service.kg_extractor
+            extractor.kg_gen = FakeKGGen()
+            extractor.is_configured = True
+
+            service.extract_from_text("Alice knows Bob from the chess club.")
+            result = service.extract_from_text("Alice knows Bob from the chess club.")
+
+        self.assertEqual(extractor.kg_gen.calls, 1)
+        self.assertTrue(result["metadata"]["cache_hit"])
+        self.assertEqual(extractor.cache_stats()["hits"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,197 @@
+import asyncio
+import random
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+
+from knowledge_graph.config import KGExtractionConfig
+from knowledge_graph.knowledge_graph.service import KnowledgeGraphService
+from knowledge_graph.llm.kg_extractor.engine import (
+    AIMDController,
+    AsyncExtractionEngine,
+    RateLimiter,
+    TokenBucket,
+    is_rate_limit_error,
+)
+from knowledge_graph.llm.kg_extractor.service import KGExtractionService
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+
+class FakeClock:
+    """Monotonic clock that only moves when something sleeps on it."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.now += seconds
+        await asyncio.sleep(0)
+
+
+class FakeLLM:
+    """kg-gen stand-in: fixed latency, throttles when too many calls are in flight."""
+
+    def __init__(self, latency_s=0.01, max_in_flight=3):
+        self.latency_s = latency_s
+        self.max_in_flight = max_in_flight
+        self.in_flight = 0
+        self.calls = 0
+        self.throttled = 0
+        self._lock = threading.Lock()
+
+    def generate(self, input_data, context=None):
+        with self._lock:
+            self.calls += 1
+            self.in_flight += 1
+            over = self.in_flight > self.max_in_flight
+        try:
+            if over:
+                with self._lock:
+                    self.throttled += 1
+                raise RateLimitError("Too Many Requests")
+            time.sleep(self.latency_s)
+            name = input_data.split()[0]
+            return SimpleNamespace(entities=[name], relations=[(name, "mentions", "Topic")])
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+class TestEngineControls(unittest.TestCase):
+    """Test the limiter and concurrency controller in isolation."""
+
+    def test_token_bucket_waits_when_empty(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate_per_minute=600, capacity=1, clock=clock, sleep=clock.sleep)  # 10 tokens/s
+
+        async def take_three():
+            return sum([await bucket.acquire(1) for _ in range(3)])
+
+        waited = asyncio.run(take_three())
+        self.assertAlmostEqual(waited, 0.2)
+        self.assertAlmostEqual(clock.now, 0.2)
+
+    def test_limits_are_shared_across_threads_and_loops(self):
+        # Each sync extract_from_chunks call runs its own loop, possibly on another thread
+        bucket = TokenBucket(rate_per_minute=60, capacity=100)
+        controller = AIMDController(initial=8, cooldown_s=60)
+
+        def worker():
+            async def take():
+                for _ in range(10):
+                    await bucket.acquire(1)
+                    controller.on_throttle()
+            asyncio.run(take())
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertLess(bucket.tokens, 21)
+        # A burst of throttles from every thread backs off once per cooldown
+        self.assertEqual(controller.current, 4)
+
+    def test_aimd_increases_and_halves(self):
+        controller = AIMDController(initial=4, maximum=8, cooldown_s=0)
+        for _ in range(8):
+            controller.on_success(0.01)
+        self.assertGreaterEqual(controller.current, 5)
+        controller.on_throttle()
+        self.assertLessEqual(controller.current, 3)
+        controller.on_throttle()
+        controller.on_throttle()
+        self.assertEqual(controller.current, 1)
+
+    def test_rate_limit_detection(self):
+        self.assertTrue(is_rate_limit_error(RateLimitError("slow down")))
+        self.assertFalse(is_rate_limit_error(ValueError("bad json")))
+
+    def test_engine_retries_transient_failures_in_order(self):
+        failures = {"b": 2}
+
+        async def extract(text, ctx):
+            if failures.get(text):
+                failures[text] -= 1
+                raise RateLimitError("429")
+            return text.upper()
+
+        clock = FakeClock()
+        engine = AsyncExtractionEngine(
+            extract,
+            controller=AIMDController(initial=2, cooldown_s=0, clock=clock),
+            base_backoff_s=1.0,
+            rng=random.Random(0),
+            clock=clock,
+            sleep=clock.sleep,
+        )
+        outcomes = asyncio.run(engine.run([("a", None), ("b", None), ("c", None)]))
+        self.assertEqual([o.result for o in outcomes], ["A", "B", "C"])
+        self.assertEqual(outcomes[1].attempts, 3)
+        self.assertEqual(engine.stats.throttled, 2)
+        # Backoff slept on the injected clock: at most 1s + 2s of full jitter
+        self.assertGreater(clock.now, 0)
+        self.assertLessEqual(clock.now, 3.0)
+
+
+class TestServiceOnAsyncEngine(unittest.TestCase):
+    """Test extract_from_chunks against a throttling fake LLM."""
+
+    def make_service(self, **kwargs):
+        service = KGExtractionService(llm_provider="none", cache={"enabled": False}, **kwargs)
+        service.kg_gen = FakeLLM()
+        service.is_configured = True
+        return service
+
+    def test_chunks_survive_throttling(self):
+        service = self.make_service(max_concurrent_chunks=8, max_retries=8)
+        chunks = [f"Entity{i} appears in this chunk of text." for i in range(20)]
+        result = service.extract_from_chunks(chunks, document_id="doc_1")
+        self.assertEqual(result["entities"], {f"Entity{i}" for i in range(20)})
+        self.assertGreater(service.kg_gen.throttled, 0)
+        self.assertEqual(service.last_engine_stats["failed"], 0)
+        self.assertLess(service.concurrency.current, 8)
+
+    def test_requests_per_minute_budget(self):
+        service = self.make_service(max_concurrent_chunks=4)
+        clock = FakeClock()
+        service.rate_limiter = RateLimiter(requests_per_minute=600, clock=clock, sleep=clock.sleep)
+        service.rate_limiter.requests.tokens = 0  # start with an empty bucket: 10 req/s
+        service.extract_from_chunks([f"Entity{i} text body here" for i in range(3)], document_id="doc_1")
+        # Three requests from an empty bucket need at least 0.3s of (simulated) waiting
+        self.assertGreaterEqual(clock.now, 0.3 - 1e-9)
+        self.assertGreater(service.last_engine_stats["rate_wait_s"], 0)
+
+
+class TestKnowledgeGraphServiceConfig(unittest.TestCase):
+    def test_extraction_config_reaches_the_engine(self):
+        config = KGExtractionConfig(
+            max_concurrent_chunks=2,
+            requests_per_minute=120,
+            tokens_per_minute=50_000,
+            max_concurrency=6,
+            latency_target_s=5.0,
+            max_retries=1,
+            batch_token_budget=2000,
+            max_chunks_per_batch=3,
+        )
+        service = KnowledgeGraphService(db_client=None, llm_service=None, llm_provider="none", kg_extraction_config=config)
+        extractor = service.kg_extractor
+
+        self.assertEqual(extractor.rate_limiter.requests.capacity, 120)
+        self.assertEqual(extractor.rate_limiter.tokens.capacity, 50_000)
+        self.assertEqual((extractor.concurrency.current, extractor.concurrency.maximum), (2, 6))
+        self.assertEqual(extractor.concurrency.latency_target_s, 5.0)
+        self.assertEqual(extractor.max_retries, 1)
+        self.assertEqual((extractor.batch_token_budget, extractor.max_chunks_per_batch), (2000, 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import unittest
+
+import pickle
+
+from knowledge_graph.agent.mapping_plan import EntityAccumulator, MappingPlan, compile_key
+
+HEADERS = ["person_id", "Name", "Degree", "City", "Name"]
+COLUMNS = {h: i for i, h in enumerate(HEADERS)}
+
+
+class TestCompileKey(unittest.TestCase):
+    """Key specs compiled to closures over column positions."""
+
+    def test_column_key_with_prefix_and_transform(self):
+        key = compile_key({"prefix": "edu:", "column": "Degree", "transform": "slug"}, COLUMNS)
+        self.assertEqual(key(["1", "a", "B.Sc Physics", "x", "b"]), "edu:b-sc-physics")
+        self.assertEqual(key(["1", "a", "  ", "x", "b"]), "")
+
+    def test_missing_column_and_unknown_normalizer(self):
+        self.assertEqual(compile_key({"prefix": "p:", "column": "nope"}, COLUMNS)(["1"] * 5), "")
+        self.assertEqual(compile_key({"column": "City", "transform": "nope"}, COLUMNS)(["", "", "", " Oslo", ""]), " Oslo")
+
+    def test_template_key(self):
+        key = compile_key({"template": "{City}/{person_id}-{Missing}", "transforms": {"City": "lower"}}, COLUMNS)
+        self.assertEqual(key(["7", "", "", " OSLO ", ""]), "oslo/7-")
+        self.assertEqual(compile_key({"template": "constant"}, COLUMNS)([]), "constant")
+
+    def test_duplicate_headers_use_last_column(self):
+        self.assertEqual(compile_key({"column": "Name"}, COLUMNS)(["1", "first", "", "", "last"]), "last")
+
+
+class TestMappingPlan(unittest.TestCase):
+    """Whole mapping specs compiled once per header row."""
+
+    def setUp(self):
+        self.plan = MappingPlan.compile(
+            {
+                "entities": {
+                    "Person": {
+                        "key": {"prefix": "person:", "column": "person_id"},
+                        "attributes": [{"name": "name", "column": "Name"}, {"name": "x", "column": "Missing"}],
+                    },
+                    "City": {"key": {"prefix": "city:", "column": "City", "transform": "slug"}},
+                },
+                "edges": [
+                    {"predicate": "lives in", "source": {"entity": "Person"}, "target": {"entity": "City"}},
+                    {
+                        "predicate": "studied",
+                        "source": {"entity": "Person"},
+                        "target": {"entity": "Degree", "by": {"prefix": "degree:", "column": "Degree"}},
+                    },
+                    {"source": {"entity": "Person"}, "target": {"entity": "City"}},
+                ],
+            },
+            HEADERS,
+        )
+
+    def test_entities_and_edges(self):
+        row = ["1", "Ada", "", "New York", "Ada L."]
+        self.assertEqual(list(self.plan.entity_ids(row)), [("Person", "person:1"), ("City", "city:new-york")])
+        triples = [(e.predicate, s, t) for e, s, t in self.plan.edge_triples(row)]
+        # Edges without a predicate are dropped; unresolved endpoints skip the edge
+        self.assertEqual(triples, [("lives in", "person:1", "city:new-york")])
+
+    def test_attribute_columns_keep_known_columns_only(self):
+        self.assertEqual(self.plan.attribute_columns, {"Person": (("Name", 4),), "City": ()})
+
+    def test_fit_pads_and_truncates(self):
+        self.assertEqual(self.plan.fit(["1"]), ["1", "", "", "", ""])
+        self.assertEqual(len(self.plan.fit(["1"] * 7)), 5)
+
+
+class TestEntityAccumulator(unittest.TestCase):
+    """Column-wise entity staging with keep-first-non-empty merges."""
+
+    COLUMNS = {"Person": (("Name", 1), ("Bio", 2)), "City": ()}
+
+    def test_stage_fills_gaps_from_later_rows(self):
+        acc = EntityAccumulator(self.COLUMNS)
+        acc.stage("p:1", "Person", ["1", "", "bio one"])
+        acc.stage("p:1", "Person", ["1", "Ada", "bio two"])
+        acc.stage("c:oslo", "City", ["", "", ""])
+        self.assertEqual(len(acc), 2)
+        self.assertIn("p:1", acc)
+        self.assertEqual(acc.to_dict(), {"p:1": ("Person", {"Name": "Ada", "Bio": "bio one"}), "c:oslo": ("City", {})})
+
+    def test_merge_matches_sequential_staging(self):
+        rows = [("p:1", ["1", "", "a"]), ("p:2", ["2", "Bo", ""]), ("p:1", ["1", "Ada", "b"]), ("p:2", ["2", "", "c"])]
+        sequential = EntityAccumulator(self.COLUMNS)
+        left, right = EntityAccumulator(self.COLUMNS), EntityAccumulator(self.COLUMNS)
+        for i, (node_id, row) in enumerate(rows):
+            sequential.stage(node_id, "Person", row)
+            (left if i < 2 else right).stage(node_id, "Person", row)
+        # An empty reducer adopts the columns of the accumulators merged into it
+        merged = EntityAccumulator().merge(left).merge(right)
+        self.assertEqual(merged.to_dict(), sequential.to_dict())
+
+    def test_select_and_pickle(self):
+        acc = EntityAccumulator(self.COLUMNS)
+        for n in range(5):
+            acc.stage(f"p:{n}", "Person", [str(n), f"N{n}", ""])
+        part = acc.select(["p:3", "p:1", "p:9"])
+        self.assertEqual(sorted(part.node_ids()), ["p:1", "p:3"])
+        self.assertEqual(part.to_dict()["p:3"], ("Person", {"Name": "N3", "Bio": ""}))
+        self.assertEqual(pickle.loads(pickle.dumps(acc)).to_dict(), acc.to_dict())
+
+
+if __name__ == "__main__":
+    unittest.main()
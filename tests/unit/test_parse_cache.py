@@ -0,0 +1,121 @@
+import hashlib
+import os
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from knowledge_graph.config import CacheConfig
+from knowledge_graph.document_ingestion import parse_cache as parse_cache_module
+from knowledge_graph.document_ingestion.parse_cache import (
+    ParseCache,
+    file_content_hash,
+    parse_cache_key,
+    resolve_parse_cache,
+)
+from knowledge_graph.api.client import KnowledgeGraphClient
+from knowledge_graph.document_ingestion.pdf.steps.load_document import load_document_from_path
+from knowledge_graph.document_ingestion.pdf.utils.parser import MarkdownParser
+from knowledge_graph.persistence.sqlite import sql_lite as sql_lite_module
+from knowledge_graph.persistence.sqlite.sql_lite import get_sql_lite
+from knowledge_graph.settings.settings import load_settings
+
+
+class TestParseCache(unittest.TestCase):
+    """Re-loading identical bytes reuses the stored parse."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = ParseCache(CacheConfig(location=os.path.join(self.tmp.name, "cache"), max_size_mb=1))
+        self.path = os.path.join(self.tmp.name, "note.md")
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write("# Title\n\nAlice knows Bob.\n")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_content_hash_streams_whole_file(self):
+        with open(self.path, "rb") as f:
+            expected = hashlib.sha256(f.read()).hexdigest()
+        self.assertEqual(file_content_hash(self.path, block_size=4), expected)
+
+    def test_second_load_skips_parsing(self):
+        first = load_document_from_path(self.path, "doc_1", cache=self.cache)
+        with mock.patch.object(MarkdownParser, "parse", side_effect=AssertionError("parsed again")):
+            second = load_document_from_path(self.path, "doc_2", cache=self.cache)
+
+        self.assertFalse(first.is_cached)
+        self.assertTrue(second.is_cached)
+        self.assertEqual(second.file_hash, first.file_hash)
+        self.assertEqual((second.raw_content, second.pages), (first.raw_content, first.pages))
+        self.assertEqual(self.cache.summary()["hits"], 1)
+
+    def test_hits_do_not_take_the_write_lock(self):
+        load_document_from_path(self.path, "doc_1", cache=self.cache)
+        with mock.patch.object(self.cache._pool, "writer", side_effect=AssertionError("write on hit")):
+            self.assertTrue(load_document_from_path(self.path, "doc_2", cache=self.cache).is_cached)
+        self.cache.flush_access_times()
+        self.assertEqual(self.cache._touched, {})
+
+    def test_concurrent_writes_schedule_every_eviction_check(self):
+        every = parse_cache_module._EVICTION_CHECK_EVERY
+        parser = MarkdownParser()
+        with mock.patch.object(self.cache, "evict") as evict, ThreadPoolExecutor(max_workers=4) as pool:
+            list(pool.map(lambda i: self.cache.put(f"k{i}", f"h{i}", parser, "raw", ["raw"]), range(4 * every)))
+        self.assertEqual(self.cache.stats.writes, 4 * every)
+        self.assertEqual(evict.call_count, 4)
+
+    def test_default_config_disables_the_cache(self):
+        self.assertIsNone(resolve_parse_cache(None))
+        self.assertIsNotNone(resolve_parse_cache({"enabled": True, "location": os.path.join(self.tmp.name, "on")}))
+
+    def test_changed_content_or_parser_version_misses(self):
+        load_document_from_path(self.path, "doc_1", cache=self.cache)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("Bob knows Carol.\n")
+        self.assertFalse(load_document_from_path(self.path, "doc_1", cache=self.cache).is_cached)
+
+        content_hash = file_content_hash(self.path)
+        parser = MarkdownParser()
+        key = parse_cache_key(content_hash, parser)
+        self.assertIsNotNone(self.cache.get(key))
+        with mock.patch.object(MarkdownParser, "version", "2"):
+            self.assertNotEqual(parse_cache_key(content_hash, parser), key)
+
+
+class TestClientParseCache(unittest.TestCase):
+    """settings.cache turns the parse cache on for KnowledgeGraphClient ingestion."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.tmp.name, "cache")
+        self.settings = load_settings({
+            "db": {"db_location": os.path.join(self.tmp.name, "kb.db")},
+            "cache": {"enabled": True, "location": self.cache_dir},
+        })
+        patcher = mock.patch.object(sql_lite_module, "get_settings", return_value=self.settings)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        get_sql_lite.cache_clear()
+        self.addCleanup(get_sql_lite.cache_clear)
+        self.client = KnowledgeGraphClient(self.settings)
+        self.kb_id = self.client.kb_repo.create("Test", "test").id
+        self.path = os.path.join(self.tmp.name, "note.md")
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write("# Title\n\nAlice knows Bob.\n")
+
+    def tearDown(self):
+        get_sql_lite().close()
+        self.tmp.cleanup()
+
+    def test_reingesting_the_same_file_skips_parsing(self):
+        self.client.add_document(self.path, self.kb_id, dedup=False)
+        with mock.patch.object(MarkdownParser, "parse", side_effect=AssertionError("parsed again")):
+            self.client.add_document(self.path, self.kb_id, dedup=False)
+
+        cache = resolve_parse_cache(CacheConfig(enabled=True, location=self.cache_dir))
+        self.assertEqual((cache.summary()["hits"], cache.summary()["writes"]), (1, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
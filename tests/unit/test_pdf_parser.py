@@ -0,0 +1,110 @@
+import os
+import tempfile
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from knowledge_graph.document_ingestion.pdf.utils import parser as parser_module
+from knowledge_graph.document_ingestion.pdf.utils.parser import ParserFactory, page_ranges
+
+
+def write_pdf(path, texts):
+    """Minimal PDF with one Helvetica text line per page."""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for text in texts:
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Resources << /Font << /F1 3 0 R >> >> "
+            b"/Contents %d 0 R >>" % len(objects)
+        )
+        kids.append(b"%d 0 R" % len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(kids), len(kids))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    with open(path, "wb") as f:
+        f.write(bytes(out))
+
+
+@unittest.skipUnless(parser_module.PyPDF2 is not None, "PyPDF2 not installed")
+class TestParallelPdfParser(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "doc.pdf")
+        self.texts = [f"Page number {i}" for i in range(1, 11)]
+        write_pdf(self.path, self.texts)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_page_ranges_cover_every_page_in_order(self):
+        ranges = page_ranges(10, workers=2)
+        self.assertEqual(len(ranges), 8)
+        self.assertEqual([p for start, end in ranges for p in range(start, end)], list(range(10)))
+        self.assertEqual(page_ranges(3, workers=4), [(0, 1), (1, 2), (2, 3)])
+        self.assertEqual(page_ranges(0, workers=4), [])
+
+    def test_parallel_matches_serial(self):
+        serial = ParserFactory.PDFParser(workers=1).parse(self.path)
+        parser = ParserFactory.PDFParser(workers=3, parallel_min_pages=2)
+        parallel = parser.parse(self.path)
+
+        self.assertEqual(parallel, serial)
+        self.assertEqual([page.text.strip() for page in parser.last_pages], self.texts)
+        self.assertEqual([page.number for page in parser.last_pages], list(range(1, 11)))
+        self.assertTrue(all(page.seconds >= 0 and page.error is None for page in parser.last_pages))
+        self.assertEqual(serial.count("\f"), 9)
+
+    def test_failed_range_is_extracted_serially(self):
+        parser = ParserFactory.PDFParser(workers=2, parallel_min_pages=2)
+        with mock.patch.object(parser_module, "ProcessPoolExecutor") as pool_cls:
+            pool_cls.return_value.submit.return_value.result.side_effect = RuntimeError("worker died")
+            pages = parser.parse_pages(self.path)
+        self.assertEqual([page.text.strip() for page in pages], self.texts)
+
+    def test_pool_that_cannot_start_workers_falls_back_to_serial(self):
+        parser = ParserFactory.PDFParser(workers=2, parallel_min_pages=2)
+        with mock.patch.object(parser_module, "ProcessPoolExecutor") as pool_cls:
+            pool_cls.return_value.submit.side_effect = OSError("cannot spawn")
+            pages = parser.parse_pages(self.path)
+        self.assertEqual([page.text.strip() for page in pages], self.texts)
+        pool_cls.return_value.shutdown.assert_called_once()
+
+    def test_default_is_serial_off_the_main_thread(self):
+        seen = {}
+
+        def parse():
+            parser = ParserFactory.PDFParser(parallel_min_pages=2)
+            with mock.patch.object(parser_module, "ProcessPoolExecutor") as pool_cls:
+                seen["pages"] = parser.parse_pages(self.path)
+            seen["pool_created"] = pool_cls.called
+
+        worker = threading.Thread(target=parse)
+        worker.start()
+        worker.join()
+        self.assertFalse(seen["pool_created"])
+        self.assertEqual([page.text.strip() for page in seen["pages"]], self.texts)
+
+    def test_shared_executor_is_used_and_left_open(self):
+        with ThreadPoolExecutor(max_workers=2) as shared:
+            parser = ParserFactory.PDFParser(parallel_min_pages=2, executor=shared)
+            with mock.patch.object(parser_module, "ProcessPoolExecutor") as pool_cls:
+                pages = parser.parse_pages(self.path)
+            self.assertFalse(pool_cls.called)
+            self.assertEqual([page.text.strip() for page in pages], self.texts)
+            # Still usable by the next parser
+            self.assertEqual(shared.submit(len, "abc").result(), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import os
+import tempfile
+import threading
+import unittest
+
+from knowledge_graph.persistence.sqlite.core.connection import close_connection_pool, get_connection_pool
+from knowledge_graph.persistence.sqlite.sql_lite import SqlLite
+from knowledge_graph.settings.settings import load_settings
+
+
+class TestSQLiteConnectionPool(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, "pool.db")
+        self.pool = get_connection_pool(self.db_path, readers=2)
+        with self.pool.writer() as conn:
+            conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+
+    def tearDown(self):
+        close_connection_pool(self.db_path)
+        self.tmp.cleanup()
+
+    def _count(self):
+        with self.pool.reader() as conn:
+            return conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+
+    def test_nested_writer_joins_outer_transaction(self):
+        with self.pool.writer() as outer:
+            outer.execute("INSERT INTO items (name) VALUES ('a')")
+            with self.pool.writer() as inner:
+                self.assertIs(inner, outer)
+                inner.execute("INSERT INTO items (name) VALUES ('b')")
+            # The inner block exiting does not commit
+            self.assertTrue(outer.in_transaction)
+        self.assertEqual(self._count(), 2)
+
+    def test_failure_rolls_back_the_whole_transaction(self):
+        with self.assertRaises(RuntimeError):
+            with self.pool.writer() as outer:
+                outer.execute("INSERT INTO items (name) VALUES ('a')")
+                with self.pool.writer() as inner:
+                    inner.execute("INSERT INTO items (name) VALUES ('b')")
+                    raise RuntimeError("boom")
+        self.assertEqual(self._count(), 0)
+
+    def test_reader_inside_writer_sees_uncommitted_rows(self):
+        seen_elsewhere = []
+        with self.pool.writer() as conn:
+            conn.execute("INSERT INTO items (name) VALUES ('a')")
+            with self.pool.reader() as reader:
+                self.assertIs(reader, conn)
+                self.assertEqual(reader.execute("SELECT COUNT(*) FROM items").fetchone()[0], 1)
+            # Another thread reads the last committed state
+            other = threading.Thread(target=lambda: seen_elsewhere.append(self._count()))
+            other.start()
+            other.join()
+        self.assertEqual(seen_elsewhere, [0])
+        self.assertEqual(self._count(), 1)
+
+    def test_close_then_reuse_reconnects(self):
+        with self.pool.writer() as conn:
+            conn.execute("INSERT INTO items (name) VALUES ('a')")
+        close_connection_pool(self.db_path)
+        self.assertIs(get_connection_pool(self.db_path), self.pool)
+        with self.pool.writer() as conn:
+            conn.execute("INSERT INTO items (name) VALUES ('b')")
+        self.assertEqual(self._count(), 2)
+
+
+class TestSqlLiteClose(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.settings = load_settings({"db": {"db_location": os.path.join(self.tmp.name, "kb.db")}})
+
+    def tearDown(self):
+        close_connection_pool(os.path.join(self.tmp.name, "kb.db"))
+        self.tmp.cleanup()
+
+    def test_other_facades_keep_working_after_close(self):
+        owner = SqlLite(self.settings)
+        owner.create_tables()
+        # e.g. the cached get_sql_lite() facade used by pipeline steps
+        shared = SqlLite(self.settings)
+        kb_repo = shared.knowledge_base_repository()
+        kb_id = kb_repo.create("A", "a").id
+
+        owner.close()
+
+        self.assertEqual([kb.id for kb in kb_repo.list()], [kb_id])
+        kb_repo.create("B", "b")
+        self.assertEqual(len(shared.knowledge_base_repository().list()), 2)
+        self.assertEqual(owner.document_repository().list_documents(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,168 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from knowledge_graph.settings.settings import load_settings
+from knowledge_graph.persistence.sqlite.sql_lite import SqlLite
+from knowledge_graph.persistence.sqlite.core.ids import (
+    document_db_id,
+    entity_db_id,
+    kb_db_id,
+    stable_id,
+)
+
+
+class TestStableIds(unittest.TestCase):
+    """Test deterministic row ids."""
+
+    def test_numeric_ids_pass_through(self):
+        self.assertEqual(document_db_id("42"), 42)
+        self.assertEqual(kb_db_id(7), 7)
+        self.assertEqual(kb_db_id(None), 0)
+
+    def test_ids_are_positive_64_bit(self):
+        value = document_db_id("doc_abc123")
+        self.assertGreater(value, 0)
+        self.assertLess(value, 1 << 63)
+
+    def test_ids_are_scoped_by_kb_and_document(self):
+        self.assertNotEqual(entity_db_id(1, 1, "alice"), entity_db_id(1, 2, "alice"))
+        self.assertNotEqual(entity_db_id(1, 1, "alice"), entity_db_id(2, 1, "alice"))
+
+    def test_ids_are_stable_across_processes(self):
+        code = (
+            "from knowledge_graph.persistence.sqlite.core.ids import stable_id;"
+            "print(stable_id('entity', 1, 2, 'alice'))"
+        )
+        env = dict(os.environ, PYTHONHASHSEED="123", PYTHONPATH=os.pathsep.join(sys.path))
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=env, check=True)
+        self.assertEqual(int(out.stdout.strip().splitlines()[-1]), stable_id("entity", 1, 2, "alice"))
+
+
+class TestSQLiteGraphRepository(unittest.TestCase):
+    """Test bulk KG writes through the pooled SqlLite facade."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        settings = load_settings({"db": {"db_location": os.path.join(self.tmp.name, "kb.db")}})
+        self.sql_lite = SqlLite(settings)
+        self.sql_lite.create_tables()
+        self.kb_id = self.sql_lite.knowledge_base_repository().create("Test", "test").id
+        with self.sql_lite.pool.writer() as conn:
+            conn.execute(
+                "INSERT INTO documents (id, kb_id, file_name, file_type) VALUES (?, ?, 'people.csv', 'CSV')",
+                (document_db_id("doc_1"), int(self.kb_id)),
+            )
+        self.kg_data = {
+            "entities": [
+                {"id": "person:1", "type": "person", "label": "Alice", "properties": {"age": 30}},
+                {"id": "person:2", "type": "person", "label": "Bob", "properties": {}},
+            ],
+            "relationships": [{"source": "person:1", "target": "person:2", "predicate": "knows"}],
+        }
+
+    def tearDown(self):
+        self.sql_lite.close()
+        self.tmp.cleanup()
+
+    def test_repositories_share_one_pool(self):
+        self.assertIs(self.sql_lite.graph_repository(), self.sql_lite.graph_repository())
+        self.assertIs(self.sql_lite.graph_repository()._pool, self.sql_lite.document_repository()._pool)
+
+    def test_save_is_idempotent(self):
+        repo = self.sql_lite.graph_repository()
+        for _ in range(2):
+            self.assertTrue(repo.save_to_knowledge_graph("doc_1", self.kg_data, kb_id=self.kb_id, batch_size=1))
+        snapshot = repo.get_graph_snapshot(document_id="doc_1")
+        self.assertEqual(len(snapshot["nodes"]), 2)
+        self.assertEqual(len(snapshot["edges"]), 1)
+        self.assertEqual(repo.last_write_stats["entities"], 2)
+
+    def test_bulk_load_restores_indexes(self):
+        repo = self.sql_lite.graph_repository()
+        self.assertTrue(
+            repo.save_to_knowledge_graph(
+                "doc_1", self.kg_data, kb_id=self.kb_id, defer_foreign_keys=True, rebuild_indexes=True
+            )
+        )
+        with self.sql_lite.pool.reader() as conn:
+            names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        self.assertIn("idx_relationships_outgoing", names)
+        alice = entity_db_id(int(self.kb_id), document_db_id("doc_1"), "person:1")
+        neighbors = repo.get_neighbors(str(alice), direction="out")
+        self.assertEqual([edge["predicate"] for edge in neighbors], ["knows"])
+
+    def test_bulk_load_keeps_indexes_on_a_populated_graph(self):
+        repo = self.sql_lite.graph_repository()
+        self.assertTrue(repo.save_to_knowledge_graph("doc_1", self.kg_data, kb_id=self.kb_id, rebuild_indexes=True))
+        self.assertGreater(repo.last_write_stats["indexes_rebuilt"], 0)
+        with self.sql_lite.pool.writer() as conn:
+            conn.execute(
+                "INSERT INTO documents (id, kb_id, file_name, file_type) VALUES (?, ?, 'b.csv', 'CSV')",
+                (document_db_id("doc_2"), int(self.kb_id)),
+            )
+
+        with repo.bulk_writer("doc_2", kb_id=self.kb_id, rebuild_indexes=True) as writer:
+            writer.write(self.kg_data["entities"], self.kg_data["relationships"])
+        self.assertEqual(repo.last_write_stats["indexes_rebuilt"], 0)
+        with self.sql_lite.pool.reader() as conn:
+            names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        self.assertIn("idx_relationships_outgoing", names)
+
+    def test_keyset_pages_cover_snapshot(self):
+        repo = self.sql_lite.graph_repository()
+        repo.save_to_knowledge_graph("doc_1", self.kg_data, kb_id=self.kb_id)
+        seen, cursor = [], None
+        while True:
+            page = repo.get_graph_page("nodes", kb_id=self.kb_id, cursor=cursor, limit=1)
+            seen.extend(node["id"] for node in page["items"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        snapshot = repo.get_graph_snapshot(kb_id=self.kb_id)
+        self.assertEqual(seen, sorted((node["id"] for node in snapshot["nodes"]), key=int))
+        streamed = [kind for kind, _ in repo.iter_graph_snapshot(kb_id=self.kb_id, page_size=1)]
+        self.assertEqual(streamed, ["node", "node", "edge"])
+
+    def test_keyset_pages_do_not_sort_in_a_temp_b_tree(self):
+        repo = self.sql_lite.graph_repository()
+        repo.create_indexes()
+        scopes = [
+            {"kb_id": self.kb_id, "document_id": None},
+            {"kb_id": self.kb_id, "document_id": "doc_1"},
+            {"kb_id": None, "document_id": "doc_1"},
+            {"kb_id": None, "document_id": None},
+        ]
+        with self.sql_lite.pool.reader() as conn:
+            for kind in ("nodes", "edges"):
+                for scope in scopes:
+                    sql, params = repo._snapshot_page_query(kind, after_id=1, limit=100, **scope)
+                    plan = " | ".join(row[-1] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params))
+                    self.assertNotIn("TEMP B-TREE", plan, (kind, scope))
+
+    def test_non_numeric_kb_reference_is_hashed_consistently(self):
+        team = kb_db_id("team-alpha")
+        with self.sql_lite.pool.writer() as conn:
+            conn.execute("INSERT INTO knowledge_bases (id, slug, name) VALUES (?, 'team-alpha', 'Team')", (team,))
+            conn.execute(
+                "INSERT INTO documents (id, kb_id, file_name, file_type) VALUES (?, ?, 'team.csv', 'CSV')",
+                (document_db_id("doc_2"), team),
+            )
+        repo = self.sql_lite.graph_repository()
+        repo.save_to_knowledge_graph("doc_1", self.kg_data, kb_id=self.kb_id)
+        with repo.bulk_writer("doc_2", kb_id="team-alpha") as writer:
+            writer.write(self.kg_data["entities"], self.kg_data["relationships"])
+
+        # The snapshot filter uses the same id as the rows, instead of matching every KB
+        snapshot = repo.get_graph_snapshot(kb_id="team-alpha")
+        self.assertEqual(
+            sorted(int(node["id"]) for node in snapshot["nodes"]),
+            sorted(entity_db_id(team, document_db_id("doc_2"), key) for key in ("person:1", "person:2")),
+        )
+        self.assertEqual(len(snapshot["edges"]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()